@@ -0,0 +1,100 @@
+"""PII scanning throughput: one regex per pattern vs. the combined scanner.
+
+Usage: python benchmarks/bench_pii.py [--mb 50] [--pii-rate 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+
+from ftdata.core.models import Message, Sample
+from ftdata.quality.pii import PII_PATTERNS, scan_samples
+
+WORDS = [
+    "the",
+    "model",
+    "should",
+    "answer",
+    "concisely",
+    "and",
+    "cite",
+    "the",
+    "relevant",
+    "section",
+    "of",
+    "the",
+    "policy",
+    "before",
+    "giving",
+    "an",
+    "example",
+    "in",
+    "python",
+    "or",
+    "plain",
+    "english",
+    "with",
+    "clear",
+    "steps",
+]
+PII_SNIPPETS = [
+    "jane.doe@example.com",
+    "555-867-5309",
+    "123-45-6789",
+    "4532 1234 5678 9012",
+    "sk-abcdefghijklmnopqrstuvwxyz012345",
+]
+
+
+def make_samples(megabytes: float, pii_rate: float, seed: int = 0) -> list[Sample]:
+    rng = random.Random(seed)
+    samples: list[Sample] = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        words = rng.choices(WORDS, k=rng.randint(20, 300))
+        if rng.random() < pii_rate:
+            words.insert(rng.randrange(len(words)), rng.choice(PII_SNIPPETS))
+        text = " ".join(words)
+        size += len(text)
+        samples.append(Sample(messages=[Message(role="assistant", content=text)]))
+    return samples
+
+
+def scan_per_pattern(samples: list[Sample]) -> int:
+    """Baseline: every pattern is a separate pass over every message."""
+    patterns = [re.compile(p) for p in PII_PATTERNS.values()]
+    found = 0
+    for sample in samples:
+        for message in sample.messages:
+            for pattern in patterns:
+                found += sum(1 for _ in pattern.finditer(message.content))
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=50.0, help="Synthetic text size in MB")
+    parser.add_argument("--pii-rate", type=float, default=0.05, help="Fraction of samples with PII")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    samples = make_samples(args.mb, args.pii_rate)
+    megabytes = sum(len(m.content) for s in samples for m in s.messages) / 1024 / 1024
+
+    runs = [
+        ("per-pattern", lambda: scan_per_pattern(samples)),
+        ("combined (1 worker)", lambda: scan_samples(samples, workers=1)),
+        ("combined (pool)", lambda: scan_samples(samples, workers=args.workers)),
+    ]
+    for name, run in runs:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {megabytes / elapsed:8.1f} MB/s  ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Pipeline throughput across dataset formats, for comparing releases.
+
+Generates a synthetic ChatML, Alpaca and ShareGPT dataset and times every
+stage (loader, analyzers, full profile pipeline) on each, writing all
+reports as one JSON document. Pass an earlier result as --baseline to see
+per-stage speed ratios.
+
+Usage: python benchmarks/bench_suite.py [--samples 20000] [--repeat 3] [--out bench.json]
+           [--baseline previous.json] [--encoding cl100k_base]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+
+from ftdata.bench.suite import compare_reports, run_benchmarks
+from ftdata.bench.synthetic import generate_dataset
+from ftdata.core.models import BenchmarkReport, DatasetFormat
+
+FORMATS = (DatasetFormat.CHATML, DatasetFormat.ALPACA, DatasetFormat.SHAREGPT)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=20_000, help="Samples per dataset")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (best is kept)")
+    parser.add_argument("--stage", action="append", help="Stage to run (default: all)")
+    parser.add_argument("--encoding", default="cl100k_base", help="tiktoken encoding")
+    parser.add_argument("--out", type=Path, help="Write the JSON results here")
+    parser.add_argument("--baseline", type=Path, help="Earlier --out file to compare against")
+    args = parser.parse_args()
+
+    baseline: dict[str, BenchmarkReport] = {}
+    if args.baseline:
+        for raw in json.loads(args.baseline.read_text())["reports"]:
+            previous = BenchmarkReport.model_validate(raw)
+            baseline[previous.dataset_format.value] = previous
+
+    reports: list[BenchmarkReport] = []
+    with tempfile.TemporaryDirectory(prefix="ftdata-bench-") as tmp:
+        for fmt in FORMATS:
+            path = generate_dataset(Path(tmp) / f"{fmt.value}.jsonl", args.samples, fmt)
+            report = run_benchmarks(path, args.stage, args.encoding, args.repeat)
+            reports.append(report)
+            ratios = compare_reports(baseline[fmt.value], report) if fmt.value in baseline else {}
+            print(f"{fmt.value}: {report.sample_count:,} samples, {report.size_bytes / 1e6:.1f} MB")
+            for timing in report.stages:
+                change = f"  {ratios[timing.stage]:.2f}x" if timing.stage in ratios else ""
+                print(
+                    f"  {timing.stage:<14} {timing.samples_per_second:>12,.0f} samples/s "
+                    f"{timing.mb_per_second:>9.2f} MB/s {timing.peak_rss_mb or 0:>8.0f} MB{change}"
+                )
+
+    if args.out:
+        payload = {"reports": [r.model_dump(mode="json") for r in reports]}
+        args.out.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,41 @@
 """ftdata — Profile and validate LLM fine-tuning datasets."""
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 
-from ftdata.core.models import (
-    Dataset,
-    DatasetFormat,
-    DedupResult,
-    DiversityResult,
-    ProfileReport,
-    ProfileResult,
-    QualityIssue,
-    QualityResult,
-    Sample,
-)
-from ftdata.exceptions import FtdataError
+if TYPE_CHECKING:
+    from ftdata.core.models import (
+        Dataset,
+        DatasetFormat,
+        DedupResult,
+        DiversityResult,
+        ProfileReport,
+        ProfileResult,
+        QualityIssue,
+        QualityResult,
+        Sample,
+    )
+    from ftdata.exceptions import FtdataError
+
+# Public names and the module that defines them. They are imported on first
+# access, so `import ftdata` (and `ftdata --version`) does not pay for
+# pydantic and numpy.
+_LAZY_ATTRIBUTES = {
+    "Dataset": "ftdata.core.models",
+    "DatasetFormat": "ftdata.core.models",
+    "DedupResult": "ftdata.core.models",
+    "DiversityResult": "ftdata.core.models",
+    "FtdataError": "ftdata.exceptions",
+    "ProfileReport": "ftdata.core.models",
+    "ProfileResult": "ftdata.core.models",
+    "QualityIssue": "ftdata.core.models",
+    "QualityResult": "ftdata.core.models",
+    "Sample": "ftdata.core.models",
+}
 
 __all__ = [
     "Dataset",
@@ -28,3 +50,16 @@ __all__ = [
     "Sample",
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -1,5 +1,6 @@
 """Allow running ftdata as a module: python -m ftdata."""
 
-from ftdata.cli import cli
+from ftdata.cli import main
 
-cli()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Benchmarks: synthetic dataset generation and pipeline throughput."""
@@ -0,0 +1,207 @@
+"""Throughput benchmarks for the loader, each analyzer and the profile pipeline.
+
+Every stage is timed on the same dataset file with the result cache
+disabled. By default each stage runs in a fresh worker process, so its
+peak RSS is measured on its own rather than as the high-water mark of
+everything that ran before it; setup (loading the dataset and tokenizer)
+happens before the clock starts. With ``isolated=False`` stages run in
+the calling process, which is faster but reports the process-wide peak.
+"""
+
+from __future__ import annotations
+
+import platform
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from ftdata import __version__
+from ftdata.core.loader import detect_format, load_dataset
+from ftdata.core.models import BenchmarkReport, Dataset, StageTiming
+from ftdata.profiling.tokens import DEFAULT_ENCODING
+from ftdata.timing import peak_rss_bytes
+
+# A stage's setup function loads what the stage needs and returns the
+# callable to time.
+StageSetup = Callable[[Path, str], Callable[[], object]]
+
+
+def _load(path: Path, encoding_name: str) -> Callable[[], object]:
+    return lambda: load_dataset(path)
+
+
+def _load_strict(path: Path, encoding_name: str) -> Callable[[], object]:
+    return lambda: load_dataset(path, strict=True)
+
+
+def _profile(path: Path, encoding_name: str) -> Callable[[], object]:
+    from ftdata.profiling.stats import profile_dataset
+    from ftdata.profiling.tokens import get_encoding
+
+    get_encoding(encoding_name)
+    return lambda: profile_dataset(load_dataset(path), encoding_name)
+
+
+def _analyzer(run: Callable[[Dataset, str], object], tokenizes: bool = True) -> StageSetup:
+    def setup(path: Path, encoding_name: str) -> Callable[[], object]:
+        from ftdata.profiling.tokens import get_encoding
+
+        dataset = load_dataset(path)
+        if tokenizes:
+            get_encoding(encoding_name)
+        return lambda: run(dataset, encoding_name)
+
+    return setup
+
+
+def _tokenize(dataset: Dataset, encoding_name: str) -> object:
+    from ftdata.profiling.tokens import tokenize_samples
+
+    return tokenize_samples(dataset, encoding_name)
+
+
+def _rules(dataset: Dataset, encoding_name: str) -> object:
+    from ftdata.quality.rules import check_quality_rules
+
+    return check_quality_rules(dataset, encoding_name=encoding_name)
+
+
+def _heuristics(dataset: Dataset, encoding_name: str) -> object:
+    from ftdata.quality.heuristics import check_heuristics
+
+    return check_heuristics(dataset, encoding_name=encoding_name)
+
+
+def _pii(dataset: Dataset, encoding_name: str) -> object:
+    from ftdata.quality.pii import detect_pii
+
+    return detect_pii(dataset)
+
+
+def _language(dataset: Dataset, encoding_name: str) -> object:
+    from ftdata.profiling.language import detect_languages
+
+    return detect_languages(dataset)
+
+
+def _exact_dedup(dataset: Dataset, encoding_name: str) -> object:
+    from ftdata.dedup.exact import find_exact_duplicates
+
+    return find_exact_duplicates(dataset)
+
+
+def _minhash_dedup(dataset: Dataset, encoding_name: str) -> object:
+    from ftdata.dedup.minhash import find_minhash_duplicates
+
+    return find_minhash_duplicates(dataset)
+
+
+def _quality(dataset: Dataset, encoding_name: str) -> object:
+    from ftdata.quality.runner import run_quality_checks
+
+    return run_quality_checks(dataset, encoding_name=encoding_name)
+
+
+# Stage name -> setup, in reporting order. "load_strict" is the loader's
+# record-by-record reference path (--strict). "profile" is the whole
+# `ftdata profile` pipeline: load, tokenize, length/turn/vocabulary stats.
+STAGES: dict[str, StageSetup] = {
+    "load": _load,
+    "load_strict": _load_strict,
+    "tokenize": _analyzer(_tokenize),
+    "quality_rules": _analyzer(_rules),
+    "heuristics": _analyzer(_heuristics),
+    "pii": _analyzer(_pii, tokenizes=False),
+    "language": _analyzer(_language, tokenizes=False),
+    "exact_dedup": _analyzer(_exact_dedup, tokenizes=False),
+    "minhash_dedup": _analyzer(_minhash_dedup, tokenizes=False),
+    "quality": _analyzer(_quality),
+    "profile": _profile,
+}
+
+
+def run_stage(stage: str, path: Path, encoding_name: str, repeat: int) -> tuple[float, int | None]:
+    """Time `stage` on `path`; returns the best of `repeat` runs and the peak RSS."""
+    run = STAGES[stage](path, encoding_name)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best, peak_rss_bytes()
+
+
+def run_benchmarks(
+    path: Path,
+    stages: list[str] | None = None,
+    encoding_name: str = DEFAULT_ENCODING,
+    repeat: int = 1,
+    isolated: bool = True,
+    on_stage: Callable[[StageTiming], None] | None = None,
+) -> BenchmarkReport:
+    """Benchmark pipeline stages on a dataset file.
+
+    Args:
+        path: Dataset to benchmark (e.g. from generate_dataset).
+        stages: Stage names from STAGES (default: all, in order).
+        encoding_name: tiktoken encoding for token-based stages.
+        repeat: Runs per stage; the fastest is reported.
+        isolated: Run each stage in a fresh worker process.
+        on_stage: Called with each stage's timing as it completes.
+
+    Returns:
+        BenchmarkReport with throughput per stage.
+
+    Raises:
+        ValueError: If a stage name is unknown.
+    """
+    selected = list(stages or STAGES)
+    unknown = [s for s in selected if s not in STAGES]
+    if unknown:
+        raise ValueError(f"unknown benchmark stage(s): {', '.join(unknown)}")
+    sample_count = load_dataset(path).sample_count
+    size = path.stat().st_size
+    report = BenchmarkReport(
+        ftdata_version=__version__,
+        python_version=platform.python_version(),
+        platform=platform.platform(),
+        dataset_path=str(path),
+        dataset_format=detect_format(path),
+        sample_count=sample_count,
+        size_bytes=size,
+        repeat=repeat,
+        isolated=isolated,
+    )
+    for stage in selected:
+        if isolated:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                seconds, peak = pool.submit(run_stage, stage, path, encoding_name, repeat).result()
+        else:
+            seconds, peak = run_stage(stage, path, encoding_name, repeat)
+        seconds = max(seconds, 1e-9)
+        timing = StageTiming(
+            stage=stage,
+            seconds=round(seconds, 6),
+            samples_per_second=round(sample_count / seconds, 1),
+            mb_per_second=round(size / 1024 / 1024 / seconds, 3),
+            peak_rss_mb=None if peak is None else round(peak / 1024 / 1024, 1),
+        )
+        report.stages.append(timing)
+        if on_stage is not None:
+            on_stage(timing)
+    return report
+
+
+def compare_reports(baseline: BenchmarkReport, current: BenchmarkReport) -> dict[str, float]:
+    """Speed of each stage relative to `baseline` (>1 is faster, <1 a regression).
+
+    Compares samples/s, so runs on datasets of different sizes are comparable.
+    """
+    before = {t.stage: t.samples_per_second for t in baseline.stages}
+    return {
+        t.stage: round(t.samples_per_second / before[t.stage], 3)
+        for t in current.stages
+        if before.get(t.stage)
+    }
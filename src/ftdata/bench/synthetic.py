@@ -0,0 +1,138 @@
+"""Deterministic synthetic fine-tuning datasets for benchmarks and tests.
+
+The same arguments always produce the same file. Each record is a
+conversation of 1 to `max_turns` user/assistant exchanges built from a
+fixed vocabulary and a handful of prompt templates. A `duplicate_rate`
+fraction of records repeat a recent earlier record exactly, and a `pii_rate`
+fraction of records contain one PII snippet (email, phone, SSN, card
+number or API key).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+from ftdata.core.models import DatasetFormat
+
+_VOCABULARY = (
+    "the model should answer concisely and cite the relevant section of the policy before "
+    "giving an example in python or plain english with clear steps data training quality "
+    "review each response for accuracy tone format length safety context user request "
+    "summary table list code function error value result because therefore however first "
+    "second finally note that this is a short overview of how to approach problem"
+)
+WORDS = tuple(_VOCABULARY.split())
+
+PROMPT_TEMPLATES = (
+    "Explain {topic} in simple terms.",
+    "Write a short function that handles {topic}.",
+    "Summarize the following notes about {topic}: {text}",
+    "What are the trade-offs of {topic}?",
+    "Rewrite this paragraph to be clearer: {text}",
+    "Give three examples of {topic}.",
+)
+
+PII_SNIPPETS = (
+    "jane.doe@example.com",
+    "555-867-5309",
+    "123-45-6789",
+    "4532 1234 5678 9012",
+    "sk-abcdefghijklmnopqrstuvwxyz012345",
+)
+
+SYSTEM_PROMPT = "You are a helpful assistant."
+
+# Earlier records that duplicates are drawn from (bounded, so memory does
+# not grow with the dataset).
+DUPLICATE_POOL = 1000
+
+
+def _text(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def _exchanges(rng: random.Random, max_turns: int) -> list[tuple[str, str]]:
+    exchanges = []
+    for _ in range(rng.randint(1, max_turns)):
+        template = rng.choice(PROMPT_TEMPLATES)
+        prompt = template.format(topic=_text(rng, 1, 3), text=_text(rng, 10, 40))
+        exchanges.append((prompt, _text(rng, 20, 200)))
+    return exchanges
+
+
+def _insert_pii(rng: random.Random, exchanges: list[tuple[str, str]]) -> None:
+    turn = rng.randrange(len(exchanges))
+    prompt, answer = exchanges[turn]
+    words = answer.split()
+    words.insert(rng.randrange(len(words) + 1), rng.choice(PII_SNIPPETS))
+    exchanges[turn] = (prompt, " ".join(words))
+
+
+def synthetic_record(
+    exchanges: list[tuple[str, str]], format: DatasetFormat, system: bool = False
+) -> dict[str, Any]:
+    """Build one raw record of `format` from ``(prompt, answer)`` exchanges.
+
+    Alpaca records hold a single exchange; later ones are dropped.
+    """
+    if format == DatasetFormat.ALPACA:
+        prompt, answer = exchanges[0]
+        record: dict[str, Any] = {"instruction": prompt, "input": "", "output": answer}
+        if system:
+            record["system"] = SYSTEM_PROMPT
+        return record
+    if format == DatasetFormat.SHAREGPT:
+        turns = [{"from": "system", "value": SYSTEM_PROMPT}] if system else []
+        for prompt, answer in exchanges:
+            turns += [{"from": "human", "value": prompt}, {"from": "gpt", "value": answer}]
+        return {"conversations": turns}
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}] if system else []
+    for prompt, answer in exchanges:
+        messages += [{"role": "user", "content": prompt}, {"role": "assistant", "content": answer}]
+    return {"messages": messages}
+
+
+def generate_dataset(
+    path: Path,
+    samples: int = 10_000,
+    format: DatasetFormat = DatasetFormat.CHATML,
+    max_turns: int = 3,
+    duplicate_rate: float = 0.05,
+    pii_rate: float = 0.02,
+    seed: int = 0,
+) -> Path:
+    """Write a deterministic synthetic JSONL dataset.
+
+    Args:
+        path: Output file (overwritten).
+        samples: Number of records.
+        format: ChatML, Alpaca or ShareGPT layout.
+        max_turns: Maximum user/assistant exchanges per record.
+        duplicate_rate: Fraction of records that exactly repeat an earlier one.
+        pii_rate: Fraction of (non-duplicate) records containing a PII snippet.
+        seed: Random seed.
+
+    Returns:
+        `path`.
+    """
+    rng = random.Random(seed)
+    pool: list[str] = []
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(samples):
+            if pool and rng.random() < duplicate_rate:
+                line = rng.choice(pool)
+            else:
+                exchanges = _exchanges(rng, max_turns)
+                if rng.random() < pii_rate:
+                    _insert_pii(rng, exchanges)
+                record = synthetic_record(exchanges, format, system=rng.random() < 0.5)
+                line = json.dumps(record, ensure_ascii=False)
+                if len(pool) < DUPLICATE_POOL:
+                    pool.append(line)
+                else:
+                    pool[rng.randrange(DUPLICATE_POOL)] = line
+            f.write(line + "\n")
+    return path
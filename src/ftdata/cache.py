@@ -0,0 +1,284 @@
+"""Persistent, content-addressed cache of per-sample analyzer results.
+
+Entries are keyed by ``(content_hash, analyzer, config hash, ftdata version)``
+so a re-run over a mostly unchanged dataset only recomputes new or edited
+samples. Storage is a single SQLite file with size-bounded LRU eviction.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from ftdata import __version__
+
+# Kept light to import: the CLI resolves the cache directory before it
+# knows whether any analyzer will run.
+if TYPE_CHECKING:
+    from ftdata.core.models import CacheStats, Sample
+
+T = TypeVar("T")
+
+CACHE_FILENAME = "results.sqlite3"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Eviction trims the cache to this fraction of the limit so that a run
+# hovering at the limit does not evict on every write.
+_EVICT_LOW_WATER = 0.9
+# Stay well below SQLite's bound-parameter limit.
+_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    analyzer TEXT NOT NULL,
+    config TEXT NOT NULL,
+    version TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (analyzer, config, version, content_hash)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('bytes', 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE key = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE key = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET value = value - OLD.size + NEW.size WHERE key = 'bytes';
+END;
+"""
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory: $FTDATA_CACHE_DIR, else $XDG_CACHE_HOME/ftdata."""
+    override = os.environ.get("FTDATA_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ftdata"
+
+
+def config_hash(config: Any) -> str:
+    """Stable short hash of an analyzer configuration.
+
+    Accepts a pydantic model, or any JSON-serializable value.
+    """
+    from pydantic import BaseModel
+
+    if isinstance(config, BaseModel):
+        config = config.model_dump(mode="json")
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _chunks(items: Sequence[str]) -> Iterable[Sequence[str]]:
+    for start in range(0, len(items), _CHUNK):
+        yield items[start : start + _CHUNK]
+
+
+class ResultCache:
+    """SQLite-backed per-sample result store with LRU eviction.
+
+    Values must be JSON-serializable. The cache is safe to share between
+    threads; separate processes may open the same file concurrently.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        version: str = __version__,
+    ) -> None:
+        self.path = path or default_cache_dir() / CACHE_FILENAME
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> ResultCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def get_many(self, analyzer: str, config: str, hashes: Sequence[str]) -> dict[str, Any]:
+        """Look up cached values for `hashes`, refreshing their LRU position.
+
+        Args:
+            analyzer: Analyzer name (e.g. ``"tokens:cl100k_base"``).
+            config: Analyzer config hash from :func:`config_hash`.
+            hashes: Sample content hashes to look up.
+
+        Returns:
+            Mapping of content hash to value for every hit.
+        """
+        found: dict[str, Any] = {}
+        now = time.time()
+        with self._lock, self._conn:
+            for chunk in _chunks(hashes):
+                marks = ",".join("?" * len(chunk))
+                params = (analyzer, config, self.version, *chunk)
+                where = f"analyzer = ? AND config = ? AND version = ? AND content_hash IN ({marks})"
+                rows = self._conn.execute(
+                    f"SELECT content_hash, value FROM entries WHERE {where}", params
+                ).fetchall()
+                for content_hash, value in rows:
+                    found[content_hash] = json.loads(value)
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE entries SET accessed = ? WHERE {where}", (now, *params)
+                    )
+        self.hits += len(found)
+        self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, analyzer: str, config: str, values: dict[str, Any]) -> None:
+        """Store values keyed by content hash, evicting old entries if over budget."""
+        if not values:
+            return
+        now = time.time()
+        rows = []
+        for content_hash, value in values.items():
+            blob = json.dumps(value, separators=(",", ":")).encode()
+            size = len(blob) + len(analyzer) + len(config) + len(content_hash)
+            rows.append((analyzer, config, self.version, content_hash, blob, size, now))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (analyzer, config, version, content_hash) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, accessed = excluded.accessed",
+                rows,
+            )
+            if self._size() > self.max_bytes:
+                self._evict(int(self.max_bytes * _EVICT_LOW_WATER))
+
+    def _size(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'bytes'").fetchone()
+        return int(row[0])
+
+    def _evict(self, target: int) -> int:
+        excess = self._size() - target
+        if excess <= 0:
+            return 0
+        victims: list[int] = []
+        rows = self._conn.execute("SELECT rowid, size FROM entries ORDER BY accessed, rowid")
+        for rowid, size in rows:
+            if excess <= 0:
+                break
+            victims.append(rowid)
+            excess -= size
+        rows.close()
+        for start in range(0, len(victims), _CHUNK):
+            chunk = victims[start : start + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            self._conn.execute(f"DELETE FROM entries WHERE rowid IN ({marks})", chunk)
+        return len(victims)
+
+    def prune(self, max_bytes: int | None = None) -> int:
+        """Drop entries from other ftdata versions, then LRU-evict to `max_bytes`.
+
+        Args:
+            max_bytes: Size budget to trim to (defaults to the cache limit).
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM entries WHERE version != ?", (self.version,))
+            removed = max(cursor.rowcount, 0)
+            removed += self._evict(self.max_bytes if max_bytes is None else max_bytes)
+        self._conn.execute("VACUUM")
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry. Returns the number of entries removed."""
+        with self._lock, self._conn:
+            removed = max(self._conn.execute("DELETE FROM entries").rowcount, 0)
+        self._conn.execute("VACUUM")
+        return removed
+
+    def stats(self) -> CacheStats:
+        """Summarize cache contents."""
+        from ftdata.core.models import CacheStats
+
+        with self._lock:
+            analyzers = dict(
+                self._conn.execute(
+                    "SELECT analyzer, COUNT(*) FROM entries GROUP BY analyzer"
+                ).fetchall()
+            )
+            stale = self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE version != ?", (self.version,)
+            ).fetchone()[0]
+            size = self._size()
+        return CacheStats(
+            path=str(self.path),
+            entries=sum(analyzers.values()),
+            size_bytes=size,
+            max_size_bytes=self.max_bytes,
+            stale_entries=stale,
+            analyzers=analyzers,
+        )
+
+
+def map_cached(
+    samples: Sequence[Sample],
+    analyzer: str,
+    config: Any,
+    compute: Callable[[list[Sample]], list[T]],
+    cache: ResultCache | None = None,
+) -> list[T]:
+    """Apply a per-sample analyzer, computing only samples not already cached.
+
+    Samples sharing a content hash are computed once. `compute` receives the
+    samples to analyze and must return one JSON-compatible value per sample
+    (lists rather than tuples) that does not depend on the sample's index.
+
+    Args:
+        samples: Samples to analyze.
+        analyzer: Analyzer name used as part of the cache key.
+        config: Analyzer configuration; hashed into the cache key.
+        compute: Batch function producing one result per sample.
+        cache: Optional ResultCache; when None everything is computed.
+
+    Returns:
+        One result per input sample, in order.
+    """
+    hashes = [s.content_hash for s in samples]
+    key = config_hash(config)
+    known: dict[str, Any] = (
+        cache.get_many(analyzer, key, list(dict.fromkeys(hashes))) if cache else {}
+    )
+
+    pending: dict[str, Sample] = {}
+    for content_hash, sample in zip(hashes, samples, strict=True):
+        if content_hash not in known and content_hash not in pending:
+            pending[content_hash] = sample
+    if pending:
+        computed = dict(zip(pending, compute(list(pending.values())), strict=True))
+        if cache is not None:
+            cache.put_many(analyzer, key, computed)
+        known.update(computed)
+    return [known[h] for h in hashes]
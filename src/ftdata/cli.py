@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
 import click
-from rich.console import Console
 
 from ftdata import __version__
+from ftdata.exceptions import FtdataError
+
+# Analyzers and their dependencies (pydantic, numpy, tiktoken, datasketch,
+# rich, ...) are imported inside the commands that use them, so `--help`,
+# `--version` and light commands start quickly.
+if TYPE_CHECKING:
+    from rich.console import Console, RenderableType
 
-console = Console()
+    from ftdata.cache import ResultCache
+    from ftdata.config import FtdataConfig
+    from ftdata.core.models import Dataset, ProfileReport
 
 
 class Context:
@@ -18,20 +31,117 @@ class Context:
         config_path: str | None = None,
         quiet: bool = False,
         json_output: bool = False,
+        use_cache: bool = True,
+        timings: bool = False,
+        strict: bool = False,
+        cwd: str | None = None,
     ) -> None:
         self.config_path = config_path
         self.quiet = quiet
         self.json_output = json_output
-        self.console = Console(quiet=quiet)
+        self.use_cache = use_cache
+        self.timings = timings
+        self.strict = strict
+        self.cwd = Path(cwd) if cwd else None
+        self._console: Console | None = None
+        self._config: FtdataConfig | None = None
+
+    @property
+    def console(self) -> Console:
+        """Console for human-readable output, created on first access."""
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(quiet=self.quiet)
+        return self._console
+
+    @property
+    def config(self) -> FtdataConfig:
+        """Project configuration, loaded on first access."""
+        if self._config is None:
+            from ftdata.config import load_config
+
+            try:
+                self._config = load_config(
+                    self.resolve(self.config_path) if self.config_path else None, self.cwd
+                )
+            except FtdataError as e:
+                raise click.ClickException(str(e)) from e
+        return self._config
+
+    def resolve(self, path: str) -> Path:
+        """`path` relative to the invoking client's directory (see ``--cwd``)."""
+        return self.cwd / path if self.cwd else Path(path)
+
+    def result_cache(self) -> ResultCache:
+        """Open the configured result cache."""
+        from ftdata.cache import ResultCache
+
+        settings = self.config.cache
+        return ResultCache(
+            self.resolve(settings.path) if settings.path else None,
+            max_bytes=settings.max_size_mb * 1024 * 1024,
+        )
+
+    def open_cache(self) -> ResultCache | None:
+        """Open the result cache, or return None if caching is disabled."""
+        if not (self.use_cache and self.config.cache.enabled):
+            return None
+        return self.result_cache()
+
+    def open_judgment_cache(self) -> ResultCache | None:
+        """Open the LLM judgment cache, or return None if caching is disabled."""
+        from ftdata.quality.llm_judge import open_judgment_cache
+
+        if not (self.use_cache and self.config.cache.enabled):
+            return None
+        settings = self.config.cache
+        return open_judgment_cache(self.resolve(settings.path).parent if settings.path else None)
+
+    def load(self, path: str) -> Dataset:
+        """Load a dataset, honouring the configured format."""
+        from ftdata.core.loader import load_dataset
+        from ftdata.core.models import DatasetFormat
+
+        fmt = DatasetFormat(self.config.format) if self.config.format else None
+        try:
+            return load_dataset(Path(path), fmt, self.strict)
+        except FtdataError as e:
+            raise click.ClickException(str(e)) from e
 
 
 pass_context = click.make_pass_decorator(Context, ensure=True)
 
 
+class ClientPath(click.Path):
+    """click.Path resolved against the invoking client's directory.
+
+    A warm server (``ftdata serve``) runs commands for clients in other
+    directories and passes theirs as ``--cwd``; its own working directory
+    is left alone.
+    """
+
+    def convert(self, value: Any, param: click.Parameter | None, ctx: click.Context | None) -> Any:
+        state = ctx.find_object(Context) if ctx else None
+        if state is not None and state.cwd is not None and isinstance(value, str):
+            value = str(state.resolve(value))
+        return super().convert(value, param, ctx)
+
+
 @click.group()
 @click.option("--config", "config_path", type=click.Path(), help="Path to .ftdata.yaml")
 @click.option("--quiet", "-q", is_flag=True, help="Suppress non-essential output")
 @click.option("--json", "json_output", is_flag=True, help="Output as JSON")
+@click.option("--no-cache", is_flag=True, help="Do not read or write the result cache")
+@click.option(
+    "--timings", is_flag=True, help="Record per-stage wall/CPU time and memory in reports"
+)
+@click.option(
+    "--strict",
+    is_flag=True,
+    help="Decode with the json module and validate each record on its own (slower)",
+)
+@click.option("--cwd", type=click.Path(file_okay=False), hidden=True)
 @click.version_option(version=__version__, prog_name="ftdata")
 @click.pass_context
 def cli(
@@ -39,53 +149,655 @@ def cli(
     config_path: str | None,
     quiet: bool,
     json_output: bool,
+    no_cache: bool,
+    timings: bool,
+    strict: bool,
+    cwd: str | None,
 ) -> None:
     """Profile and validate LLM fine-tuning datasets."""
     ctx.ensure_object(Context)
-    ctx.obj = Context(config_path=config_path, quiet=quiet, json_output=json_output)
+    ctx.obj = Context(
+        config_path=config_path,
+        quiet=quiet,
+        json_output=json_output,
+        use_cache=not no_cache,
+        timings=timings,
+        strict=strict,
+        cwd=cwd,
+    )
+
+
+def _emit_report(ctx: Context, report: ProfileReport) -> None:
+    if ctx.json_output:
+        click.echo(report.model_dump_json(indent=2))
+    else:
+        from ftdata.report.cli_report import print_report
+
+        print_report(report, ctx.console)
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True))
+@click.argument("path", type=ClientPath(exists=True))
+@click.option("--watch", is_flag=True, help="Follow a growing JSONL file and update live")
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.05),
+    default=1.0,
+    show_default=True,
+    help="Seconds between refreshes with --watch",
+)
 @pass_context
-def profile(ctx: Context, path: str) -> None:
+def profile(ctx: Context, path: str, watch: bool, interval: float) -> None:
     """Full profiling report for a dataset."""
-    ctx.console.print("[yellow]Not yet implemented[/yellow]")
+    from ftdata.core.models import ProfileReport
+    from ftdata.profiling.stats import profile_dataset
+    from ftdata.timing import record_timings
+
+    if watch:
+        _watch_profile(ctx, Path(path), interval)
+        return
+    with record_timings(ctx.timings) as recorder:
+        dataset = ctx.load(path)
+        cache = ctx.open_cache()
+        try:
+            profiling = ctx.config.profiling
+            result = profile_dataset(
+                dataset, profiling.token_encoding, cache, profiling.language_detection
+            )
+        finally:
+            if cache is not None:
+                cache.close()
+    _emit_report(
+        ctx,
+        ProfileReport(
+            dataset_path=path,
+            dataset_format=dataset.format,
+            sample_count=dataset.sample_count,
+            profile=result,
+            timings=recorder.spans,
+        ),
+    )
+
+
+def _watch_profile(ctx: Context, path: Path, interval: float) -> None:
+    import time
+
+    from rich.live import Live
+
+    from ftdata.core.compression import compression_of
+    from ftdata.core.loader import is_json_array
+    from ftdata.core.models import DatasetFormat
+    from ftdata.profiling.watch import WatchSession
+    from ftdata.report.cli_report import watch_renderable
+
+    if compression_of(path) is not None:
+        raise click.UsageError("--watch needs an uncompressed JSONL file")
+    with open(path, encoding="utf-8", errors="replace") as f:
+        if is_json_array(f.read(64)):
+            raise click.UsageError("--watch needs a JSONL file (one record per line)")
+    config = ctx.config
+    cache = ctx.open_cache()
+    session = WatchSession(
+        path,
+        DatasetFormat(config.format) if config.format else None,
+        config.profiling.token_encoding,
+        config.quality,
+        config.dedup,
+        cache,
+        config.profiling.language_detection,
+    )
+
+    def view() -> RenderableType:
+        return watch_renderable(
+            session.live_report(),
+            session.issue_counts(),
+            session.exact_duplicate_count,
+            session.near_duplicate_count,
+            session.bytes_read,
+        )
+
+    try:
+        with Live(console=ctx.console, auto_refresh=False, transient=ctx.json_output) as live:
+            rendered = 0.0
+            while True:
+                added = session.poll()
+                now = time.monotonic()
+                if now - rendered >= interval:
+                    live.update(view(), refresh=True)
+                    rendered = now
+                if not added:
+                    time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    except FtdataError as e:
+        raise click.ClickException(str(e)) from e
+    finally:
+        if cache is not None:
+            cache.close()
+    if ctx.json_output:
+        click.echo(session.report().model_dump_json(indent=2))
+
+
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(ctx: click.Context, param: click.Parameter, value: str | None) -> float | None:
+    """Seconds from ``5``, ``2.5s``, ``500ms`` or ``2m``."""
+    if value is None:
+        return None
+    text = value.strip().lower()
+    number, scale = text, 1.0
+    for unit in sorted(_DURATION_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            number, scale = text[: -len(unit)], _DURATION_UNITS[unit]
+            break
+    try:
+        seconds = float(number) * scale
+    except ValueError:
+        raise click.BadParameter(f"{value!r} is not a duration (e.g. 5s, 500ms, 2m)") from None
+    if seconds <= 0:
+        raise click.BadParameter(f"{value!r} must be positive")
+    return seconds
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True))
+@click.argument("path", type=ClientPath(exists=True))
+@click.option(
+    "--sample",
+    "sample_size",
+    type=click.IntRange(min=1),
+    help="Estimate from this many randomly sampled records instead of reading the whole file",
+)
+@click.option(
+    "--time-budget",
+    callback=_parse_duration,
+    help="Estimate from as many sampled records as fit in this time (e.g. 5s)",
+)
+@click.option("--seed", type=int, default=0, show_default=True, help="Seed for --sample")
 @pass_context
-def stats(ctx: Context, path: str) -> None:
-    """Quick statistical summary of a dataset."""
-    ctx.console.print("[yellow]Not yet implemented[/yellow]")
+def stats(
+    ctx: Context, path: str, sample_size: int | None, time_budget: float | None, seed: int
+) -> None:
+    """Quick statistical summary of a dataset.
+
+    With --sample or --time-budget, records are read at random offsets of a
+    JSONL file and the statistics are estimates with confidence intervals.
+    """
+    from ftdata.core.models import ProfileReport, ProfileResult
+    from ftdata.profiling.stats import compute_length_profile, compute_turn_profile
+    from ftdata.timing import record_timings
+
+    if sample_size is not None or time_budget is not None:
+        _estimate_stats(ctx, path, sample_size, time_budget, seed)
+        return
+    with record_timings(ctx.timings) as recorder:
+        dataset = ctx.load(path)
+        cache = ctx.open_cache()
+        try:
+            length = compute_length_profile(dataset, ctx.config.profiling.token_encoding, cache)
+        finally:
+            if cache is not None:
+                cache.close()
+    _emit_report(
+        ctx,
+        ProfileReport(
+            dataset_path=path,
+            dataset_format=dataset.format,
+            sample_count=dataset.sample_count,
+            profile=ProfileResult(
+                length=length,
+                turns=compute_turn_profile(dataset),
+                sample_count=dataset.sample_count,
+                total_tokens=length.total_tokens.total,
+            ),
+            timings=recorder.spans,
+        ),
+    )
+
+
+def _estimate_stats(
+    ctx: Context, path: str, sample_size: int | None, time_budget: float | None, seed: int
+) -> None:
+    from ftdata.core.models import DatasetFormat, ProfileReport
+    from ftdata.profiling.estimate import estimate_profile
+    from ftdata.timing import record_timings
+
+    fmt = DatasetFormat(ctx.config.format) if ctx.config.format else None
+    with record_timings(ctx.timings) as recorder:
+        cache = ctx.open_cache()
+        try:
+            profile, estimate, fmt = estimate_profile(
+                Path(path),
+                sample_size,
+                time_budget,
+                fmt,
+                ctx.config.profiling.token_encoding,
+                cache,
+                seed,
+            )
+        except FtdataError as e:
+            raise click.ClickException(str(e)) from e
+        finally:
+            if cache is not None:
+                cache.close()
+    _emit_report(
+        ctx,
+        ProfileReport(
+            dataset_path=path,
+            dataset_format=fmt,
+            sample_count=profile.sample_count,
+            profile=profile,
+            estimate=estimate,
+            timings=recorder.spans,
+        ),
+    )
+
+
+_SIZE_UNITS = {"b": 1, "kb": 1024, "mb": 1024**2, "gb": 1024**3}
+
+
+def _parse_size(ctx: click.Context, param: click.Parameter, value: str | None) -> int | None:
+    """Bytes from ``1048576``, ``512KB``, ``500MB`` or ``2GB``."""
+    if value is None:
+        return None
+    text = value.strip().lower()
+    number, scale = text, 1
+    for unit in sorted(_SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            number, scale = text[: -len(unit)], _SIZE_UNITS[unit]
+            break
+    try:
+        size = int(float(number) * scale)
+    except ValueError:
+        raise click.BadParameter(f"{value!r} is not a size (e.g. 500MB, 2GB)") from None
+    if size <= 0:
+        raise click.BadParameter(f"{value!r} must be positive")
+    return size
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True))
-@click.option("--output", "-o", type=click.Path(), help="Output path for cleaned dataset")
+@click.argument("path", type=ClientPath(exists=True))
+@click.option("--output", "-o", type=ClientPath(), help="Output path for cleaned dataset")
 @click.option(
     "--method",
-    type=click.Choice(["exact", "minhash", "semantic"]),
+    type=click.Choice(["exact", "minhash", "semantic", "substring"]),
     default="exact",
-    help="Deduplication method",
+    help="Deduplication method (substring: repeated spans inside samples)",
+)
+@click.option(
+    "--min-tokens",
+    type=click.IntRange(min=2),
+    help="Shortest repeated span for --method substring (default: dedup.span_min_tokens)",
+)
+@click.option(
+    "--max-occurrences",
+    type=click.IntRange(min=1),
+    help="Report spans occurring more often than this (default: dedup.span_max_occurrences)",
+)
+@click.option(
+    "--shard-size",
+    callback=_parse_size,
+    help="Split --output into files of about this size, written in parallel (e.g. 500MB)",
+)
+@click.option(
+    "--against",
+    type=ClientPath(exists=True, file_okay=False),
+    help="Match against a reference index (see build-index) instead of within the dataset",
+)
+@click.option(
+    "--external",
+    is_flag=True,
+    help="Exact dedup by on-disk merge sort in bounded memory (JSONL; see dedup.sort_memory_mb)",
 )
 @pass_context
-def dedup(ctx: Context, path: str, output: str | None, method: str) -> None:
-    """Deduplication analysis."""
-    ctx.console.print("[yellow]Not yet implemented[/yellow]")
+def dedup(
+    ctx: Context,
+    path: str,
+    output: str | None,
+    method: str,
+    min_tokens: int | None,
+    max_occurrences: int | None,
+    shard_size: int | None,
+    against: str | None,
+    external: bool,
+) -> None:
+    """Deduplication analysis.
+
+    With --output, a copy keeping the first sample of every duplicate
+    cluster is streamed from the source file, byte for byte. With
+    --against, samples are matched against a reference index instead and
+    --output drops every sample that has a reference match. --external (or
+    dedup.exact_strategy: external) never loads the dataset into memory.
+    --method substring reports token spans repeated across samples instead
+    of duplicate samples.
+    """
+    import json
+
+    from ftdata.core.models import CleanedDataset, DedupMethod
+    from ftdata.core.writer import keep_bitmap, write_kept
+    from ftdata.dedup.exact import find_exact_duplicates, keep_first
+    from ftdata.dedup.minhash import find_minhash_duplicates
+    from ftdata.dedup.reference import ReferenceIndex, find_reference_duplicates
+    from ftdata.dedup.semantic import find_semantic_duplicates
+    from ftdata.report.cli_report import print_dedup_result, print_reference_result
+
+    if shard_size is not None and output is None:
+        raise click.UsageError("--shard-size requires --output")
+    if external and (method != "exact" or against is not None):
+        raise click.UsageError("--external only applies to exact dedup within a dataset")
+    config = ctx.config.dedup
+    if method == "substring":
+        _repeated_spans(ctx, path, output, against, external, min_tokens, max_occurrences)
+        return
+    if method == "exact" and against is None and (external or config.exact_strategy == "external"):
+        from ftdata.dedup.external import find_exact_duplicates_external
+
+        try:
+            result, sample_count = find_exact_duplicates_external(
+                Path(path),
+                config.sort_memory_mb * 1024 * 1024,
+                ctx.resolve(config.temp_dir) if config.temp_dir else None,
+            )
+        except FtdataError as e:
+            raise click.ClickException(str(e)) from e
+        except OSError as e:
+            raise click.ClickException(f"Cannot write sort runs: {e}") from e
+    else:
+        dataset = ctx.load(path)
+        cache = ctx.open_cache()
+        try:
+            if against is not None:
+                if method == "semantic":
+                    raise click.ClickException("Semantic deduplication is not available yet")
+                matched = find_reference_duplicates(
+                    dataset, ReferenceIndex(Path(against)), DedupMethod(method), cache
+                )
+            elif method == "minhash":
+                result = find_minhash_duplicates(
+                    dataset, config.minhash_threshold, config.minhash_num_perm, cache
+                )
+            elif method == "semantic":
+                try:
+                    result = find_semantic_duplicates(dataset)
+                except NotImplementedError:
+                    raise click.ClickException(
+                        "Semantic deduplication is not available yet"
+                    ) from None
+            else:
+                result = find_exact_duplicates(dataset)
+        except FtdataError as e:
+            raise click.ClickException(str(e)) from e
+        finally:
+            if cache is not None:
+                cache.close()
+
+        sample_count = dataset.sample_count
+        # The writer copies records from the source file, not from the samples.
+        del dataset
+    cleaned: CleanedDataset | None = None
+    if output is not None:
+        if against is not None:
+            keep = keep_bitmap(sample_count, (m.sample_index for m in matched.matches))
+        else:
+            keep = keep_first(result, sample_count)
+        try:
+            cleaned = write_kept(Path(path), Path(output), keep, shard_size)
+        except FtdataError as e:
+            raise click.ClickException(str(e)) from e
+        except OSError as e:
+            raise click.ClickException(f"Cannot write {output}: {e}") from e
+    if ctx.json_output:
+        payload = (matched if against is not None else result).model_dump(mode="json")
+        if cleaned is not None:
+            payload["cleaned"] = cleaned.model_dump(mode="json")
+        click.echo(json.dumps(payload, indent=2))
+    elif against is not None:
+        print_reference_result(matched, ctx.console, cleaned)
+    else:
+        print_dedup_result(result, sample_count, ctx.console, cleaned)
+
+
+def _repeated_spans(
+    ctx: Context,
+    path: str,
+    output: str | None,
+    against: str | None,
+    external: bool,
+    min_tokens: int | None,
+    max_occurrences: int | None,
+) -> None:
+    import json
+
+    from ftdata.core.models import DatasetFormat
+    from ftdata.dedup.substring import find_repeated_spans
+    from ftdata.report.cli_report import print_repeated_spans
+
+    if output is not None or against is not None or external:
+        raise click.UsageError(
+            "--method substring reports spans; --output, --against and --external do not apply"
+        )
+    config = ctx.config
+    try:
+        result = find_repeated_spans(
+            Path(path),
+            min_tokens or config.dedup.span_min_tokens,
+            max_occurrences or config.dedup.span_max_occurrences,
+            config.profiling.token_encoding,
+            DatasetFormat(config.format) if config.format else None,
+            config.dedup.sort_memory_mb * 1024 * 1024,
+            ctx.resolve(config.dedup.temp_dir) if config.dedup.temp_dir else None,
+        )
+    except FtdataError as e:
+        raise click.ClickException(str(e)) from e
+    except OSError as e:
+        raise click.ClickException(f"Cannot write suffix array: {e}") from e
+    if ctx.json_output:
+        click.echo(json.dumps(result.model_dump(mode="json"), indent=2))
+    else:
+        print_repeated_spans(result, ctx.console)
+
+
+@cli.command(name="build-index")
+@click.argument("directory", type=ClientPath(file_okay=False))
+@click.argument("paths", nargs=-1, required=True, type=ClientPath(exists=True))
+@click.option("--threshold", type=click.FloatRange(0, 1), help="Near-duplicate Jaccard threshold")
+@click.option("--num-perm", type=click.IntRange(min=2), help="MinHash permutations")
+@pass_context
+def build_index(
+    ctx: Context,
+    directory: str,
+    paths: tuple[str, ...],
+    threshold: float | None,
+    num_perm: int | None,
+) -> None:
+    """Build a reference index of PATHS for `dedup --against DIRECTORY`.
+
+    The index holds exact content hashes and MinHash LSH bands and is
+    memory-mapped when queried. Defaults come from the dedup: settings.
+    """
+    import json
+
+    from ftdata.core.models import DatasetFormat
+    from ftdata.dedup.reference import build_reference_index
+
+    config = ctx.config.dedup
+    fmt = DatasetFormat(ctx.config.format) if ctx.config.format else None
+    cache = ctx.open_cache()
+    try:
+        index = build_reference_index(
+            [Path(p) for p in paths],
+            Path(directory),
+            config.minhash_threshold if threshold is None else threshold,
+            num_perm or config.minhash_num_perm,
+            fmt,
+            cache,
+        )
+    except FtdataError as e:
+        raise click.ClickException(str(e)) from e
+    except OSError as e:
+        raise click.ClickException(f"Cannot write {directory}: {e}") from e
+    finally:
+        if cache is not None:
+            cache.close()
+    if ctx.json_output:
+        click.echo(json.dumps(index.manifest, indent=2))
+    else:
+        ctx.console.print(
+            f"Indexed {index.sample_count:,} samples from {len(paths)} datasets in {directory} "
+            f"({index.bands} bands x {index.rows} rows)"
+        )
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True))
+@click.argument("path", type=ClientPath(exists=True))
+@click.option(
+    "--redact-pii",
+    is_flag=True,
+    help=(
+        "Stream a copy of the dataset with PII replaced by typed placeholders "
+        "(only redacts; no quality checks are run)"
+    ),
+)
+@click.option(
+    "--output", "-o", type=ClientPath(), help="Output path for the redacted dataset (--redact-pii)"
+)
+@click.option(
+    "--llm-judge", is_flag=True, help="Also score samples with an LLM judge ([llm] extra)"
+)
+@click.option(
+    "--judge-samples",
+    type=click.IntRange(min=1),
+    help=(
+        "Judge budget for --llm-judge; samples are stratified by length and language "
+        "(default: all eligible)"
+    ),
+)
 @pass_context
-def check(ctx: Context, path: str) -> None:
+def check(
+    ctx: Context,
+    path: str,
+    redact_pii: bool,
+    output: str | None,
+    llm_judge: bool,
+    judge_samples: int | None,
+) -> None:
     """Run quality checks on a dataset."""
-    ctx.console.print("[yellow]Not yet implemented[/yellow]")
+    from ftdata.report.cli_report import print_quality_result
+
+    if output is not None and not redact_pii:
+        raise click.UsageError("--output requires --redact-pii")
+    if judge_samples is not None and not llm_judge:
+        raise click.UsageError("--judge-samples requires --llm-judge")
+    if redact_pii:
+        from ftdata.core.models import DatasetFormat
+        from ftdata.quality.pii import redact_file
+        from ftdata.report.cli_report import print_redaction_result
+
+        if output is None:
+            raise click.UsageError("--redact-pii requires --output")
+        fmt = DatasetFormat(ctx.config.format) if ctx.config.format else None
+        try:
+            redaction = redact_file(Path(path), Path(output), fmt)
+        except FtdataError as e:
+            raise click.ClickException(str(e)) from e
+        if ctx.json_output:
+            click.echo(redaction.model_dump_json(indent=2))
+        else:
+            print_redaction_result(redaction, ctx.console)
+        return
+
+    from ftdata.dedup.minhash import find_minhash_duplicates
+    from ftdata.quality.llm_judge import score_with_llm
+    from ftdata.quality.runner import run_quality_checks
+    from ftdata.quality.sampling import plan_judge_sample
+
+    dataset = ctx.load(path)
+    encoding = ctx.config.profiling.token_encoding
+    cache = ctx.open_cache()
+    try:
+        result = run_quality_checks(dataset, ctx.config.quality, cache, encoding)
+        if llm_judge:
+            dedup = ctx.config.dedup
+            plan = plan_judge_sample(
+                dataset,
+                judge_samples,
+                result,
+                find_minhash_duplicates(
+                    dataset, dedup.minhash_threshold, dedup.minhash_num_perm, cache
+                ),
+                encoding,
+                cache,
+            )
+    finally:
+        if cache is not None:
+            cache.close()
+    if llm_judge:
+        judgments = ctx.open_judgment_cache()
+        try:
+            judged = score_with_llm(
+                dataset,
+                config=ctx.config.judge,
+                cache=judgments,
+                encoding_name=encoding,
+                plan=plan,
+            )
+        except FtdataError as e:
+            raise click.ClickException(str(e)) from e
+        finally:
+            if judgments is not None:
+                judgments.close()
+        result.store.extend(judged.store)
+        result.store.sort_by_sample()
+    if ctx.json_output:
+        click.echo(result.model_dump_json(indent=2))
+    else:
+        print_quality_result(result, ctx.console)
+    if not result.passed:
+        raise click.exceptions.Exit(1)
+
+
+@cli.command(name="filter")
+@click.argument("path", type=ClientPath(exists=True))
+@click.option(
+    "--output", "-o", type=ClientPath(), required=True, help="Output path for the survivors"
+)
+@click.option(
+    "--log",
+    "log_path",
+    type=ClientPath(),
+    help="Per-sample decision log (default: <output>.decisions.jsonl)",
+)
+@pass_context
+def filter_command(ctx: Context, path: str, output: str, log_path: str | None) -> None:
+    """Drop, deduplicate and redact samples per the filter: policy.
+
+    Samples with ERROR-level findings or benchmark overlap are dropped, one
+    sample per duplicate cluster is kept and PII in the rest is redacted,
+    in one streamed pass. Survivors go to --output, one decision per sample
+    to the log.
+    """
+    from ftdata.core.models import DatasetFormat
+    from ftdata.quality.filter import decision_log_path, filter_dataset
+    from ftdata.report.cli_report import print_filter_result
+
+    fmt = DatasetFormat(ctx.config.format) if ctx.config.format else None
+    log = Path(log_path) if log_path else decision_log_path(Path(output))
+    cache = ctx.open_cache()
+    try:
+        result = filter_dataset(Path(path), Path(output), ctx.config, log, fmt, cache)
+    except FtdataError as e:
+        raise click.ClickException(str(e)) from e
+    finally:
+        if cache is not None:
+            cache.close()
+    if ctx.json_output:
+        click.echo(result.model_dump_json(indent=2))
+    else:
+        print_filter_result(result, ctx.console)
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True))
+@click.argument("path", type=ClientPath(exists=True))
 @click.option("--benchmark", "-b", multiple=True, help="Specific benchmarks to check against")
 @pass_context
 def contamination(ctx: Context, path: str, benchmark: tuple[str, ...]) -> None:
@@ -94,7 +806,7 @@ def contamination(ctx: Context, path: str, benchmark: tuple[str, ...]) -> None:
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True))
+@click.argument("path", type=ClientPath(exists=True))
 @pass_context
 def diversity(ctx: Context, path: str) -> None:
     """Analyze topic diversity and clustering."""
@@ -102,12 +814,59 @@ def diversity(ctx: Context, path: str) -> None:
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True))
-@click.option("--output", "-o", type=click.Path(), help="Output path for HTML report")
+@click.argument("path", type=ClientPath(exists=True))
+@click.option(
+    "--output",
+    "-o",
+    type=ClientPath(),
+    default="ftdata-report.html",
+    show_default=True,
+    help="Output path for HTML report",
+)
 @pass_context
-def report(ctx: Context, path: str, output: str | None) -> None:
-    """Generate an HTML report."""
-    ctx.console.print("[yellow]Not yet implemented[/yellow]")
+def report(ctx: Context, path: str, output: str) -> None:
+    """Generate an HTML report (profile, quality and duplicates)."""
+    from ftdata.core.models import DedupMethod, ProfileReport
+    from ftdata.dedup.exact import find_exact_duplicates
+    from ftdata.dedup.minhash import find_minhash_duplicates
+    from ftdata.profiling.stats import profile_dataset
+    from ftdata.quality.runner import run_quality_checks
+    from ftdata.report.html import render_html_report
+    from ftdata.timing import record_timings
+
+    config = ctx.config
+    encoding = config.profiling.token_encoding
+    with record_timings(ctx.timings) as recorder:
+        dataset = ctx.load(path)
+        cache = ctx.open_cache()
+        try:
+            profile_result = profile_dataset(
+                dataset, encoding, cache, config.profiling.language_detection
+            )
+            quality = run_quality_checks(dataset, config.quality, cache, encoding)
+            if config.dedup.method == DedupMethod.MINHASH.value:
+                duplicates = find_minhash_duplicates(
+                    dataset, config.dedup.minhash_threshold, config.dedup.minhash_num_perm, cache
+                )
+            else:
+                duplicates = find_exact_duplicates(dataset)
+        finally:
+            if cache is not None:
+                cache.close()
+    result = ProfileReport(
+        dataset_path=path,
+        dataset_format=dataset.format,
+        sample_count=dataset.sample_count,
+        profile=profile_result,
+        dedup=duplicates,
+        quality=quality,
+        timings=recorder.spans,
+    )
+    render_html_report(result, Path(output))
+    if ctx.json_output:
+        click.echo(result.model_dump_json(indent=2))
+    else:
+        ctx.console.print(f"Wrote HTML report to {output}")
 
 
 @cli.command()
@@ -115,3 +874,179 @@ def report(ctx: Context, path: str, output: str | None) -> None:
 def init(ctx: Context) -> None:
     """Create a .ftdata.yaml configuration file."""
     ctx.console.print("[yellow]Not yet implemented[/yellow]")
+
+
+@cli.command()
+@click.option("--socket", "socket", type=click.Path(), help="Socket path (default: in cache dir)")
+@click.option("--stop", is_flag=True, help="Stop the running server")
+@pass_context
+def serve(ctx: Context, socket: str | None, stop: bool) -> None:
+    """Keep a warm ftdata process that other invocations run on."""
+    from ftdata import server
+
+    path = Path(socket) if socket else server.socket_path()
+    if stop:
+        if not server.stop(path):
+            raise click.ClickException(f"No ftdata server running on {path}")
+        ctx.console.print(f"Stopped ftdata server on {path}")
+        return
+
+    def ready(_: server.CommandServer) -> None:
+        ctx.console.print(f"Serving on {path} (Ctrl-C to stop)")
+
+    try:
+        server.serve(path, ctx.config.profiling.token_encoding, ready)
+    except FtdataError as e:
+        raise click.ClickException(str(e)) from e
+
+
+@cli.command()
+@click.option("--samples", type=click.IntRange(min=1), default=10_000, show_default=True)
+@click.option(
+    "--format",
+    "dataset_format",
+    type=click.Choice(["chatml", "alpaca", "sharegpt"]),
+    default="chatml",
+    show_default=True,
+)
+@click.option("--max-turns", type=click.IntRange(min=1), default=3, show_default=True)
+@click.option("--duplicate-rate", type=click.FloatRange(0, 1), default=0.05, show_default=True)
+@click.option("--pii-rate", type=click.FloatRange(0, 1), default=0.02, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Benchmark this file instead of a synthetic dataset",
+)
+@click.option("--stage", "stages", multiple=True, help="Stage to run (repeatable; default: all)")
+@click.option("--repeat", type=click.IntRange(min=1), default=1, show_default=True)
+@click.option("--in-process", is_flag=True, help="Run stages in this process (no per-stage RSS)")
+@click.option("--output", "-o", type=click.Path(), help="Write the JSON report to this file")
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Earlier JSON report to compare against",
+)
+@pass_context
+def bench(
+    ctx: Context,
+    samples: int,
+    dataset_format: str,
+    max_turns: int,
+    duplicate_rate: float,
+    pii_rate: float,
+    seed: int,
+    dataset: str | None,
+    stages: tuple[str, ...],
+    repeat: int,
+    in_process: bool,
+    output: str | None,
+    baseline: str | None,
+) -> None:
+    """Measure loader, analyzer and pipeline throughput."""
+    import tempfile
+
+    from ftdata.bench.suite import STAGES, compare_reports, run_benchmarks
+    from ftdata.bench.synthetic import generate_dataset
+    from ftdata.core.models import BenchmarkReport, DatasetFormat
+    from ftdata.report.cli_report import print_benchmark_report
+
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        raise click.BadParameter(
+            f"{', '.join(unknown)} (choose from {', '.join(STAGES)})", param_hint="--stage"
+        )
+    with tempfile.TemporaryDirectory(prefix="ftdata-bench-") as tmp:
+        if dataset is None:
+            path = generate_dataset(
+                Path(tmp) / f"synthetic-{dataset_format}.jsonl",
+                samples,
+                DatasetFormat(dataset_format),
+                max_turns,
+                duplicate_rate,
+                pii_rate,
+                seed,
+            )
+        else:
+            path = Path(dataset)
+        try:
+            report = run_benchmarks(
+                path,
+                list(stages) or None,
+                ctx.config.profiling.token_encoding,
+                repeat,
+                isolated=not in_process,
+            )
+        except FtdataError as e:
+            raise click.ClickException(str(e)) from e
+
+    if output:
+        Path(output).write_text(report.model_dump_json(indent=2) + "\n")
+    if ctx.json_output:
+        click.echo(report.model_dump_json(indent=2))
+        return
+    comparison = None
+    if baseline:
+        previous = BenchmarkReport.model_validate_json(Path(baseline).read_text())
+        comparison = compare_reports(previous, report)
+    print_benchmark_report(report, ctx.console, comparison)
+
+
+@cli.group(name="cache")
+def cache_group() -> None:
+    """Inspect and prune the per-sample result cache."""
+
+
+@cache_group.command(name="stats")
+@pass_context
+def cache_stats(ctx: Context) -> None:
+    """Show result cache size and contents."""
+    from rich.table import Table
+
+    with ctx.result_cache() as cache:
+        info = cache.stats()
+    if ctx.json_output:
+        click.echo(info.model_dump_json(indent=2))
+        return
+    table = Table(title="Result cache", show_header=False)
+    table.add_column("Metric", style="bold")
+    table.add_column("Value")
+    table.add_row("path", info.path)
+    table.add_row("entries", f"{info.entries:,}")
+    table.add_row("size", f"{info.size_bytes / 1024 / 1024:,.1f} MB")
+    table.add_row("limit", f"{info.max_size_bytes / 1024 / 1024:,.0f} MB")
+    table.add_row("stale entries", f"{info.stale_entries:,}")
+    for analyzer, count in sorted(info.analyzers.items()):
+        table.add_row(f"  {analyzer}", f"{count:,}")
+    ctx.console.print(table)
+
+
+@cache_group.command(name="prune")
+@click.option("--max-size", type=int, help="Evict least recently used entries down to this many MB")
+@click.option("--all", "clear_all", is_flag=True, help="Remove every cache entry")
+@pass_context
+def cache_prune(ctx: Context, max_size: int | None, clear_all: bool) -> None:
+    """Drop stale entries and evict down to the size limit."""
+    with ctx.result_cache() as cache:
+        if clear_all:
+            removed = cache.clear()
+        else:
+            removed = cache.prune(None if max_size is None else max_size * 1024 * 1024)
+    ctx.console.print(f"Removed {removed:,} cache entries")
+
+
+def main() -> None:
+    """Console entry point; runs on a warm `ftdata serve` process when one is up."""
+    from ftdata.server import NO_SERVER_ENV, forward, served_command
+
+    argv = sys.argv[1:]
+    if served_command(argv) and not os.environ.get(NO_SERVER_ENV):
+        try:
+            code = forward(argv)
+        except FtdataError as e:
+            # The server may have run part of the command; do not run it twice.
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+        if code is not None:
+            sys.exit(code)
+    cli()
@@ -20,6 +20,15 @@ class DedupConfig(BaseModel):
     method: str = "exact"
     minhash_threshold: float = 0.8
     minhash_num_perm: int = 128
+    # "memory" hashes the loaded dataset; "external" merge-sorts hashes on
+    # disk within sort_memory_mb, for JSONL files larger than memory.
+    exact_strategy: str = "memory"
+    sort_memory_mb: int = 256
+    temp_dir: str | None = None
+    # --method substring: spans of at least span_min_tokens tokens that occur
+    # more than span_max_occurrences times across the corpus.
+    span_min_tokens: int = 50
+    span_max_occurrences: int = 10
 
 
 class QualityConfig(BaseModel):
@@ -28,6 +37,33 @@ class QualityConfig(BaseModel):
     disabled_rules: list[str] = Field(default_factory=list)
     max_response_tokens: int = 4096
     min_response_tokens: int = 1
+    repetition_ngram_size: int = 4
+    max_repetition_ratio: float = 0.4
+    min_distinct_prompt_ratio: float = 0.5
+    max_template_share: float = 0.3
+    max_prompt_similarity: float = 0.5
+
+
+class JudgeConfig(BaseModel):
+    """LLM-as-judge configuration."""
+
+    model: str = "claude-sonnet-4-5-20250929"
+    base_url: str | None = None
+    concurrency: int = Field(default=8, gt=0)
+    requests_per_minute: int = Field(default=50, gt=0)
+    tokens_per_minute: int = Field(default=40_000, gt=0)
+    max_tokens: int = Field(default=256, gt=0)
+    max_retries: int = 5
+    backoff_base: float = 1.0
+    backoff_max: float = 60.0
+    min_score: int = 3
+    # Pack several samples into one request up to this many prompt tokens
+    # (0 = one sample per request).
+    batch_tokens: int = 0
+    max_batch_size: int = 20
+    # Output token limit of the judge model. A batch asks for max_tokens
+    # per sample, so batches are capped at max_output_tokens // max_tokens.
+    max_output_tokens: int = Field(default=8192, gt=0)
 
 
 class ContaminationConfig(BaseModel):
@@ -37,6 +73,19 @@ class ContaminationConfig(BaseModel):
     ngram_size: int = 13
 
 
+class FilterConfig(BaseModel):
+    """Policy applied by ``ftdata filter``."""
+
+    # Drop samples with ERROR-severity quality findings.
+    drop_errors: bool = True
+    # Keep only the first surviving sample of each duplicate cluster
+    # (found with dedup.method).
+    dedup: bool = True
+    # Drop samples that overlap a contamination.benchmarks test set.
+    drop_contaminated: bool = True
+    redact_pii: bool = True
+
+
 class ReportConfig(BaseModel):
     """Report generation configuration."""
 
@@ -44,6 +93,14 @@ class ReportConfig(BaseModel):
     template_path: str | None = None
 
 
+class CacheConfig(BaseModel):
+    """Persistent per-sample result cache configuration."""
+
+    enabled: bool = True
+    path: str | None = None
+    max_size_mb: int = 1024
+
+
 class FtdataConfig(BaseModel):
     """Top-level project configuration (.ftdata.yaml)."""
 
@@ -51,8 +108,11 @@ class FtdataConfig(BaseModel):
     profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
     dedup: DedupConfig = Field(default_factory=DedupConfig)
     quality: QualityConfig = Field(default_factory=QualityConfig)
+    judge: JudgeConfig = Field(default_factory=JudgeConfig)
     contamination: ContaminationConfig = Field(default_factory=ContaminationConfig)
+    filter: FilterConfig = Field(default_factory=FilterConfig)
     report: ReportConfig = Field(default_factory=ReportConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
 
 
 CONFIG_FILENAME = ".ftdata.yaml"
@@ -71,14 +131,14 @@ def discover_config(start: Path | None = None) -> Path | None:
     return None
 
 
-def load_config(path: Path | None = None) -> FtdataConfig:
+def load_config(path: Path | None = None, start: Path | None = None) -> FtdataConfig:
     """Load configuration from a .ftdata.yaml file.
 
-    If no path is provided, discovers config by walking up from CWD.
-    Returns default config if no file is found.
+    If no path is provided, discovers config by walking up from `start`
+    (or CWD). Returns default config if no file is found.
     """
     if path is None:
-        path = discover_config()
+        path = discover_config(start)
 
     if path is None or not path.is_file():
         return FtdataConfig()
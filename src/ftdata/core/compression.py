@@ -0,0 +1,249 @@
+"""Transparent streaming (de)compression of dataset files by suffix.
+
+``data.jsonl.gz``, ``.bz2`` and ``.zst`` are read without writing a
+decompressed copy anywhere. Decompression runs in a background thread a
+few chunks ahead of the reader, so it overlaps with JSON parsing (zlib,
+bz2 and zstandard release the GIL while they work). zstd needs the
+optional ``zstandard`` package (the [zstd] extra); multi-frame files are
+read across frames.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import queue
+import threading
+import zlib
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+from ftdata.exceptions import DatasetLoadError
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".zst": "zstd"}
+
+# Compressed bytes fed to the decompressor per call. Each call releases
+# the GIL for a substantial amount of work; the decompressed output of one
+# block is bounded by the format's maximum ratio.
+COMPRESSED_BLOCK = 256 * 1024
+# zstd output bytes per read, and how many decompressed chunks the
+# prefetch thread may run ahead of the reader.
+PREFETCH_CHUNK = 1024 * 1024
+PREFETCH_DEPTH = 4
+
+
+def compression_of(path: Path) -> str | None:
+    """Compression implied by the file suffix ("gzip", "bz2", "zstd"), or None."""
+    return COMPRESSION_SUFFIXES.get(path.suffix.lower())
+
+
+def data_suffix(path: Path) -> str:
+    """Suffix of the data inside the file: ``.jsonl`` for both data.jsonl and data.jsonl.gz."""
+    if compression_of(path) is not None:
+        return Path(path.stem).suffix
+    return path.suffix
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Reading or writing .zst files requires the zstandard package: "
+            "pip install 'ftdata[zstd]'"
+        ) from e
+    return zstandard
+
+
+class _Decompressor(Protocol):
+    @property
+    def eof(self) -> bool: ...
+
+    @property
+    def unused_data(self) -> bytes: ...
+
+    def decompress(self, data: bytes, /) -> bytes: ...
+
+
+def _stream_chunks(path: Path, new: Callable[[], _Decompressor]) -> Iterator[bytes]:
+    """Decompress a gzip or bz2 file, including concatenated members/streams."""
+    with open(path, "rb") as f:
+        decompressor, fresh = new(), True
+        while block := f.read(COMPRESSED_BLOCK):
+            while block:
+                data = decompressor.decompress(block)
+                fresh = False
+                if data:
+                    yield data
+                if not decompressor.eof:
+                    break
+                block = decompressor.unused_data
+                decompressor, fresh = new(), True
+        if not fresh and not decompressor.eof:
+            raise EOFError("compressed file ended before the end-of-stream marker")
+
+
+def _zstd_chunks(path: Path) -> Iterator[bytes]:
+    decompressor = _zstandard().ZstdDecompressor()
+    with open(path, "rb") as f, decompressor.stream_reader(f, read_across_frames=True) as reader:
+        while data := reader.read(PREFETCH_CHUNK):
+            yield data
+
+
+def _chunks(path: Path, compression: str) -> Iterator[bytes]:
+    if compression == "gzip":
+        return _stream_chunks(path, lambda: zlib.decompressobj(zlib.MAX_WBITS | 16))
+    if compression == "bz2":
+        return _stream_chunks(path, bz2.BZ2Decompressor)
+    return _zstd_chunks(path)
+
+
+class _PrefetchReader(io.RawIOBase):
+    """Raw stream fed by a thread that decompresses ahead of the consumer.
+
+    Errors raised while decompressing (corrupt or truncated input) are
+    re-raised to the consumer as OSError.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        super().__init__()
+        self._chunks = chunks
+        self._queue: queue.Queue[bytes | BaseException] = queue.Queue(PREFETCH_DEPTH)
+        self._stop = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, name="ftdata-decompress", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: bytes | BaseException) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        try:
+            for data in self._chunks:
+                if not self._put(data):
+                    return
+            self._put(b"")
+        except Exception as e:
+            self._put(e)
+        finally:
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                if isinstance(item, OSError):
+                    raise item
+                raise OSError(f"decompression failed: {item}") from item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+def open_binary(path: Path) -> IO[bytes]:
+    """Open a dataset file for reading bytes, decompressing by suffix.
+
+    Raises:
+        DatasetLoadError: If zstandard is needed but not installed.
+        OSError: If the file cannot be opened.
+    """
+    compression = compression_of(path)
+    if compression is None:
+        return open(path, "rb")  # noqa: SIM115
+    if compression == "zstd":
+        try:
+            _zstandard()
+        except ImportError as e:
+            raise DatasetLoadError(str(path), str(e)) from e
+    if not path.is_file():
+        raise FileNotFoundError(f"No such file: {path}")
+    return io.BufferedReader(_PrefetchReader(_chunks(path, compression)), PREFETCH_CHUNK)
+
+
+def open_text(path: Path, newline: str | None = None) -> IO[str]:
+    """Open a dataset file for reading as UTF-8 text, decompressing by suffix.
+
+    `newline` is passed to the text layer; ``""`` splits lines the same
+    way as the default but keeps their endings untranslated.
+
+    Raises:
+        DatasetLoadError: If zstandard is needed but not installed.
+        OSError: If the file cannot be opened.
+    """
+    if compression_of(path) is None:
+        return open(path, encoding="utf-8", newline=newline)  # noqa: SIM115
+    return io.TextIOWrapper(open_binary(path), encoding="utf-8", newline=newline)
+
+
+class BinaryOutput(Protocol):
+    """Writable byte stream returned by open_binary_output."""
+
+    def write(self, data: bytes, /) -> int: ...
+
+    def close(self) -> None: ...
+
+
+def open_binary_output(path: Path) -> BinaryOutput:
+    """Open a file for writing bytes, compressing by suffix.
+
+    Raises:
+        ImportError: If the path ends in .zst and zstandard is not installed.
+        OSError: If the file cannot be created.
+    """
+    compression = compression_of(path)
+    if compression == "gzip":
+        return gzip.open(path, "wb")
+    if compression == "bz2":
+        return bz2.open(path, "wb")
+    if compression == "zstd":
+        compressor = _zstandard().ZstdCompressor()
+        raw = open(path, "wb")  # noqa: SIM115 - closed by the stream writer
+        return compressor.stream_writer(raw, closefd=True)  # type: ignore[no-any-return]
+    return open(path, "wb")  # noqa: SIM115
+
+
+def open_text_output(path: Path) -> IO[str]:
+    """Open a file for writing UTF-8 text, compressing by suffix.
+
+    Raises:
+        ImportError: If the path ends in .zst and zstandard is not installed.
+        OSError: If the file cannot be created.
+    """
+    compression = compression_of(path)
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8")
+    if compression == "bz2":
+        return bz2.open(path, "wt", encoding="utf-8")
+    if compression == "zstd":
+        compressor = _zstandard().ZstdCompressor()
+        raw = open(path, "wb")  # noqa: SIM115 - closed by the stream writer
+        return io.TextIOWrapper(compressor.stream_writer(raw, closefd=True), encoding="utf-8")
+    return open(path, "w", encoding="utf-8")  # noqa: SIM115
@@ -2,9 +2,81 @@
 
 from __future__ import annotations
 
+import json
+from functools import cache
 from typing import Any
 
-from ftdata.core.models import Sample
+from pydantic import TypeAdapter
+
+from ftdata.core.models import DatasetFormat, Sample
+
+SHAREGPT_ROLES: dict[str, str] = {
+    "human": "user",
+    "user": "user",
+    "gpt": "assistant",
+    "assistant": "assistant",
+    "system": "system",
+}
+
+
+def _coerce_text(value: Any, field: str, errors: list[str]) -> str:
+    """Return `value` as a string, recording a format error if it is not one."""
+    if isinstance(value, str):
+        return value
+    if value is None:
+        errors.append(f"missing {field}")
+        return ""
+    errors.append(f"non-string {field}")
+    return str(value)
+
+
+def _sample_fields(
+    raw: dict[str, Any],
+    index: int,
+    messages: list[dict[str, str]],
+    format: DatasetFormat,
+    consumed: set[str],
+    errors: list[str],
+) -> dict[str, Any]:
+    metadata = {k: v for k, v in raw.items() if k not in consumed}
+    if errors:
+        metadata["format_errors"] = errors
+    return {
+        "messages": messages,
+        "format": format,
+        "raw_content": json.dumps(raw, ensure_ascii=False),
+        "metadata": metadata,
+        "index": index,
+    }
+
+
+@cache
+def _sample_list() -> TypeAdapter[list[Sample]]:
+    return TypeAdapter(list[Sample])
+
+
+def build_samples(fields: list[dict[str, Any]]) -> list[Sample]:
+    """Validate a batch of ``*_fields`` dicts into Samples with one validator call.
+
+    Much cheaper than constructing each Sample and Message separately,
+    while validating exactly the same schema.
+    """
+    return _sample_list().validate_python(fields)
+
+
+def intern_fields(fields: dict[str, Any], pool: dict[str, str]) -> dict[str, Any]:
+    """Swap the strings of a ``*_fields`` dict for equal strings already in `pool`.
+
+    Message roles and contents and the raw record that occur again (a
+    system prompt in every sample, exact duplicate records) then share one
+    string object instead of holding a copy each. Analyzers that memoize
+    per string also get cheap identity hits on them.
+    """
+    for message in fields["messages"]:
+        message["role"] = pool.setdefault(message["role"], message["role"])
+        message["content"] = pool.setdefault(message["content"], message["content"])
+    fields["raw_content"] = pool.setdefault(fields["raw_content"], fields["raw_content"])
+    return fields
 
 
 def parse_chatml(raw: dict[str, Any], index: int) -> Sample:
@@ -12,6 +84,9 @@ def parse_chatml(raw: dict[str, Any], index: int) -> Sample:
 
     ChatML format: {"messages": [{"role": "...", "content": "..."}]}
 
+    Structural problems (missing roles, non-string content) do not raise;
+    they are recorded under ``metadata["format_errors"]`` for FT004.
+
     Args:
         raw: Raw JSON dict from file.
         index: Sample index in dataset.
@@ -19,7 +94,28 @@ def parse_chatml(raw: dict[str, Any], index: int) -> Sample:
     Returns:
         Normalized Sample.
     """
-    raise NotImplementedError
+    return Sample.model_validate(chatml_fields(raw, index))
+
+
+def chatml_fields(raw: dict[str, Any], index: int) -> dict[str, Any]:
+    """Sample fields of a ChatML record, for build_samples (see parse_chatml)."""
+    errors: list[str] = []
+    messages: list[dict[str, str]] = []
+    entries = raw.get("messages")
+    if not isinstance(entries, list):
+        errors.append("messages is not a list")
+        entries = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            errors.append("message is not an object")
+            continue
+        messages.append(
+            {
+                "role": _coerce_text(entry.get("role"), "role", errors),
+                "content": _coerce_text(entry.get("content"), "content", errors),
+            }
+        )
+    return _sample_fields(raw, index, messages, DatasetFormat.CHATML, {"messages"}, errors)
 
 
 def parse_alpaca(raw: dict[str, Any], index: int) -> Sample:
@@ -27,6 +123,9 @@ def parse_alpaca(raw: dict[str, Any], index: int) -> Sample:
 
     Alpaca format: {"instruction": "...", "input": "...", "output": "..."}
 
+    The instruction and optional input are joined into a single user turn;
+    an optional ``system`` field becomes a leading system message.
+
     Args:
         raw: Raw JSON dict from file.
         index: Sample index in dataset.
@@ -34,7 +133,28 @@ def parse_alpaca(raw: dict[str, Any], index: int) -> Sample:
     Returns:
         Normalized Sample.
     """
-    raise NotImplementedError
+    return Sample.model_validate(alpaca_fields(raw, index))
+
+
+def alpaca_fields(raw: dict[str, Any], index: int) -> dict[str, Any]:
+    """Sample fields of an Alpaca record, for build_samples (see parse_alpaca)."""
+    errors: list[str] = []
+    messages: list[dict[str, str]] = []
+    if raw.get("system"):
+        messages.append(
+            {"role": "system", "content": _coerce_text(raw["system"], "system", errors)}
+        )
+    instruction = _coerce_text(raw.get("instruction"), "instruction", errors)
+    extra = raw.get("input")
+    prompt = instruction
+    if extra:
+        prompt = f"{instruction}\n\n{_coerce_text(extra, 'input', errors)}"
+    messages.append({"role": "user", "content": prompt})
+    messages.append(
+        {"role": "assistant", "content": _coerce_text(raw.get("output"), "output", errors)}
+    )
+    consumed = {"system", "instruction", "input", "output"}
+    return _sample_fields(raw, index, messages, DatasetFormat.ALPACA, consumed, errors)
 
 
 def parse_sharegpt(raw: dict[str, Any], index: int) -> Sample:
@@ -42,6 +162,9 @@ def parse_sharegpt(raw: dict[str, Any], index: int) -> Sample:
 
     ShareGPT format: {"conversations": [{"from": "...", "value": "..."}]}
 
+    Speaker names are mapped to ChatML roles via SHAREGPT_ROLES; unknown
+    speakers are kept verbatim.
+
     Args:
         raw: Raw JSON dict from file.
         index: Sample index in dataset.
@@ -49,4 +172,59 @@ def parse_sharegpt(raw: dict[str, Any], index: int) -> Sample:
     Returns:
         Normalized Sample.
     """
-    raise NotImplementedError
+    return Sample.model_validate(sharegpt_fields(raw, index))
+
+
+def sharegpt_fields(raw: dict[str, Any], index: int) -> dict[str, Any]:
+    """Sample fields of a ShareGPT record, for build_samples (see parse_sharegpt)."""
+    errors: list[str] = []
+    messages: list[dict[str, str]] = []
+    entries = raw.get("conversations")
+    if not isinstance(entries, list):
+        errors.append("conversations is not a list")
+        entries = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            errors.append("turn is not an object")
+            continue
+        speaker = _coerce_text(entry.get("from"), "from", errors)
+        messages.append(
+            {
+                "role": SHAREGPT_ROLES.get(speaker, speaker),
+                "content": _coerce_text(entry.get("value"), "value", errors),
+            }
+        )
+    return _sample_fields(raw, index, messages, DatasetFormat.SHAREGPT, {"conversations"}, errors)
+
+
+def text_slots(raw: dict[str, Any], format: DatasetFormat) -> list[tuple[dict[str, Any], str]]:
+    """Locate the message text fields of a raw record.
+
+    Returns ``(container, key)`` pairs so callers can rewrite text in place
+    while leaving every other field of the record untouched.
+
+    Args:
+        raw: Raw JSON dict from file.
+        format: Format of the record.
+
+    Returns:
+        Pairs whose ``container[key]`` is a message text string.
+    """
+    if format == DatasetFormat.ALPACA:
+        containers: list[Any] = [raw]
+        keys: tuple[str, ...] = ("system", "instruction", "input", "output")
+    elif format == DatasetFormat.SHAREGPT:
+        containers = raw.get("conversations") or []
+        keys = ("value",)
+    else:
+        containers = raw.get("messages") or []
+        keys = ("content",)
+    if not isinstance(containers, list):
+        return []
+    return [
+        (container, key)
+        for container in containers
+        if isinstance(container, dict)
+        for key in keys
+        if isinstance(container.get(key), str)
+    ]
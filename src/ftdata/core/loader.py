@@ -2,15 +2,112 @@
 
 from __future__ import annotations
 
+import gc
+import json
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
-from ftdata.core.models import Dataset, DatasetFormat
+from ftdata.core.compression import data_suffix, open_text
+from ftdata.core.formats import (
+    alpaca_fields,
+    build_samples,
+    chatml_fields,
+    intern_fields,
+    parse_alpaca,
+    parse_chatml,
+    parse_sharegpt,
+    sharegpt_fields,
+)
+from ftdata.core.models import Dataset, DatasetFormat, Sample
+from ftdata.exceptions import (
+    DatasetLoadError,
+    EmptyDatasetError,
+    FormatDetectionError,
+    UnsupportedFormatError,
+)
+from ftdata.timing import span
+
+try:
+    import orjson
+except ImportError:  # optional: the [fast] extra
+    orjson = None  # type: ignore[assignment]
+
+PARSERS: dict[DatasetFormat, Callable[[dict[str, Any], int], Sample]] = {
+    DatasetFormat.CHATML: parse_chatml,
+    DatasetFormat.JSONL_MESSAGES: parse_chatml,
+    DatasetFormat.ALPACA: parse_alpaca,
+    DatasetFormat.SHAREGPT: parse_sharegpt,
+}
+
+# Fast path: per-format Sample fields, validated in batches by build_samples.
+FIELD_PARSERS: dict[DatasetFormat, Callable[[dict[str, Any], int], dict[str, Any]]] = {
+    DatasetFormat.CHATML: chatml_fields,
+    DatasetFormat.JSONL_MESSAGES: chatml_fields,
+    DatasetFormat.ALPACA: alpaca_fields,
+    DatasetFormat.SHAREGPT: sharegpt_fields,
+}
+
+# Records validated per build_samples call on the fast path.
+DECODE_BATCH = 1024
+
+JSON_SUFFIXES = {".jsonl", ".json", ".ndjson"}
+
+
+def record_format(record: Any) -> DatasetFormat | None:
+    """Format implied by the keys of one record, or None if unrecognized."""
+    if not isinstance(record, dict):
+        return None
+    if "messages" in record:
+        return DatasetFormat.CHATML
+    if "conversations" in record:
+        return DatasetFormat.SHAREGPT
+    if "instruction" in record and "output" in record:
+        return DatasetFormat.ALPACA
+    return None
+
+
+def decode_json(text: str) -> Any:
+    """Parse one JSON document, with orjson when it is installed.
+
+    Input orjson rejects but the standard library accepts (NaN, integers
+    beyond 64 bits, lone surrogates) falls back to ``json.loads``, so the
+    result never depends on whether orjson is present.
+
+    Raises:
+        json.JSONDecodeError: If `text` is not valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Suspend cyclic garbage collection while building many acyclic objects.
+
+    Allocating hundreds of thousands of models otherwise triggers repeated
+    full collections that rescan everything built so far.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 def detect_format(path: Path) -> DatasetFormat:
     """Auto-detect the format of a dataset file.
 
-    Examines file extension and content structure to determine format.
+    Examines file extension and content structure to determine format;
+    for compressed files (``data.jsonl.gz``) the inner extension and the
+    decompressed content are used.
 
     Args:
         path: Path to the dataset file.
@@ -21,10 +118,130 @@ def detect_format(path: Path) -> DatasetFormat:
     Raises:
         FormatDetectionError: If format cannot be determined.
     """
-    raise NotImplementedError
+    if path.suffix == ".parquet":
+        return DatasetFormat.PARQUET
+    if data_suffix(path) not in JSON_SUFFIXES:
+        raise FormatDetectionError(str(path))
+
+    try:
+        first = next(iter_records(path), None)
+    except DatasetLoadError as e:
+        raise FormatDetectionError(str(path)) from e
+    detected = record_format(first[1] if first else None)
+    if detected is None:
+        raise FormatDetectionError(str(path))
+    return detected
+
+
+def iter_raw_records(path: Path, strict: bool = False) -> Iterator[tuple[int, str | None, Any]]:
+    """Yield ``(index, line, record)`` triples from a JSONL file or JSON array.
+
+    JSONL is streamed line by line and `line` is the record's original text
+    (newline stripped), so writers can copy untouched records verbatim.
+    Records from a JSON array have no source line and yield ``None``.
+    Blank lines are skipped and do not consume an index. Compressed files
+    (``.gz``, ``.bz2``, ``.zst``) are decompressed on the fly.
+
+    Args:
+        path: Dataset file.
+        strict: Decode with the standard-library json module only.
+
+    Raises:
+        DatasetLoadError: If a record is not valid JSON.
+    """
+    decode = json.loads if strict else decode_json
+    try:
+        with open_text(path) as f:
+            json_array = is_json_array(f.read(64))
+        with open_text(path) as f:
+            if json_array:
+                for index, record in enumerate(decode(f.read())):
+                    yield index, None, record
+                return
+
+            index = 0
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = decode(line)
+                except json.JSONDecodeError as e:
+                    raise DatasetLoadError(str(path), f"invalid JSON on line {line_number}") from e
+                yield index, line.rstrip("\r\n"), record
+                index += 1
+    except json.JSONDecodeError as e:
+        raise DatasetLoadError(str(path), f"invalid JSON: {e}") from e
+    except (OSError, UnicodeDecodeError) as e:
+        raise DatasetLoadError(str(path), str(e)) from e
+
+
+def is_json_array(head: str) -> bool:
+    """Whether a file starting with `head` holds a JSON array rather than JSONL."""
+    return head.lstrip().startswith("[")
+
+
+def iter_records(path: Path, strict: bool = False) -> Iterator[tuple[int, Any]]:
+    """Yield ``(index, record)`` pairs from a JSONL file or JSON array.
+
+    Raises:
+        DatasetLoadError: If a record is not valid JSON.
+    """
+    for index, _, record in iter_raw_records(path, strict):
+        yield index, record
+
+
+def iter_samples(
+    path: Path,
+    format: DatasetFormat | None = None,
+    strict: bool = False,
+    pool: dict[str, str] | None = None,
+) -> Iterator[Sample]:
+    """Stream normalized samples from a dataset file without loading it whole.
+
+    By default records are decoded with orjson (when installed) and
+    validated in batches of DECODE_BATCH. ``strict=True`` uses the
+    reference path instead: standard-library json and one Sample built and
+    validated per record. Both produce identical samples.
+
+    Args:
+        path: Path to the dataset file.
+        format: Optional explicit format (auto-detected if None).
+        strict: Decode and validate record by record.
+        pool: Intern table (see intern_fields) shared by the samples
+            yielded; it keeps every distinct string alive, so pass one only
+            when the samples are kept anyway. Ignored with `strict`.
+
+    Raises:
+        DatasetLoadError: If a record cannot be parsed.
+        UnsupportedFormatError: If the format has no parser.
+    """
+    fmt = format or detect_format(path)
+    if strict:
+        parser = PARSERS.get(fmt)
+        if parser is None:
+            raise UnsupportedFormatError(fmt.value)
+        for index, record in iter_records(path, strict=True):
+            if not isinstance(record, dict):
+                raise DatasetLoadError(str(path), f"record {index} is not a JSON object")
+            yield parser(record, index)
+        return
+
+    fields = FIELD_PARSERS.get(fmt)
+    if fields is None:
+        raise UnsupportedFormatError(fmt.value)
+    batch: list[dict[str, Any]] = []
+    for index, record in iter_records(path):
+        if not isinstance(record, dict):
+            raise DatasetLoadError(str(path), f"record {index} is not a JSON object")
+        sample_fields = fields(record, index)
+        batch.append(sample_fields if pool is None else intern_fields(sample_fields, pool))
+        if len(batch) == DECODE_BATCH:
+            yield from build_samples(batch)
+            batch = []
+    yield from build_samples(batch)
 
 
-def load_dataset(path: Path, format: DatasetFormat | None = None) -> Dataset:
+def load_dataset(path: Path, format: DatasetFormat | None = None, strict: bool = False) -> Dataset:
     """Load a dataset from file, optionally specifying format.
 
     If format is None, auto-detection is attempted.
@@ -32,6 +249,7 @@ def load_dataset(path: Path, format: DatasetFormat | None = None) -> Dataset:
     Args:
         path: Path to the dataset file.
         format: Optional explicit format.
+        strict: Decode and validate record by record (see iter_samples).
 
     Returns:
         Loaded Dataset with normalized samples.
@@ -40,4 +258,18 @@ def load_dataset(path: Path, format: DatasetFormat | None = None) -> Dataset:
         DatasetLoadError: If loading fails.
         EmptyDatasetError: If dataset has no samples.
     """
-    raise NotImplementedError
+    if not path.is_file():
+        raise DatasetLoadError(str(path), "file not found")
+    try:
+        fmt = format or detect_format(path)
+    except FormatDetectionError:
+        if data_suffix(path) in JSON_SUFFIXES and next(iter_records(path), None) is None:
+            raise EmptyDatasetError(str(path)) from None
+        raise
+    with span("load") as timed, gc_paused():
+        # Repeated strings (system prompts, duplicate records) share one object.
+        samples = list(iter_samples(path, fmt, strict, pool={}))
+        timed.samples = len(samples)
+    if not samples:
+        raise EmptyDatasetError(str(path))
+    return Dataset(samples=samples, format=fmt, path=path)
@@ -7,11 +7,27 @@ never the reverse. All models are in one file to prevent circular imports.
 from __future__ import annotations
 
 import hashlib
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
-from typing import Any
-
-from pydantic import BaseModel, Field, computed_field, field_validator
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import (
+    BaseModel,
+    Field,
+    ModelWrapValidatorHandler,
+    PrivateAttr,
+    computed_field,
+    field_validator,
+    model_validator,
+)
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
 
 # --- Enums ---
 
@@ -50,6 +66,7 @@ class QualityRule(str, Enum):
     FT010 = "FT010"  # Imbalanced turns
     FT011 = "FT011"  # Missing system message
     FT012 = "FT012"  # Low diversity
+    FT013 = "FT013"  # Low LLM judge score
 
 
 class DedupMethod(str, Enum):
@@ -80,11 +97,23 @@ class Sample(BaseModel):
     index: int = 0
 
     @computed_field  # type: ignore[prop-decorator]
-    @property
+    @cached_property
     def content_hash(self) -> str:
-        """SHA-256 hash of the raw content for dedup."""
+        """SHA-256 hash of the raw content for dedup (computed on first access)."""
         return hashlib.sha256(self.raw_content.encode()).hexdigest()[:16]
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "raw_content":
+            self.__dict__.pop("content_hash", None)
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        # The cached hash lives in __dict__, which model_copy copies verbatim.
+        copied = super().model_copy(update=update, deep=deep)
+        if update and "raw_content" in update:
+            copied.__dict__.pop("content_hash", None)
+        return copied
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def turn_count(self) -> int:
@@ -171,6 +200,29 @@ class ProfileResult(BaseModel):
     total_tokens: int = 0
 
 
+class IntervalEstimate(BaseModel):
+    """A point estimate with the bounds of its confidence interval."""
+
+    value: float
+    low: float
+    high: float
+
+
+class SampleEstimate(BaseModel):
+    """How an approximate profile was estimated from randomly sampled records.
+
+    ``intervals`` maps metric names (``samples``, ``total_tokens``,
+    ``prompt_tokens.median``, ``turns.mean``, ``language.en``, ...) to their
+    estimates; language values are percentages of samples.
+    """
+
+    sampled: int
+    file_bytes: int
+    confidence: float = 0.95
+    elapsed_seconds: float = 0.0
+    intervals: dict[str, IntervalEstimate] = Field(default_factory=dict)
+
+
 # --- Dedup Models ---
 
 
@@ -196,9 +248,74 @@ class DedupResult(BaseModel):
         return sum(len(c.indices) - 1 for c in self.clusters if len(c.indices) > 1)
 
 
+class ReferenceMatch(BaseModel):
+    """A sample that duplicates a sample of a reference index."""
+
+    sample_index: int
+    reference_path: str
+    reference_index: int
+    similarity: float = 1.0
+    method: DedupMethod = DedupMethod.EXACT
+
+
+class ReferenceDedupResult(BaseModel):
+    """Matches of a dataset against a reference index (``dedup --against``)."""
+
+    index_path: str
+    sample_count: int = 0
+    matches: list[ReferenceMatch] = Field(default_factory=list)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def match_percentage(self) -> float:
+        """Share of samples that match a reference sample."""
+        if not self.sample_count:
+            return 0.0
+        return round(100.0 * len(self.matches) / self.sample_count, 2)
+
+
+class RepeatedSpan(BaseModel):
+    """A token span that recurs across samples (``dedup --method substring``)."""
+
+    text: str
+    token_count: int
+    occurrences: int
+    # Samples containing the span, ascending.
+    sample_indices: list[int] = Field(default_factory=list)
+
+
+class RepeatedSpanResult(BaseModel):
+    """Spans of at least `min_tokens` tokens repeated more than `max_occurrences` times."""
+
+    sample_count: int = 0
+    token_count: int = 0
+    min_tokens: int
+    max_occurrences: int
+    spans: list[RepeatedSpan] = Field(default_factory=list)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def affected_samples(self) -> int:
+        """Samples that contain at least one repeated span."""
+        return len(set().union(*(s.sample_indices for s in self.spans)))
+
+
+class CleanedDataset(BaseModel):
+    """Summary of a cleaned dataset written from a keep/drop bitmap."""
+
+    output_paths: list[str] = Field(default_factory=list)
+    kept: int = 0
+    dropped: int = 0
+    bytes_written: int = 0
+
+
 # --- Quality Models ---
 
 
+# sample_index of findings that concern the dataset as a whole (e.g. FT012).
+DATASET_LEVEL_INDEX = -1
+
+
 class QualityIssue(BaseModel):
     """A single quality finding."""
 
@@ -209,22 +326,227 @@ class QualityIssue(BaseModel):
     details: dict[str, Any] = Field(default_factory=dict)
 
 
+_RULES: tuple[QualityRule, ...] = tuple(QualityRule)
+_SEVERITIES: tuple[QualitySeverity, ...] = tuple(QualitySeverity)
+_RULE_IDS = {rule: i for i, rule in enumerate(_RULES)}
+_SEVERITY_IDS = {severity: i for i, severity in enumerate(_SEVERITIES)}
+
+
+class IssueStore:
+    """Columnar storage for quality findings.
+
+    Each finding is one row across compact typed arrays (rule, severity,
+    sample index, interned message id); ``details`` dicts live in a side
+    table keyed by row and are only stored when non-empty. Per-rule and
+    per-severity counters are maintained on insert, so summary counts are
+    O(1). QualityIssue objects are only built when rows are read back.
+    """
+
+    def __init__(self) -> None:
+        self._rules = array("B")
+        self._severities = array("B")
+        self._samples = array("q")
+        self._message_ids = array("I")
+        self._messages: list[str] = []
+        self._message_index: dict[str, int] = {}
+        self._details: dict[int, dict[str, Any]] = {}
+        self._pair_counts: dict[tuple[QualityRule, QualitySeverity], int] = {}
+        self._severity_counts = [0] * len(_SEVERITIES)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def __iter__(self) -> Iterator[QualityIssue]:
+        return (self.issue(row) for row in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IssueStore):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _message_id(self, message: str) -> int:
+        message_id = self._message_index.get(message)
+        if message_id is None:
+            message_id = self._message_index[message] = len(self._messages)
+            self._messages.append(message)
+        return message_id
+
+    def add_many(
+        self,
+        rule: QualityRule,
+        severity: QualitySeverity,
+        message: str,
+        sample_indices: Sequence[int] | npt.NDArray[np.int64],
+        details: Sequence[dict[str, Any]] | None = None,
+    ) -> None:
+        """Append one finding per sample index for a single rule.
+
+        Args:
+            rule: Rule that fired.
+            severity: Severity of the findings.
+            message: Message shared by all findings.
+            sample_indices: Dataset index of each finding.
+            details: Optional per-finding details, parallel to sample_indices.
+        """
+        count = len(sample_indices)
+        if not count:
+            return
+        start = len(self)
+        self._rules.frombytes(bytes((_RULE_IDS[rule],)) * count)
+        self._severities.frombytes(bytes((_SEVERITY_IDS[severity],)) * count)
+        self._samples.frombytes(np.asarray(sample_indices, dtype=np.int64).tobytes())
+        self._message_ids.extend(array("I", (self._message_id(message),)) * count)
+        if details is not None:
+            for offset, detail in enumerate(details):
+                if detail:
+                    self._details[start + offset] = detail
+        key = (rule, severity)
+        self._pair_counts[key] = self._pair_counts.get(key, 0) + count
+        self._severity_counts[_SEVERITY_IDS[severity]] += count
+
+    def add(
+        self,
+        rule: QualityRule,
+        severity: QualitySeverity,
+        message: str,
+        sample_index: int,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        """Append a single finding."""
+        self.add_many(rule, severity, message, (sample_index,), (details or {},))
+
+    def append(self, issue: QualityIssue) -> None:
+        """Append a materialized QualityIssue."""
+        self.add(issue.rule, issue.severity, issue.message, issue.sample_index, issue.details)
+
+    def extend(self, other: IssueStore) -> None:
+        """Append every finding of another store."""
+        start = len(self)
+        remap = array("I", (self._message_id(m) for m in other._messages))
+        self._rules.extend(other._rules)
+        self._severities.extend(other._severities)
+        self._samples.extend(other._samples)
+        self._message_ids.extend(remap[i] for i in other._message_ids)
+        for row, detail in other._details.items():
+            self._details[start + row] = detail
+        for key, count in other._pair_counts.items():
+            self._pair_counts[key] = self._pair_counts.get(key, 0) + count
+        for i, count in enumerate(other._severity_counts):
+            self._severity_counts[i] += count
+
+    def sort_by_sample(self) -> None:
+        """Stable-sort rows by sample index, in place."""
+        samples = np.frombuffer(self._samples, dtype=np.int64)
+        order = np.argsort(samples, kind="stable")
+        if not len(order) or bool((order[1:] > order[:-1]).all()):
+            return
+        self._rules = array("B", np.frombuffer(self._rules, np.uint8)[order].tobytes())
+        self._severities = array("B", np.frombuffer(self._severities, np.uint8)[order].tobytes())
+        self._message_ids = array("I", np.frombuffer(self._message_ids, np.uint32)[order].tobytes())
+        self._samples = array("q", samples[order].tobytes())
+        if self._details:
+            new_rows = np.empty_like(order)
+            new_rows[order] = np.arange(len(order))
+            self._details = {int(new_rows[row]): d for row, d in self._details.items()}
+
+    def issue(self, row: int) -> QualityIssue:
+        """Materialize the finding at `row`."""
+        return QualityIssue(
+            rule=_RULES[self._rules[row]],
+            severity=_SEVERITIES[self._severities[row]],
+            message=self._messages[self._message_ids[row]],
+            sample_index=self._samples[row],
+            details=self._details.get(row, {}),
+        )
+
+    def page(self, offset: int = 0, limit: int | None = None) -> list[QualityIssue]:
+        """Materialize rows ``offset`` to ``offset + limit``."""
+        stop = len(self) if limit is None else min(len(self), offset + limit)
+        return [self.issue(row) for row in range(offset, stop)]
+
+    def sample_indices(self, severity: QualitySeverity | None = None) -> npt.NDArray[np.int64]:
+        """Sample index of every row, optionally only rows of one severity."""
+        samples: npt.NDArray[np.int64] = np.frombuffer(self._samples, dtype=np.int64)
+        if severity is None:
+            return np.array(samples, dtype=np.int64)
+        severities = np.frombuffer(self._severities, dtype=np.uint8)
+        selected: npt.NDArray[np.int64] = samples[severities == _SEVERITY_IDS[severity]]
+        return selected
+
+    def severity_count(self, severity: QualitySeverity) -> int:
+        """Number of findings with the given severity."""
+        return self._severity_counts[_SEVERITY_IDS[severity]]
+
+    def counts(self) -> dict[tuple[QualityRule, QualitySeverity], int]:
+        """Number of findings per (rule, severity) pair."""
+        return dict(self._pair_counts)
+
+
 class QualityResult(BaseModel):
-    """Aggregate quality check results."""
+    """Aggregate quality check results.
 
-    issues: list[QualityIssue] = Field(default_factory=list)
+    Findings are held in an IssueStore. ``QualityResult(issues=[...])``
+    and ``QualityResult(store=...)`` are both accepted; ``issues``
+    materializes every finding, so reports should page through ``store``.
+    """
+
+    _store: IssueStore = PrivateAttr(default_factory=IssueStore)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _load_issues(cls, data: Any, handler: ModelWrapValidatorHandler[QualityResult]) -> Any:
+        if not isinstance(data, dict):
+            return handler(data)
+        data = dict(data)
+        issues = data.pop("issues", ())
+        store = data.pop("store", None)
+        for key in ("error_count", "warning_count", "passed", "rule_counts"):
+            data.pop(key, None)
+        result = handler(data)
+        if store is not None:
+            result._store = store
+        for issue in issues:
+            result._store.append(QualityIssue.model_validate(issue))
+        return result
+
+    @property
+    def store(self) -> IssueStore:
+        """Columnar storage backing this result."""
+        return self._store
+
+    @property
+    def issue_count(self) -> int:
+        """Total number of findings."""
+        return len(self._store)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def issues(self) -> list[QualityIssue]:
+        """All findings, materialized as QualityIssue objects."""
+        return self._store.page()
 
     @computed_field  # type: ignore[prop-decorator]
     @property
     def error_count(self) -> int:
         """Number of error-severity issues."""
-        return sum(1 for i in self.issues if i.severity == QualitySeverity.ERROR)
+        return self._store.severity_count(QualitySeverity.ERROR)
 
     @computed_field  # type: ignore[prop-decorator]
     @property
     def warning_count(self) -> int:
         """Number of warning-severity issues."""
-        return sum(1 for i in self.issues if i.severity == QualitySeverity.WARNING)
+        return self._store.severity_count(QualitySeverity.WARNING)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def rule_counts(self) -> dict[str, int]:
+        """Number of issues per rule."""
+        counts: dict[str, int] = {}
+        for (rule, _), count in sorted(self._store.counts().items()):
+            counts[rule.value] = counts.get(rule.value, 0) + count
+        return counts
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -233,6 +555,68 @@ class QualityResult(BaseModel):
         return self.error_count == 0
 
 
+class SamplingStratum(BaseModel):
+    """One length-bucket/language stratum of a judge sampling plan."""
+
+    length_bucket: int = 0
+    language: str = ""
+    population: int = 0
+    sample_indices: list[int] = Field(default_factory=list)
+
+
+class SamplingPlan(BaseModel):
+    """Samples chosen for LLM judging, stratified by length and language."""
+
+    strata: list[SamplingStratum] = Field(default_factory=list)
+    excluded_errors: int = 0
+    excluded_duplicates: int = 0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def sample_count(self) -> int:
+        """Number of samples selected for judging."""
+        return sum(len(s.sample_indices) for s in self.strata)
+
+    def sample_indices(self) -> list[int]:
+        """Selected sample indices across all strata, ascending."""
+        return sorted(i for s in self.strata for i in s.sample_indices)
+
+
+class RedactionResult(BaseModel):
+    """Summary of a streaming PII redaction pass."""
+
+    output_path: str = ""
+    sample_count: int = 0
+    redacted_samples: int = 0
+    redactions: dict[str, int] = Field(default_factory=dict)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def total_redactions(self) -> int:
+        """Number of replaced PII spans."""
+        return sum(self.redactions.values())
+
+
+class FilterResult(BaseModel):
+    """Summary of an ``ftdata filter`` pass."""
+
+    output_path: str = ""
+    log_path: str | None = None
+    sample_count: int = 0
+    kept: int = 0
+    # Dropped samples by their first reason: "quality", "contamination"
+    # or "duplicate".
+    dropped: dict[str, int] = Field(default_factory=dict)
+    redacted_samples: int = 0
+    redactions: dict[str, int] = Field(default_factory=dict)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def total_dropped(self) -> int:
+        """Number of samples left out of the output."""
+        return sum(self.dropped.values())
+
+
 # --- Contamination Models ---
 
 
@@ -277,6 +661,95 @@ class DiversityResult(BaseModel):
     topic_distribution: dict[str, float] = Field(default_factory=dict)
 
 
+class PromptDiversity(BaseModel):
+    """Dataset-level prompt diversity estimated from streaming sketches."""
+
+    sample_count: int = 0
+    distinct_prompts: int = 0
+    top_templates: dict[str, int] = Field(default_factory=dict)
+    mean_similarity: float = 0.0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def distinct_ratio(self) -> float:
+        """Estimated fraction of samples with a distinct prompt."""
+        if not self.sample_count:
+            return 1.0
+        return min(1.0, self.distinct_prompts / self.sample_count)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def top_template_share(self) -> float:
+        """Fraction of samples using the most frequent prompt template."""
+        if not self.sample_count or not self.top_templates:
+            return 0.0
+        return max(self.top_templates.values()) / self.sample_count
+
+
+# --- Cache Models ---
+
+
+class CacheStats(BaseModel):
+    """Summary of the persistent per-sample result cache."""
+
+    path: str = ""
+    entries: int = 0
+    size_bytes: int = 0
+    max_size_bytes: int = 0
+    stale_entries: int = 0
+    analyzers: dict[str, int] = Field(default_factory=dict)
+
+
+# --- Timing and Benchmark Models ---
+
+
+class TimingSpan(BaseModel):
+    """Wall time, CPU time and memory of one instrumented pipeline stage.
+
+    ``stage`` is dotted for nested stages (e.g. ``quality.pii``), so a
+    parent's time includes its children's.
+    """
+
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    samples: int = 0
+    rss_delta_mb: float | None = None
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def samples_per_second(self) -> float | None:
+        """Throughput, when the stage reported how many samples it processed."""
+        if not self.samples or self.wall_seconds <= 0:
+            return None
+        return round(self.samples / self.wall_seconds, 1)
+
+
+class StageTiming(BaseModel):
+    """Throughput of one benchmarked pipeline stage."""
+
+    stage: str
+    seconds: float
+    samples_per_second: float
+    mb_per_second: float
+    peak_rss_mb: float | None = None
+
+
+class BenchmarkReport(BaseModel):
+    """Result of an `ftdata bench` run."""
+
+    ftdata_version: str
+    python_version: str
+    platform: str
+    dataset_path: str
+    dataset_format: DatasetFormat
+    sample_count: int
+    size_bytes: int
+    repeat: int = 1
+    isolated: bool = True
+    stages: list[StageTiming] = Field(default_factory=list)
+
+
 # --- Report Model ---
 
 
@@ -291,6 +764,8 @@ class ProfileReport(BaseModel):
     quality: QualityResult | None = None
     contamination: ContaminationResult | None = None
     diversity: DiversityResult | None = None
+    timings: list[TimingSpan] = Field(default_factory=list)
+    estimate: SampleEstimate | None = None
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -311,6 +786,8 @@ class ProfileReport(BaseModel):
             result["contaminated"] = self.contamination.is_contaminated
         if self.diversity is not None:
             result["diversity_score"] = self.diversity.diversity_score
+        if self.estimate is not None:
+            result["sampled"] = self.estimate.sampled
         return result
 
     @field_validator("sample_count")
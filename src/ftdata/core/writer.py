@@ -0,0 +1,313 @@
+"""Streaming dataset writers that preserve the source file layout."""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ftdata.core.compression import (
+    compression_of,
+    data_suffix,
+    open_binary_output,
+    open_text,
+    open_text_output,
+)
+from ftdata.core.loader import decode_json, is_json_array
+from ftdata.core.models import CleanedDataset
+from ftdata.exceptions import DatasetLoadError
+
+# Kept bytes handed to a shard's writer thread at a time, and how many such
+# blocks a shard may have queued before the reader waits.
+WRITE_BLOCK = 1024 * 1024
+_QUEUED_BLOCKS = 8
+
+
+class DatasetWriter:
+    """Write records one at a time as JSONL or as a JSON array.
+
+    Memory use is constant regardless of dataset size. Untouched JSONL
+    records can be written from their original line with write_line, so
+    they round-trip byte for byte. A ``.gz``, ``.bz2`` or ``.zst`` path is
+    compressed as it is written.
+    """
+
+    def __init__(self, path: Path, json_array: bool = False) -> None:
+        self.path = path
+        self.json_array = json_array
+        self.count = 0
+        self._file: IO[str] = open_text_output(path)
+        if json_array:
+            self._file.write("[")
+
+    def __enter__(self) -> DatasetWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def write_line(self, line: str) -> None:
+        """Write an already-serialized record (without trailing newline)."""
+        if self.json_array:
+            self._file.write(",\n" if self.count else "\n")
+            self._file.write(line)
+        else:
+            self._file.write(line)
+            self._file.write("\n")
+        self.count += 1
+
+    def write_record(self, record: Any) -> None:
+        """Serialize and write a record."""
+        self.write_line(json.dumps(record, ensure_ascii=False))
+
+    def close(self) -> None:
+        """Finish the file (closing the JSON array if needed)."""
+        if self._file.closed:
+            return
+        if self.json_array:
+            self._file.write("\n]\n")
+        self._file.close()
+
+
+def keep_bitmap(sample_count: int, dropped: Iterable[int] = ()) -> npt.NDArray[np.uint8]:
+    """Keep/drop bitmap with one bit per sample, set for samples to keep.
+
+    Bits are in little-endian order within each byte: sample ``i`` is bit
+    ``i % 8`` of byte ``i // 8``.
+
+    Args:
+        sample_count: Number of samples in the dataset.
+        dropped: Indices of samples to drop.
+    """
+    keep = np.ones(sample_count, dtype=bool)
+    drop = np.fromiter(dropped, dtype=np.int64)
+    keep[drop[(drop >= 0) & (drop < sample_count)]] = False
+    return np.packbits(keep, bitorder="little")
+
+
+def shard_path(path: Path, shard: int) -> Path:
+    """Path of one output shard: ``clean.jsonl.gz`` -> ``clean-00003.jsonl.gz``."""
+    suffix = data_suffix(path) + (path.suffix if compression_of(path) else "")
+    stem = path.name[: len(path.name) - len(suffix)] if suffix else path.name
+    return path.with_name(f"{stem}-{shard:05d}{suffix}")
+
+
+class _ShardWriter:
+    """Writes one output file from a queue of byte blocks in its own thread.
+
+    Compression (zlib, bz2, zstd) releases the GIL, so several shards can
+    compress at once while the reader keeps filtering.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._queue: queue.Queue[bytes | None] = queue.Queue(_QUEUED_BLOCKS)
+        self._error: BaseException | None = None
+        self._file = open_binary_output(path)
+        self._thread = threading.Thread(target=self._drain, name="ftdata-write", daemon=True)
+        self._thread.start()
+
+    def _drain(self) -> None:
+        try:
+            while (block := self._queue.get()) is not None:
+                self._file.write(block)
+        except BaseException as e:  # re-raised to the reader by write() or finish()
+            self._error = e
+            while self._queue.get() is not None:
+                pass
+        finally:
+            self._file.close()
+
+    def write(self, block: bytes) -> None:
+        if self._error is not None:
+            raise self._error
+        self._queue.put(block)
+
+    def finish(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+class _ShardedOutput:
+    """Kept records laid out over one or more size-limited output files.
+
+    A shard is closed once it holds at least `shard_bytes` (uncompressed);
+    records are never split. At most `workers` shards are still being
+    written at a time.
+    """
+
+    def __init__(
+        self, output: Path, shard_bytes: int | None, workers: int, json_array: bool
+    ) -> None:
+        self.output = output
+        self.shard_bytes = shard_bytes
+        self.workers = max(1, workers)
+        self.json_array = json_array
+        self.paths: list[str] = []
+        self.bytes_written = 0
+        self._active: list[_ShardWriter] = []
+        self._block: list[bytes] = []
+        self._block_size = 0
+        self._shard_size = 0
+        self._records = 0
+        self._open_shard()
+
+    def _emit(self, data: bytes) -> None:
+        self._block.append(data)
+        self._block_size += len(data)
+        self._shard_size += len(data)
+        self.bytes_written += len(data)
+        if self._block_size >= WRITE_BLOCK:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._block:
+            self._active[-1].write(b"".join(self._block))
+            self._block, self._block_size = [], 0
+
+    def _close_shard(self) -> None:
+        if self.json_array:
+            self._emit(b"\n]\n")
+        self._flush()
+
+    def _open_shard(self) -> None:
+        while len(self._active) >= self.workers:
+            self._active.pop(0).finish()
+        path = self.output if self.shard_bytes is None else shard_path(self.output, len(self.paths))
+        self._active.append(_ShardWriter(path))
+        self.paths.append(str(path))
+        self._shard_size = 0
+        self._records = 0
+        if self.json_array:
+            self._emit(b"[")
+
+    def add(self, record: bytes) -> None:
+        """Append one serialized record (JSONL lines include their newline)."""
+        if self.shard_bytes is not None and self._records and self._shard_size >= self.shard_bytes:
+            self._close_shard()
+            self._open_shard()
+        if self.json_array:
+            self._emit(b",\n" if self._records else b"\n")
+        self._emit(record)
+        self._records += 1
+
+    def close(self) -> None:
+        """Finish the last shard and wait for every writer."""
+        try:
+            self._close_shard()
+        finally:
+            for writer in self._active:
+                writer.finish()
+            self._active = []
+
+
+def _records(path: Path) -> tuple[bool, Iterator[bytes]]:
+    """Whether `path` is a JSON array, and its records as bytes.
+
+    JSONL records are the source lines byte for byte, including their line
+    ending (a missing final newline is added). Lines are split and blank
+    lines skipped exactly as the loader does (universal newlines,
+    ``str.strip``), so record ``i`` here is sample ``i`` there. Records of
+    a JSON array are re-serialized, as they have no source text of their own.
+
+    Raises:
+        DatasetLoadError: If the file cannot be read (also while iterating).
+    """
+
+    def array_records() -> Iterator[bytes]:
+        with open_text(path) as f:
+            for record in decode_json(f.read()):
+                yield json.dumps(record, ensure_ascii=False).encode()
+
+    def lines() -> Iterator[bytes]:
+        with open_text(path, newline="") as f:
+            for line in f:
+                if line.strip():
+                    yield (line if line.endswith(("\n", "\r")) else line + "\n").encode()
+
+    def reading(records: Iterator[bytes]) -> Iterator[bytes]:
+        try:
+            yield from records
+        except json.JSONDecodeError as e:
+            raise DatasetLoadError(str(path), f"invalid JSON: {e}") from e
+        except (OSError, UnicodeDecodeError) as e:
+            raise DatasetLoadError(str(path), str(e)) from e
+
+    try:
+        with open_text(path) as f:
+            json_array = is_json_array(f.read(64))
+    except (OSError, UnicodeDecodeError) as e:
+        raise DatasetLoadError(str(path), str(e)) from e
+    return json_array, reading(array_records() if json_array else lines())
+
+
+def write_kept(
+    path: Path,
+    output: Path,
+    keep: npt.NDArray[np.uint8],
+    shard_bytes: int | None = None,
+    workers: int | None = None,
+) -> CleanedDataset:
+    """Stream the records of `path` whose bit is set in `keep` to `output`.
+
+    JSONL records are copied byte for byte without being parsed, so the
+    output keeps the source format, key order and escaping; a JSON array
+    stays a JSON array. Blank lines are skipped and do not count as
+    records, matching the loader's sample indices. Either file may be
+    compressed (by suffix).
+
+    With `shard_bytes`, the output is split into files of about that many
+    uncompressed bytes, named ``<stem>-00000<suffix>``, ``<stem>-00001...``;
+    up to `workers` of them are written (and compressed) concurrently.
+
+    Args:
+        path: Source dataset file.
+        output: Output path (or naming template for shards).
+        keep: Keep/drop bitmap from keep_bitmap (bit ``i`` keeps sample ``i``).
+        shard_bytes: Optional size limit per output shard.
+        workers: Shards written concurrently (default: CPU count).
+
+    Returns:
+        CleanedDataset with the files written and kept/dropped counts.
+
+    Raises:
+        DatasetLoadError: If the source cannot be read, or has more records
+            than `keep` has bits.
+        OSError: If an output file cannot be written.
+    """
+    bits = keep.tobytes()
+    capacity = len(bits) * 8
+    kept = dropped = 0
+    json_array, records = _records(path)
+    sink = _ShardedOutput(output, shard_bytes, workers or os.cpu_count() or 1, json_array)
+    try:
+        for index, record in enumerate(records):
+            if index >= capacity:
+                raise DatasetLoadError(
+                    str(path), f"has more records than the keep bitmap ({capacity})"
+                )
+            if bits[index >> 3] >> (index & 7) & 1:
+                sink.add(record)
+                kept += 1
+            else:
+                dropped += 1
+    finally:
+        sink.close()
+    return CleanedDataset(
+        output_paths=sink.paths, kept=kept, dropped=dropped, bytes_written=sink.bytes_written
+    )
@@ -1 +1 @@
-"""Deduplication: exact, near-duplicate (MinHash), and semantic."""
+"""Deduplication: exact, near-duplicate (MinHash), semantic, and repeated spans."""
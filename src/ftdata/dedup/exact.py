@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from ftdata.core.models import Dataset, DedupResult
+import numpy as np
+import numpy.typing as npt
+
+from ftdata.core.models import Dataset, DedupMethod, DedupResult, DuplicateCluster
+from ftdata.core.writer import keep_bitmap
+from ftdata.timing import span
 
 
 def find_exact_duplicates(dataset: Dataset) -> DedupResult:
@@ -16,4 +21,31 @@ def find_exact_duplicates(dataset: Dataset) -> DedupResult:
     Returns:
         DedupResult with clusters of exact duplicates.
     """
-    raise NotImplementedError
+    with span("exact_dedup", dataset.sample_count):
+        groups: dict[str, list[int]] = {}
+        for sample in dataset.samples:
+            groups.setdefault(sample.content_hash, []).append(sample.index)
+        clusters = [
+            DuplicateCluster(indices=indices, method=DedupMethod.EXACT)
+            for indices in groups.values()
+            if len(indices) > 1
+        ]
+        return dedup_result(clusters, dataset.sample_count)
+
+
+def dedup_result(clusters: list[DuplicateCluster], sample_count: int) -> DedupResult:
+    """Summarize duplicate clusters as a DedupResult."""
+    duplicates = sum(len(c.indices) - 1 for c in clusters)
+    return DedupResult(
+        clusters=clusters,
+        total_duplicates=duplicates,
+        duplicate_percentage=round(100.0 * duplicates / sample_count, 2) if sample_count else 0.0,
+    )
+
+
+def keep_first(result: DedupResult, sample_count: int) -> npt.NDArray[np.uint8]:
+    """Keep/drop bitmap keeping the lowest-index sample of every cluster.
+
+    Works for the clusters of any dedup method; see write_kept.
+    """
+    return keep_bitmap(sample_count, (i for c in result.clusters for i in sorted(c.indices)[1:]))
@@ -0,0 +1,354 @@
+"""Exact dedup by external merge sort, for corpora larger than memory.
+
+find_exact_duplicates keeps every sample (and a dict of every content
+hash) in memory. This strategy streams the source file instead: each
+record becomes a 16-byte ``(hash, index)`` pair, pairs are collected into
+runs that fit the memory budget, sorted and spilled to a temporary
+directory, and the runs are k-way merged block by block so that equal
+hashes come out adjacent. Only the duplicate clusters themselves are kept.
+
+Hashing (JSON decode, re-serialization, SHA-256) runs on a process pool;
+sorting and spilling runs happens on threads while the next run fills.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from ftdata.core.compression import open_text
+from ftdata.core.loader import decode_json, is_json_array
+from ftdata.core.models import DedupMethod, DedupResult, DuplicateCluster
+from ftdata.dedup.exact import dedup_result
+from ftdata.exceptions import DatasetLoadError, EmptyDatasetError
+from ftdata.timing import span
+
+PAIR = np.dtype([("hash", "<u8"), ("index", "<i8")])
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024
+# Runs merged at once; more runs than this are merged in several passes.
+MERGE_FAN_IN = 64
+# Smallest run / merge block, so tiny budgets still make progress.
+MIN_RUN_PAIRS = 4096
+MIN_BLOCK_PAIRS = 1024
+# Records hashed per worker task.
+_HASH_BATCH = 8192
+# Below this many source bytes a process pool costs more than it saves.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+class SortedRun(NamedTuple):
+    """A file of PAIR records in (hash, index) order."""
+
+    path: Path
+    pairs: int
+
+
+def merge_block_pairs(memory_bytes: int) -> int:
+    """Pairs read per run and merge step so a merge stays within `memory_bytes`."""
+    # A merge holds one block per run, plus the concatenated and sorted chunk.
+    return max(memory_bytes // PAIR.itemsize // (3 * MERGE_FAN_IN), MIN_BLOCK_PAIRS)
+
+
+def content_key(record: object) -> int:
+    """Sample.content_hash of a raw record, as an unsigned 64-bit integer.
+
+    Samples keep the record re-serialized as ``raw_content``; hashing that
+    text here gives the same value without building the Sample.
+    """
+    text = json.dumps(record, ensure_ascii=False)
+    return int(hashlib.sha256(text.encode()).hexdigest()[:16], 16)
+
+
+def _hash_lines(path: str, first_index: int, lines: list[str]) -> npt.NDArray[np.uint64]:
+    """Content keys of a batch of JSONL lines (runs in worker processes)."""
+    keys = np.empty(len(lines), dtype=np.uint64)
+    for offset, line in enumerate(lines):
+        try:
+            record = decode_json(line)
+        except json.JSONDecodeError as e:
+            raise DatasetLoadError(path, f"invalid JSON in record {first_index + offset}") from e
+        if not isinstance(record, dict):
+            raise DatasetLoadError(path, f"record {first_index + offset} is not a JSON object")
+        keys[offset] = content_key(record)
+    return keys
+
+
+def _line_batches(path: Path) -> Iterator[list[str]]:
+    """Non-blank lines of a JSONL file in batches of _HASH_BATCH.
+
+    Raises:
+        DatasetLoadError: If the file cannot be read or is a JSON array.
+    """
+    try:
+        with open_text(path) as f:
+            if is_json_array(f.read(64)):
+                raise DatasetLoadError(str(path), "external sort dedup needs a JSONL file")
+        with open_text(path) as f:
+            batch: list[str] = []
+            for line in f:
+                if line.strip():
+                    batch.append(line)
+                    if len(batch) == _HASH_BATCH:
+                        yield batch
+                        batch = []
+            if batch:
+                yield batch
+    except (OSError, UnicodeDecodeError) as e:
+        raise DatasetLoadError(str(path), str(e)) from e
+
+
+def _hashed_batches(path: Path, workers: int) -> Iterator[npt.NDArray[np.uint64]]:
+    """Content keys of consecutive batches of records, in source order."""
+    first = 0
+    if workers == 1:
+        for lines in _line_batches(path):
+            yield _hash_lines(str(path), first, lines)
+            first += len(lines)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[Future[npt.NDArray[np.uint64]]] = deque()
+    try:
+        for lines in _line_batches(path):
+            pending.append(pool.submit(_hash_lines, str(path), first, lines))
+            first += len(lines)
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def write_run(
+    path: Path, keys: npt.NDArray[np.uint64], indices: npt.NDArray[np.int64]
+) -> SortedRun:
+    """Sort `keys` with their (ascending) `indices` and write them as a run of pairs."""
+    order = np.argsort(keys)
+    hashes = keys[order]
+    # Quicksort leaves equal keys in any order; restore index order among them.
+    ties = np.flatnonzero(hashes[1:] == hashes[:-1])
+    if len(ties):
+        tied = np.union1d(ties, ties + 1)
+        order[tied] = order[tied][np.lexsort((order[tied], hashes[tied]))]
+    pairs = np.empty(len(keys), dtype=PAIR)
+    pairs["hash"] = hashes
+    pairs["index"] = indices[order]
+    pairs.tofile(path)
+    return SortedRun(path, len(pairs))
+
+
+def _spill_run(path: Path, keys: npt.NDArray[np.uint64], first_index: int) -> SortedRun:
+    """Sort one run of keys for indices ``first_index``, ... and write it."""
+    return write_run(path, keys, np.arange(first_index, first_index + len(keys)))
+
+
+def _generate_runs(
+    path: Path, directory: Path, run_pairs: int, workers: int
+) -> tuple[list[SortedRun], int]:
+    """Spill sorted runs of at most `run_pairs` pairs; returns them and the record count.
+
+    At most `workers` full runs are being sorted at once, on threads, so
+    run buffers never exceed ``(workers + 1) * run_pairs`` pairs.
+    """
+    runs: list[Future[SortedRun]] = []
+    buffer = np.empty(run_pairs, dtype=np.uint64)
+    filled = start = 0
+    with ThreadPoolExecutor(max_workers=workers) as sorters:
+        in_flight: deque[Future[SortedRun]] = deque()
+
+        def spill() -> None:
+            nonlocal buffer, filled, start
+            if len(in_flight) >= workers:
+                in_flight.popleft().result()
+            run_path = directory / f"run-{len(runs):06d}.bin"
+            in_flight.append(sorters.submit(_spill_run, run_path, buffer[:filled], start))
+            runs.append(in_flight[-1])
+            start += filled
+            buffer, filled = np.empty(run_pairs, dtype=np.uint64), 0
+
+        for keys in _hashed_batches(path, workers):
+            while len(keys):
+                take = min(len(keys), run_pairs - filled)
+                buffer[filled : filled + take] = keys[:take]
+                filled += take
+                keys = keys[take:]
+                if filled == run_pairs:
+                    spill()
+        if filled:
+            spill()
+    return [run.result() for run in runs], start
+
+
+class _RunReader:
+    """Block-wise reader over one sorted run."""
+
+    def __init__(self, run: SortedRun, block_pairs: int) -> None:
+        self._data = np.memmap(run.path, dtype=PAIR, mode="r", shape=(run.pairs,))
+        self._block_pairs = block_pairs
+        self._position = 0
+        self.buffer: npt.NDArray[np.void] = np.empty(0, dtype=PAIR)
+        self.refill()
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every pair has been loaded into a buffer."""
+        return self._position >= len(self._data)
+
+    def refill(self) -> None:
+        stop = self._position + self._block_pairs
+        self.buffer = np.array(self._data[self._position : stop])
+        self._position = min(stop, len(self._data))
+
+
+def _merged(runs: list[SortedRun], block_pairs: int) -> Iterator[npt.NDArray[np.void]]:
+    """Sorted chunks of all pairs in `runs`, in (hash, index) order overall.
+
+    Each round takes, from every loaded block, the pairs up to the lowest
+    last-loaded hash of any run with data left on disk: no pair still on
+    disk can sort before those. A hash equal to that bound may continue in
+    the next chunk.
+
+    Runs must cover ascending, disjoint index ranges in list order (as
+    spilled), so a stable sort on the hash alone puts ties in index order.
+    """
+    readers = [_RunReader(run, block_pairs) for run in runs if run.pairs]
+    while readers:
+        pending = [r.buffer["hash"][-1] for r in readers if not r.exhausted]
+        bound = min(pending) if pending else None
+        parts = []
+        for reader in readers:
+            hashes = reader.buffer["hash"]
+            take = len(hashes) if bound is None else int(np.searchsorted(hashes, bound, "right"))
+            parts.append(reader.buffer[:take])
+            reader.buffer = reader.buffer[take:]
+            if not len(reader.buffer) and not reader.exhausted:
+                reader.refill()
+        readers = [r for r in readers if len(r.buffer)]
+        chunk = np.concatenate(parts)
+        yield chunk[np.argsort(chunk["hash"], kind="stable")]
+
+
+def _merge_passes(runs: list[SortedRun], directory: Path, block_pairs: int) -> list[SortedRun]:
+    """Merge groups of runs until at most MERGE_FAN_IN remain."""
+    generation = 0
+    while len(runs) > MERGE_FAN_IN:
+        merged: list[SortedRun] = []
+        for group in range(0, len(runs), MERGE_FAN_IN):
+            path = directory / f"merge-{generation:03d}-{len(merged):06d}.bin"
+            count = 0
+            with open(path, "wb") as f:
+                for chunk in _merged(runs[group : group + MERGE_FAN_IN], block_pairs):
+                    chunk.tofile(f)
+                    count += len(chunk)
+            merged.append(SortedRun(path, count))
+        for run in runs:
+            run.path.unlink()
+        runs, generation = merged, generation + 1
+    return runs
+
+
+def merge_runs(
+    runs: list[SortedRun], directory: Path, block_pairs: int
+) -> Iterator[npt.NDArray[np.void]]:
+    """Sorted chunks of all pairs in `runs`, merging in passes if there are many.
+
+    Intermediate runs are written to `directory` and the inputs deleted.
+    """
+    yield from _merged(_merge_passes(runs, directory, block_pairs), block_pairs)
+
+
+def duplicate_groups(
+    chunks: Iterator[npt.NDArray[np.void]], min_size: int = 2
+) -> Iterator[list[int]]:
+    """Ascending indices sharing a hash, for hashes seen at least `min_size` times.
+
+    Only the first and last group of a chunk can continue across chunks;
+    the groups in between are complete and already in index order.
+    """
+    open_hash: int | None = None
+    open_group: list[int] = []
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        hashes = chunk["hash"]
+        indices = chunk["index"]
+        starts = np.flatnonzero(np.concatenate(([True], hashes[1:] != hashes[:-1])))
+        ends = np.append(starts[1:], len(hashes))
+        head = indices[: ends[0]].tolist()
+        if int(hashes[0]) == open_hash:
+            open_group.extend(head)
+        else:
+            if len(open_group) >= min_size:
+                yield sorted(open_group)
+            open_hash, open_group = int(hashes[0]), head
+        if len(starts) == 1:
+            continue
+        if len(open_group) >= min_size:
+            yield sorted(open_group)
+        for group in (np.flatnonzero(ends[1:-1] - starts[1:-1] >= min_size) + 1).tolist():
+            yield indices[starts[group] : ends[group]].tolist()
+        open_hash, open_group = int(hashes[starts[-1]]), indices[starts[-1] :].tolist()
+    if len(open_group) >= min_size:
+        yield sorted(open_group)
+
+
+def find_exact_duplicates_external(
+    path: Path,
+    memory_bytes: int = DEFAULT_MEMORY_BYTES,
+    temp_dir: Path | None = None,
+    workers: int | None = None,
+) -> tuple[DedupResult, int]:
+    """Find exact duplicates in a JSONL file with a bounded-memory external sort.
+
+    Clusters are identical to those of find_exact_duplicates on the loaded
+    dataset, in the same order. Memory use is bounded by `memory_bytes`
+    for the sort (plus the clusters found), whatever the corpus size; disk
+    use is 16 bytes per record in `temp_dir`.
+
+    Args:
+        path: JSONL dataset file (may be compressed).
+        memory_bytes: Budget for run buffers and merge blocks.
+        temp_dir: Directory for sorted runs (default: the system temp dir).
+        workers: Hashing processes and sorting threads (default: CPU count).
+
+    Returns:
+        DedupResult with clusters of exact duplicates, and the number of
+        records in the file.
+
+    Raises:
+        DatasetLoadError: If the file cannot be read, is a JSON array or
+            holds a record that is not a JSON object.
+        EmptyDatasetError: If the file holds no records.
+    """
+    workers = workers or os.cpu_count() or 1
+    if path.stat().st_size < PARALLEL_MIN_BYTES:
+        workers = 1
+    budget_pairs = memory_bytes // PAIR.itemsize
+    run_pairs = max(budget_pairs // (workers + 1), MIN_RUN_PAIRS)
+    block_pairs = merge_block_pairs(memory_bytes)
+
+    with (
+        span("exact_dedup") as timed,
+        tempfile.TemporaryDirectory(prefix="ftdata-sort-", dir=temp_dir) as tmp,
+    ):
+        directory = Path(tmp)
+        with span("runs"):
+            runs, sample_count = _generate_runs(path, directory, run_pairs, workers)
+        if not sample_count:
+            raise EmptyDatasetError(str(path))
+        timed.samples = sample_count
+        with span("merge", sample_count):
+            groups = sorted(duplicate_groups(merge_runs(runs, directory, block_pairs)))
+    clusters = [DuplicateCluster(indices=g, method=DedupMethod.EXACT) for g in groups]
+    return dedup_result(clusters, sample_count), sample_count
@@ -2,22 +2,184 @@
 
 from __future__ import annotations
 
-from ftdata.core.models import Dataset, DedupResult
+from typing import TYPE_CHECKING, Any
+
+from ftdata.cache import ResultCache, map_cached
+from ftdata.core.models import Dataset, DedupMethod, DedupResult, DuplicateCluster, Sample
+from ftdata.dedup.exact import dedup_result
+from ftdata.timing import span
+
+if TYPE_CHECKING:
+    from datasketch import LeanMinHash
+
+SHINGLE_WORDS = 3
+MINHASH_SEED = 1
+MINHASH_SCHEME = "affine32"
+
+# Cached per-sample signature: the MinHash hash values.
+Signature = list[int]
+
+
+def word_shingles(text: str, size: int = SHINGLE_WORDS) -> list[bytes]:
+    """Lowercased word n-grams of `text` (the whole text if it is shorter)."""
+    words = text.lower().split()
+    if len(words) <= size:
+        return [" ".join(words).encode()]
+    return [" ".join(words[i : i + size]).encode() for i in range(len(words) - size + 1)]
+
+
+def _signatures(samples: list[Sample], num_perm: int) -> list[Signature]:
+    from datasketch import MinHash
+
+    texts = ["\n".join(m.content for m in s.messages) for s in samples]
+    minhashes = MinHash.bulk(
+        [word_shingles(t) for t in texts],
+        num_perm=num_perm,
+        seed=MINHASH_SEED,
+        scheme=MINHASH_SCHEME,
+    )
+    return [m.hashvalues.tolist() for m in minhashes]
+
+
+def minhash_signatures(
+    dataset: Dataset,
+    num_perm: int = 128,
+    cache: ResultCache | None = None,
+) -> list[Signature]:
+    """MinHash signature of every sample's text, reusing cached signatures.
+
+    Args:
+        dataset: Dataset to sign.
+        num_perm: Number of permutations for MinHash.
+        cache: Optional ResultCache for incremental re-runs.
+
+    Returns:
+        One signature (list of hash values) per sample.
+    """
+    config: dict[str, Any] = {
+        "num_perm": num_perm,
+        "shingle": SHINGLE_WORDS,
+        "seed": MINHASH_SEED,
+        "scheme": MINHASH_SCHEME,
+    }
+    return map_cached(
+        dataset.samples,
+        f"minhash:{num_perm}",
+        config,
+        lambda batch: _signatures(batch, num_perm),
+        cache,
+    )
+
+
+class MinHashIndex:
+    """Incremental near-duplicate index: MinHash LSH plus union-find clusters.
+
+    Signatures can be added in any number of batches; each one is checked
+    against everything added before it, so clusters after adding a stream
+    in pieces match a single pass over the whole stream.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128) -> None:
+        from datasketch import MinHashLSH
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.duplicates = 0
+        self._lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+        self._minhashes: list[LeanMinHash] = []
+        self._sample_indices: list[int] = []
+        self._parent: list[int] = []
+        self._lowest: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._sample_indices)
+
+    def _find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def add(self, sample_index: int, signature: Signature) -> None:
+        """Add one sample, merging it with every confirmed near-duplicate."""
+        from datasketch import LeanMinHash
+
+        i = len(self._sample_indices)
+        minhash = LeanMinHash(seed=MINHASH_SEED, hashvalues=signature, scheme=MINHASH_SCHEME)
+        self._parent.append(i)
+        self._lowest.append(1.0)
+        for j in self._lsh.query(minhash):
+            similarity = minhash.jaccard(self._minhashes[j])
+            if similarity >= self.threshold:
+                root_i, root_j = self._find(i), self._find(j)
+                if root_i != root_j:
+                    self._parent[root_i] = root_j
+                    self.duplicates += 1
+                self._lowest[root_j] = min(self._lowest[root_j], self._lowest[root_i], similarity)
+        self._lsh.insert(i, minhash)
+        self._minhashes.append(minhash)
+        self._sample_indices.append(sample_index)
+
+    def duplicate_of(self, signature: Signature) -> int | None:
+        """Lowest sample index already added that is a near-duplicate of `signature`.
+
+        The index is not changed, so callers can decide whether to add() the
+        sample afterwards.
+        """
+        from datasketch import LeanMinHash
+
+        minhash = LeanMinHash(seed=MINHASH_SEED, hashvalues=signature, scheme=MINHASH_SCHEME)
+        matches = [
+            self._sample_indices[j]
+            for j in self._lsh.query(minhash)
+            if minhash.jaccard(self._minhashes[j]) >= self.threshold
+        ]
+        return min(matches, default=None)
+
+    def clusters(self) -> list[DuplicateCluster]:
+        """Current clusters of two or more near-duplicate samples."""
+        groups: dict[int, list[int]] = {}
+        for i, sample_index in enumerate(self._sample_indices):
+            groups.setdefault(self._find(i), []).append(sample_index)
+        return [
+            DuplicateCluster(
+                indices=members,
+                similarity=round(self._lowest[root], 4),
+                method=DedupMethod.MINHASH,
+            )
+            for root, members in groups.items()
+            if len(members) > 1
+        ]
 
 
 def find_minhash_duplicates(
     dataset: Dataset,
     threshold: float = 0.8,
     num_perm: int = 128,
+    cache: ResultCache | None = None,
 ) -> DedupResult:
     """Find near-duplicate samples using MinHash locality-sensitive hashing.
 
+    LSH candidates are confirmed against the estimated Jaccard similarity
+    before being merged, and clusters are the connected components of the
+    confirmed pairs.
+
     Args:
         dataset: Dataset to check for near-duplicates.
         threshold: Jaccard similarity threshold for duplicate detection.
         num_perm: Number of permutations for MinHash.
+        cache: Optional ResultCache for signatures.
 
     Returns:
         DedupResult with clusters of near-duplicates.
     """
-    raise NotImplementedError
+    samples = dataset.sample_count
+    with span("minhash_dedup", samples):
+        with span("signatures", samples):
+            signatures = minhash_signatures(dataset, num_perm, cache)
+        with span("lsh", samples):
+            index = MinHashIndex(threshold, num_perm)
+            for sample, signature in zip(dataset.samples, signatures, strict=True):
+                index.add(sample.index, signature)
+            return dedup_result(index.clusters(), samples)
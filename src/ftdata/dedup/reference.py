@@ -0,0 +1,355 @@
+"""Reference index for deduplicating new data against existing corpora.
+
+An index is a directory built once from one or more datasets (a training
+mix, held-out eval sets, ...) and then opened read-only, memory-mapped, by
+``ftdata dedup --against``:
+
+- ``exact_hashes.npy`` / ``exact_ids.npy``: every sample's content hash as
+  a sorted uint64 array, with the reference id of each entry.
+- ``band_keys.npy`` / ``band_ids.npy``: one row per MinHash LSH band, the
+  band hashes sorted, with the reference id of each entry.
+- ``signatures.npy``: the MinHash signature of every reference sample, used
+  to confirm LSH candidates against the similarity threshold.
+- ``manifest.json``: MinHash parameters and the source datasets; reference
+  id ``i`` is sample ``i - offset`` of the source whose range contains it.
+
+Lookups are binary searches over the mapped arrays, so opening an index
+costs nothing and only the pages a query touches are read.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ftdata.cache import ResultCache
+from ftdata.core.loader import detect_format, iter_samples
+from ftdata.core.models import (
+    Dataset,
+    DatasetFormat,
+    DedupMethod,
+    ReferenceDedupResult,
+    ReferenceMatch,
+    Sample,
+)
+from ftdata.dedup.minhash import MINHASH_SCHEME, MINHASH_SEED, SHINGLE_WORDS, minhash_signatures
+from ftdata.exceptions import DatasetLoadError, EmptyDatasetError
+from ftdata.timing import span
+
+INDEX_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+# Samples signed per batch while building.
+BUILD_BATCH = 65_536
+# Candidates confirmed per band bucket; very common band values (e.g.
+# empty texts) would otherwise make every lookup scan a huge range.
+MAX_BUCKET_CANDIDATES = 256
+_BAND_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def lsh_params(threshold: float, num_perm: int) -> tuple[int, int]:
+    """``(bands, rows)`` that datasketch's MinHashLSH picks for these settings."""
+    from datasketch import MinHashLSH
+
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    return lsh.b, lsh.r
+
+
+def band_keys(signatures: npt.NDArray[np.uint32], bands: int, rows: int) -> npt.NDArray[np.uint64]:
+    """One 64-bit hash per LSH band of each signature, shape ``(n, bands)``."""
+    block = signatures[:, : bands * rows].astype(np.uint64).reshape(len(signatures), bands, rows)
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    for row in range(rows):
+        keys = keys * _BAND_MULTIPLIER + block[:, :, row]
+    return keys
+
+
+def content_keys(samples: Sequence[Sample]) -> npt.NDArray[np.uint64]:
+    """Each sample's content hash as an unsigned 64-bit integer."""
+    return np.array([int(s.content_hash, 16) for s in samples], dtype=np.uint64)
+
+
+def _batches(samples: Iterator[Sample], size: int) -> Iterator[list[Sample]]:
+    batch: list[Sample] = []
+    for sample in samples:
+        batch.append(sample)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_reference_index(
+    paths: Sequence[Path],
+    directory: Path,
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    format: DatasetFormat | None = None,
+    cache: ResultCache | None = None,
+) -> ReferenceIndex:
+    """Build a reference index over `paths` in `directory`.
+
+    Datasets are streamed in batches; signatures are spilled to disk as
+    they are computed, so memory grows with the number of reference
+    samples (about 24 bytes each while sorting a band), not with their
+    size.
+
+    Args:
+        paths: Reference datasets, in reference-id order.
+        directory: Output directory (created if missing; files are replaced).
+        threshold: Jaccard threshold the LSH bands are tuned for.
+        num_perm: Number of MinHash permutations.
+        format: Optional explicit format (auto-detected per file if None).
+        cache: Optional ResultCache for signatures.
+
+    Returns:
+        The new index, opened read-only.
+
+    Raises:
+        DatasetLoadError: If a dataset cannot be read.
+        EmptyDatasetError: If the datasets hold no samples at all.
+    """
+    bands, rows = lsh_params(threshold, num_perm)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Written last, so an interrupted build never looks like a usable index.
+    (directory / MANIFEST_FILENAME).unlink(missing_ok=True)
+    spill = directory / "signatures.tmp"
+    sources: list[dict[str, Any]] = []
+    hashes: list[npt.NDArray[np.uint64]] = []
+    total = 0
+    with span("reference_index") as timed:
+        try:
+            with open(spill, "wb") as f:
+                for path in paths:
+                    fmt = format or detect_format(path)
+                    count = 0
+                    for batch in _batches(iter_samples(path, fmt), BUILD_BATCH):
+                        dataset = Dataset(samples=batch, format=fmt, path=path)
+                        signatures = minhash_signatures(dataset, num_perm, cache)
+                        np.asarray(signatures, dtype=np.uint32).tofile(f)
+                        hashes.append(content_keys(batch))
+                        count += len(batch)
+                    sources.append({"path": str(path), "sample_count": count})
+                    total += count
+            if not total:
+                raise EmptyDatasetError(", ".join(str(p) for p in paths))
+            timed.samples = total
+
+            spilled = np.memmap(spill, dtype=np.uint32, mode="r", shape=(total, num_perm))
+            _write_signatures(directory, spilled)
+            _write_bands(directory, spilled, bands, rows)
+            del spilled
+        finally:
+            spill.unlink(missing_ok=True)
+        _write_sorted(directory, "exact", np.concatenate(hashes))
+
+    manifest: dict[str, Any] = {
+        "version": INDEX_VERSION,
+        "sample_count": total,
+        "threshold": threshold,
+        "num_perm": num_perm,
+        "bands": bands,
+        "rows": rows,
+        "shingle": SHINGLE_WORDS,
+        "seed": MINHASH_SEED,
+        "scheme": MINHASH_SCHEME,
+        "sources": sources,
+    }
+    (directory / MANIFEST_FILENAME).write_text(json.dumps(manifest, indent=2))
+    return ReferenceIndex(directory)
+
+
+def _write_signatures(directory: Path, spilled: npt.NDArray[np.uint32]) -> None:
+    out = np.lib.format.open_memmap(
+        directory / "signatures.npy", mode="w+", dtype=np.uint32, shape=spilled.shape
+    )
+    for start in range(0, len(spilled), BUILD_BATCH):
+        out[start : start + BUILD_BATCH] = spilled[start : start + BUILD_BATCH]
+    out.flush()
+
+
+def _write_bands(directory: Path, spilled: npt.NDArray[np.uint32], bands: int, rows: int) -> None:
+    total = len(spilled)
+    keys_out = np.lib.format.open_memmap(
+        directory / "band_keys.npy", mode="w+", dtype=np.uint64, shape=(bands, total)
+    )
+    ids_out = np.lib.format.open_memmap(
+        directory / "band_ids.npy", mode="w+", dtype=np.int64, shape=(bands, total)
+    )
+    keys = np.empty(total, dtype=np.uint64)
+    for band in range(bands):
+        columns = slice(band * rows, (band + 1) * rows)
+        for start in range(0, total, BUILD_BATCH):
+            block = spilled[start : start + BUILD_BATCH, columns]
+            keys[start : start + len(block)] = band_keys(block, 1, rows)[:, 0]
+        order = np.argsort(keys, kind="stable")
+        keys_out[band] = keys[order]
+        ids_out[band] = order
+    keys_out.flush()
+    ids_out.flush()
+
+
+def _write_sorted(directory: Path, name: str, keys: npt.NDArray[np.uint64]) -> None:
+    # Stable, so equal keys keep ascending ids and a lookup finds the lowest.
+    order = np.argsort(keys, kind="stable")
+    np.save(directory / f"{name}_hashes.npy", keys[order])
+    np.save(directory / f"{name}_ids.npy", order.astype(np.int64))
+
+
+class ReferenceIndex:
+    """A reference index opened read-only; arrays are memory-mapped."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        try:
+            self.manifest: dict[str, Any] = json.loads((directory / MANIFEST_FILENAME).read_text())
+        except FileNotFoundError:
+            raise DatasetLoadError(str(directory), "not a reference index") from None
+        except (OSError, json.JSONDecodeError) as e:
+            raise DatasetLoadError(str(directory), f"unreadable index manifest: {e}") from e
+        expected = {
+            "version": INDEX_VERSION,
+            "shingle": SHINGLE_WORDS,
+            "seed": MINHASH_SEED,
+            "scheme": MINHASH_SCHEME,
+        }
+        for key, value in expected.items():
+            if self.manifest.get(key) != value:
+                raise DatasetLoadError(
+                    str(directory), f"index was built with {key}={self.manifest.get(key)!r}"
+                )
+        self.sample_count: int = self.manifest["sample_count"]
+        self.threshold: float = self.manifest["threshold"]
+        self.num_perm: int = self.manifest["num_perm"]
+        self.bands: int = self.manifest["bands"]
+        self.rows: int = self.manifest["rows"]
+        sources = self.manifest["sources"]
+        self._paths: list[str] = [s["path"] for s in sources]
+        self._offsets = np.cumsum([0] + [s["sample_count"] for s in sources])
+        try:
+            self._exact_hashes = self._open("exact_hashes")
+            self._exact_ids = self._open("exact_ids")
+            self._band_keys = self._open("band_keys")
+            self._band_ids = self._open("band_ids")
+            self._signatures = self._open("signatures")
+        except (OSError, ValueError) as e:
+            raise DatasetLoadError(str(directory), str(e)) from e
+
+    def _open(self, name: str) -> npt.NDArray[Any]:
+        array: npt.NDArray[Any] = np.load(self.directory / f"{name}.npy", mmap_mode="r")
+        return array
+
+    def source_of(self, reference_id: int) -> tuple[str, int]:
+        """Source dataset path and sample index of a reference id."""
+        source = int(np.searchsorted(self._offsets, reference_id, side="right")) - 1
+        return self._paths[source], reference_id - int(self._offsets[source])
+
+    def exact_ids(self, keys: npt.NDArray[np.uint64]) -> npt.NDArray[np.int64]:
+        """Lowest reference id with each content key, or -1 where there is none."""
+        positions = np.searchsorted(self._exact_hashes, keys)
+        found = positions < len(self._exact_hashes)
+        found[found] = self._exact_hashes[positions[found]] == keys[found]
+        ids = np.full(len(keys), -1, dtype=np.int64)
+        ids[found] = self._exact_ids[positions[found]]
+        return ids
+
+    def near_ids(
+        self, signatures: npt.NDArray[np.uint32], threshold: float | None = None
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """Most similar reference sample for each signature.
+
+        Candidates share at least one LSH band; each is confirmed by the
+        MinHash estimate of Jaccard similarity.
+
+        Args:
+            signatures: Query signatures, shape ``(n, num_perm)``.
+            threshold: Minimum similarity (default: the build threshold).
+
+        Returns:
+            Reference id (-1 if none reaches the threshold) and similarity
+            of the best match per signature; ties go to the lowest id.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        keys = band_keys(signatures, self.bands, self.rows)
+        candidates: list[list[npt.NDArray[np.int64]]] = [[] for _ in range(len(signatures))]
+        for band in range(self.bands):
+            sorted_keys = self._band_keys[band]
+            low = np.searchsorted(sorted_keys, keys[:, band], side="left")
+            high = np.searchsorted(sorted_keys, keys[:, band], side="right")
+            for hit in np.flatnonzero(high > low):
+                stop = min(int(high[hit]), int(low[hit]) + MAX_BUCKET_CANDIDATES)
+                candidates[hit].append(self._band_ids[band, low[hit] : stop])
+
+        ids = np.full(len(signatures), -1, dtype=np.int64)
+        similarities = np.zeros(len(signatures), dtype=np.float64)
+        for query, found in enumerate(candidates):
+            if not found:
+                continue
+            unique = np.unique(np.concatenate(found))
+            estimates = (self._signatures[unique] == signatures[query]).mean(axis=1)
+            best = int(np.argmax(estimates))
+            if estimates[best] >= threshold:
+                ids[query] = unique[best]
+                similarities[query] = estimates[best]
+        return ids, similarities
+
+
+def find_reference_duplicates(
+    dataset: Dataset,
+    index: ReferenceIndex,
+    method: DedupMethod = DedupMethod.MINHASH,
+    cache: ResultCache | None = None,
+) -> ReferenceDedupResult:
+    """Find samples of `dataset` that duplicate a sample of a reference index.
+
+    Exact matches come from the content hash set. With the MinHash method,
+    the remaining samples are also looked up in the LSH bands.
+
+    Args:
+        dataset: Dataset to check.
+        index: Opened reference index.
+        method: ``EXACT`` or ``MINHASH``.
+        cache: Optional ResultCache for signatures.
+
+    Returns:
+        ReferenceDedupResult with one match per duplicated sample, naming
+        the reference dataset and sample it hits.
+    """
+    samples = dataset.sample_count
+    with span("reference_dedup", samples):
+        exact = index.exact_ids(content_keys(dataset.samples))
+        reference_ids = exact.copy()
+        similarities = np.where(exact >= 0, 1.0, 0.0)
+        if method is DedupMethod.MINHASH:
+            unmatched = np.flatnonzero(exact < 0)
+            if len(unmatched):
+                subset = Dataset(
+                    samples=[dataset.samples[i] for i in unmatched], format=dataset.format
+                )
+                signatures = np.asarray(
+                    minhash_signatures(subset, index.num_perm, cache), dtype=np.uint32
+                )
+                near, near_similarity = index.near_ids(signatures)
+                reference_ids[unmatched] = near
+                similarities[unmatched] = near_similarity
+
+        matches: list[ReferenceMatch] = []
+        for position in np.flatnonzero(reference_ids >= 0):
+            path, reference_index = index.source_of(int(reference_ids[position]))
+            matches.append(
+                ReferenceMatch(
+                    sample_index=dataset.samples[position].index,
+                    reference_path=path,
+                    reference_index=reference_index,
+                    similarity=round(float(similarities[position]), 4),
+                    method=DedupMethod.EXACT if exact[position] >= 0 else DedupMethod.MINHASH,
+                )
+            )
+    return ReferenceDedupResult(
+        index_path=str(index.directory), sample_count=samples, matches=matches
+    )
@@ -0,0 +1,290 @@
+"""Corpus-wide repeated token spans, found with a disk-backed suffix array.
+
+Exact and MinHash dedup compare whole samples, so a boilerplate paragraph
+pasted into many otherwise different responses goes unnoticed. Here the
+corpus is tokenized into one token stream on disk and the suffixes
+starting at every position are sorted by their first `min_tokens` tokens:
+a suffix array truncated to the depth the search needs. Each suffix is
+keyed by a 64-bit rolling hash of that prefix; the (hash, position) pairs
+are sorted in memory-sized chunks and merged on disk (see
+ftdata.dedup.external), so equal prefixes come out adjacent.
+
+Windows that occur more than `max_occurrences` times are then chained
+into maximal spans: a window extends the previous one when its
+occurrences are exactly the previous window's, shifted by one token.
+Spans never cross sample boundaries.
+"""
+
+from __future__ import annotations
+
+import itertools
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from ftdata.core.loader import iter_samples
+from ftdata.core.models import DatasetFormat, RepeatedSpan, RepeatedSpanResult, Sample
+from ftdata.dedup.external import (
+    DEFAULT_MEMORY_BYTES,
+    MIN_RUN_PAIRS,
+    PAIR,
+    SortedRun,
+    duplicate_groups,
+    merge_block_pairs,
+    merge_runs,
+    write_run,
+)
+from ftdata.exceptions import EmptyDatasetError
+from ftdata.profiling.tokens import DEFAULT_ENCODING, get_encoding
+from ftdata.timing import span
+
+DEFAULT_MIN_TOKENS = 50
+DEFAULT_MAX_OCCURRENCES = 10
+# Samples per tiktoken batch call.
+_TOKENIZE_BATCH = 1024
+# Fixed so that runs over the same corpus hash identically.
+_HASH_SEED = 0x5EED
+_HASH_BASE = 0x9E3779B97F4A7C15
+_U64 = 1 << 64
+
+
+def _sample_text(sample: Sample) -> str:
+    return "\n".join(m.content for m in sample.messages)
+
+
+def _write_token_stream(
+    samples: Iterator[Sample], encoding_name: str, path: Path
+) -> npt.NDArray[np.int64]:
+    """Append every sample's tokens to `path` (uint32); returns sample offsets.
+
+    Sample ``i`` covers tokens ``offsets[i]:offsets[i + 1]``.
+    """
+    encoding = get_encoding(encoding_name)
+    lengths: list[npt.NDArray[np.int64]] = []
+    with open(path, "wb") as f:
+        while batch := list(itertools.islice(samples, _TOKENIZE_BATCH)):
+            encoded = encoding.encode_ordinary_batch([_sample_text(s) for s in batch])
+            sizes = np.array([len(ids) for ids in encoded], dtype=np.int64)
+            tokens = np.fromiter(
+                itertools.chain.from_iterable(encoded), dtype=np.uint32, count=int(sizes.sum())
+            )
+            tokens.tofile(f)
+            lengths.append(sizes)
+    offsets = np.zeros(sum(len(s) for s in lengths) + 1, dtype=np.int64)
+    if lengths:
+        np.cumsum(np.concatenate(lengths), out=offsets[1:])
+    return offsets
+
+
+def window_hashes(
+    tokens: npt.NDArray[np.uint32], width: int, table: npt.NDArray[np.uint64]
+) -> npt.NDArray[np.uint64]:
+    """Rolling hash of every `width`-token window of `tokens`.
+
+    Tokens are mapped through the random `table` and combined as a
+    polynomial modulo 2**64. Windows of length 2**k are built by doubling
+    and concatenated along the binary digits of `width`, so the cost is
+    O(len(tokens) * log(width)) rather than O(len(tokens) * width).
+
+    Returns:
+        ``len(tokens) - width + 1`` hashes; entry ``i`` covers
+        ``tokens[i:i + width]``.
+    """
+    count = len(tokens) - width + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    level, size = table[tokens], 1
+    result: npt.NDArray[np.uint64] | None = None
+    covered = 0
+    remaining = width
+    while True:
+        if remaining & 1:
+            block = level[covered : covered + count]
+            if result is None:
+                result = block.copy()
+            else:
+                result = result * np.uint64(pow(_HASH_BASE, size, _U64)) + block
+            covered += size
+        remaining >>= 1
+        if not remaining:
+            break
+        level = level[:-size] * np.uint64(pow(_HASH_BASE, size, _U64)) + level[size:]
+        size *= 2
+    assert result is not None
+    return result
+
+
+def _spill_window_runs(
+    tokens: npt.NDArray[np.uint32],
+    offsets: npt.NDArray[np.int64],
+    width: int,
+    table: npt.NDArray[np.uint64],
+    directory: Path,
+    chunk: int,
+) -> list[SortedRun]:
+    """Sorted (window hash, position) runs for every window inside one sample."""
+    runs: list[SortedRun] = []
+    for start in range(0, len(tokens), chunk):
+        stop = min(start + chunk, len(tokens))
+        hashes = window_hashes(tokens[start : stop + width - 1], width, table)[: stop - start]
+        positions = np.arange(start, start + len(hashes), dtype=np.int64)
+        sample_ends = offsets[np.searchsorted(offsets, positions, "right")]
+        inside = positions + width <= sample_ends
+        if inside.any():
+            path = directory / f"run-{len(runs):06d}.bin"
+            runs.append(write_run(path, hashes[inside], positions[inside]))
+    return runs
+
+
+def _span_chains(
+    groups: npt.NDArray[np.int64], counts: npt.NDArray[np.int64], chunk: int
+) -> npt.NDArray[np.int64]:
+    """Next window of each repeated window's span (0 where the span ends).
+
+    Window group ``g`` continues into ``h`` when every occurrence of ``g``
+    is followed, one token later, by an occurrence of ``h`` and both occur
+    equally often: the occurrences of ``h`` are then exactly those of
+    ``g`` shifted by one.
+    """
+    successor = np.zeros(len(counts), dtype=np.int64)
+    conflict = np.zeros(len(counts), dtype=bool)
+    followed = np.zeros(len(counts), dtype=np.int64)
+    for start in range(0, len(groups), chunk):
+        window = np.asarray(groups[start : start + chunk + 1])
+        current, following = window[:-1], window[1:]
+        both = (current > 0) & (following > 0)
+        current, following = current[both], following[both]
+        followed += np.bincount(current, minlength=len(counts))
+        unset = successor[current] == 0
+        successor[current[unset]] = following[unset]
+        conflict[current[successor[current] != following]] = True
+    linked = (successor > 0) & ~conflict & (followed == counts) & (counts[successor] == counts)
+    return np.where(linked, successor, 0)
+
+
+def _head_positions(
+    groups: npt.NDArray[np.int64], is_head: npt.NDArray[np.bool_], chunk: int
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Group ids and positions of every occurrence of a span's first window, by group."""
+    found_groups, found_positions = [], []
+    for start in range(0, len(groups), chunk):
+        window = np.asarray(groups[start : start + chunk])
+        hits = np.flatnonzero(is_head[window])
+        found_groups.append(window[hits])
+        found_positions.append(hits + start)
+    heads = np.concatenate(found_groups) if found_groups else np.empty(0, dtype=np.int64)
+    positions = np.concatenate(found_positions) if found_positions else heads
+    order = np.lexsort((positions, heads))
+    return heads[order], positions[order]
+
+
+def find_repeated_spans(
+    path: Path,
+    min_tokens: int = DEFAULT_MIN_TOKENS,
+    max_occurrences: int = DEFAULT_MAX_OCCURRENCES,
+    encoding_name: str = DEFAULT_ENCODING,
+    format: DatasetFormat | None = None,
+    memory_bytes: int = DEFAULT_MEMORY_BYTES,
+    temp_dir: Path | None = None,
+) -> RepeatedSpanResult:
+    """Find token spans of at least `min_tokens` repeated more than `max_occurrences` times.
+
+    Samples are streamed, so the corpus is never held in memory. Disk use
+    in `temp_dir` is about 28 bytes per token (token stream, sorted runs
+    and per-position window groups); memory stays within `memory_bytes`
+    apart from the spans found and their occurrence positions.
+
+    Args:
+        path: Dataset file.
+        min_tokens: Shortest span reported (at least 2).
+        max_occurrences: Spans must occur more often than this.
+        encoding_name: tiktoken encoding used to tokenize message contents.
+        format: Optional explicit format (auto-detected if None).
+        memory_bytes: Budget for sorting and scanning.
+        temp_dir: Directory for the on-disk arrays (default: the system temp dir).
+
+    Returns:
+        RepeatedSpanResult with spans ordered by repeated tokens
+        (occurrences times length), most first.
+
+    Raises:
+        DatasetLoadError: If the file cannot be read or parsed.
+        EmptyDatasetError: If the file holds no samples.
+        ValueError: If `min_tokens` is below 2.
+    """
+    if min_tokens < 2:
+        raise ValueError("min_tokens must be at least 2")
+    chunk = max(memory_bytes // (4 * PAIR.itemsize), MIN_RUN_PAIRS)
+    encoding = get_encoding(encoding_name)
+    table = np.random.default_rng(_HASH_SEED).integers(
+        0, np.iinfo(np.uint64).max, size=encoding.n_vocab, dtype=np.uint64, endpoint=True
+    )
+
+    with (
+        span("substring_dedup") as timed,
+        tempfile.TemporaryDirectory(prefix="ftdata-spans-", dir=temp_dir) as tmp,
+    ):
+        directory = Path(tmp)
+        with span("tokenize"):
+            offsets = _write_token_stream(
+                iter_samples(path, format), encoding_name, directory / "tokens.bin"
+            )
+        sample_count = len(offsets) - 1
+        if not sample_count:
+            raise EmptyDatasetError(str(path))
+        timed.samples = sample_count
+        token_count = int(offsets[-1])
+        result = RepeatedSpanResult(
+            sample_count=sample_count,
+            token_count=token_count,
+            min_tokens=min_tokens,
+            max_occurrences=max_occurrences,
+        )
+        if token_count < min_tokens:
+            return result
+        tokens = np.memmap(directory / "tokens.bin", dtype=np.uint32, mode="r")
+
+        with span("sort", sample_count):
+            runs = _spill_window_runs(tokens, offsets, min_tokens, table, directory, chunk)
+            # Window group (1-based) of each position; 0 where the window is not repeated.
+            groups = np.memmap(
+                directory / "groups.bin", dtype=np.int64, mode="w+", shape=(token_count,)
+            )
+            counts = [0]
+            merged = merge_runs(runs, directory, merge_block_pairs(memory_bytes))
+            for occurrences in duplicate_groups(merged, max_occurrences + 1):
+                groups[occurrences] = len(counts)
+                counts.append(len(occurrences))
+
+        with span("spans", sample_count):
+            group_counts = np.array(counts, dtype=np.int64)
+            following = _span_chains(groups, group_counts, chunk)
+            is_head = np.ones(len(counts), dtype=bool)
+            is_head[0] = False
+            is_head[following[following > 0]] = False
+            heads, positions = _head_positions(groups, is_head, chunk)
+            bounds = np.flatnonzero(np.diff(heads)) + 1
+            firsts = heads[np.r_[0, bounds]].tolist() if len(heads) else []
+            spans = []
+            for head, where in zip(firsts, np.split(positions, bounds), strict=False):
+                length, group = min_tokens, head
+                while following[group]:
+                    group = int(following[group])
+                    length += 1
+                first = int(where[0])
+                samples = np.unique(np.searchsorted(offsets, where, "right") - 1)
+                spans.append(
+                    RepeatedSpan(
+                        text=encoding.decode(tokens[first : first + length].tolist()),
+                        token_count=length,
+                        occurrences=len(where),
+                        sample_indices=samples.tolist(),
+                    )
+                )
+        del tokens, groups
+    spans.sort(key=lambda s: (-s.occurrences * s.token_count, s.sample_indices[0]))
+    result.spans = spans
+    return result
@@ -0,0 +1,145 @@
+"""Mergeable streaming sketches of prompt diversity.
+
+A PromptSketch consumes prompts one at a time in bounded memory:
+
+- a HyperLogLog++ counter estimates the number of distinct prompts;
+- a Misra-Gries heavy-hitters summary tracks the most frequent prompt
+  templates (prompts normalized to their leading words);
+- a bottom-k sample of distinct prompts, chosen by hash, is kept for
+  MinHash-based similarity estimation.
+
+All three are mergeable with the same error bounds as a single pass, so
+shards can be sketched independently and combined with PromptSketch.merge.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import re
+from collections.abc import Iterable
+
+import numpy as np
+
+from ftdata.core.models import PromptDiversity, Sample
+from ftdata.dedup.minhash import word_shingles
+
+HLL_PRECISION = 14
+# Misra-Gries counters; any template above 1/(TEMPLATE_COUNTERS + 1) of
+# the stream is guaranteed to be tracked.
+TEMPLATE_COUNTERS = 64
+TEMPLATE_WORDS = 8
+TOP_REPORTED_TEMPLATES = 5
+# Distinct prompts sampled for pairwise MinHash similarity.
+SIMILARITY_SAMPLE = 128
+SIMILARITY_CHARS = 2000
+NUM_PERM = 64
+
+_DIGITS = re.compile(r"\d+")
+_TEMPLATE_END = re.compile(r"[:\n]")
+
+
+def prompt_text(sample: Sample) -> str:
+    """The prompt of a sample: its user turns joined by newlines."""
+    return "\n".join(m.content for m in sample.messages if m.role == "user")
+
+
+def template_key(prompt: str) -> str:
+    """Normalize a prompt to its template.
+
+    The template is the prompt's leading words (up to the first colon or
+    line break, at most TEMPLATE_WORDS), lowercased with digit runs
+    collapsed, so "Translate into French: <text>" maps to one key.
+    """
+    head = _TEMPLATE_END.split(prompt, maxsplit=1)[0]
+    return " ".join(_DIGITS.sub("0", head.lower()).split()[:TEMPLATE_WORDS])
+
+
+def _hash64(digest: bytes) -> int:
+    return int.from_bytes(digest[:8], "little")
+
+
+class PromptSketch:
+    """Bounded-memory, mergeable summary of a stream of prompts."""
+
+    def __init__(self) -> None:
+        from datasketch import HyperLogLogPlusPlus
+
+        self.count = 0
+        self._hll = HyperLogLogPlusPlus(p=HLL_PRECISION, hashfunc=_hash64)
+        self._templates: dict[str, int] = {}
+        # Max-heap (negated priorities) of the SIMILARITY_SAMPLE smallest hashes.
+        self._heap: list[int] = []
+        self._sample: dict[int, str] = {}
+
+    def add(self, prompt: str) -> None:
+        """Add one prompt to the sketch."""
+        self.count += 1
+        digest = hashlib.blake2b(prompt.encode(), digest_size=8).digest()
+        self._hll.update(digest)
+        self._offer(_hash64(digest), prompt[:SIMILARITY_CHARS])
+
+        key = template_key(prompt)
+        if key in self._templates:
+            self._templates[key] += 1
+        elif len(self._templates) < TEMPLATE_COUNTERS:
+            self._templates[key] = 1
+        else:
+            self._templates = {k: c - 1 for k, c in self._templates.items() if c > 1}
+
+    def _offer(self, priority: int, text: str) -> None:
+        if priority in self._sample:
+            return
+        if len(self._heap) < SIMILARITY_SAMPLE:
+            heapq.heappush(self._heap, -priority)
+        elif priority < -self._heap[0]:
+            del self._sample[-heapq.heapreplace(self._heap, -priority)]
+        else:
+            return
+        self._sample[priority] = text
+
+    def merge(self, other: PromptSketch) -> None:
+        """Fold another sketch (e.g. from a different shard) into this one."""
+        self.count += other.count
+        self._hll.merge(other._hll)
+        for priority, text in other._sample.items():
+            self._offer(priority, text)
+
+        merged = dict(self._templates)
+        for key, count in other._templates.items():
+            merged[key] = merged.get(key, 0) + count
+        if len(merged) > TEMPLATE_COUNTERS:
+            cutoff = sorted(merged.values(), reverse=True)[TEMPLATE_COUNTERS]
+            merged = {k: c - cutoff for k, c in merged.items() if c > cutoff}
+        self._templates = merged
+
+    def mean_similarity(self) -> float:
+        """Mean pairwise MinHash Jaccard estimate over the sampled prompts."""
+        from datasketch import MinHash
+
+        texts = list(self._sample.values())
+        if len(texts) < 2:
+            return 0.0
+        signatures = MinHash.bulk([word_shingles(t) for t in texts], num_perm=NUM_PERM)
+        values = np.stack([m.hashvalues for m in signatures])
+        agreement = (values[:, None, :] == values[None, :, :]).mean(axis=2)
+        pairs = np.triu_indices(len(texts), k=1)
+        return float(agreement[pairs].mean())
+
+    def summary(self) -> PromptDiversity:
+        """Estimate diversity statistics from the sketch."""
+        top = sorted(self._templates.items(), key=lambda kv: (-kv[1], kv[0]))
+        return PromptDiversity(
+            sample_count=self.count,
+            distinct_prompts=min(self.count, round(self._hll.count())),
+            top_templates=dict(top[:TOP_REPORTED_TEMPLATES]),
+            mean_similarity=round(self.mean_similarity(), 4),
+        )
+
+
+def sketch_prompts(samples: Iterable[Sample]) -> PromptSketch:
+    """Build a PromptSketch over the prompts of `samples` in one pass."""
+    sketch = PromptSketch()
+    for sample in samples:
+        sketch.add(prompt_text(sample))
+    return sketch
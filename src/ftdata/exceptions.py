@@ -1,5 +1,7 @@
 """Custom exception hierarchy for ftdata."""
 
+from __future__ import annotations
+
 
 class FtdataError(Exception):
     """Base exception for all ftdata errors."""
@@ -13,6 +15,10 @@ class DatasetLoadError(FtdataError):
         self.reason = reason
         super().__init__(f"Failed to load {path}: {reason}")
 
+    def __reduce__(self) -> tuple[type[DatasetLoadError], tuple[str, str]]:
+        # Raised inside worker processes too, so it must survive pickling.
+        return type(self), (self.path, self.reason)
+
 
 class FormatDetectionError(FtdataError):
     """Cannot auto-detect dataset format."""
@@ -54,6 +60,41 @@ class LLMUnavailableError(FtdataError):
         super().__init__("LLM judge features require the [llm] extra: pip install ftdata[llm]")
 
 
+class JudgeRequestError(FtdataError):
+    """An LLM judge request failed with a non-retryable error."""
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+        super().__init__(f"LLM judge request failed: {reason}")
+
+
+class ServerRunningError(FtdataError):
+    """An ftdata server is already listening on the socket."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        super().__init__(f"ftdata server already running on {path}")
+
+
+class ServerLostError(FtdataError):
+    """The server stopped answering after a command was sent to it."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        super().__init__(
+            f"ftdata server on {path} closed the connection before the command finished"
+        )
+
+
+class OutputWriteError(FtdataError):
+    """Failed to write an output file."""
+
+    def __init__(self, path: str, reason: str) -> None:
+        self.path = path
+        self.reason = reason
+        super().__init__(f"Cannot write {path}: {reason}")
+
+
 class BenchmarkNotFoundError(FtdataError):
     """Unknown benchmark name."""
 
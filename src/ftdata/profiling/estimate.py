@@ -0,0 +1,382 @@
+"""Approximate profiling of a large JSONL file from a random sample of records.
+
+Records are drawn by seeking to uniformly random byte offsets and taking
+the line that contains each offset, so only the sampled lines are read.
+That picks a line with probability proportional to its length in bytes;
+every statistic is therefore weighted by ``1 / length`` (self-normalized
+importance sampling), which makes it an estimate over records rather than
+over bytes. The same weights estimate the number of records in the file.
+Confidence intervals come from a bootstrap over the sampled records.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ftdata.cache import ResultCache
+from ftdata.core.compression import compression_of
+from ftdata.core.formats import build_samples
+from ftdata.core.loader import FIELD_PARSERS, decode_json, is_json_array, record_format
+from ftdata.core.models import (
+    Dataset,
+    DatasetFormat,
+    IntervalEstimate,
+    LanguageProfile,
+    LengthProfile,
+    ProfileResult,
+    Sample,
+    SampleEstimate,
+    TokenStats,
+    TurnProfile,
+)
+from ftdata.exceptions import (
+    DatasetLoadError,
+    EmptyDatasetError,
+    FormatDetectionError,
+    UnsupportedFormatError,
+)
+from ftdata.profiling.language import sample_languages
+from ftdata.profiling.tokens import DEFAULT_ENCODING, tokenize_samples
+from ftdata.timing import span
+
+DEFAULT_CONFIDENCE = 0.95
+BOOTSTRAP_ROUNDS = 200
+# Records drawn, parsed and tokenized per step; the time budget is checked
+# between steps.
+SAMPLE_BATCH = 64
+# Sample size when only a time budget is given.
+MAX_SAMPLES = 100_000
+# Bytes read per seek while looking for the boundaries of a line.
+_SCAN_BYTES = 64 * 1024
+# Random offsets tried per sampled record before giving up (blank lines
+# are redrawn).
+_MAX_DRAWS_PER_SAMPLE = 100
+
+
+class LineSampler:
+    """Draws random newline-delimited lines from a file by seeking.
+
+    A line's chance of being drawn is proportional to its length in bytes
+    (including its newline); blank lines are redrawn.
+    """
+
+    def __init__(self, path: Path, seed: int = 0) -> None:
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.draws = 0
+        self.accepted = 0
+        self._rng = random.Random(seed)
+        self._file = open(path, "rb")  # noqa: SIM115 - closed by close()
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
+
+    def _line_start(self, offset: int) -> int:
+        start = offset
+        while start > 0:
+            low = max(0, start - _SCAN_BYTES)
+            self._file.seek(low)
+            newline = self._file.read(start - low).rfind(b"\n")
+            if newline >= 0:
+                return low + newline + 1
+            start = low
+        return 0
+
+    def _line_from(self, start: int) -> bytes:
+        self._file.seek(start)
+        parts: list[bytes] = []
+        while chunk := self._file.read(_SCAN_BYTES):
+            newline = chunk.find(b"\n")
+            if newline >= 0:
+                parts.append(chunk[: newline + 1])
+                break
+            parts.append(chunk)
+        return b"".join(parts)
+
+    def draw(self) -> tuple[int, bytes] | None:
+        """Draw one non-blank line as ``(start offset, bytes including newline)``.
+
+        Returns None if none was found within a bounded number of tries
+        (the file is empty or nearly all blank).
+        """
+        for _ in range(_MAX_DRAWS_PER_SAMPLE):
+            if not self.size:
+                return None
+            self.draws += 1
+            start = self._line_start(self._rng.randrange(self.size))
+            line = self._line_from(start)
+            if line.strip():
+                self.accepted += 1
+                return start, line
+        return None
+
+
+@dataclass
+class _Draws:
+    samples: list[Sample] = field(default_factory=list)
+    lengths: list[int] = field(default_factory=list)
+    prompt: list[int] = field(default_factory=list)
+    response: list[int] = field(default_factory=list)
+
+
+_Array = npt.NDArray[np.float64]
+_QUANTILES = {"median": 0.5, "p95": 0.95, "p99": 0.99}
+
+
+def _quantile_sorted(values: _Array, weights: _Array, q: float) -> float:
+    """Weighted quantile of `values`, which must already be sorted."""
+    cumulative = np.cumsum(weights)
+    position = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+    return float(values[min(position, len(values) - 1)])
+
+
+def _mean(values: _Array, weights: _Array) -> float:
+    return float(np.dot(values, weights) / weights.sum())
+
+
+class _Estimator:
+    """Weighted statistics of the sample and their bootstrap intervals.
+
+    Each record is weighted by ``1 / line bytes``. With ``scale`` the
+    non-blank bytes of the file, ``scale * mean(weight)`` estimates the
+    number of records. A bootstrap round reweights every record by how
+    often it was redrawn, so no round has to copy or re-sort the sample;
+    every metric sees the same rounds.
+    """
+
+    def __init__(self, weights: _Array, scale: float, confidence: float, seed: int) -> None:
+        self.weights = weights
+        self.scale = scale
+        self.tail = (1 - confidence) / 2
+        self.seed = seed
+        self.intervals: dict[str, IntervalEstimate] = {}
+
+    def _rounds(self, order: npt.NDArray[np.intp] | None = None) -> Iterator[_Array]:
+        """Per-round record weights (in `order`, if given)."""
+        rng = np.random.default_rng(self.seed)
+        n = len(self.weights)
+        for _ in range(BOOTSTRAP_ROUNDS):
+            weights = self.weights * np.bincount(rng.integers(0, n, size=n), minlength=n)
+            yield weights if order is None else weights[order]
+
+    def _interval(self, name: str, value: float, replicates: list[float]) -> None:
+        low, high = np.quantile(replicates, [self.tail, 1 - self.tail])
+        self.intervals[name] = IntervalEstimate(
+            value=round(value, 3), low=round(float(low), 3), high=round(float(high), 3)
+        )
+
+    def _count(self, weights: _Array) -> float:
+        # Resampled weights keep the sample size, so their sum / n is the round's mean.
+        return self.scale * float(weights.sum()) / len(weights)
+
+    def record_count(self) -> float:
+        """Estimated number of records in the file."""
+        value = self._count(self.weights)
+        self._interval("samples", value, [self._count(w) for w in self._rounds()])
+        return value
+
+    def distribution(
+        self, name: str, raw: list[int], quantiles: dict[str, float], total: bool = False
+    ) -> dict[str, float]:
+        """Weighted mean and quantiles of `raw`, each with its interval.
+
+        With `total`, also estimates the sum over all records as ``name``.
+        """
+        values = np.asarray(raw, dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        ordered = values[order]
+        point = {"mean": _mean(values, self.weights)}
+        for key, q in quantiles.items():
+            point[key] = _quantile_sorted(ordered, self.weights[order], q)
+        if total:
+            point["total"] = self._count(self.weights) * point["mean"]
+        replicates: dict[str, list[float]] = {key: [] for key in point}
+        for weights in self._rounds(order):
+            mean = _mean(ordered, weights)
+            replicates["mean"].append(mean)
+            for key, q in quantiles.items():
+                replicates[key].append(_quantile_sorted(ordered, weights, q))
+            if total:
+                replicates["total"].append(self._count(weights) * mean)
+        for key, value in point.items():
+            self._interval(name if key == "total" else f"{name}.{key}", value, replicates[key])
+        point["min"], point["max"] = float(ordered[0]), float(ordered[-1])
+        return point
+
+    def token_stats(self, name: str, raw: list[int]) -> TokenStats:
+        """TokenStats of `raw`; for total_tokens also the interval of the dataset total."""
+        point = self.distribution(name, raw, _QUANTILES, total=name == "total_tokens")
+        return TokenStats(
+            min=int(point["min"]),
+            max=int(point["max"]),
+            mean=point["mean"],
+            median=point["median"],
+            p95=point["p95"],
+            p99=point["p99"],
+            total=round(self._count(self.weights) * point["mean"]),
+        )
+
+    def shares(self, labels: list[str]) -> dict[str, float]:
+        """Estimated percentage of records per label."""
+        array = np.asarray(labels)
+        hits = {label: (array == label).astype(np.float64) for label in sorted(set(labels))}
+        result = {label: 100.0 * _mean(h, self.weights) for label, h in hits.items()}
+        replicates: dict[str, list[float]] = {label: [] for label in hits}
+        for weights in self._rounds():
+            for label, h in hits.items():
+                replicates[label].append(100.0 * _mean(h, weights))
+        for label, share in result.items():
+            self._interval(f"language.{label}", share, replicates[label])
+        return result
+
+
+def _parse(
+    lines: list[tuple[int, bytes]], fmt: DatasetFormat | None, path: Path, first_index: int
+) -> tuple[list[Sample], DatasetFormat]:
+    fields: list[dict[str, Any]] = []
+    for offset, line in lines:
+        try:
+            record = decode_json(line.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise DatasetLoadError(str(path), f"invalid JSON at byte {offset}") from e
+        if not isinstance(record, dict):
+            raise DatasetLoadError(str(path), f"record at byte {offset} is not a JSON object")
+        if fmt is None:
+            fmt = record_format(record)
+            if fmt is None:
+                raise FormatDetectionError(str(path))
+        parser = FIELD_PARSERS.get(fmt)
+        if parser is None:
+            raise UnsupportedFormatError(fmt.value)
+        fields.append(parser(record, first_index + len(fields)))
+    return build_samples(fields), fmt or DatasetFormat.CHATML
+
+
+def estimate_profile(
+    path: Path,
+    sample_size: int | None = None,
+    time_budget: float | None = None,
+    format: DatasetFormat | None = None,
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+    seed: int = 0,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> tuple[ProfileResult, SampleEstimate, DatasetFormat]:
+    """Estimate token, turn and language statistics from randomly sampled records.
+
+    Sampling stops after `sample_size` records or once `time_budget`
+    seconds have passed, whichever comes first (at least one batch is
+    always drawn). Records are drawn with replacement. ``min`` and ``max``
+    are the extremes of the sample, so they bound the true values from the
+    inside.
+
+    Args:
+        path: Uncompressed JSONL file.
+        sample_size: Records to sample (default MAX_SAMPLES).
+        time_budget: Seconds to spend sampling, parsing and tokenizing.
+        format: Optional explicit format (detected from the first sampled
+            record if None).
+        encoding_name: tiktoken encoding name.
+        cache: Optional ResultCache for token counts and languages.
+        seed: Random seed for offsets and bootstrap.
+        confidence: Confidence level of the reported intervals.
+
+    Returns:
+        ``(profile, estimate, format)``: the estimated ProfileResult, the
+        SampleEstimate with confidence intervals, and the record format.
+
+    Raises:
+        DatasetLoadError: If the file is compressed, a JSON array, or a
+            sampled record is not valid JSON.
+        EmptyDatasetError: If the file has no records.
+    """
+    if compression_of(path) is not None:
+        raise DatasetLoadError(str(path), "sampling needs an uncompressed JSONL file")
+    with open(path, encoding="utf-8", errors="replace") as f:
+        if is_json_array(f.read(64)):
+            raise DatasetLoadError(str(path), "sampling needs a JSONL file (one record per line)")
+
+    started = time.perf_counter()
+    target = sample_size or MAX_SAMPLES
+    deadline = None if time_budget is None else started + time_budget
+    draws = _Draws()
+    sampler = LineSampler(path, seed)
+    fmt = format
+    try:
+        with span("sample", 0) as timed:
+            while len(draws.samples) < target:
+                lines = []
+                for _ in range(min(SAMPLE_BATCH, target - len(draws.samples))):
+                    line = sampler.draw()
+                    if line is None:
+                        break
+                    lines.append(line)
+                if not lines:
+                    break
+                samples, fmt = _parse(lines, fmt, path, len(draws.samples))
+                batch = Dataset(samples=samples, format=fmt)
+                for prompt, response, _ in tokenize_samples(batch, encoding_name, cache):
+                    draws.prompt.append(prompt)
+                    draws.response.append(response)
+                draws.samples.extend(samples)
+                draws.lengths.extend(len(line) for _, line in lines)
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+            timed.samples = len(draws.samples)
+    finally:
+        sampler.close()
+    if not draws.samples:
+        raise EmptyDatasetError(str(path))
+
+    weights = 1.0 / np.asarray(draws.lengths, dtype=np.float64)
+    scale = sampler.size * sampler.accepted / max(sampler.draws, 1)
+    estimator = _Estimator(weights, scale, confidence, seed)
+    count = estimator.record_count()
+    total = [p + r for p, r in zip(draws.prompt, draws.response, strict=True)]
+    length = LengthProfile(
+        prompt_tokens=estimator.token_stats("prompt_tokens", draws.prompt),
+        response_tokens=estimator.token_stats("response_tokens", draws.response),
+        total_tokens=estimator.token_stats("total_tokens", total),
+    )
+    turn_counts = [s.turn_count for s in draws.samples]
+    turns = estimator.distribution("turns", turn_counts, {"median": 0.5})
+    shares = estimator.shares([labels[0] for labels in sample_languages(draws.samples, cache)])
+    primary, primary_share = max(shares.items(), key=lambda kv: kv[1])
+    profile = ProfileResult(
+        length=length,
+        turns=TurnProfile(
+            min=int(turns["min"]),
+            max=int(turns["max"]),
+            mean=turns["mean"],
+            median=turns["median"],
+        ),
+        language=LanguageProfile(
+            languages={
+                language: round(count * share / 100)
+                for language, share in sorted(shares.items(), key=lambda kv: -kv[1])
+            },
+            primary_language=primary,
+            primary_percentage=round(primary_share, 2),
+        ),
+        sample_count=round(count),
+        total_tokens=length.total_tokens.total,
+    )
+    estimate = SampleEstimate(
+        sampled=len(draws.samples),
+        file_bytes=sampler.size,
+        confidence=confidence,
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+        intervals=estimator.intervals,
+    )
+    return profile, estimate, fmt or DatasetFormat.CHATML
@@ -1,17 +1,269 @@
-"""Language detection per sample."""
+"""Language detection per sample.
+
+Identification is lightweight and has no extra dependencies: text in a
+distinctive script (Cyrillic, Arabic, CJK, ...) is identified from a
+histogram of its Unicode scripts; Latin-script text is matched against
+small stopword lists for the most common fine-tuning languages. ASCII
+text skips the script histogram entirely.
+
+Datasets are detected in batches: only the first DETECT_CHARS characters
+of each text are examined, results are cached per sample content hash,
+and large batches are spread over a process pool. Each sample gets three
+labels (whole sample, prompt, response); profiling uses the first and
+the FT008 language-mismatch check the other two, so one detection pass
+serves both.
+"""
 
 from __future__ import annotations
 
-from ftdata.core.models import Dataset, LanguageProfile
+import os
+import re
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ftdata.cache import ResultCache, map_cached
+from ftdata.core.models import Dataset, LanguageProfile, Sample
+from ftdata.profiling.tokens import RESPONSE_ROLE
+from ftdata.timing import span
+
+UNKNOWN_LANGUAGE = "unknown"
+
+# (first code point, last code point, language) for scripts that identify
+# a language on their own. Checked in order.
+SCRIPT_RANGES: tuple[tuple[int, int, str], ...] = (
+    (0x0400, 0x04FF, "ru"),
+    (0x0370, 0x03FF, "el"),
+    (0x0590, 0x05FF, "he"),
+    (0x0600, 0x06FF, "ar"),
+    (0x0900, 0x097F, "hi"),
+    (0x0E00, 0x0E7F, "th"),
+    (0x3040, 0x30FF, "ja"),
+    (0xAC00, 0xD7AF, "ko"),
+    (0x4E00, 0x9FFF, "zh"),
+)
+
+_STOPWORD_LISTS = {
+    "en": "the and is are of to in that it for with was this you not be on",
+    "es": "el la los las de que y en un una es por para con no se del",
+    "fr": "le la les de des et est un une que pour dans pas sur du avec",
+    "de": "der die das und ist nicht ein eine zu den mit von sich auf ich",
+    "it": "il la di che e un una per non sono con del della gli le",
+    "pt": "o a os as de que e um uma para com não do da em é",
+    "nl": "de het een en van is dat niet op te zijn met voor ik",
+}
+STOPWORDS = {language: frozenset(words.split()) for language, words in _STOPWORD_LISTS.items()}
+
+# Minimum stopword hits before a Latin-script language is reported.
+MIN_STOPWORD_HITS = 2
+
+_WORD = re.compile(r"[^\W\d_]+")
+# Splitting ASCII text on non-letters gives the same words as _WORD, faster.
+_ASCII_NON_LETTERS = {code: " " for code in range(128) if not chr(code).isalpha()}
+
+
+# Characters of each text examined; the start of a text identifies its
+# language as well as the whole of it.
+DETECT_CHARS = 1024
+
+# Combined characters of a batch below which detection runs inline rather
+# than in a process pool, and texts per pool task.
+PARALLEL_MIN_CHARS = 4 * 1024 * 1024
+_BATCH_TEXTS = 2048
+
+# Word -> languages whose stopword list contains it.
+_STOPWORD_INDEX: dict[str, tuple[str, ...]] = {}
+for _language, _words in STOPWORDS.items():
+    for _word in _words:
+        _STOPWORD_INDEX[_word] = (*_STOPWORD_INDEX.get(_word, ()), _language)
+
+# Sorted [first, last + 1) boundaries of SCRIPT_RANGES: a code point falls
+# in range i when searchsorted(..., side="right") returns 2 * i + 1.
+_SCRIPT_EDGES = np.array(
+    sorted(edge for first, last, _ in SCRIPT_RANGES for edge in (first, last + 1)),
+    dtype=np.uint32,
+)
+_EDGE_LANGUAGES = [
+    language for _, language in sorted((first, language) for first, _, language in SCRIPT_RANGES)
+]
+_LATIN_LETTER = re.compile(r"[A-Za-z\u00aa\u00b5\u00ba\u00c0-\u00d6\u00d8-\u00f6\u00f8-\u024f]")
+
+# [sample language, prompt language, response language]
+SampleLanguages = list[str]
+
+
+def _script_language(text: str) -> str | None:
+    if text.isascii():
+        return None
+    codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    bins = np.bincount(
+        np.searchsorted(_SCRIPT_EDGES, codes, side="right"), minlength=len(_SCRIPT_EDGES) + 1
+    )
+    counts = {
+        language: int(count)
+        for language, count in zip(_EDGE_LANGUAGES, bins[1::2].tolist(), strict=False)
+        if count
+    }
+    if not counts:
+        return None
+    # Ties go to the script listed first in SCRIPT_RANGES.
+    order = {language: i for i, (_, _, language) in enumerate(SCRIPT_RANGES)}
+    language, count = max(counts.items(), key=lambda kv: (kv[1], -order[kv[0]]))
+    if count < len(_LATIN_LETTER.findall(text)):
+        return None
+    # Kanji are shared with Chinese; any kana means Japanese.
+    if language == "zh" and counts.get("ja"):
+        return "ja"
+    return language
+
+
+def _stopword_language(text: str) -> str:
+    hits = dict.fromkeys(STOPWORDS, 0)
+    lowered = text.lower()
+    words = Counter(
+        lowered.translate(_ASCII_NON_LETTERS).split()
+        if lowered.isascii()
+        else _WORD.findall(lowered)
+    )
+    for word in words.keys() & _STOPWORD_INDEX.keys():
+        for language in _STOPWORD_INDEX[word]:
+            hits[language] += words[word]
+    language, count = max(hits.items(), key=lambda kv: kv[1])
+    return language if count >= MIN_STOPWORD_HITS else UNKNOWN_LANGUAGE
+
+
+def detect_language(text: str) -> str:
+    """Best-effort ISO 639-1 code for `text`, or "unknown".
+
+    Args:
+        text: Text to identify.
+
+    Returns:
+        Language code such as "en" or "zh", or UNKNOWN_LANGUAGE.
+    """
+    return _script_language(text) or _stopword_language(text)
+
+
+def _texts(sample: Sample) -> tuple[str, str, str]:
+    """Truncated (whole sample, prompt, response) texts of a sample."""
+    prompt: list[str] = []
+    response: list[str] = []
+    for message in sample.messages:
+        (response if message.role == RESPONSE_ROLE else prompt).append(message.content)
+    combined = "\n".join(m.content for m in sample.messages)
+    return (
+        combined[:DETECT_CHARS],
+        "\n".join(prompt)[:DETECT_CHARS],
+        "\n".join(response)[:DETECT_CHARS],
+    )
+
+
+def _detect_batch(batch: list[tuple[str, str, str]]) -> list[SampleLanguages]:
+    # Texts repeated within the batch (e.g. a long shared system prompt that
+    # fills the whole DETECT_CHARS prefix) are identified once.
+    detected: dict[str, str] = {}
+
+    def detect(text: str) -> str:
+        if not text:
+            return UNKNOWN_LANGUAGE
+        language = detected.get(text)
+        if language is None:
+            language = detected[text] = detect_language(text)
+        return language
+
+    results: list[SampleLanguages] = []
+    for combined, prompt, response in batch:
+        prompt_language = detect(prompt)
+        response_language = detect(response)
+        if prompt_language == response_language != UNKNOWN_LANGUAGE:
+            language = prompt_language
+        else:
+            language = detect(combined)
+        results.append([language, prompt_language, response_language])
+    return results
+
+
+def _batches(items: list[tuple[str, str, str]], size: int) -> Iterator[list[tuple[str, str, str]]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _detect_samples(samples: Sequence[Sample], workers: int | None) -> list[SampleLanguages]:
+    texts = [_texts(s) for s in samples]
+    workers = workers or os.cpu_count() or 1
+    total_chars = sum(len(combined) for combined, _, _ in texts)
+    if workers == 1 or total_chars < PARALLEL_MIN_CHARS:
+        return _detect_batch(texts)
 
+    results: list[SampleLanguages] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch_result in pool.map(_detect_batch, _batches(texts, _BATCH_TEXTS)):
+            results.extend(batch_result)
+    return results
 
-def detect_languages(dataset: Dataset) -> LanguageProfile:
+
+def sample_languages(
+    samples: Sequence[Sample],
+    cache: ResultCache | None = None,
+    workers: int | None = None,
+) -> list[SampleLanguages]:
+    """Detect the languages of many samples, reusing cached results.
+
+    Args:
+        samples: Samples to identify.
+        cache: Optional ResultCache for incremental re-runs.
+        workers: Worker processes for large batches (default: CPU count;
+            1 disables the pool).
+
+    Returns:
+        Per sample, ``[sample, prompt, response]`` language codes; a side
+        with no text is UNKNOWN_LANGUAGE.
+    """
+    return map_cached(
+        samples,
+        "language",
+        {"chars": DETECT_CHARS, "scripts": SCRIPT_RANGES, "stopwords": _STOPWORD_LISTS},
+        lambda batch: _detect_samples(batch, workers),
+        cache,
+    )
+
+
+def sample_language(sample: Sample) -> str:
+    """Language of a sample's combined message text."""
+    return _detect_batch([_texts(sample)])[0][0]
+
+
+def detect_languages(
+    dataset: Dataset,
+    cache: ResultCache | None = None,
+    workers: int | None = None,
+) -> LanguageProfile:
     """Detect the language distribution across dataset samples.
 
     Args:
         dataset: Dataset to analyze.
+        cache: Optional ResultCache for incremental re-runs.
+        workers: Worker processes for large datasets (1 disables the pool).
 
     Returns:
         LanguageProfile with language counts and primary language.
     """
-    raise NotImplementedError
+    counts: dict[str, int] = {}
+    with span("language", dataset.sample_count):
+        for language, _, _ in sample_languages(dataset.samples, cache, workers):
+            counts[language] = counts.get(language, 0) + 1
+    return language_profile(counts)
+
+
+def language_profile(counts: dict[str, int]) -> LanguageProfile:
+    """LanguageProfile from per-language sample counts."""
+    if not counts:
+        return LanguageProfile()
+    primary, count = max(counts.items(), key=lambda kv: kv[1])
+    return LanguageProfile(
+        languages=dict(sorted(counts.items(), key=lambda kv: -kv[1])),
+        primary_language=primary,
+        primary_percentage=round(100.0 * count / sum(counts.values()), 2),
+    )
@@ -2,19 +2,149 @@
 
 from __future__ import annotations
 
-from ftdata.core.models import Dataset, LengthProfile, ProfileResult, TurnProfile, VocabProfile
-
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from itertools import accumulate
+
+from ftdata.cache import ResultCache
+from ftdata.core.models import (
+    Dataset,
+    LengthProfile,
+    ProfileResult,
+    TokenStats,
+    TurnProfile,
+    VocabProfile,
+)
+from ftdata.profiling.language import detect_languages
+from ftdata.profiling.tokens import (
+    DEFAULT_ENCODING,
+    SampleTokens,
+    get_encoding,
+    tokenize_samples,
+)
+from ftdata.timing import span
+
+TOP_TOKENS = 20
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return float(ordered[low] + (ordered[high] - ordered[low]) * (rank - low))
+
+
+def token_stats(values: Sequence[int]) -> TokenStats:
+    """Summarize a list of per-sample token counts."""
+    if not values:
+        return TokenStats()
+    ordered = sorted(values)
+    total = sum(ordered)
+    return TokenStats(
+        min=ordered[0],
+        max=ordered[-1],
+        mean=total / len(ordered),
+        median=_percentile(ordered, 50),
+        p95=_percentile(ordered, 95),
+        p99=_percentile(ordered, 99),
+        total=total,
+    )
+
+
+class LengthHistogram:
+    """Per-sample counts kept as a histogram of distinct values.
+
+    Summaries match token_stats / turn_stats exactly, but cost grows with
+    the number of distinct values (bounded by the longest sample) rather
+    than with the number of samples, so a running total can be summarized
+    repeatedly without re-sorting everything seen so far.
+    """
 
-def compute_length_profile(dataset: Dataset) -> LengthProfile:
+    def __init__(self) -> None:
+        self.counts: Counter[int] = Counter()
+        self.samples = 0
+        self.total = 0
+
+    def update(self, values: Iterable[int]) -> None:
+        """Add one value per new sample."""
+        for value in values:
+            self.counts[value] += 1
+            self.samples += 1
+            self.total += value
+
+    def _percentiles(self, qs: Sequence[float]) -> list[float]:
+        # Same linear interpolation as _percentile, over the expanded sorted values.
+        values = sorted(self.counts)
+        ends = list(accumulate(self.counts[v] for v in values))
+
+        def at(position: int) -> int:
+            return values[bisect_right(ends, position)]
+
+        result = []
+        for q in qs:
+            rank = (self.samples - 1) * q / 100
+            low = int(rank)
+            high = min(low + 1, self.samples - 1)
+            result.append(float(at(low) + (at(high) - at(low)) * (rank - low)))
+        return result
+
+    def token_stats(self) -> TokenStats:
+        """The TokenStats token_stats() would give for the values added."""
+        if not self.samples:
+            return TokenStats()
+        median, p95, p99 = self._percentiles((50, 95, 99))
+        return TokenStats(
+            min=min(self.counts),
+            max=max(self.counts),
+            mean=self.total / self.samples,
+            median=median,
+            p95=p95,
+            p99=p99,
+            total=self.total,
+        )
+
+    def turn_stats(self) -> TurnProfile:
+        """The TurnProfile turn_stats() would give for the values added."""
+        if not self.samples:
+            return TurnProfile()
+        return TurnProfile(
+            min=min(self.counts),
+            max=max(self.counts),
+            mean=self.total / self.samples,
+            median=self._percentiles((50,))[0],
+        )
+
+
+def compute_length_profile(
+    dataset: Dataset,
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+    tokens: list[SampleTokens] | None = None,
+) -> LengthProfile:
     """Compute token length statistics for prompts, responses, and totals.
 
     Args:
         dataset: Dataset to profile.
+        encoding_name: tiktoken encoding name.
+        cache: Optional ResultCache for incremental re-runs.
+        tokens: Pre-computed records from tokenize_samples (skips tokenization).
 
     Returns:
         LengthProfile with min/max/mean/median/p95/p99 stats.
     """
-    raise NotImplementedError
+    if tokens is None:
+        tokens = tokenize_samples(dataset, encoding_name, cache)
+    prompt = [t[0] for t in tokens]
+    response = [t[1] for t in tokens]
+    return LengthProfile(
+        prompt_tokens=token_stats(prompt),
+        response_tokens=token_stats(response),
+        total_tokens=token_stats([p + r for p, r in zip(prompt, response, strict=True)]),
+    )
 
 
 def compute_turn_profile(dataset: Dataset) -> TurnProfile:
@@ -26,28 +156,94 @@ def compute_turn_profile(dataset: Dataset) -> TurnProfile:
     Returns:
         TurnProfile with min/max/mean/median.
     """
-    raise NotImplementedError
-
-
-def compute_vocab_profile(dataset: Dataset) -> VocabProfile:
+    return turn_stats([s.turn_count for s in dataset.samples])
+
+
+def turn_stats(values: Sequence[int]) -> TurnProfile:
+    """Summarize a list of per-sample turn counts."""
+    turns = sorted(values)
+    if not turns:
+        return TurnProfile()
+    return TurnProfile(
+        min=turns[0],
+        max=turns[-1],
+        mean=sum(turns) / len(turns),
+        median=_percentile(turns, 50),
+    )
+
+
+def compute_vocab_profile(
+    dataset: Dataset,
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+    tokens: list[SampleTokens] | None = None,
+) -> VocabProfile:
     """Compute vocabulary statistics.
 
     Args:
         dataset: Dataset to profile.
+        encoding_name: tiktoken encoding name.
+        cache: Optional ResultCache for incremental re-runs.
+        tokens: Pre-computed records from tokenize_samples (skips tokenization).
 
     Returns:
         VocabProfile with unique tokens, TTR, and top tokens.
     """
-    raise NotImplementedError
-
-
-def profile_dataset(dataset: Dataset) -> ProfileResult:
+    if tokens is None:
+        tokens = tokenize_samples(dataset, encoding_name, cache)
+    counts: Counter[int] = Counter()
+    for record in tokens:
+        for token_id, n in record[2]:
+            counts[token_id] += n
+    return vocab_stats(counts, encoding_name)
+
+
+def vocab_stats(counts: Counter[int], encoding_name: str = DEFAULT_ENCODING) -> VocabProfile:
+    """Summarize aggregated token counts (token id -> occurrences)."""
+    total = sum(counts.values())
+    if total == 0:
+        return VocabProfile()
+    encoding = get_encoding(encoding_name)
+    return VocabProfile(
+        unique_tokens=len(counts),
+        type_token_ratio=len(counts) / total,
+        top_tokens=[
+            (encoding.decode([token_id]), n) for token_id, n in counts.most_common(TOP_TOKENS)
+        ],
+    )
+
+
+def profile_dataset(
+    dataset: Dataset,
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+    language_detection: bool = True,
+) -> ProfileResult:
     """Run full profiling on a dataset.
 
+    Each sample is tokenized once; length and vocabulary statistics share
+    the same token records.
+
     Args:
         dataset: Dataset to profile.
+        encoding_name: tiktoken encoding name.
+        cache: Optional ResultCache for incremental re-runs.
+        language_detection: Whether to detect the language distribution.
 
     Returns:
         Complete ProfileResult.
     """
-    raise NotImplementedError
+    with span("profile", dataset.sample_count):
+        tokens = tokenize_samples(dataset, encoding_name, cache)
+        with span("stats", dataset.sample_count):
+            length = compute_length_profile(dataset, encoding_name, tokens=tokens)
+            result = ProfileResult(
+                length=length,
+                turns=compute_turn_profile(dataset),
+                vocab=compute_vocab_profile(dataset, encoding_name, tokens=tokens),
+                sample_count=dataset.sample_count,
+                total_tokens=length.total_tokens.total,
+            )
+        if language_detection:
+            result.language = detect_languages(dataset, cache)
+        return result
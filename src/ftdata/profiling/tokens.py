@@ -0,0 +1,131 @@
+"""Tokenization shared by profiling and quality checks (tiktoken)."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ftdata.cache import ResultCache, map_cached
+from ftdata.core.models import Dataset, Sample
+from ftdata.timing import span
+
+if TYPE_CHECKING:
+    import tiktoken
+
+DEFAULT_ENCODING = "cl100k_base"
+
+RESPONSE_ROLE = "assistant"
+
+# Per-sample token record as stored in the result cache:
+# [prompt_tokens, response_tokens, [[token_id, count], ...]]
+SampleTokens = list[Any]
+# Per-sample token counts as stored in the result cache: [prompt_tokens, response_tokens]
+SampleCounts = list[int]
+
+
+@cache
+def get_encoding(name: str = DEFAULT_ENCODING) -> tiktoken.Encoding:
+    """Load (once per process) the tiktoken encoding `name`."""
+    import tiktoken
+
+    return tiktoken.get_encoding(name)
+
+
+def _tokenize(samples: list[Sample], encoding_name: str) -> list[SampleTokens]:
+    encoding = get_encoding(encoding_name)
+    # Repeated contents (a shared system prompt) are encoded and counted once.
+    # One batched call for the whole chunk lets tiktoken spread work over threads.
+    unique = list(dict.fromkeys(m.content for s in samples for m in s.messages))
+    counted = {
+        content: (len(ids), Counter(ids))
+        for content, ids in zip(unique, encoding.encode_ordinary_batch(unique), strict=True)
+    }
+    records: list[SampleTokens] = []
+    for sample in samples:
+        prompt = response = 0
+        counts: Counter[int] = Counter()
+        for message in sample.messages:
+            length, message_counts = counted[message.content]
+            if message.role == RESPONSE_ROLE:
+                response += length
+            else:
+                prompt += length
+            counts.update(message_counts)
+        records.append([prompt, response, [[t, n] for t, n in counts.items()]])
+    return records
+
+
+def tokenize_samples(
+    dataset: Dataset,
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+) -> list[SampleTokens]:
+    """Tokenize every sample once, reusing cached results where possible.
+
+    Assistant messages count as response tokens; every other role counts
+    towards prompt tokens.
+
+    Args:
+        dataset: Dataset to tokenize.
+        encoding_name: tiktoken encoding name.
+        cache: Optional ResultCache for incremental re-runs.
+
+    Returns:
+        One ``[prompt_tokens, response_tokens, token_counts]`` record per sample.
+    """
+    with span("tokenize", dataset.sample_count):
+        return map_cached(
+            dataset.samples,
+            f"tokens:{encoding_name}",
+            {"encoding": encoding_name},
+            lambda batch: _tokenize(batch, encoding_name),
+            cache,
+        )
+
+
+def _count(samples: list[Sample], encoding_name: str) -> list[SampleCounts]:
+    encoding = get_encoding(encoding_name)
+    unique = list(dict.fromkeys(m.content for s in samples for m in s.messages))
+    lengths = dict(zip(unique, map(len, encoding.encode_ordinary_batch(unique)), strict=True))
+    messages = [m for s in samples for m in s.messages]
+    owner = np.repeat(np.arange(len(samples)), [len(s.messages) for s in samples])
+    length = np.fromiter((lengths[m.content] for m in messages), np.int64, len(messages))
+    response = np.fromiter((m.role == RESPONSE_ROLE for m in messages), np.bool_, len(messages))
+    counts = np.zeros((len(samples), 2), dtype=np.int64)
+    np.add.at(counts, (owner, response.astype(np.intp)), length)
+    records: list[SampleCounts] = counts.tolist()
+    return records
+
+
+def count_tokens(
+    samples: Sequence[Sample],
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+) -> npt.NDArray[np.int64]:
+    """Prompt and response token counts per sample, without per-token tallies.
+
+    Cheaper than tokenize_samples when only lengths are needed; counts are
+    cached separately from its records.
+
+    Args:
+        samples: Samples to count.
+        encoding_name: tiktoken encoding name.
+        cache: Optional ResultCache for incremental re-runs.
+
+    Returns:
+        ``(len(samples), 2)`` array of ``[prompt_tokens, response_tokens]``.
+    """
+    with span("count_tokens", len(samples)):
+        records = map_cached(
+            samples,
+            f"token_counts:{encoding_name}",
+            {"encoding": encoding_name},
+            lambda batch: _count(batch, encoding_name),
+            cache,
+        )
+    return np.array(records, dtype=np.int64).reshape(len(records), 2)
@@ -0,0 +1,309 @@
+"""Incremental profiling of a JSONL file that is still being appended to.
+
+``ftdata profile --watch`` tails the file from the last processed byte
+offset and folds each batch of new samples into running state: token and
+turn counts, vocabulary counts, quality findings, the prompt-diversity
+sketch, language counts and the exact and MinHash dedup indexes. Nothing is read twice; a
+partially written last line is left until its newline arrives.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from ftdata.cache import ResultCache
+from ftdata.config import DedupConfig, QualityConfig
+from ftdata.core.formats import build_samples
+from ftdata.core.loader import FIELD_PARSERS, decode_json, record_format
+from ftdata.core.models import (
+    Dataset,
+    DatasetFormat,
+    DedupMethod,
+    DedupResult,
+    DuplicateCluster,
+    IssueStore,
+    LengthProfile,
+    ProfileReport,
+    ProfileResult,
+    QualityResult,
+    QualityRule,
+    QualitySeverity,
+    Sample,
+)
+from ftdata.dedup.exact import dedup_result
+from ftdata.dedup.minhash import MinHashIndex, minhash_signatures
+from ftdata.diversity.sketches import PromptSketch, sketch_prompts
+from ftdata.exceptions import DatasetLoadError, FormatDetectionError, UnsupportedFormatError
+from ftdata.profiling.language import language_profile, sample_languages
+from ftdata.profiling.stats import LengthHistogram, vocab_stats
+from ftdata.profiling.tokens import DEFAULT_ENCODING, tokenize_samples
+from ftdata.quality.heuristics import MIN_DIVERSITY_SAMPLES, add_diversity_issue
+from ftdata.quality.runner import run_quality_checks
+
+# Bytes read per call; a poll that finds more data keeps reading.
+READ_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+class JsonlTail:
+    """Reads the complete lines appended to a file since the previous read."""
+
+    def __init__(self, path: Path, chunk_bytes: int = READ_CHUNK_BYTES) -> None:
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.offset = 0
+        self.line_number = 0
+
+    def read_lines(self) -> list[tuple[int, str]]:
+        """Return ``(line_number, text)`` for new non-blank lines, up to about one chunk.
+
+        A trailing line without a newline is not consumed. Lines longer than
+        a chunk are read whole.
+
+        Raises:
+            DatasetLoadError: If the file shrank (it was rewritten, not
+                appended to) or a line is not valid UTF-8.
+        """
+        try:
+            size = self.path.stat().st_size
+            if size < self.offset:
+                raise DatasetLoadError(str(self.path), "file was truncated while watching")
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(self.chunk_bytes)
+                while data and b"\n" not in data:
+                    more = f.read(self.chunk_bytes)
+                    if not more:
+                        break
+                    data += more
+        except OSError as e:
+            raise DatasetLoadError(str(self.path), str(e)) from e
+
+        end = data.rfind(b"\n") + 1
+        lines: list[tuple[int, str]] = []
+        for raw in data[:end].split(b"\n")[:-1]:
+            self.line_number += 1
+            try:
+                text = raw.decode("utf-8").rstrip("\r")
+            except UnicodeDecodeError as e:
+                raise DatasetLoadError(
+                    str(self.path), f"invalid UTF-8 on line {self.line_number}"
+                ) from e
+            if text.strip():
+                lines.append((self.line_number, text))
+        self.offset += end
+        return lines
+
+
+class WatchSession:
+    """Running profile, quality and dedup state for a growing JSONL file.
+
+    Call poll() repeatedly. A live view refreshes from live_report(),
+    issue_counts() and the running duplicate counters, whose cost does not
+    grow with the samples seen; report(), exact_duplicates() and
+    near_duplicates() build the full results once watching ends.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        format: DatasetFormat | None = None,
+        encoding_name: str = DEFAULT_ENCODING,
+        quality: QualityConfig | None = None,
+        dedup: DedupConfig | None = None,
+        cache: ResultCache | None = None,
+        language_detection: bool = True,
+    ) -> None:
+        self.path = path
+        self.format = format
+        self.encoding_name = encoding_name
+        self.quality_config = quality or QualityConfig()
+        self.dedup_config = dedup or DedupConfig()
+        self.cache = cache
+        self.language_detection = language_detection
+        self.tail = JsonlTail(path)
+        self.sample_count = 0
+        self.exact_duplicate_count = 0
+
+        # FT012 is a whole-dataset finding; it is computed from the merged sketch.
+        disabled = self.quality_config.disabled_rules
+        self._diversity_enabled = QualityRule.FT012.value not in disabled
+        self._batch_quality = self.quality_config.model_copy(
+            update={"disabled_rules": [*disabled, QualityRule.FT012.value]}
+        )
+        # Histograms rather than per-sample lists: profile() runs on every
+        # refresh and must not re-sort everything seen so far.
+        self._prompt_tokens = LengthHistogram()
+        self._response_tokens = LengthHistogram()
+        self._total_tokens = LengthHistogram()
+        self._turns = LengthHistogram()
+        self._vocab: Counter[int] = Counter()
+        self._languages: Counter[str] = Counter()
+        self._issues = IssueStore()
+        self._sketch = PromptSketch()
+        self._exact: dict[str, list[int]] = {}
+        self._minhash = MinHashIndex(
+            self.dedup_config.minhash_threshold, self.dedup_config.minhash_num_perm
+        )
+
+    @property
+    def bytes_read(self) -> int:
+        """Byte offset up to which the file has been processed."""
+        return self.tail.offset
+
+    def _parse(self, lines: list[tuple[int, str]]) -> list[Sample]:
+        fields: list[dict[str, Any]] = []
+        for line_number, text in lines:
+            try:
+                record = decode_json(text)
+            except json.JSONDecodeError as e:
+                raise DatasetLoadError(str(self.path), f"invalid JSON on line {line_number}") from e
+            if not isinstance(record, dict):
+                raise DatasetLoadError(str(self.path), f"line {line_number} is not a JSON object")
+            if self.format is None:
+                self.format = record_format(record)
+                if self.format is None:
+                    raise FormatDetectionError(str(self.path))
+            parser = FIELD_PARSERS.get(self.format)
+            if parser is None:
+                raise UnsupportedFormatError(self.format.value)
+            fields.append(parser(record, self.sample_count + len(fields)))
+        return build_samples(fields)
+
+    def poll(self) -> int:
+        """Process the next chunk of complete lines appended since the last poll.
+
+        A large backlog is consumed over several calls, so callers can
+        refresh their display in between.
+
+        Returns:
+            Number of new samples (0 once caught up with the writer).
+
+        Raises:
+            DatasetLoadError: If new data cannot be read or parsed.
+        """
+        samples = self._parse(self.tail.read_lines())
+        self.update(samples)
+        return len(samples)
+
+    def update(self, samples: list[Sample]) -> None:
+        """Fold a batch of new samples (indices continuing the stream) into the state."""
+        if not samples:
+            return
+        batch = Dataset(samples=samples, format=self.format or DatasetFormat.CHATML)
+        tokens = tokenize_samples(batch, self.encoding_name, self.cache)
+        self._prompt_tokens.update(prompt for prompt, _, _ in tokens)
+        self._response_tokens.update(response for _, response, _ in tokens)
+        self._total_tokens.update(prompt + response for prompt, response, _ in tokens)
+        for _, _, counts in tokens:
+            for token_id, n in counts:
+                self._vocab[token_id] += n
+        self._turns.update(s.turn_count for s in samples)
+        if self.language_detection:
+            self._languages.update(labels[0] for labels in sample_languages(samples, self.cache))
+
+        # Batches arrive in index order, so the accumulated store stays sorted.
+        self._issues.extend(
+            run_quality_checks(batch, self._batch_quality, self.cache, self.encoding_name).store
+        )
+        if self._diversity_enabled:
+            self._sketch.merge(sketch_prompts(samples))
+
+        for sample in samples:
+            indices = self._exact.setdefault(sample.content_hash, [])
+            self.exact_duplicate_count += bool(indices)
+            indices.append(sample.index)
+        signatures = minhash_signatures(batch, self.dedup_config.minhash_num_perm, self.cache)
+        for sample, signature in zip(samples, signatures, strict=True):
+            self._minhash.add(sample.index, signature)
+        self.sample_count += len(samples)
+
+    def profile(self) -> ProfileResult:
+        """Token, turn, vocabulary and language profile of every sample so far."""
+        length = LengthProfile(
+            prompt_tokens=self._prompt_tokens.token_stats(),
+            response_tokens=self._response_tokens.token_stats(),
+            total_tokens=self._total_tokens.token_stats(),
+        )
+        return ProfileResult(
+            length=length,
+            turns=self._turns.turn_stats(),
+            vocab=vocab_stats(self._vocab, self.encoding_name),
+            language=language_profile(dict(self._languages)),
+            sample_count=self.sample_count,
+            total_tokens=length.total_tokens.total,
+        )
+
+    @property
+    def near_duplicate_count(self) -> int:
+        """Samples so far that are near-duplicates of an earlier one."""
+        return self._minhash.duplicates
+
+    def _diversity_issues(self) -> IssueStore:
+        store = IssueStore()
+        if self._diversity_enabled and self.sample_count >= MIN_DIVERSITY_SAMPLES:
+            config = self.quality_config
+            add_diversity_issue(
+                store,
+                self._sketch.summary(),
+                config.min_distinct_prompt_ratio,
+                config.max_template_share,
+                config.max_prompt_similarity,
+            )
+        return store
+
+    def issue_counts(self) -> dict[tuple[QualityRule, QualitySeverity], int]:
+        """Findings so far per (rule, severity) pair, including FT012."""
+        counts = self._issues.counts()
+        for key, count in self._diversity_issues().counts().items():
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    def quality(self) -> QualityResult:
+        """Quality findings so far, including dataset-level diversity (FT012).
+
+        Copies every finding; a live view should use issue_counts().
+        """
+        store = self._diversity_issues()
+        store.extend(self._issues)
+        return QualityResult(store=store)
+
+    def exact_duplicates(self) -> DedupResult:
+        """Exact duplicate clusters so far."""
+        clusters = [
+            DuplicateCluster(indices=indices, method=DedupMethod.EXACT)
+            for indices in self._exact.values()
+            if len(indices) > 1
+        ]
+        return dedup_result(clusters, self.sample_count)
+
+    def near_duplicates(self) -> DedupResult:
+        """MinHash near-duplicate clusters so far."""
+        return dedup_result(self._minhash.clusters(), self.sample_count)
+
+    def live_report(self) -> ProfileReport:
+        """Profile of everything seen so far, without dedup clusters or findings."""
+        return ProfileReport(
+            dataset_path=str(self.path),
+            dataset_format=self.format or DatasetFormat.CHATML,
+            sample_count=self.sample_count,
+            profile=self.profile(),
+        )
+
+    def report(self) -> ProfileReport:
+        """Everything seen so far as a ProfileReport.
+
+        ``dedup`` holds the clusters of the configured method (exact unless
+        ``dedup.method`` is "minhash").
+        """
+        minhash = self.dedup_config.method == DedupMethod.MINHASH.value
+        return ProfileReport(
+            dataset_path=str(self.path),
+            dataset_format=self.format or DatasetFormat.CHATML,
+            sample_count=self.sample_count,
+            profile=self.profile(),
+            dedup=self.near_duplicates() if minhash else self.exact_duplicates(),
+            quality=self.quality(),
+        )
@@ -0,0 +1,420 @@
+"""Policy-driven filtering: drop, deduplicate and redact in one streamed pass.
+
+``ftdata filter`` applies the ``filter:`` policy of ``.ftdata.yaml``.
+Samples with ERROR-severity quality findings or benchmark overlap are
+dropped, only the first surviving sample of each duplicate cluster is
+kept, and PII in the survivors is replaced by typed placeholders.
+
+Records are read once, in batches. Each batch is evaluated (quality rules,
+contamination, hashes / MinHash signatures, redaction) on a process pool;
+the parent consumes the results in source order, makes the dedup decision
+(which depends on every earlier survivor) and writes the survivors and
+the decision log as it goes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from ftdata.cache import ResultCache
+from ftdata.config import FtdataConfig, QualityConfig
+from ftdata.contamination.ngram import check_ngram_overlap
+from ftdata.core.compression import compression_of, data_suffix, open_text, open_text_output
+from ftdata.core.formats import build_samples
+from ftdata.core.loader import FIELD_PARSERS, decode_json, detect_format, is_json_array
+from ftdata.core.models import (
+    Dataset,
+    DatasetFormat,
+    DedupMethod,
+    FilterResult,
+    QualityRule,
+    QualitySeverity,
+)
+from ftdata.core.writer import DatasetWriter
+from ftdata.dedup.minhash import MinHashIndex, Signature, minhash_signatures
+from ftdata.exceptions import (
+    ConfigError,
+    DatasetLoadError,
+    OutputWriteError,
+    UnsupportedFormatError,
+)
+from ftdata.quality.pii import redact_record
+from ftdata.quality.runner import run_quality_checks
+
+# Below this many source bytes a process pool costs more than it saves.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+_BATCH_RECORDS = 2048
+# Batches queued per worker ahead of the one being written.
+_BATCHES_PER_WORKER = 2
+
+
+class _Policy(NamedTuple):
+    """What a worker needs to evaluate a batch; picklable."""
+
+    path: str
+    format: DatasetFormat
+    quality: QualityConfig | None
+    encoding_name: str
+    dedup: DedupMethod | None
+    num_perm: int
+    benchmarks: list[str]
+    ngram_size: int
+    redact_pii: bool
+
+
+class _Verdict(NamedTuple):
+    """Per-sample evaluation; the dedup decision is left to the parent."""
+
+    errors: list[str]
+    contaminated: list[str]
+    content_hash: str
+    signature: Signature | None
+    # Re-serialized record when PII was replaced, and the type of each span.
+    redacted: str | None
+    pii: list[str]
+
+
+def decision_log_path(output: Path) -> Path:
+    """Default decision log next to `output`: ``clean.jsonl.gz`` -> ``clean.decisions.jsonl``."""
+    suffix = data_suffix(output) + (output.suffix if compression_of(output) else "")
+    stem = output.name[: len(output.name) - len(suffix)] if suffix else output.name
+    return output.with_name(f"{stem}.decisions.jsonl")
+
+
+def _policy(path: Path, format: DatasetFormat, config: FtdataConfig) -> _Policy:
+    settings = config.filter
+    quality: QualityConfig | None = None
+    if settings.drop_errors:
+        # PII is redacted rather than flagged, and FT012 concerns the whole
+        # dataset rather than any one sample.
+        disabled = [
+            *config.quality.disabled_rules,
+            QualityRule.FT009.value,
+            QualityRule.FT012.value,
+        ]
+        quality = config.quality.model_copy(update={"disabled_rules": disabled})
+    dedup: DedupMethod | None = None
+    if settings.dedup:
+        if config.dedup.method not in (DedupMethod.EXACT.value, DedupMethod.MINHASH.value):
+            raise ConfigError(
+                f"filter supports dedup.method 'exact' or 'minhash', not {config.dedup.method!r}"
+            )
+        dedup = DedupMethod(config.dedup.method)
+    if settings.drop_contaminated and config.contamination.benchmarks:
+        # Rejected before any output is opened; check_ngram_overlap is not implemented.
+        raise ConfigError(
+            "contamination checks are not available yet; clear contamination.benchmarks "
+            "or set filter.drop_contaminated: false"
+        )
+    return _Policy(
+        path=str(path),
+        format=format,
+        quality=quality,
+        encoding_name=config.profiling.token_encoding,
+        dedup=dedup,
+        num_perm=config.dedup.minhash_num_perm,
+        benchmarks=list(config.contamination.benchmarks) if settings.drop_contaminated else [],
+        ngram_size=config.contamination.ngram_size,
+        redact_pii=settings.redact_pii,
+    )
+
+
+@contextmanager
+def _writing(path: Path | None) -> Iterator[None]:
+    """Report OSErrors raised inside the block as failures to write `path`."""
+    try:
+        yield
+    except OSError as e:
+        raise OutputWriteError(str(path), str(e)) from e
+
+
+def _partial_path(path: Path) -> Path:
+    """Where `path` is written until it is complete (same directory and suffixes)."""
+    return path.with_name(f".partial-{os.getpid()}-{path.name}")
+
+
+def _source_lines(path: Path) -> tuple[bool, Iterator[str]]:
+    """Whether `path` is a JSON array, and the text of each of its records.
+
+    JSONL records are the source lines without their line ending, so
+    survivors can be copied verbatim; records of a JSON array are
+    re-serialized. Blank lines are skipped, matching the loader's indices.
+
+    Raises:
+        DatasetLoadError: If the file cannot be read (also while iterating).
+    """
+
+    def array_records() -> Iterator[str]:
+        with open_text(path) as f:
+            for record in decode_json(f.read()):
+                yield json.dumps(record, ensure_ascii=False)
+
+    def lines() -> Iterator[str]:
+        with open_text(path) as f:
+            for line in f:
+                if line.strip():
+                    yield line.rstrip("\r\n")
+
+    def reading(records: Iterator[str]) -> Iterator[str]:
+        try:
+            yield from records
+        except json.JSONDecodeError as e:
+            raise DatasetLoadError(str(path), f"invalid JSON: {e}") from e
+        except (OSError, UnicodeDecodeError) as e:
+            raise DatasetLoadError(str(path), str(e)) from e
+
+    try:
+        with open_text(path) as f:
+            json_array = is_json_array(f.read(64))
+    except (OSError, UnicodeDecodeError) as e:
+        raise DatasetLoadError(str(path), str(e)) from e
+    return json_array, reading(array_records() if json_array else lines())
+
+
+def _batches(lines: Iterator[str]) -> Iterator[tuple[int, list[str]]]:
+    """``(first_index, lines)`` for consecutive batches of records."""
+    batch: list[str] = []
+    first = 0
+    for line in lines:
+        batch.append(line)
+        if len(batch) == _BATCH_RECORDS:
+            yield first, batch
+            first += len(batch)
+            batch = []
+    if batch:
+        yield first, batch
+
+
+def _evaluate_batch(
+    policy: _Policy, first_index: int, lines: list[str], cache: ResultCache | None = None
+) -> list[_Verdict]:
+    """Evaluate a batch of records against the policy (runs in worker processes)."""
+    parser = FIELD_PARSERS[policy.format]
+    records: list[dict[str, Any]] = []
+    fields: list[dict[str, Any]] = []
+    for offset, line in enumerate(lines):
+        index = first_index + offset
+        try:
+            record = decode_json(line)
+        except json.JSONDecodeError as e:
+            raise DatasetLoadError(policy.path, f"invalid JSON in record {index}") from e
+        if not isinstance(record, dict):
+            raise DatasetLoadError(policy.path, f"record {index} is not a JSON object")
+        records.append(record)
+        fields.append(parser(record, index))
+    samples = build_samples(fields)
+    batch = Dataset(samples=samples, format=policy.format)
+
+    errors: list[list[str]] = [[] for _ in samples]
+    if policy.quality is not None:
+        store = run_quality_checks(batch, policy.quality, cache, policy.encoding_name).store
+        for issue in store:
+            rules = errors[issue.sample_index - first_index]
+            if issue.severity is QualitySeverity.ERROR and issue.rule.value not in rules:
+                rules.append(issue.rule.value)
+    contaminated: list[list[str]] = [[] for _ in samples]
+    for name in policy.benchmarks:
+        for match in check_ngram_overlap(batch, name, policy.ngram_size).matches:
+            names = contaminated[match.sample_index - first_index]
+            if name not in names:
+                names.append(name)
+    signatures: list[Signature | None] = [None] * len(samples)
+    if policy.dedup is DedupMethod.MINHASH:
+        signatures = list(minhash_signatures(batch, policy.num_perm, cache))
+
+    verdicts: list[_Verdict] = []
+    for i, (sample, record) in enumerate(zip(samples, records, strict=True)):
+        redacted: str | None = None
+        pii: list[str] = []
+        # Samples that will be dropped anyway are not worth redacting.
+        if policy.redact_pii and not errors[i] and not contaminated[i]:
+            matches = redact_record(record, policy.format)
+            if matches:
+                redacted = json.dumps(record, ensure_ascii=False)
+                pii = [m.type for m in matches]
+        verdicts.append(
+            _Verdict(errors[i], contaminated[i], sample.content_hash, signatures[i], redacted, pii)
+        )
+    return verdicts
+
+
+def _evaluated(
+    policy: _Policy, lines: Iterator[str], workers: int, cache: ResultCache | None
+) -> Iterator[tuple[int, list[str], list[_Verdict]]]:
+    """Evaluated batches in source order, on a process pool when `workers` > 1.
+
+    At most ``workers * _BATCHES_PER_WORKER`` batches are in flight, so
+    memory stays bounded however large the source is. Worker processes do
+    not share the result cache.
+    """
+    if workers == 1:
+        for first, batch in _batches(lines):
+            yield first, batch, _evaluate_batch(policy, first, batch, cache)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[tuple[int, list[str], Future[list[_Verdict]]]] = deque()
+    try:
+        for first, batch in _batches(lines):
+            pending.append((first, batch, pool.submit(_evaluate_batch, policy, first, batch)))
+            if len(pending) >= workers * _BATCHES_PER_WORKER:
+                first, batch, future = pending.popleft()
+                yield first, batch, future.result()
+        while pending:
+            first, batch, future = pending.popleft()
+            yield first, batch, future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def filter_dataset(
+    path: Path,
+    output: Path,
+    config: FtdataConfig | None = None,
+    log_path: Path | None = None,
+    format: DatasetFormat | None = None,
+    cache: ResultCache | None = None,
+    workers: int | None = None,
+) -> FilterResult:
+    """Stream the samples of `path` that pass the ``filter:`` policy to `output`.
+
+    A sample is dropped if it has an ERROR-severity quality finding
+    (``drop_errors``) or overlaps a configured benchmark
+    (``drop_contaminated``); of the remaining samples, only the first of
+    each duplicate cluster is kept (``dedup``, using ``dedup.method``).
+    Survivors without PII are copied verbatim; PII in the others is
+    replaced by typed placeholders (``redact_pii``). The output keeps the
+    source format and JSONL / JSON-array layout.
+
+    The decision log has one JSON line per sample, e.g.
+    ``{"index": 3, "action": "drop", "reasons": ["FT001"]}``. Actions are
+    "keep", "redact" and "drop"; reasons are rule ids, ``contamination:<name>``,
+    ``duplicate_of:<index>`` and ``pii:<type>``.
+
+    Args:
+        path: Source dataset file.
+        output: Path for the filtered dataset (compressed by suffix).
+        config: Project configuration (policy, quality, dedup, contamination).
+        log_path: Path for the decision log (none is written if None).
+        format: Optional explicit format (auto-detected if None).
+        cache: Optional ResultCache, used when evaluating in-process.
+        workers: Worker processes (default: CPU count; 1 disables the pool).
+
+    Returns:
+        FilterResult with kept, dropped and redaction counts.
+
+    Raises:
+        ConfigError: If the policy asks for semantic deduplication or for
+            contamination checks, which are not available yet.
+        DatasetLoadError: If a record cannot be read or parsed.
+        OutputWriteError: If the output or the log cannot be written. Both
+            are written under temporary names and only renamed into place
+            once complete, so a failed run leaves neither behind.
+    """
+    config = config or FtdataConfig()
+    fmt = format or detect_format(path)
+    if fmt not in FIELD_PARSERS:
+        raise UnsupportedFormatError(fmt.value)
+    policy = _policy(path, fmt, config)
+    workers = workers or os.cpu_count() or 1
+    if path.stat().st_size < PARALLEL_MIN_BYTES:
+        workers = 1
+
+    exact: dict[str, int] = {}
+    near = (
+        MinHashIndex(config.dedup.minhash_threshold, policy.num_perm)
+        if policy.dedup is DedupMethod.MINHASH
+        else None
+    )
+    dropped: Counter[str] = Counter()
+    redactions: Counter[str] = Counter()
+    redacted_samples = sample_count = 0
+    json_array, lines = _source_lines(path)
+    # Written under temporary names and renamed once complete, so a failed run
+    # never leaves a truncated file that looks valid.
+    partial_output = _partial_path(output)
+    partial_log = _partial_path(log_path) if log_path else None
+    try:
+        with ExitStack() as stack:
+            with _writing(output):
+                writer = stack.enter_context(DatasetWriter(partial_output, json_array=json_array))
+            with _writing(log_path):
+                log = stack.enter_context(open_text_output(partial_log)) if partial_log else None
+            for first, batch, verdicts in _evaluated(policy, lines, workers, cache):
+                for offset, (line, verdict) in enumerate(zip(batch, verdicts, strict=True)):
+                    index = first + offset
+                    sample_count = index + 1
+                    reasons = [
+                        *verdict.errors,
+                        *(f"contamination:{n}" for n in verdict.contaminated),
+                    ]
+                    if not reasons and policy.dedup is not None:
+                        if near is not None and verdict.signature is not None:
+                            original = near.duplicate_of(verdict.signature)
+                            if original is None:
+                                near.add(index, verdict.signature)
+                        else:
+                            original = exact.setdefault(verdict.content_hash, index)
+                            if original == index:
+                                original = None
+                        if original is not None:
+                            reasons.append(f"duplicate_of:{original}")
+
+                    survivor: str | None = None
+                    if reasons:
+                        action = "drop"
+                        if verdict.errors:
+                            dropped["quality"] += 1
+                        elif verdict.contaminated:
+                            dropped["contamination"] += 1
+                        else:
+                            dropped["duplicate"] += 1
+                    elif verdict.redacted is not None:
+                        action = "redact"
+                        reasons = [f"pii:{t}" for t in dict.fromkeys(verdict.pii)]
+                        redacted_samples += 1
+                        redactions.update(verdict.pii)
+                        survivor = verdict.redacted
+                    else:
+                        action = "keep"
+                        survivor = line
+                    if survivor is not None:
+                        with _writing(output):
+                            writer.write_line(survivor)
+                    if log is not None:
+                        decision = {"index": index, "action": action, "reasons": reasons}
+                        with _writing(log_path):
+                            log.write(json.dumps(decision) + "\n")
+            kept = writer.count
+            with _writing(output):
+                writer.close()
+            if log is not None:
+                with _writing(log_path):
+                    log.close()
+        with _writing(output):
+            os.replace(partial_output, output)
+        if log_path and partial_log:
+            with _writing(log_path):
+                os.replace(partial_log, log_path)
+    except BaseException:
+        for partial in (partial_output, partial_log):
+            if partial is not None:
+                partial.unlink(missing_ok=True)
+        raise
+
+    return FilterResult(
+        output_path=str(output),
+        log_path=str(log_path) if log_path else None,
+        sample_count=sample_count,
+        kept=kept,
+        dropped=dict(dropped),
+        redacted_samples=redacted_samples,
+        redactions=dict(redactions),
+    )
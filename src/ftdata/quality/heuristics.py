@@ -2,19 +2,255 @@
 
 from __future__ import annotations
 
-from ftdata.core.models import Dataset, QualityResult
+from typing import Any
 
+import numpy as np
+import numpy.typing as npt
 
-def check_heuristics(dataset: Dataset) -> QualityResult:
+from ftdata.cache import ResultCache, map_cached
+from ftdata.core.models import (
+    DATASET_LEVEL_INDEX,
+    Dataset,
+    IssueStore,
+    PromptDiversity,
+    QualityResult,
+    QualityRule,
+    QualitySeverity,
+    Sample,
+)
+from ftdata.diversity.sketches import sketch_prompts
+from ftdata.profiling.language import UNKNOWN_LANGUAGE, sample_languages
+from ftdata.profiling.tokens import DEFAULT_ENCODING, RESPONSE_ROLE, get_encoding
+
+DEFAULT_NGRAM_SIZE = 4
+DEFAULT_MAX_REPETITION = 0.4
+
+# Responses with fewer n-grams than this are too short to judge.
+MIN_NGRAMS = 16
+# N-gram hashes are checked against the seen-set in chunks of this size,
+# so the scan can stop as soon as the outcome is decided.
+REPETITION_CHUNK = 512
+_HASH_BASE = np.uint64(0x100000001B3)
+
+# User and assistant turn counts may differ by at most this much (FT010).
+MAX_TURN_IMBALANCE = 1
+
+DEFAULT_MIN_DISTINCT_RATIO = 0.5
+DEFAULT_MAX_TEMPLATE_SHARE = 0.3
+DEFAULT_MAX_SIMILARITY = 0.5
+# Below this many samples dataset-level diversity (FT012) is not judged.
+MIN_DIVERSITY_SAMPLES = 20
+
+
+def ngram_hashes(token_ids: npt.NDArray[np.int64], n: int) -> npt.NDArray[np.uint64]:
+    """Polynomial hash of every length-`n` window of `token_ids`.
+
+    Built with `n` vectorized passes over the array (arithmetic wraps
+    modulo 2**64), so cost is linear in the number of tokens.
+    """
+    count = len(token_ids) - n + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    ids = token_ids.astype(np.uint64)
+    hashes = np.zeros(count, dtype=np.uint64)
+    for k in range(n):
+        hashes = hashes * _HASH_BASE + ids[k : k + count]
+    return hashes
+
+
+def exceeds_repetition(
+    token_ids: npt.NDArray[np.int64],
+    n: int = DEFAULT_NGRAM_SIZE,
+    threshold: float = DEFAULT_MAX_REPETITION,
+) -> bool:
+    """Whether more than `threshold` of the n-grams in `token_ids` are repeats.
+
+    An n-gram counts as a repeat when the same n-gram occurred earlier in
+    the sequence. Hashes are streamed through a set chunk by chunk (linear
+    time overall), stopping early once the threshold has been crossed or
+    can no longer be reached.
+
+    Args:
+        token_ids: Token ids of one response.
+        n: N-gram size.
+        threshold: Maximum allowed fraction of repeated n-grams.
+
+    Returns:
+        True if the repeated n-gram ratio exceeds `threshold`.
+    """
+    hashes = ngram_hashes(token_ids, n)
+    total = len(hashes)
+    if total < MIN_NGRAMS:
+        return False
+    allowed = threshold * total
+    seen: set[int] = set()
+    for start in range(0, total, REPETITION_CHUNK):
+        seen.update(hashes[start : start + REPETITION_CHUNK].tolist())
+        processed = min(start + REPETITION_CHUNK, total)
+        repeats = processed - len(seen)
+        if repeats > allowed:
+            return True
+        if repeats + (total - processed) <= allowed:
+            return False
+    return False
+
+
+def _repetitive_messages(
+    samples: list[Sample], encoding_name: str, n: int, threshold: float
+) -> list[list[int]]:
+    encoding = get_encoding(encoding_name)
+    positions = [[i for i, m in enumerate(s.messages) if m.role == RESPONSE_ROLE] for s in samples]
+    # Responses repeated across samples are encoded and checked once.
+    unique = list(
+        dict.fromkeys(
+            s.messages[i].content for s, idx in zip(samples, positions, strict=True) for i in idx
+        )
+    )
+    repetitive = {
+        content: exceeds_repetition(np.array(ids), n, threshold)
+        for content, ids in zip(unique, encoding.encode_ordinary_batch(unique), strict=True)
+    }
+    return [
+        [i for i in idx if repetitive[sample.messages[i].content]]
+        for sample, idx in zip(samples, positions, strict=True)
+    ]
+
+
+def _turn_imbalance(sample: Sample) -> int:
+    user = sum(1 for m in sample.messages if m.role == "user")
+    assistant = sum(1 for m in sample.messages if m.role == RESPONSE_ROLE)
+    return abs(user - assistant)
+
+
+def low_diversity_reasons(
+    diversity: PromptDiversity,
+    min_distinct_ratio: float = DEFAULT_MIN_DISTINCT_RATIO,
+    max_template_share: float = DEFAULT_MAX_TEMPLATE_SHARE,
+    max_similarity: float = DEFAULT_MAX_SIMILARITY,
+) -> list[str]:
+    """Explain which FT012 diversity thresholds a dataset violates (if any)."""
+    reasons: list[str] = []
+    if diversity.distinct_ratio < min_distinct_ratio:
+        reasons.append(f"only {diversity.distinct_ratio:.0%} of prompts are distinct")
+    if diversity.top_template_share > max_template_share:
+        reasons.append(f"{diversity.top_template_share:.0%} of prompts share one template")
+    if diversity.mean_similarity > max_similarity:
+        reasons.append(f"mean prompt similarity is {diversity.mean_similarity:.2f}")
+    return reasons
+
+
+def add_diversity_issue(
+    store: IssueStore,
+    diversity: PromptDiversity,
+    min_distinct_ratio: float = DEFAULT_MIN_DISTINCT_RATIO,
+    max_template_share: float = DEFAULT_MAX_TEMPLATE_SHARE,
+    max_similarity: float = DEFAULT_MAX_SIMILARITY,
+) -> None:
+    """Add the dataset-level FT012 warning to `store` if `diversity` is too low."""
+    reasons = low_diversity_reasons(
+        diversity, min_distinct_ratio, max_template_share, max_similarity
+    )
+    if reasons:
+        store.add(
+            QualityRule.FT012,
+            QualitySeverity.WARNING,
+            "Low prompt diversity: " + "; ".join(reasons),
+            DATASET_LEVEL_INDEX,
+            diversity.model_dump(),
+        )
+
+
+def check_heuristics(
+    dataset: Dataset,
+    disabled_rules: list[str] | None = None,
+    ngram_size: int = DEFAULT_NGRAM_SIZE,
+    max_repetition: float = DEFAULT_MAX_REPETITION,
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+    min_distinct_ratio: float = DEFAULT_MIN_DISTINCT_RATIO,
+    max_template_share: float = DEFAULT_MAX_TEMPLATE_SHARE,
+    max_similarity: float = DEFAULT_MAX_SIMILARITY,
+) -> QualityResult:
     """Run heuristic quality checks on a dataset.
 
-    Checks include: high repetition (FT007), imbalanced turns (FT010),
-    low diversity (FT012).
+    Checks include: high repetition (FT007), language mismatch (FT008),
+    imbalanced turns (FT010), low diversity (FT012).
+
+    FT007 flags assistant messages whose repeated token n-gram ratio
+    exceeds `max_repetition` (see exceeds_repetition); results are cached
+    per sample.
+
+    FT008 flags samples whose prompt and response are identified as
+    different languages. It reads the same cached per-sample labels as
+    language profiling (see sample_languages), so a profile followed by a
+    check detects each sample once.
+
+    FT012 is a single dataset-level finding (sample index -1) computed in
+    one pass from mergeable sketches (see ftdata.diversity.sketches):
+    distinct-prompt ratio, top prompt-template share, and mean MinHash
+    similarity of a sample of distinct prompts.
 
     Args:
         dataset: Dataset to check.
+        disabled_rules: List of rule IDs to skip.
+        ngram_size: Token n-gram size for repetition detection.
+        max_repetition: Maximum fraction of repeated n-grams (FT007).
+        encoding_name: tiktoken encoding used to tokenize responses.
+        cache: Optional ResultCache for incremental re-runs.
+        min_distinct_ratio: Minimum estimated fraction of distinct prompts (FT012).
+        max_template_share: Maximum share of the most common prompt template (FT012).
+        max_similarity: Maximum mean pairwise prompt similarity (FT012).
 
     Returns:
         QualityResult with heuristic findings.
     """
-    raise NotImplementedError
+    disabled = set(disabled_rules or ())
+    store = IssueStore()
+
+    if QualityRule.FT007.value not in disabled:
+        config: dict[str, Any] = {"n": ngram_size, "threshold": max_repetition}
+        flagged = map_cached(
+            dataset.samples,
+            f"repetition:{encoding_name}",
+            config,
+            lambda batch: _repetitive_messages(batch, encoding_name, ngram_size, max_repetition),
+            cache,
+        )
+        for sample, messages in zip(dataset.samples, flagged, strict=True):
+            if messages:
+                store.add(
+                    QualityRule.FT007,
+                    QualitySeverity.WARNING,
+                    "High repetition",
+                    sample.index,
+                    {"messages": messages, "ngram_size": ngram_size},
+                )
+
+    if QualityRule.FT008.value not in disabled:
+        for sample, (_, prompt, response) in zip(
+            dataset.samples, sample_languages(dataset.samples, cache), strict=True
+        ):
+            if UNKNOWN_LANGUAGE not in (prompt, response) and prompt != response:
+                store.add(
+                    QualityRule.FT008,
+                    QualitySeverity.WARNING,
+                    "Language mismatch between prompt and response",
+                    sample.index,
+                    {"prompt": prompt, "response": response},
+                )
+
+    if QualityRule.FT010.value not in disabled:
+        imbalanced = [s.index for s in dataset.samples if _turn_imbalance(s) > MAX_TURN_IMBALANCE]
+        store.add_many(QualityRule.FT010, QualitySeverity.WARNING, "Imbalanced turns", imbalanced)
+
+    if QualityRule.FT012.value not in disabled and dataset.sample_count >= MIN_DIVERSITY_SAMPLES:
+        add_diversity_issue(
+            store,
+            sketch_prompts(dataset.samples).summary(),
+            min_distinct_ratio,
+            max_template_share,
+            max_similarity,
+        )
+
+    store.sort_by_sample()
+    return QualityResult(store=store)
@@ -1,28 +1,547 @@
-"""Optional LLM-as-judge scoring (requires [llm] extra)."""
+"""Optional LLM-as-judge scoring (requires [llm] extra).
+
+Samples are judged concurrently on an asyncio event loop. A fixed pool of
+workers caps in-flight requests, two token buckets keep the run within
+requests-per-minute and tokens-per-minute limits, and transient failures
+(rate limits, overload, connection errors) are retried with jittered
+exponential backoff. Verdicts are stored in a persistent judgment cache
+keyed by model, prompt-template hash and sample content hash, so a re-run
+only pays for samples that have not been judged before.
+
+With ``batch_tokens`` set, several samples are packed into one request up
+to that prompt-token budget and the judge returns a JSON array with one
+verdict per sample, amortizing the rubric over the batch. Replies are
+parsed item by item, so a truncated or partly malformed array still yields
+the verdicts it contains, and only the missing items are retried.
+"""
 
 from __future__ import annotations
 
-from ftdata.core.models import Dataset, QualityResult
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from ftdata.cache import ResultCache, config_hash, default_cache_dir
+from ftdata.config import JudgeConfig
+from ftdata.core.models import (
+    DATASET_LEVEL_INDEX,
+    Dataset,
+    IssueStore,
+    QualityResult,
+    QualityRule,
+    QualitySeverity,
+    Sample,
+    SamplingPlan,
+)
+from ftdata.exceptions import JudgeRequestError, LLMUnavailableError
+from ftdata.profiling.tokens import DEFAULT_ENCODING, get_encoding
+from ftdata.quality.sampling import stratified_mean
+
+JUDGE_SYSTEM = "You are a meticulous reviewer of supervised fine-tuning data for chat assistants."
+
+JUDGE_PROMPT = """\
+Rate the quality of the training conversation below as an example for fine-tuning an assistant.
+
+Consider whether the assistant replies are correct, helpful, complete and well written, and
+whether the conversation as a whole is coherent.
+
+Reply with only a JSON object of the form {{"score": <integer 1-5>, "reason": "<one sentence>"}},
+where 5 is an excellent example and 1 means the sample should be removed.
+
+<conversation>
+{conversation}
+</conversation>"""
+
+JUDGE_BATCH_PROMPT = """\
+Rate the quality of each of the {count} training conversations below as an example for
+fine-tuning an assistant. Judge every conversation on its own.
+
+Consider whether the assistant replies are correct, helpful, complete and well written, and
+whether the conversation as a whole is coherent.
+
+Reply with only a JSON array containing one object per conversation, of the form
+[{{"id": <conversation id>, "score": <integer 1-5>, "reason": "<one sentence>"}}, ...],
+where 5 is an excellent example and 1 means the sample should be removed.
+
+{conversations}"""
+
+BATCH_ITEM = """<conversation id="{id}">
+{conversation}
+</conversation>"""
+
+# Identifies the rubric in judgment cache keys; editing the prompt
+# invalidates previously cached verdicts.
+PROMPT_HASH = hashlib.sha256((JUDGE_SYSTEM + JUDGE_PROMPT).encode()).hexdigest()[:16]
+BATCH_PROMPT_HASH = hashlib.sha256(
+    (JUDGE_SYSTEM + JUDGE_BATCH_PROMPT + BATCH_ITEM).encode()
+).hexdigest()[:16]
+
+JUDGE_ANALYZER = "judge"
+JUDGMENT_CACHE_FILENAME = "judgments.sqlite3"
+# Judgments are paid for, so they are kept across ftdata upgrades.
+JUDGMENT_CACHE_VERSION = "1"
+MIN_SCORE, MAX_SCORE = 1, 5
+
+# Cached verdict: [score, reason]
+Verdict = list[Any]
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `per_minute` units per minute.
+
+    Waiters are served in arrival order. Requests larger than the bucket's
+    capacity are clamped to it so they cannot wait forever.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute if capacity is None else capacity)
+        self._level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until `amount` units are available, then take them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._level >= amount:
+                    self._level -= amount
+                    return
+                await asyncio.sleep((amount - self._level) / self.rate)
+
+
+def render_conversation(sample: Sample) -> str:
+    """Render a sample's messages as a plain-text transcript."""
+    return "\n\n".join(f"[{m.role}]\n{m.content}" for m in sample.messages)
+
+
+def judge_prompt(sample: Sample) -> str:
+    """The user prompt sent to the judge for one sample."""
+    return JUDGE_PROMPT.format(conversation=render_conversation(sample))
+
+
+def batch_prompt(samples: list[Sample]) -> str:
+    """The user prompt for judging `samples` in one request (ids start at 1)."""
+    items = [
+        BATCH_ITEM.format(id=i, conversation=render_conversation(sample))
+        for i, sample in enumerate(samples, 1)
+    ]
+    return JUDGE_BATCH_PROMPT.format(count=len(samples), conversations="\n\n".join(items))
+
+
+def _json_objects(text: str) -> Iterator[dict[str, Any]]:
+    """Top-level JSON objects embedded anywhere in `text`, in order.
+
+    Objects inside a truncated or otherwise invalid array are still found,
+    because each one is decoded on its own.
+    """
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, end = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            value, end = None, start + 1
+        if isinstance(value, dict):
+            yield value
+        else:
+            end = start + 1
+        start = text.find("{", end)
+
+
+def _verdict(value: dict[str, Any]) -> Verdict | None:
+    score = value.get("score")
+    # JSON true/false decode to bool (an int subclass); 3.5 is not on the scale.
+    if isinstance(score, bool) or not isinstance(score, int | float):
+        return None
+    if isinstance(score, float) and not score.is_integer():
+        return None
+    if MIN_SCORE <= score <= MAX_SCORE:
+        return [int(score), str(value.get("reason", ""))]
+    return None
+
+
+def parse_verdict(text: str) -> Verdict | None:
+    """Extract ``[score, reason]`` from a judge reply, or None if malformed.
+
+    The first JSON object in the text with an integer score in range is
+    used, so surrounding prose or code fences are tolerated.
+    """
+    for value in _json_objects(text):
+        verdict = _verdict(value)
+        if verdict is not None:
+            return verdict
+    return None
+
+
+def parse_batch_verdicts(text: str, count: int) -> dict[int, Verdict]:
+    """Extract per-item verdicts from a batch judge reply.
+
+    Every object with a valid score is matched to its ``id`` (1-based);
+    objects without an id are matched by position. Items that are missing,
+    malformed, out of range or repeated are left out, so the caller can
+    retry just those.
+
+    Args:
+        text: Raw reply text.
+        count: Number of conversations in the batch.
+
+    Returns:
+        Mapping from item id to ``[score, reason]``.
+    """
+    verdicts: dict[int, Verdict] = {}
+    position = 0
+    for value in _json_objects(text):
+        verdict = _verdict(value)
+        if verdict is None:
+            continue
+        position += 1
+        item = value.get("id", position)
+        if isinstance(item, str) and item.isdigit():
+            item = int(item)
+        if isinstance(item, int) and 1 <= item <= count and item not in verdicts:
+            verdicts[item] = verdict
+    return verdicts
+
+
+def pack_batches(
+    samples: list[Sample], encoding_name: str, budget: int, max_size: int
+) -> list[list[Sample]]:
+    """Greedily pack samples, in order, into batches of at most `budget` prompt tokens.
+
+    A sample that does not fit in the budget on its own gets a batch of
+    its own.
+    """
+    encoding = get_encoding(encoding_name)
+    overhead = len(encoding.encode_ordinary(JUDGE_BATCH_PROMPT))
+    items = [
+        BATCH_ITEM.format(id=i, conversation=render_conversation(s))
+        for i, s in enumerate(samples, 1)
+    ]
+    costs = [len(tokens) for tokens in encoding.encode_ordinary_batch(items)]
+    batches: list[list[Sample]] = []
+    batch: list[Sample] = []
+    used = overhead
+    for sample, cost in zip(samples, costs, strict=True):
+        if batch and (used + cost > budget or len(batch) >= max_size):
+            batches.append(batch)
+            batch, used = [], overhead
+        batch.append(sample)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def max_batch_size(config: JudgeConfig) -> int:
+    """Samples per batch request, so their replies fit the model's output limit."""
+    return max(1, min(config.max_batch_size, config.max_output_tokens // config.max_tokens))
+
+
+def open_judgment_cache(directory: Path | None = None) -> ResultCache:
+    """Open the persistent judgment cache (kept separate from analyzer results)."""
+    return ResultCache(
+        (directory or default_cache_dir()) / JUDGMENT_CACHE_FILENAME,
+        version=JUDGMENT_CACHE_VERSION,
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    import anthropic
+
+    if isinstance(error, anthropic.RateLimitError | anthropic.APIConnectionError):
+        return True
+    return isinstance(error, anthropic.APIStatusError) and error.status_code >= 500
+
+
+def _retry_after(error: Exception) -> float:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else 0.0
+    except ValueError:
+        return 0.0
+
+
+class Judge:
+    """Sends judge requests under shared rate limits, retrying transient errors."""
+
+    def __init__(
+        self,
+        client: Any,
+        model: str,
+        config: JudgeConfig,
+        encoding_name: str = DEFAULT_ENCODING,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.client = client
+        self.model = model
+        self.config = config
+        self.requests = 0
+        self.retries = 0
+        self._request_bucket = TokenBucket(config.requests_per_minute)
+        self._token_bucket = TokenBucket(config.tokens_per_minute)
+        self._encoding = get_encoding(encoding_name)
+        self._system_tokens = len(self._encoding.encode_ordinary(JUDGE_SYSTEM))
+        self._rng = rng or random.Random()
+
+    def _backoff(self, attempt: int, error: Exception | None) -> float:
+        ceiling = min(self.config.backoff_max, self.config.backoff_base * 2**attempt)
+        delay = self._rng.uniform(0, ceiling)
+        return max(delay, _retry_after(error)) if error is not None else delay
+
+    async def _request(self, prompt: str, max_tokens: int) -> str:
+        response = await self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            system=JUDGE_SYSTEM,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return "".join(block.text for block in response.content if block.type == "text")
+
+    async def _attempt(self, attempt: int, prompt: str, max_tokens: int) -> str | None:
+        """One rate-limited request; None on a retryable error (after backing off)."""
+        if attempt:
+            self.retries += 1
+        cost = len(self._encoding.encode_ordinary(prompt)) + self._system_tokens + max_tokens
+        await self._request_bucket.acquire()
+        await self._token_bucket.acquire(cost)
+        self.requests += 1
+        try:
+            return await self._request(prompt, max_tokens)
+        except Exception as e:
+            if not _is_retryable(e):
+                raise JudgeRequestError(str(e)) from e
+            if attempt < self.config.max_retries:
+                await asyncio.sleep(self._backoff(attempt, e))
+            return None
+
+    async def judge(self, sample: Sample) -> Verdict | None:
+        """Judge one sample; None if every attempt failed or was unparseable.
+
+        Raises:
+            JudgeRequestError: On a non-retryable API error (e.g. bad credentials).
+        """
+        prompt = judge_prompt(sample)
+        for attempt in range(self.config.max_retries + 1):
+            text = await self._attempt(attempt, prompt, self.config.max_tokens)
+            if text is None:
+                continue
+            verdict = parse_verdict(text)
+            if verdict is not None:
+                return verdict
+            if attempt < self.config.max_retries:
+                await asyncio.sleep(self._backoff(attempt, None))
+        return None
+
+    async def judge_batch(self, samples: list[Sample]) -> list[Verdict | None]:
+        """Judge samples in one request, re-asking only for items without a verdict.
+
+        Raises:
+            JudgeRequestError: On a non-retryable API error (e.g. bad credentials).
+        """
+        verdicts: list[Verdict | None] = [None] * len(samples)
+        missing = list(range(len(samples)))
+        for attempt in range(self.config.max_retries + 1):
+            batch = [samples[i] for i in missing]
+            max_tokens = min(self.config.max_tokens * len(batch), self.config.max_output_tokens)
+            text = await self._attempt(attempt, batch_prompt(batch), max_tokens)
+            if text is None:
+                continue
+            for item, verdict in parse_batch_verdicts(text, len(batch)).items():
+                verdicts[missing[item - 1]] = verdict
+            missing = [i for i in missing if verdicts[i] is None]
+            if not missing:
+                break
+            if attempt < self.config.max_retries:
+                await asyncio.sleep(self._backoff(attempt, None))
+        return verdicts
+
+
+async def judge_samples(
+    samples: list[Sample],
+    model: str,
+    config: JudgeConfig,
+    on_verdict: Callable[[Sample, Verdict | None], None],
+    encoding_name: str = DEFAULT_ENCODING,
+) -> Judge:
+    """Judge samples with `config.concurrency` workers sharing one client.
+
+    With ``config.batch_tokens`` set, samples are packed into multi-sample
+    requests (see pack_batches). `on_verdict` is called as each sample
+    completes, so results can be persisted incrementally.
+
+    Returns:
+        The Judge used, for its request and retry counters.
+
+    Raises:
+        LLMUnavailableError: If [llm] extra is not installed.
+        JudgeRequestError: On a non-retryable API error.
+    """
+    try:
+        import anthropic
+    except ImportError as e:
+        raise LLMUnavailableError() from e
+
+    try:
+        client = anthropic.AsyncAnthropic(base_url=config.base_url, max_retries=0)
+    except anthropic.AnthropicError as e:
+        raise JudgeRequestError(str(e)) from e
+    judge = Judge(client, model, config, encoding_name)
+    if config.batch_tokens > 0:
+        batches = pack_batches(samples, encoding_name, config.batch_tokens, max_batch_size(config))
+    else:
+        batches = [[sample] for sample in samples]
+    pending: Iterator[list[Sample]] = iter(batches)
+
+    async def worker() -> None:
+        for batch in pending:
+            if config.batch_tokens <= 0:
+                verdicts = [await judge.judge(batch[0])]
+            else:
+                verdicts = await judge.judge_batch(batch)
+            for sample, verdict in zip(batch, verdicts, strict=True):
+                on_verdict(sample, verdict)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, config.concurrency))]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        raise
+    finally:
+        await client.close()
+    return judge
 
 
 def score_with_llm(
     dataset: Dataset,
-    model: str = "claude-sonnet-4-5-20250929",
+    model: str | None = None,
     sample_size: int | None = None,
+    config: JudgeConfig | None = None,
+    cache: ResultCache | None = None,
+    encoding_name: str = DEFAULT_ENCODING,
+    seed: int = 0,
+    plan: SamplingPlan | None = None,
 ) -> QualityResult:
     """Score dataset samples using an LLM as judge.
 
     Requires the [llm] extra (anthropic).
 
+    Samples scoring below ``config.min_score`` get an FT013 warning, and a
+    dataset-level FT013 info finding summarizes the score distribution,
+    with a mean score estimate and 95% confidence interval. With a
+    SamplingPlan (see ftdata.quality.sampling) exactly the planned samples
+    are judged and the estimate is weighted by stratum.
+    Batched and single-sample verdicts are cached separately, since the
+    prompts differ. Cached verdicts are reused; each new verdict is written to the cache as
+    soon as it arrives. Samples that could not be judged are counted as
+    failed and are not cached.
+
     Args:
         dataset: Dataset to score.
-        model: LLM model to use for judging.
+        model: LLM model to use for judging (defaults to ``config.model``).
         sample_size: Number of samples to judge (None = all).
+        config: Concurrency, rate-limit and retry settings.
+        cache: Optional judgment cache (see open_judgment_cache).
+        encoding_name: tiktoken encoding used to estimate request tokens.
+        seed: Random seed for choosing samples when sample_size is set.
+        plan: Stratified sampling plan; overrides sample_size.
 
     Returns:
         QualityResult with LLM-generated quality assessments.
 
     Raises:
         LLMUnavailableError: If [llm] extra is not installed.
+        JudgeRequestError: On a non-retryable API error.
     """
-    raise NotImplementedError
+    config = config or JudgeConfig()
+    model = model or config.model
+    samples = dataset.samples
+    if plan is not None:
+        by_index = {s.index: s for s in dataset.samples}
+        strata = [
+            (stratum.population, [by_index[i] for i in stratum.sample_indices])
+            for stratum in plan.strata
+        ]
+    else:
+        if sample_size is not None and sample_size < len(samples):
+            samples = random.Random(seed).sample(samples, sample_size)
+        strata = [(dataset.sample_count, sorted(samples, key=lambda s: s.index))]
+    samples = [s for _, members in strata for s in members]
+
+    prompt_hash = BATCH_PROMPT_HASH if config.batch_tokens > 0 else PROMPT_HASH
+    key = config_hash({"model": model, "prompt": prompt_hash})
+    unique = {s.content_hash: s for s in samples}
+    verdicts: dict[str, Verdict] = (
+        cache.get_many(JUDGE_ANALYZER, key, list(unique)) if cache else {}
+    )
+    pending = [s for h, s in unique.items() if h not in verdicts]
+
+    def record(sample: Sample, verdict: Verdict | None) -> None:
+        if verdict is None:
+            return
+        verdicts[sample.content_hash] = verdict
+        if cache is not None:
+            cache.put_many(JUDGE_ANALYZER, key, {sample.content_hash: verdict})
+
+    if pending:
+        asyncio.run(judge_samples(pending, model, config, record, encoding_name))
+
+    store = IssueStore()
+    scores: dict[str, int] = {str(score): 0 for score in range(MIN_SCORE, MAX_SCORE + 1)}
+    observed: list[tuple[int, list[int]]] = []
+    for population, members in strata:
+        values: list[int] = []
+        for sample in members:
+            verdict = verdicts.get(sample.content_hash)
+            if verdict is None:
+                continue
+            score, reason = verdict
+            scores[str(score)] += 1
+            values.append(score)
+            if score < config.min_score:
+                store.add(
+                    QualityRule.FT013,
+                    QualitySeverity.WARNING,
+                    f"Low LLM judge score ({score}/{MAX_SCORE})",
+                    sample.index,
+                    {"score": score, "reason": reason},
+                )
+        observed.append((population, values))
+    if samples:
+        judged = sum(len(values) for _, values in observed)
+        mean, half_width = stratified_mean(observed)
+        store.add(
+            QualityRule.FT013,
+            QualitySeverity.INFO,
+            f"LLM judge mean score {mean:.2f} ± {half_width:.2f} (of {MAX_SCORE}) "
+            f"over {judged:,} samples",
+            DATASET_LEVEL_INDEX,
+            {
+                "model": model,
+                "judged": judged,
+                "failed": len(samples) - judged,
+                "mean_score": round(mean, 3),
+                "ci95": round(half_width, 3),
+                "scores": scores,
+            },
+        )
+    store.sort_by_sample()
+    return QualityResult(store=store)
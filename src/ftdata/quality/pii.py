@@ -2,19 +2,312 @@
 
 from __future__ import annotations
 
-from ftdata.core.models import Dataset, QualityResult
+import os
+import re
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import Any, NamedTuple
 
+from ftdata.cache import ResultCache, map_cached
+from ftdata.core.compression import open_text
+from ftdata.core.formats import text_slots
+from ftdata.core.loader import detect_format, is_json_array, iter_raw_records
+from ftdata.core.models import (
+    Dataset,
+    DatasetFormat,
+    IssueStore,
+    QualityResult,
+    QualityRule,
+    QualitySeverity,
+    RedactionResult,
+    Sample,
+)
+from ftdata.core.writer import DatasetWriter
+from ftdata.exceptions import DatasetLoadError
 
-def detect_pii(dataset: Dataset) -> QualityResult:
+# Alternation order matters: earlier patterns win at the same position, so
+# the stricter SSN / card shapes come before the looser phone pattern.
+PII_PATTERNS: dict[str, str] = {
+    "email": r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}",
+    "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
+    "credit_card": r"\b(?:\d{4}[- ]?){3}\d{4}\b",
+    "phone": r"(?<!\w)(?:\+?1[-.\s]?)?(?:\(\d{3}\)\s?|\d{3}[-.\s])\d{3}[-.\s]\d{4}\b",
+    "api_key": (
+        r"\b(?:sk-(?:ant-)?[A-Za-z0-9_-]{20,}|AKIA[0-9A-Z]{16}"
+        r"|gh[pousr]_[A-Za-z0-9]{36}|xox[abposr]-[A-Za-z0-9-]{10,})"
+    ),
+}
+
+PII_LABELS: dict[str, str] = {
+    "email": "email address",
+    "ssn": "social security number",
+    "credit_card": "credit card number",
+    "phone": "phone number",
+    "api_key": "API key",
+}
+
+# Cheap guards evaluated before any regex runs: a pattern is only attempted
+# on text that passes its prefilter.
+_DIGIT_RUN = re.compile(r"\d{3}")
+_API_KEY_LITERALS = ("sk-", "AKIA", "ghp_", "gho_", "ghu_", "ghs_", "ghr_", "xox")
+
+# Below this many characters a process pool costs more than it saves.
+PARALLEL_MIN_CHARS = 4 * 1024 * 1024
+_BATCH_TEXTS = 2048
+
+
+# Per-message finding as stored in the result cache:
+# [type, message_index, start, end]
+PiiFinding = list[Any]
+
+
+class PiiMatch(NamedTuple):
+    """A single PII span within a text."""
+
+    type: str
+    start: int
+    end: int
+
+
+def _candidate_types(text: str) -> frozenset[str]:
+    """PII types whose literal prefilter passes for `text`."""
+    types: set[str] = set()
+    if "@" in text:
+        types.add("email")
+    if _DIGIT_RUN.search(text):
+        types.update(("ssn", "credit_card", "phone"))
+    if any(literal in text for literal in _API_KEY_LITERALS):
+        types.add("api_key")
+    return frozenset(types)
+
+
+@cache
+def _combined_pattern(types: frozenset[str]) -> re.Pattern[str]:
+    """One alternation with a named group per PII type, in PII_PATTERNS order."""
+    return re.compile(
+        "|".join(f"(?P<{name}>{regex})" for name, regex in PII_PATTERNS.items() if name in types)
+    )
+
+
+def scan_text(text: str) -> list[PiiMatch]:
+    """Find all PII spans in `text` with a single regex pass.
+
+    Args:
+        text: Text to scan.
+
+    Returns:
+        Non-overlapping matches in order of position.
+    """
+    types = _candidate_types(text)
+    if not types:
+        return []
+    return [
+        PiiMatch(m.lastgroup or "", m.start(), m.end())
+        for m in _combined_pattern(types).finditer(text)
+    ]
+
+
+def placeholder(pii_type: str) -> str:
+    """Typed replacement token for a PII type, e.g. ``<EMAIL>``."""
+    return f"<{pii_type.upper()}>"
+
+
+def redact_text(text: str) -> tuple[str, list[PiiMatch]]:
+    """Replace every PII span in `text` with its typed placeholder.
+
+    Detection and rewrite happen in the same regex pass.
+
+    Args:
+        text: Text to redact.
+
+    Returns:
+        The redacted text and the matches (spans refer to the original text).
+    """
+    types = _candidate_types(text)
+    if not types:
+        return text, []
+    matches: list[PiiMatch] = []
+
+    def replace(m: re.Match[str]) -> str:
+        pii_type = m.lastgroup or ""
+        matches.append(PiiMatch(pii_type, m.start(), m.end()))
+        return placeholder(pii_type)
+
+    return _combined_pattern(types).sub(replace, text), matches
+
+
+def redact_record(raw: dict[str, Any], format: DatasetFormat) -> list[PiiMatch]:
+    """Redact the message texts of a raw record in place.
+
+    Fields other than message text are left untouched.
+
+    Returns:
+        All matches replaced in the record.
+    """
+    matches: list[PiiMatch] = []
+    for container, key in text_slots(raw, format):
+        redacted, found = redact_text(container[key])
+        if found:
+            container[key] = redacted
+            matches.extend(found)
+    return matches
+
+
+def redact_file(path: Path, output: Path, format: DatasetFormat | None = None) -> RedactionResult:
+    """Stream a dataset to `output` with PII replaced by typed placeholders.
+
+    JSONL input is streamed one record at a time, so memory use is
+    constant. A JSON array has to be parsed whole before the first record is
+    written, so memory grows with the file; convert large arrays to JSONL
+    first. Records without PII are copied verbatim; the output keeps the
+    input's format and JSONL / JSON-array layout. Either file may be
+    compressed (by suffix).
+
+    Args:
+        path: Input dataset file.
+        output: Path for the redacted dataset.
+        format: Optional explicit format (auto-detected if None).
+
+    Returns:
+        RedactionResult with per-type redaction counts.
+
+    Raises:
+        DatasetLoadError: If a record cannot be parsed.
+    """
+    fmt = format or detect_format(path)
+    try:
+        with open_text(path) as f:
+            json_array = is_json_array(f.read(64))
+    except (OSError, UnicodeDecodeError) as e:
+        raise DatasetLoadError(str(path), str(e)) from e
+
+    counts: Counter[str] = Counter()
+    redacted_samples = 0
+    with DatasetWriter(output, json_array=json_array) as writer:
+        for index, line, record in iter_raw_records(path):
+            if not isinstance(record, dict):
+                raise DatasetLoadError(str(path), f"record {index} is not a JSON object")
+            matches = redact_record(record, fmt)
+            if matches:
+                redacted_samples += 1
+                counts.update(m.type for m in matches)
+                writer.write_record(record)
+            elif line is not None:
+                writer.write_line(line)
+            else:
+                writer.write_record(record)
+        written = writer.count
+
+    return RedactionResult(
+        output_path=str(output),
+        sample_count=written,
+        redacted_samples=redacted_samples,
+        redactions=dict(counts),
+    )
+
+
+def _scan_batch(batch: list[list[str]]) -> list[list[PiiFinding]]:
+    """Scan a batch of samples (lists of message texts).
+
+    Returns per sample a list of ``[type, message_index, start, end]``.
+    Texts repeated within the batch are scanned once.
+    """
+    scanned: dict[str, list[PiiMatch]] = {}
+    results: list[list[PiiFinding]] = []
+    for texts in batch:
+        findings: list[PiiFinding] = []
+        for message_index, text in enumerate(texts):
+            matches = scanned.get(text)
+            if matches is None:
+                matches = scanned[text] = scan_text(text)
+            findings.extend([m.type, message_index, m.start, m.end] for m in matches)
+        results.append(findings)
+    return results
+
+
+def _batches(items: list[list[str]], size: int) -> Iterator[list[list[str]]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def scan_samples(samples: Sequence[Sample], workers: int | None = None) -> list[list[PiiFinding]]:
+    """Scan message contents of `samples` for PII, in parallel when worthwhile.
+
+    Regex matching holds the GIL, so large inputs are spread over a process
+    pool in batches; small inputs are scanned inline.
+
+    Args:
+        samples: Samples to scan.
+        workers: Worker processes (default: CPU count; 1 disables the pool).
+
+    Returns:
+        Per sample, a list of ``[type, message_index, start, end]`` findings.
+    """
+    texts = [[m.content for m in s.messages] for s in samples]
+    workers = workers or os.cpu_count() or 1
+    total_chars = sum(len(t) for sample_texts in texts for t in sample_texts)
+    if workers == 1 or total_chars < PARALLEL_MIN_CHARS:
+        return _scan_batch(texts)
+
+    results: list[list[PiiFinding]] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch_result in pool.map(_scan_batch, _batches(texts, _BATCH_TEXTS)):
+            results.extend(batch_result)
+    return results
+
+
+def add_pii_issues(store: IssueStore, sample_index: int, findings: list[PiiFinding]) -> None:
+    """Record FT009 issues (one per PII type) for a sample's findings."""
+    by_type: dict[str, list[int]] = {}
+    for pii_type, message_index, _, _ in findings:
+        by_type.setdefault(str(pii_type), []).append(int(message_index))
+    for pii_type, message_indices in by_type.items():
+        store.add(
+            QualityRule.FT009,
+            QualitySeverity.WARNING,
+            f"Possible {PII_LABELS.get(pii_type, pii_type)} detected",
+            sample_index,
+            {
+                "type": pii_type,
+                "count": len(message_indices),
+                "messages": sorted(set(message_indices)),
+            },
+        )
+
+
+def detect_pii(
+    dataset: Dataset,
+    workers: int | None = None,
+    cache: ResultCache | None = None,
+) -> QualityResult:
     """Scan dataset samples for personally identifiable information.
 
     Detects: email addresses, phone numbers, SSNs, API keys,
     and other common PII patterns.
 
+    All patterns run as one combined regex, and literal prefilters skip
+    messages that cannot contain a given PII type.
+
     Args:
         dataset: Dataset to scan.
+        workers: Worker processes for large datasets (1 disables the pool).
+        cache: Optional ResultCache for incremental re-runs.
 
     Returns:
         QualityResult with PII findings (FT009).
     """
-    raise NotImplementedError
+    findings = map_cached(
+        dataset.samples,
+        "pii",
+        {"patterns": PII_PATTERNS},
+        lambda batch: scan_samples(batch, workers),
+        cache,
+    )
+    store = IssueStore()
+    for sample, sample_findings in zip(dataset.samples, findings, strict=True):
+        if sample_findings:
+            add_pii_issues(store, sample.index, sample_findings)
+    return QualityResult(store=store)
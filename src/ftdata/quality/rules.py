@@ -1,8 +1,207 @@
-"""Rule-based quality checks: empty, truncated, encoding, format errors."""
+"""Rule-based quality checks: empty, truncated, encoding, format errors.
+
+Rules are evaluated column-wise: per-sample features (response length,
+token counts, system-message flags, ...) are extracted into NumPy arrays
+for a batch of samples, and every rule is a vectorized predicate over
+those arrays. Issues are only materialized for failing rows, and a
+column is only extracted when an enabled rule needs it.
+"""
 
 from __future__ import annotations
 
-from ftdata.core.models import Dataset, QualityResult
+from collections.abc import Callable, Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from ftdata.cache import ResultCache
+from ftdata.core.models import (
+    Dataset,
+    IssueStore,
+    QualityResult,
+    QualityRule,
+    QualitySeverity,
+    Sample,
+)
+from ftdata.profiling.tokens import DEFAULT_ENCODING, RESPONSE_ROLE, count_tokens
+
+Columns = dict[str, npt.NDArray[Any]]
+
+BATCH_SIZE = 65_536
+
+# Response endings that indicate generation stopped mid-thought.
+TRUNCATION_SUFFIXES = ("...", "…", ",", ";", ":", "-")
+CODE_FENCE = "```"
+REPLACEMENT_CHAR = "\ufffd"
+
+
+class Thresholds(NamedTuple):
+    """Numeric limits used by length rules."""
+
+    max_response_tokens: int
+    min_response_tokens: int
+
+
+class Rule(NamedTuple):
+    """A vectorized quality rule."""
+
+    rule: QualityRule
+    severity: QualitySeverity
+    message: str
+    columns: tuple[str, ...]
+    predicate: Callable[[Columns, Thresholds], npt.NDArray[np.bool_]]
+    details: tuple[str, ...] = ()
+
+
+RULES: tuple[Rule, ...] = (
+    Rule(
+        QualityRule.FT001,
+        QualitySeverity.ERROR,
+        "Empty response",
+        ("has_response", "response_chars"),
+        lambda c, t: c["has_response"] & (c["response_chars"] == 0),
+    ),
+    Rule(
+        QualityRule.FT002,
+        QualitySeverity.WARNING,
+        "Response appears truncated",
+        ("truncated",),
+        lambda c, t: c["truncated"],
+    ),
+    Rule(
+        QualityRule.FT003,
+        QualitySeverity.ERROR,
+        "Encoding error (Unicode replacement characters)",
+        ("replacement_chars",),
+        lambda c, t: c["replacement_chars"] > 0,
+        ("replacement_chars",),
+    ),
+    Rule(
+        QualityRule.FT004,
+        QualitySeverity.ERROR,
+        "Format error",
+        ("format_errors",),
+        lambda c, t: c["format_errors"] > 0,
+        ("format_errors",),
+    ),
+    Rule(
+        QualityRule.FT005,
+        QualitySeverity.WARNING,
+        "Response exceeds maximum token length",
+        ("response_tokens",),
+        lambda c, t: c["response_tokens"] > t.max_response_tokens,
+        ("response_tokens",),
+    ),
+    Rule(
+        QualityRule.FT006,
+        QualitySeverity.WARNING,
+        "Response is shorter than the minimum token length",
+        ("response_chars", "response_tokens"),
+        lambda c, t: (c["response_chars"] > 0) & (c["response_tokens"] < t.min_response_tokens),
+        ("response_tokens",),
+    ),
+    Rule(
+        QualityRule.FT011,
+        QualitySeverity.INFO,
+        "Missing system message",
+        ("has_system",),
+        lambda c, t: ~c["has_system"],
+    ),
+)
+
+
+def _response(sample: Sample) -> list[str]:
+    return [m.content for m in sample.messages if m.role == RESPONSE_ROLE]
+
+
+def _is_truncated(sample: Sample) -> bool:
+    responses = _response(sample)
+    if not responses:
+        return False
+    text = responses[-1].rstrip()
+    if not text:
+        return False
+    return text.count(CODE_FENCE) % 2 == 1 or text.endswith(TRUNCATION_SUFFIXES)
+
+
+def _format_error_count(sample: Sample) -> int:
+    errors = len(sample.metadata.get("format_errors", ()))
+    roles = {m.role for m in sample.messages}
+    errors += RESPONSE_ROLE not in roles
+    errors += "user" not in roles
+    return errors
+
+
+# Per-sample extractors for every non-token column.
+EXTRACTORS: dict[str, tuple[Callable[[Sample], Any], type]] = {
+    "has_response": (lambda s: any(m.role == RESPONSE_ROLE for m in s.messages), np.bool_),
+    "response_chars": (lambda s: sum(len(t.strip()) for t in _response(s)), np.int64),
+    "truncated": (_is_truncated, np.bool_),
+    "replacement_chars": (
+        lambda s: sum(m.content.count(REPLACEMENT_CHAR) for m in s.messages),
+        np.int64,
+    ),
+    "format_errors": (_format_error_count, np.int64),
+    "has_system": (lambda s: s.has_system, np.bool_),
+}
+
+
+def build_columns(
+    samples: Sequence[Sample],
+    names: set[str],
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+) -> Columns:
+    """Extract the requested feature columns for a batch of samples.
+
+    Args:
+        samples: Samples in the batch.
+        names: Column names to build (see EXTRACTORS, plus "response_tokens").
+        encoding_name: tiktoken encoding for token-count columns.
+        cache: Optional ResultCache for token counts.
+
+    Returns:
+        Mapping of column name to a 1-D array with one entry per sample.
+    """
+    columns: Columns = {}
+    for name in names:
+        if name == "response_tokens":
+            columns[name] = count_tokens(samples, encoding_name, cache)[:, 1]
+        else:
+            extract, dtype = EXTRACTORS[name]
+            columns[name] = np.fromiter((extract(s) for s in samples), dtype, len(samples))
+    return columns
+
+
+def evaluate_rules(
+    columns: Columns,
+    indices: npt.NDArray[np.int64],
+    rules: Sequence[Rule],
+    thresholds: Thresholds,
+    store: IssueStore | None = None,
+) -> IssueStore:
+    """Evaluate rules over a column batch, recording only the failures.
+
+    Args:
+        columns: Feature columns for the batch.
+        indices: Dataset index of each row.
+        rules: Rules to evaluate.
+        thresholds: Numeric limits for length rules.
+        store: IssueStore to append to (a new one if not provided).
+
+    Returns:
+        The store, with one finding for every failing (rule, row) pair.
+    """
+    store = store if store is not None else IssueStore()
+    for rule in rules:
+        rows = np.flatnonzero(rule.predicate(columns, thresholds))
+        details = None
+        if rule.details:
+            values = {name: columns[name][rows].tolist() for name in rule.details}
+            details = [{name: values[name][i] for name in rule.details} for i in range(len(rows))]
+        store.add_many(rule.rule, rule.severity, rule.message, indices[rows], details)
+    return store
 
 
 def check_quality_rules(
@@ -10,6 +209,8 @@ def check_quality_rules(
     disabled_rules: list[str] | None = None,
     max_response_tokens: int = 4096,
     min_response_tokens: int = 1,
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
 ) -> QualityResult:
     """Run rule-based quality checks on a dataset.
 
@@ -17,13 +218,31 @@ def check_quality_rules(
     encoding errors (FT003), format errors (FT004), excessive length (FT005),
     short responses (FT006), missing system messages (FT011).
 
+    Disabled rules are dropped before any feature extraction, so e.g.
+    disabling FT005 and FT006 skips tokenization entirely.
+
     Args:
         dataset: Dataset to check.
         disabled_rules: List of rule IDs to skip.
         max_response_tokens: Maximum allowed response tokens (FT005).
         min_response_tokens: Minimum required response tokens (FT006).
+        encoding_name: tiktoken encoding for token-count rules.
+        cache: Optional ResultCache for token counts.
 
     Returns:
         QualityResult with all detected issues.
     """
-    raise NotImplementedError
+    disabled = set(disabled_rules or ())
+    rules = [r for r in RULES if r.rule.value not in disabled]
+    names = {name for r in rules for name in r.columns}
+    thresholds = Thresholds(max_response_tokens, min_response_tokens)
+
+    store = IssueStore()
+    samples = dataset.samples
+    for start in range(0, len(samples), BATCH_SIZE):
+        batch = samples[start : start + BATCH_SIZE]
+        columns = build_columns(batch, names, encoding_name, cache)
+        indices = np.fromiter((s.index for s in batch), np.int64, len(batch))
+        evaluate_rules(columns, indices, rules, thresholds, store)
+    store.sort_by_sample()
+    return QualityResult(store=store)
@@ -0,0 +1,63 @@
+"""Run all configured quality checks and merge their findings."""
+
+from __future__ import annotations
+
+from ftdata.cache import ResultCache
+from ftdata.config import QualityConfig
+from ftdata.core.models import Dataset, QualityResult, QualityRule
+from ftdata.profiling.tokens import DEFAULT_ENCODING
+from ftdata.quality.heuristics import check_heuristics
+from ftdata.quality.pii import detect_pii
+from ftdata.quality.rules import check_quality_rules
+from ftdata.timing import span
+
+
+def run_quality_checks(
+    dataset: Dataset,
+    config: QualityConfig | None = None,
+    cache: ResultCache | None = None,
+    encoding_name: str = DEFAULT_ENCODING,
+) -> QualityResult:
+    """Run every enabled quality check on a dataset.
+
+    Args:
+        dataset: Dataset to check.
+        config: Quality configuration (rule toggles and thresholds).
+        cache: Optional ResultCache for incremental re-runs.
+        encoding_name: tiktoken encoding for token-count rules.
+
+    Returns:
+        QualityResult with the findings of all checks, ordered by sample.
+    """
+    config = config or QualityConfig()
+    disabled = set(config.disabled_rules)
+    samples = dataset.sample_count
+    with span("quality", samples):
+        with span("rules", samples):
+            store = check_quality_rules(
+                dataset,
+                config.disabled_rules,
+                config.max_response_tokens,
+                config.min_response_tokens,
+                encoding_name,
+                cache,
+            ).store
+        with span("heuristics", samples):
+            store.extend(
+                check_heuristics(
+                    dataset,
+                    config.disabled_rules,
+                    config.repetition_ngram_size,
+                    config.max_repetition_ratio,
+                    encoding_name,
+                    cache,
+                    config.min_distinct_prompt_ratio,
+                    config.max_template_share,
+                    config.max_prompt_similarity,
+                ).store
+            )
+        if QualityRule.FT009.value not in disabled:
+            with span("pii", samples):
+                store.extend(detect_pii(dataset, cache=cache).store)
+        store.sort_by_sample()
+    return QualityResult(store=store)
@@ -0,0 +1,144 @@
+"""Sampling planner that spends the LLM-judge budget where it adds signal.
+
+Samples that already fail rule checks (ERROR-level issues) are excluded,
+each duplicate cluster contributes a single representative, and the rest
+are stratified by token-length bucket and language. The judge budget is
+split across strata proportionally to their size (every stratum gets at
+least one sample when the budget allows), and stratum weights turn the
+judged scores into a dataset-level estimate with a confidence interval.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+
+from ftdata.cache import ResultCache
+from ftdata.core.models import (
+    Dataset,
+    DedupResult,
+    QualityResult,
+    QualitySeverity,
+    SamplingPlan,
+    SamplingStratum,
+)
+from ftdata.profiling.language import sample_languages
+from ftdata.profiling.tokens import DEFAULT_ENCODING, tokenize_samples
+
+# Length strata are quantile buckets of total (prompt + response) tokens.
+LENGTH_BUCKETS = 4
+Z_95 = 1.96
+
+
+def allocate(populations: list[int], budget: int) -> list[int]:
+    """Split `budget` across strata proportionally to their populations.
+
+    Every stratum gets at least one sample when the budget covers all
+    strata; the rest goes by largest remaining quota. No stratum is given
+    more than its population.
+    """
+    total = sum(populations)
+    if budget >= total:
+        return list(populations)
+    floor = 1 if budget >= len(populations) else 0
+    counts = [min(p, floor) for p in populations]
+    quotas = [p * budget / total for p in populations]
+    for _ in range(budget - sum(counts)):
+        open_strata = [i for i, p in enumerate(populations) if counts[i] < p]
+        best = max(open_strata, key=lambda i: quotas[i] - counts[i])
+        counts[best] += 1
+    return counts
+
+
+def plan_judge_sample(
+    dataset: Dataset,
+    sample_size: int | None = None,
+    quality: QualityResult | None = None,
+    duplicates: DedupResult | None = None,
+    encoding_name: str = DEFAULT_ENCODING,
+    cache: ResultCache | None = None,
+    seed: int = 0,
+) -> SamplingPlan:
+    """Choose which samples to send to the LLM judge.
+
+    Args:
+        dataset: Dataset to sample from.
+        sample_size: Judge budget in samples (None = every eligible sample).
+        quality: Rule-check results; samples with ERROR issues are skipped.
+        duplicates: Exact, MinHash or semantic clusters; one sample per
+            cluster (the first eligible one) is kept.
+        encoding_name: tiktoken encoding for length buckets.
+        cache: Optional ResultCache for token counts and languages.
+        seed: Random seed for the within-stratum draw.
+
+    Returns:
+        SamplingPlan with the selected samples grouped by stratum.
+    """
+    errors = set(quality.store.sample_indices(QualitySeverity.ERROR).tolist()) if quality else set()
+    redundant: set[int] = set()
+    for cluster in duplicates.clusters if duplicates else ():
+        kept = [i for i in cluster.indices if i not in errors]
+        redundant.update(kept[1:])
+
+    candidates = [s for s in dataset.samples if s.index not in errors and s.index not in redundant]
+    plan = SamplingPlan(
+        excluded_errors=sum(1 for s in dataset.samples if s.index in errors),
+        excluded_duplicates=len(redundant),
+    )
+    if not candidates:
+        return plan
+
+    tokens = tokenize_samples(Dataset(samples=candidates), encoding_name, cache)
+    lengths = np.array([t[0] + t[1] for t in tokens], dtype=np.int64)
+    edges = np.quantile(lengths, np.linspace(0, 1, LENGTH_BUCKETS + 1)[1:-1])
+    buckets = np.searchsorted(edges, lengths, side="right")
+
+    strata: dict[tuple[int, str], list[int]] = {}
+    languages = [labels[0] for labels in sample_languages(candidates, cache)]
+    for sample, bucket, language in zip(candidates, buckets.tolist(), languages, strict=True):
+        strata.setdefault((bucket, language), []).append(sample.index)
+
+    keys = sorted(strata)
+    budget = len(candidates) if sample_size is None else sample_size
+    counts = allocate([len(strata[k]) for k in keys], budget)
+    rng = random.Random(seed)
+    plan.strata = [
+        SamplingStratum(
+            length_bucket=bucket,
+            language=language,
+            population=len(strata[(bucket, language)]),
+            sample_indices=sorted(rng.sample(strata[(bucket, language)], count)),
+        )
+        for (bucket, language), count in zip(keys, counts, strict=True)
+    ]
+    return plan
+
+
+def stratified_mean(strata: list[tuple[int, list[int]]]) -> tuple[float, float]:
+    """Stratified estimate of the population mean and its 95% CI half-width.
+
+    Args:
+        strata: ``(population, observed values)`` per stratum; strata with
+            no observations are ignored.
+
+    Returns:
+        ``(mean, half_width)``; the half-width is 0.0 with fewer than two
+        observations in total.
+    """
+    observed = [(n, values) for n, values in strata if values]
+    total = sum(n for n, _ in observed)
+    if not total:
+        return 0.0, 0.0
+    pooled = [v for _, values in observed for v in values]
+    pooled_var = float(np.var(pooled, ddof=1)) if len(pooled) > 1 else 0.0
+
+    mean = variance = 0.0
+    for population, values in observed:
+        weight = population / total
+        count = len(values)
+        var = float(np.var(values, ddof=1)) if count > 1 else pooled_var
+        mean += weight * float(np.mean(values))
+        variance += weight**2 * (1 - count / max(population, count)) * var / count
+    return mean, Z_95 * math.sqrt(variance)
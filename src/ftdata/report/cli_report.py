@@ -2,9 +2,132 @@
 
 from __future__ import annotations
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
+from rich.table import Table
 
-from ftdata.core.models import ProfileReport
+from ftdata.core.models import (
+    DATASET_LEVEL_INDEX,
+    BenchmarkReport,
+    CleanedDataset,
+    DedupResult,
+    FilterResult,
+    ProfileReport,
+    QualityResult,
+    QualityRule,
+    QualitySeverity,
+    RedactionResult,
+    ReferenceDedupResult,
+    RepeatedSpanResult,
+    SampleEstimate,
+    TimingSpan,
+    TokenStats,
+)
+
+MAX_LISTED_ISSUES = 20
+MAX_LISTED_CLUSTERS = 20
+MAX_SPAN_PREVIEW = 80
+
+
+def _overview_table(report: ProfileReport) -> Table:
+    table = Table(title="Overview", show_header=False)
+    table.add_column("Metric", style="bold")
+    table.add_column("Value")
+    for key, value in report.summary.items():
+        is_count = isinstance(value, int) and not isinstance(value, bool)
+        table.add_row(key.replace("_", " "), f"{value:,}" if is_count else str(value))
+    return table
+
+
+def _length_table(report: ProfileReport) -> Table:
+    table = Table(title="Token lengths")
+    table.add_column("")
+    for column in ("min", "median", "mean", "p95", "p99", "max", "total"):
+        table.add_column(column, justify="right")
+    rows: list[tuple[str, TokenStats]] = [
+        ("prompt", report.profile.length.prompt_tokens),
+        ("response", report.profile.length.response_tokens),
+        ("total", report.profile.length.total_tokens),
+    ]
+    for label, stats in rows:
+        table.add_row(
+            label,
+            f"{stats.min:,}",
+            f"{stats.median:,.0f}",
+            f"{stats.mean:,.1f}",
+            f"{stats.p95:,.0f}",
+            f"{stats.p99:,.0f}",
+            f"{stats.max:,}",
+            f"{stats.total:,}",
+        )
+    return table
+
+
+def report_renderables(report: ProfileReport) -> list[RenderableType]:
+    """The Rich renderables that make up the CLI summary of a ProfileReport."""
+    profile = report.profile
+    parts: list[RenderableType] = [_overview_table(report), _length_table(report)]
+
+    turns = profile.turns
+    parts.append(
+        f"[bold]Turns[/bold]: min {turns.min}, median {turns.median:g}, "
+        f"mean {turns.mean:.1f}, max {turns.max}"
+    )
+    if profile.vocab.unique_tokens:
+        top = ", ".join(repr(token) for token, _ in profile.vocab.top_tokens[:10])
+        parts.append(
+            f"[bold]Vocabulary[/bold]: {profile.vocab.unique_tokens:,} unique tokens, "
+            f"TTR {profile.vocab.type_token_ratio:.3f}"
+        )
+        parts.append(f"  top: {top}")
+    if profile.language.primary_language:
+        languages = ", ".join(
+            f"{lang} ({count})"
+            for lang, count in sorted(profile.language.languages.items(), key=lambda kv: -kv[1])
+        )
+        parts.append(f"[bold]Languages[/bold]: {languages}")
+    if report.quality is not None and report.quality.issue_count:
+        parts.append(_quality_table(report.quality.store.counts()))
+    if report.estimate is not None:
+        parts.append(_estimate_table(report.estimate))
+    if report.timings:
+        parts.append(_timings_table(report.timings))
+    return parts
+
+
+def _estimate_table(estimate: SampleEstimate) -> Table:
+    table = Table(
+        title=f"Estimated from {estimate.sampled:,} sampled records ({estimate.confidence:.0%} CI)"
+    )
+    table.add_column("Metric")
+    for column in ("estimate", "low", "high"):
+        table.add_column(column, justify="right")
+    for name, interval in estimate.intervals.items():
+        table.add_row(
+            name + (" (%)" if name.startswith("language.") else ""),
+            f"{interval.value:,.1f}",
+            f"{interval.low:,.1f}",
+            f"{interval.high:,.1f}",
+        )
+    return table
+
+
+def _timings_table(timings: list[TimingSpan]) -> Table:
+    table = Table(title="Timings")
+    table.add_column("Stage")
+    for column in ("wall s", "CPU s", "samples", "samples/s", "RSS Δ MB"):
+        table.add_column(column, justify="right")
+    for timing in timings:
+        depth = timing.stage.count(".")
+        rate = timing.samples_per_second
+        table.add_row(
+            "  " * depth + timing.stage.rsplit(".", 1)[-1],
+            f"{timing.wall_seconds:,.3f}",
+            f"{timing.cpu_seconds:,.3f}",
+            f"{timing.samples:,}" if timing.samples else "",
+            "" if rate is None else f"{rate:,.0f}",
+            "" if timing.rss_delta_mb is None else f"{timing.rss_delta_mb:+,.1f}",
+        )
+    return table
 
 
 def print_report(report: ProfileReport, console: Console | None = None) -> None:
@@ -14,4 +137,255 @@ def print_report(report: ProfileReport, console: Console | None = None) -> None:
         report: ProfileReport to display.
         console: Optional Rich Console (creates one if not provided).
     """
-    raise NotImplementedError
+    console = console or Console()
+    for part in report_renderables(report):
+        console.print(part)
+
+
+def watch_renderable(
+    report: ProfileReport,
+    issue_counts: dict[tuple[QualityRule, QualitySeverity], int],
+    exact_duplicates: int,
+    near_duplicates: int,
+    bytes_read: int,
+) -> Group:
+    """Live view of a watched file: the profile summary plus running counts."""
+    parts = report_renderables(report)
+    if issue_counts:
+        parts.append(_quality_table(issue_counts))
+    near_share = 100.0 * near_duplicates / report.sample_count if report.sample_count else 0.0
+    return Group(
+        *parts,
+        f"[bold]Duplicates[/bold]: {exact_duplicates:,} exact, "
+        f"{near_duplicates:,} near-duplicate ({near_share:.1f}% of samples)",
+        f"[dim]{bytes_read:,} bytes read; waiting for more data (Ctrl-C to stop)[/dim]",
+    )
+
+
+def _quality_table(counts: dict[tuple[QualityRule, QualitySeverity], int]) -> Table:
+    table = Table(title="Quality issues")
+    table.add_column("Rule")
+    table.add_column("Severity")
+    table.add_column("Count", justify="right")
+    for (rule, severity), count in sorted(counts.items()):
+        table.add_row(rule.value, severity.value, f"{count:,}")
+    return table
+
+
+def print_quality_result(
+    result: QualityResult,
+    console: Console | None = None,
+    limit: int = MAX_LISTED_ISSUES,
+) -> None:
+    """Print quality findings grouped by rule, followed by the first issues.
+
+    Args:
+        result: QualityResult to display.
+        console: Optional Rich Console (creates one if not provided).
+        limit: Maximum number of individual issues to list.
+    """
+    console = console or Console()
+    if not result.issue_count:
+        console.print("[green]No quality issues found[/green]")
+        return
+
+    console.print(_quality_table(result.store.counts()))
+
+    for issue in result.store.page(0, limit):
+        where = (
+            "dataset"
+            if issue.sample_index == DATASET_LEVEL_INDEX
+            else f"sample {issue.sample_index}"
+        )
+        console.print(f"  {where}: [{issue.rule.value}] {issue.message}")
+    if result.issue_count > limit:
+        console.print(f"  ... and {result.issue_count - limit:,} more")
+    status = "[red]FAILED[/red]" if not result.passed else "[green]PASSED[/green]"
+    console.print(f"{status}: {result.error_count:,} errors, {result.warning_count:,} warnings")
+
+
+def print_redaction_result(result: RedactionResult, console: Console | None = None) -> None:
+    """Print a one-line summary of a PII redaction pass."""
+    console = console or Console()
+    by_type = ", ".join(f"{t} {n:,}" for t, n in sorted(result.redactions.items())) or "none"
+    console.print(
+        f"Wrote {result.sample_count:,} samples to {result.output_path}; "
+        f"redacted {result.total_redactions:,} spans in {result.redacted_samples:,} samples "
+        f"({by_type})"
+    )
+
+
+def print_reference_result(
+    result: ReferenceDedupResult,
+    console: Console | None = None,
+    cleaned: CleanedDataset | None = None,
+    limit: int = MAX_LISTED_CLUSTERS,
+) -> None:
+    """Print reference-index matches and any cleaned output.
+
+    Args:
+        result: ReferenceDedupResult to display.
+        console: Optional Rich Console (creates one if not provided).
+        cleaned: Summary of the copy without matched samples, if one was written.
+        limit: Maximum number of matches to list.
+    """
+    console = console or Console()
+    console.print(
+        f"{len(result.matches):,} of {result.sample_count:,} samples "
+        f"({result.match_percentage}%) match {result.index_path}"
+    )
+    if result.matches:
+        table = Table(title="Reference matches")
+        table.add_column("Sample", justify="right")
+        table.add_column("Reference")
+        table.add_column("Index", justify="right")
+        table.add_column("Similarity", justify="right")
+        table.add_column("Method")
+        for match in result.matches[:limit]:
+            table.add_row(
+                str(match.sample_index),
+                match.reference_path,
+                str(match.reference_index),
+                f"{match.similarity:.2f}",
+                match.method.value,
+            )
+        console.print(table)
+        if len(result.matches) > limit:
+            console.print(f"  ... and {len(result.matches) - limit:,} more matches")
+    if cleaned is not None:
+        where = ", ".join(cleaned.output_paths)
+        console.print(
+            f"Wrote {cleaned.kept:,} samples to {where}; dropped {cleaned.dropped:,} matched samples"
+        )
+
+
+def print_filter_result(result: FilterResult, console: Console | None = None) -> None:
+    """Print kept / dropped / redacted counts of a filter pass."""
+    console = console or Console()
+    reasons = ", ".join(f"{r} {n:,}" for r, n in sorted(result.dropped.items())) or "none"
+    by_type = ", ".join(f"{t} {n:,}" for t, n in sorted(result.redactions.items())) or "none"
+    console.print(
+        f"Kept {result.kept:,} of {result.sample_count:,} samples in {result.output_path}; "
+        f"dropped {result.total_dropped:,} ({reasons}); "
+        f"redacted PII in {result.redacted_samples:,} samples ({by_type})"
+    )
+    if result.log_path:
+        console.print(f"Decisions logged to {result.log_path}")
+
+
+def print_repeated_spans(
+    result: RepeatedSpanResult,
+    console: Console | None = None,
+    limit: int = MAX_LISTED_CLUSTERS,
+) -> None:
+    """Print the spans found by ``dedup --method substring``, most repeated tokens first.
+
+    Args:
+        result: RepeatedSpanResult to display.
+        console: Optional Rich Console (creates one if not provided).
+        limit: Maximum number of spans to list.
+    """
+    console = console or Console()
+    console.print(
+        f"{len(result.spans):,} spans of {result.min_tokens}+ tokens occur more than "
+        f"{result.max_occurrences:,} times; {result.affected_samples:,} of "
+        f"{result.sample_count:,} samples contain one"
+    )
+    if result.spans:
+        table = Table(title="Repeated spans")
+        table.add_column("Occurrences", justify="right")
+        table.add_column("Tokens", justify="right")
+        table.add_column("Samples", justify="right")
+        table.add_column("Text")
+        for repeated in result.spans[:limit]:
+            text = " ".join(repeated.text.split())
+            if len(text) > MAX_SPAN_PREVIEW:
+                text = text[: MAX_SPAN_PREVIEW - 3] + "..."
+            table.add_row(
+                f"{repeated.occurrences:,}",
+                f"{repeated.token_count:,}",
+                f"{len(repeated.sample_indices):,}",
+                text,
+            )
+        console.print(table)
+        if len(result.spans) > limit:
+            console.print(f"  ... and {len(result.spans) - limit:,} more spans")
+
+
+def print_dedup_result(
+    result: DedupResult,
+    sample_count: int,
+    console: Console | None = None,
+    cleaned: CleanedDataset | None = None,
+    limit: int = MAX_LISTED_CLUSTERS,
+) -> None:
+    """Print duplicate counts, the largest clusters and any cleaned output.
+
+    Args:
+        result: DedupResult to display.
+        sample_count: Samples in the analyzed dataset.
+        console: Optional Rich Console (creates one if not provided).
+        cleaned: Summary of the deduplicated copy, if one was written.
+        limit: Maximum number of clusters to list.
+    """
+    console = console or Console()
+    console.print(
+        f"{result.total_duplicates:,} duplicates ({result.duplicate_percentage}% of "
+        f"{sample_count:,} samples) in {len(result.clusters):,} clusters"
+    )
+    if result.clusters:
+        table = Table(title="Largest clusters")
+        table.add_column("Method")
+        table.add_column("Size", justify="right")
+        table.add_column("Samples")
+        clusters = sorted(result.clusters, key=lambda c: -len(c.indices))
+        for cluster in clusters[:limit]:
+            shown = ", ".join(str(i) for i in cluster.indices[:10])
+            more = ", ..." if len(cluster.indices) > 10 else ""
+            table.add_row(cluster.method.value, f"{len(cluster.indices):,}", shown + more)
+        console.print(table)
+        if len(clusters) > limit:
+            console.print(f"  ... and {len(clusters) - limit:,} more clusters")
+    if cleaned is not None:
+        where = ", ".join(cleaned.output_paths)
+        console.print(
+            f"Wrote {cleaned.kept:,} samples to {where}; dropped {cleaned.dropped:,} duplicates"
+        )
+
+
+def print_benchmark_report(
+    report: BenchmarkReport,
+    console: Console | None = None,
+    comparison: dict[str, float] | None = None,
+) -> None:
+    """Print per-stage benchmark throughput, optionally relative to a baseline.
+
+    Args:
+        report: BenchmarkReport to display.
+        console: Optional Rich Console (creates one if not provided).
+        comparison: Stage -> speed relative to a baseline (see compare_reports).
+    """
+    console = console or Console()
+    table = Table(
+        title=f"Benchmark: {report.sample_count:,} samples, "
+        f"{report.size_bytes / 1024 / 1024:,.1f} MB ({report.dataset_format.value})"
+    )
+    table.add_column("Stage")
+    for column in ("seconds", "samples/s", "MB/s", "peak RSS MB"):
+        table.add_column(column, justify="right")
+    if comparison is not None:
+        table.add_column("vs baseline", justify="right")
+    for timing in report.stages:
+        row = [
+            timing.stage,
+            f"{timing.seconds:,.3f}",
+            f"{timing.samples_per_second:,.0f}",
+            f"{timing.mb_per_second:,.2f}",
+            "-" if timing.peak_rss_mb is None else f"{timing.peak_rss_mb:,.0f}",
+        ]
+        if comparison is not None:
+            ratio = comparison.get(timing.stage)
+            style = "green" if ratio and ratio >= 1 else "red"
+            row.append("-" if ratio is None else f"[{style}]{ratio:.2f}x[/{style}]")
+        table.add_row(*row)
+    console.print(table)
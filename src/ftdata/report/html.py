@@ -4,8 +4,18 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
 from ftdata.core.models import ProfileReport
 
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+DEFAULT_TEMPLATE = "report.html.j2"
+
+# Individual findings and duplicate clusters listed in the report; the
+# per-rule counts always cover everything.
+MAX_LISTED_ISSUES = 200
+MAX_LISTED_CLUSTERS = 50
+
 
 def render_html_report(
     report: ProfileReport,
@@ -22,4 +32,25 @@ def render_html_report(
     Returns:
         Rendered HTML string.
     """
-    raise NotImplementedError
+    directory, name = (
+        (template_path.parent, template_path.name)
+        if template_path
+        else (TEMPLATES_DIR, DEFAULT_TEMPLATE)
+    )
+    env = Environment(
+        loader=FileSystemLoader(directory),
+        autoescape=select_autoescape(["html", "j2"], default_for_string=True),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    quality = report.quality
+    clusters = report.dedup.clusters if report.dedup is not None else []
+    html = env.get_template(name).render(
+        report=report,
+        issue_counts=sorted(quality.store.counts().items()) if quality is not None else [],
+        issues=quality.store.page(0, MAX_LISTED_ISSUES) if quality is not None else [],
+        clusters=sorted(clusters, key=lambda c: -len(c.indices))[:MAX_LISTED_CLUSTERS],
+    )
+    if output_path is not None:
+        output_path.write_text(html, encoding="utf-8")
+    return html
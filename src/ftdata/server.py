@@ -0,0 +1,281 @@
+"""Warm local server for repeated ftdata invocations (``ftdata serve``).
+
+A server process keeps analyzers imported and tiktoken encodings loaded,
+and runs CLI invocations sent to it over a Unix socket. The ``ftdata``
+entry point forwards the commands in ``SERVED_COMMANDS`` (profile, stats,
+check, dedup, filter, contamination, diversity and report) to a running
+server, so short checks from pre-commit or CI hooks skip interpreter and
+model start-up. Without a reachable server (or with ``FTDATA_NO_SERVER``
+set) commands run in-process as usual.
+
+Protocol: the client sends one JSON line ``{"argv", "cwd", "version",
+"env"}`` and the server answers with one JSON line ``{"exit_code",
+"stdout", "stderr"}``. Requests are handled one at a time. Relative paths
+resolve against the client's working directory (passed to the CLI as
+``--cwd``), and the client's ``FTDATA_*``, ``ANTHROPIC_*`` and cache
+variables replace the server's for the duration of the command. Besides
+the standard library this module only imports ``ftdata.__version__``,
+``ftdata.cache`` and ``ftdata.exceptions``. The CLI and analyzers are
+imported only when the server starts, so checking for a server costs the
+client almost nothing.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ftdata import __version__
+from ftdata.cache import default_cache_dir
+from ftdata.exceptions import ServerLostError, ServerRunningError
+
+SOCKET_FILENAME = "serve.sock"
+SOCKET_ENV = "FTDATA_SOCKET"
+NO_SERVER_ENV = "FTDATA_NO_SERVER"
+
+# Commands that a server runs on the client's behalf.
+SERVED_COMMANDS = frozenset(
+    {"profile", "stats", "check", "dedup", "filter", "contamination", "diversity", "report"}
+)
+# Global options taking a value, to find the command name in argv.
+_VALUE_OPTIONS = frozenset({"--config", "--cwd"})
+# Client environment that a forwarded command sees instead of the server's.
+FORWARDED_ENV_PREFIXES = ("FTDATA_", "ANTHROPIC_")
+FORWARDED_ENV = frozenset({"XDG_CACHE_HOME", "COLUMNS", "FORCE_COLOR", "NO_COLOR"})
+
+# Modules imported when the server starts.
+WARM_MODULES = (
+    "ftdata.dedup.minhash",
+    "ftdata.diversity.sketches",
+    "ftdata.profiling.stats",
+    "ftdata.quality.llm_judge",
+    "ftdata.quality.runner",
+    "ftdata.quality.sampling",
+    "ftdata.report.cli_report",
+    "datasketch",
+)
+
+
+def socket_path() -> Path:
+    """Server socket: $FTDATA_SOCKET, else ``serve.sock`` in the cache directory."""
+    override = os.environ.get(SOCKET_ENV)
+    return Path(override) if override else default_cache_dir() / SOCKET_FILENAME
+
+
+def served_command(argv: list[str]) -> str | None:
+    """The subcommand in `argv` if a server should run it, else None.
+
+    Long-running invocations (``--watch``) always run in the client.
+    """
+    if "--watch" in argv:
+        return None
+    args = iter(argv)
+    for arg in args:
+        if arg in ("--help", "--version"):
+            return None
+        if arg in _VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg if arg in SERVED_COMMANDS else None
+    return None
+
+
+def _connect(path: Path) -> socket.socket | None:
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path))
+    except OSError:
+        client.close()
+        return None
+    return client
+
+
+def _forwarded(name: str) -> bool:
+    return name in FORWARDED_ENV or name.startswith(FORWARDED_ENV_PREFIXES)
+
+
+def client_env() -> dict[str, str]:
+    """The client environment sent along with a forwarded command."""
+    env = {name: value for name, value in os.environ.items() if _forwarded(name)}
+    env["COLUMNS"] = str(shutil.get_terminal_size().columns)
+    if sys.stdout.isatty():
+        env.setdefault("FORCE_COLOR", "1")
+    return env
+
+
+def _send(client: socket.socket, request: dict[str, Any]) -> bool:
+    try:
+        client.sendall(json.dumps(request).encode() + b"\n")
+    except OSError:
+        client.close()
+        return False
+    return True
+
+
+def _receive(client: socket.socket) -> dict[str, Any] | None:
+    with client, client.makefile("rb") as stream:
+        line = stream.readline()
+    response: dict[str, Any] | None = json.loads(line) if line else None
+    return response
+
+
+def forward(argv: list[str], path: Path | None = None) -> int | None:
+    """Run `argv` on a running server and replay its output.
+
+    Args:
+        argv: CLI arguments (without the program name).
+        path: Server socket (defaults to socket_path()).
+
+    Returns:
+        The command's exit code, or None if no compatible server took the
+        command (the caller should then run the command itself).
+
+    Raises:
+        ServerLostError: If the server took the command but closed the
+            connection without an answer; running it again could repeat
+            its side effects.
+    """
+    path = path or socket_path()
+    client = _connect(path)
+    if client is None:
+        return None
+    request = {"argv": argv, "cwd": os.getcwd(), "version": __version__, "env": client_env()}
+    if not _send(client, request):
+        return None
+    try:
+        response = _receive(client)
+    except (OSError, ValueError) as e:
+        raise ServerLostError(str(path)) from e
+    if response is None:
+        raise ServerLostError(str(path))
+    if "exit_code" not in response:
+        return None  # version mismatch: the server ran nothing
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    sys.stderr.flush()
+    return int(response["exit_code"])
+
+
+def stop(path: Path | None = None) -> bool:
+    """Ask a running server to shut down. Returns False if none was running."""
+    client = _connect(path or socket_path())
+    if client is None:
+        return False
+    if _send(client, {"stop": True}):
+        with contextlib.suppress(OSError, ValueError):
+            _receive(client)
+    return True
+
+
+def warm(encoding_name: str) -> None:
+    """Import the analyzers and load the tiktoken encoding ahead of requests."""
+    import importlib
+
+    from ftdata.profiling.tokens import get_encoding
+
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+    get_encoding(encoding_name)
+
+
+def run_command(request: dict[str, Any]) -> dict[str, Any]:
+    """Run one forwarded CLI invocation in this process and capture its output.
+
+    The server's working directory is not changed: the client's is passed
+    to the CLI as ``--cwd``. Forwarded variables the client did not set
+    are unset while the command runs.
+    """
+    from click.testing import CliRunner
+
+    from ftdata.cli import cli
+
+    env: dict[str, str | None] = {name: None for name in os.environ if _forwarded(name)}
+    env.update(request.get("env") or {})
+    result = CliRunner().invoke(cli, ["--cwd", request["cwd"], *request["argv"]], env=env)
+    stderr = result.stderr
+    if result.exc_info is not None and not isinstance(result.exception, SystemExit):
+        stderr += "".join(traceback.format_exception(*result.exc_info))
+    return {"exit_code": result.exit_code, "stdout": result.stdout, "stderr": stderr}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: CommandServer
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        if request.get("stop"):
+            response: dict[str, Any] = {"stopping": True}
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif request.get("version") != __version__:
+            response = {"error": f"server runs ftdata {__version__}"}
+        else:
+            response = run_command(request)
+            self.server.served += 1
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    """Unix-socket server running forwarded CLI invocations one at a time."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.served = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Only the owner may connect: the server reads and writes their files.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), _Handler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+
+def serve(
+    path: Path | None = None,
+    encoding_name: str | None = None,
+    on_ready: Callable[[CommandServer], None] | None = None,
+) -> None:
+    """Serve CLI invocations on `path` until stopped.
+
+    Args:
+        path: Socket path (defaults to socket_path()).
+        encoding_name: tiktoken encoding to preload, if any.
+        on_ready: Called with the server once it is listening.
+
+    Raises:
+        ServerRunningError: If a server already answers on `path`.
+    """
+    path = path or socket_path()
+    existing = _connect(path)
+    if existing is not None:
+        existing.close()
+        raise ServerRunningError(str(path))
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()  # stale socket from a server that did not shut down cleanly
+    if encoding_name:
+        warm(encoding_name)
+    with CommandServer(path) as server:
+        if on_ready is not None:
+            on_ready(server)
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
@@ -0,0 +1,154 @@
+"""Per-stage wall time, CPU time and memory spans for pipeline runs.
+
+Library code wraps each stage in ``with span("tokenize") as s: ...`` and
+sets ``s.samples`` to the number of samples it processed. Spans are only
+recorded inside ``record_timings()``; otherwise span() returns a shared
+no-op, so an uninstrumented run pays one context-variable lookup per
+stage. Spans opened inside another span are named ``parent.child``.
+
+CPU time is this process's (all threads); work done in worker processes
+shows up as wall time only.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+# Kept light to import, like ftdata.cache: TimingSpan (pydantic) is only
+# built once a recorded span closes.
+if TYPE_CHECKING:
+    from ftdata.core.models import TimingSpan
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def current_rss_bytes() -> int | None:
+    """Current resident set size, falling back to the peak where it is not exposed."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return peak_rss_bytes()
+
+
+class Span:
+    """An open timing span; set ``samples`` to the number of samples processed."""
+
+    __slots__ = ("_cpu", "_recorder", "_rss", "_slot", "_wall", "name", "samples")
+
+    def __init__(self, recorder: TimingRecorder | None, name: str, samples: int) -> None:
+        self._recorder = recorder
+        self.name = name
+        self.samples = samples
+
+    def __enter__(self) -> Span:
+        recorder = self._recorder
+        if recorder is not None:
+            if recorder._open:
+                self.name = f"{recorder._open[-1].name}.{self.name}"
+            recorder._open.append(self)
+            # Reserve the slot now so parents are listed before their children.
+            self._slot = len(recorder._spans)
+            recorder._spans.append(None)
+            self._rss = current_rss_bytes()
+            self._cpu = time.process_time()
+            self._wall = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        recorder = self._recorder
+        if recorder is None:
+            return
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        rss = current_rss_bytes()
+        recorder._open.pop()
+
+        from ftdata.core.models import TimingSpan
+
+        delta = None if rss is None or self._rss is None else (rss - self._rss) / 1024 / 1024
+        recorder._spans[self._slot] = TimingSpan(
+            stage=self.name,
+            wall_seconds=round(wall, 6),
+            cpu_seconds=round(cpu, 6),
+            samples=self.samples,
+            rss_delta_mb=None if delta is None else round(delta, 1),
+        )
+
+
+# Returned by span() when nothing is recording; setting samples on it is harmless.
+_NULL_SPAN = Span(None, "", 0)
+
+
+class TimingRecorder:
+    """Collects the spans closed while it is active (see record_timings)."""
+
+    def __init__(self) -> None:
+        self._spans: list[TimingSpan | None] = []
+        self._open: list[Span] = []
+
+    @property
+    def spans(self) -> list[TimingSpan]:
+        """Closed spans in the order they were opened."""
+        return [s for s in self._spans if s is not None]
+
+
+_recorder: ContextVar[TimingRecorder | None] = ContextVar("ftdata_timing", default=None)
+
+
+def span(name: str, samples: int = 0) -> Span:
+    """Context manager timing one stage if a recorder is active, else a no-op.
+
+    Args:
+        name: Stage name (nested spans are prefixed with their parent's).
+        samples: Samples processed, if known up front; may also be set on
+            the returned span before it closes.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NULL_SPAN
+    return Span(recorder, name, samples)
+
+
+@contextmanager
+def record_timings(enabled: bool = True) -> Iterator[TimingRecorder]:
+    """Record the spans opened in this context.
+
+    Args:
+        enabled: When False, nothing is recorded and the recorder stays empty.
+
+    Yields:
+        The TimingRecorder collecting the spans.
+    """
+    recorder = TimingRecorder()
+    if not enabled:
+        yield recorder
+        return
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
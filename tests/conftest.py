@@ -11,6 +11,10 @@ from ftdata.core.models import Dataset, DatasetFormat, Message, Sample
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures" / "datasets"
 
+# Byte-level tiktoken encoding registered for tests, so tokenization runs
+# without downloading BPE files.
+TEST_ENCODING = "ftdata_test_bytes"
+
 
 def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
     """Auto-apply markers based on test directory."""
@@ -24,6 +28,42 @@ def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
             item.add_marker(pytest.mark.e2e)
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Point the result cache at a per-test directory."""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("FTDATA_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(scope="session")
+def test_encoding() -> str:
+    """Name of an offline byte-level tiktoken encoding (one token per byte)."""
+    import tiktoken
+    import tiktoken.registry
+
+    tiktoken.registry.ENCODINGS.setdefault(
+        TEST_ENCODING,
+        tiktoken.Encoding(
+            name=TEST_ENCODING,
+            pat_str=r"\s+|\S+",
+            mergeable_ranks={bytes([i]): i for i in range(256)},
+            special_tokens={},
+        ),
+    )
+    return TEST_ENCODING
+
+
+@pytest.fixture
+def test_config_path(tmp_path: Path, test_encoding: str) -> Path:
+    """A .ftdata.yaml that selects the offline test encoding."""
+    config_path = tmp_path / ".ftdata.yaml"
+    config_path.write_text(f"profiling:\n  token_encoding: {test_encoding}\n")
+    return config_path
+
+
 @pytest.fixture
 def fixtures_dir() -> Path:
     """Path to the test fixtures/datasets directory."""
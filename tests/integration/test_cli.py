@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
+import pytest
 from click.testing import CliRunner
 
 from ftdata.cli import cli
@@ -20,25 +24,293 @@ class TestCli:
         assert result.exit_code == 0
         assert "0.1.0" in result.output
 
-    def test_profile_stub(self, minimal_dataset_path: str) -> None:
+    def test_profile(self, minimal_dataset_path: Path, test_config_path: Path) -> None:
         runner = CliRunner()
-        result = runner.invoke(cli, ["profile", str(minimal_dataset_path)])
-        assert "Not yet implemented" in result.output
+        result = runner.invoke(
+            cli, ["--config", str(test_config_path), "profile", str(minimal_dataset_path)]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Token lengths" in result.output
 
-    def test_check_stub(self, minimal_dataset_path: str) -> None:
+    def test_profile_json(self, minimal_dataset_path: Path, test_config_path: Path) -> None:
         runner = CliRunner()
-        result = runner.invoke(cli, ["check", str(minimal_dataset_path)])
-        assert "Not yet implemented" in result.output
+        result = runner.invoke(
+            cli,
+            ["--config", str(test_config_path), "--json", "profile", str(minimal_dataset_path)],
+        )
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.output)
+        assert report["sample_count"] == 2
+        assert report["profile"]["total_tokens"] > 0
 
-    def test_dedup_stub(self, minimal_dataset_path: str) -> None:
+    def test_profile_populates_cache(
+        self, minimal_dataset_path: Path, test_config_path: Path
+    ) -> None:
         runner = CliRunner()
-        result = runner.invoke(cli, ["dedup", str(minimal_dataset_path)])
-        assert "Not yet implemented" in result.output
+        runner.invoke(
+            cli, ["--config", str(test_config_path), "profile", str(minimal_dataset_path)]
+        )
+        result = runner.invoke(cli, ["--json", "cache", "stats"])
+        assert result.exit_code == 0, result.output
+        # Token counts and languages for each of the two samples.
+        assert json.loads(result.output)["entries"] == 4
 
-    def test_stats_stub(self, minimal_dataset_path: str) -> None:
+    def test_no_cache(self, minimal_dataset_path: Path, test_config_path: Path) -> None:
         runner = CliRunner()
-        result = runner.invoke(cli, ["stats", str(minimal_dataset_path)])
-        assert "Not yet implemented" in result.output
+        runner.invoke(
+            cli,
+            ["--config", str(test_config_path), "--no-cache", "profile", str(minimal_dataset_path)],
+        )
+        result = runner.invoke(cli, ["--json", "cache", "stats"])
+        assert json.loads(result.output)["entries"] == 0
+
+    def test_cache_prune_all(self, minimal_dataset_path: Path, test_config_path: Path) -> None:
+        runner = CliRunner()
+        runner.invoke(
+            cli, ["--config", str(test_config_path), "profile", str(minimal_dataset_path)]
+        )
+        result = runner.invoke(cli, ["cache", "prune", "--all"])
+        assert result.exit_code == 0, result.output
+        assert "Removed 4 cache entries" in result.output
+
+    def test_profile_unknown_format(self, tmp_path: Path) -> None:
+        unknown = tmp_path / "data.jsonl"
+        unknown.write_text('{"text": "hello"}\n')
+        runner = CliRunner()
+        result = runner.invoke(cli, ["profile", str(unknown)])
+        assert result.exit_code != 0
+        assert "Cannot detect format" in result.output
+
+    def test_check(self, minimal_dataset_path: Path, test_config_path: Path) -> None:
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["--config", str(test_config_path), "check", str(minimal_dataset_path)]
+        )
+        assert result.exit_code == 0, result.output
+        assert "PASSED" in result.output
+
+    def test_check_fails_on_errors(
+        self, quality_issues_dataset_path: Path, test_config_path: Path
+    ) -> None:
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "--config",
+                str(test_config_path),
+                "--json",
+                "check",
+                str(quality_issues_dataset_path),
+            ],
+        )
+        assert result.exit_code == 1
+        issues = json.loads(result.output)["issues"]
+        assert {i["rule"] for i in issues} >= {"FT001", "FT002", "FT009"}
+
+    def test_check_redact_pii(self, quality_issues_dataset_path: Path, tmp_path: Path) -> None:
+        output = tmp_path / "clean.jsonl"
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "--json",
+                "check",
+                str(quality_issues_dataset_path),
+                "--redact-pii",
+                "-o",
+                str(output),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        summary = json.loads(result.output)
+        assert summary["total_redactions"] == 5
+        assert summary["redacted_samples"] == 1
+        assert "<SSN>" in output.read_text()
+
+    def test_check_redact_pii_requires_output(self, quality_issues_dataset_path: Path) -> None:
+        runner = CliRunner()
+        result = runner.invoke(cli, ["check", str(quality_issues_dataset_path), "--redact-pii"])
+        assert result.exit_code == 2
+        assert "--redact-pii requires --output" in result.output
+
+    def test_check_output_requires_redact_pii(
+        self, quality_issues_dataset_path: Path, tmp_path: Path
+    ) -> None:
+        output = tmp_path / "clean.jsonl"
+        runner = CliRunner()
+        result = runner.invoke(cli, ["check", str(quality_issues_dataset_path), "-o", str(output)])
+        assert result.exit_code == 2
+        assert "--output requires --redact-pii" in result.output
+        assert not output.exists()
+
+    @pytest.mark.parametrize(
+        ("options", "message"),
+        [
+            (["--llm-judge", "--judge-samples", "0"], "0 is not in the range x>=1"),
+            (["--judge-samples", "10"], "--judge-samples requires --llm-judge"),
+        ],
+    )
+    def test_check_judge_samples_usage(
+        self, quality_issues_dataset_path: Path, options: list[str], message: str
+    ) -> None:
+        runner = CliRunner()
+        result = runner.invoke(cli, ["check", str(quality_issues_dataset_path), *options])
+        assert result.exit_code == 2
+        assert message in result.output
+
+    def test_dedup(self, duplicates_dataset_path: Path, test_config_path: Path) -> None:
+        runner = CliRunner()
+        args = ["--config", str(test_config_path), "dedup", str(duplicates_dataset_path)]
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 0, result.output
+        assert "2 duplicates" in result.output
+
+    def test_dedup_output(
+        self, duplicates_dataset_path: Path, test_config_path: Path, tmp_path: Path
+    ) -> None:
+        runner = CliRunner()
+        output = tmp_path / "clean.jsonl"
+        args = ["--config", str(test_config_path), "--json", "dedup"]
+        result = runner.invoke(cli, [*args, str(duplicates_dataset_path), "-o", str(output)])
+        assert result.exit_code == 0, result.output
+        cleaned = json.loads(result.output)["cleaned"]
+        assert (cleaned["kept"], cleaned["dropped"]) == (4, 2)
+        assert len(output.read_text().splitlines()) == 4
+
+        result = runner.invoke(cli, [*args, str(duplicates_dataset_path), "--shard-size", "1MB"])
+        assert result.exit_code == 2
+        assert "--shard-size requires --output" in result.output
+
+    def test_dedup_external(self, duplicates_dataset_path: Path, test_config_path: Path) -> None:
+        runner = CliRunner()
+        args = ["--config", str(test_config_path), "--json", "dedup"]
+        result = runner.invoke(cli, [*args, str(duplicates_dataset_path), "--external"])
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.output)
+        assert [c["indices"] for c in report["clusters"]] == [[0, 1], [3, 4]]
+
+        result = runner.invoke(
+            cli, [*args, str(duplicates_dataset_path), "--external", "--method", "minhash"]
+        )
+        assert result.exit_code == 2
+        assert "--external only applies" in result.output
+
+    def test_dedup_substring(self, duplicates_dataset_path: Path, test_config_path: Path) -> None:
+        runner = CliRunner()
+        args = ["--config", str(test_config_path), "--json", "dedup", "--method", "substring"]
+        result = runner.invoke(
+            cli,
+            [*args, str(duplicates_dataset_path), "--min-tokens", "20", "--max-occurrences", "2"],
+        )
+        assert result.exit_code == 0, result.output
+        spans = json.loads(result.output)["spans"]
+        # Shared by the two exact duplicates and the paraphrase; one token per byte.
+        assert [(s["text"], s["occurrences"], s["sample_indices"]) for s in spans] == [
+            (" programming language known for its simpl", 3, [0, 1, 2]),
+            ("What is Python?\nPython is a ", 3, [0, 1, 2]),
+        ]
+
+        result = runner.invoke(cli, [*args, str(duplicates_dataset_path), "-o", "out.jsonl"])
+        assert result.exit_code == 2
+        assert "--method substring reports spans" in result.output
+
+    def test_dedup_against_reference_index(
+        self, duplicates_dataset_path: Path, test_config_path: Path, tmp_path: Path
+    ) -> None:
+        runner = CliRunner()
+        config = ["--config", str(test_config_path), "--json"]
+        ref = tmp_path / "ref"
+        result = runner.invoke(
+            cli, [*config, "build-index", str(ref), str(duplicates_dataset_path)]
+        )
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.output)["sample_count"] == 6
+
+        output = tmp_path / "clean.jsonl"
+        args = ["dedup", str(duplicates_dataset_path), "--against", str(ref), "-o", str(output)]
+        result = runner.invoke(cli, [*config, *args])
+        assert result.exit_code == 0, result.output
+        matched = json.loads(result.output)
+        # Duplicates within the reference resolve to their first copy.
+        assert [m["reference_index"] for m in matched["matches"]] == [0, 0, 2, 3, 3, 5]
+        assert matched["cleaned"]["kept"] == 0
+        assert output.read_text() == ""
+
+    def test_filter(
+        self, quality_issues_dataset_path: Path, test_config_path: Path, tmp_path: Path
+    ) -> None:
+        runner = CliRunner()
+        output = tmp_path / "clean.jsonl"
+        args = ["--config", str(test_config_path), "--json", "filter"]
+        result = runner.invoke(cli, [*args, str(quality_issues_dataset_path), "-o", str(output)])
+        assert result.exit_code == 0, result.output
+        summary = json.loads(result.output)
+        assert (summary["kept"], summary["total_dropped"]) == (4, 1)
+        assert summary["log_path"] == str(tmp_path / "clean.decisions.jsonl")
+        assert len((tmp_path / "clean.decisions.jsonl").read_text().splitlines()) == 5
+
+        test_config_path.write_text(
+            test_config_path.read_text() + "contamination:\n  benchmarks: [mmlu]\n"
+        )
+        output.unlink()
+        result = runner.invoke(cli, [*args, str(quality_issues_dataset_path), "-o", str(output)])
+        assert result.exit_code == 1
+        assert "contamination checks are not available yet" in result.output
+        assert not output.exists()
+
+    def test_stats(self, minimal_dataset_path: Path, test_config_path: Path) -> None:
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["--config", str(test_config_path), "stats", str(minimal_dataset_path)]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Turns" in result.output
+
+    def test_stats_sampled(self, chatml_dataset_path: Path, test_config_path: Path) -> None:
+        runner = CliRunner()
+        args = ["--config", str(test_config_path), "--json", "stats", str(chatml_dataset_path)]
+        result = runner.invoke(cli, [*args, "--sample", "20", "--seed", "1"])
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.output)
+        assert report["estimate"]["sampled"] == 20
+        assert "total_tokens" in report["estimate"]["intervals"]
+
+        result = runner.invoke(cli, [*args, "--time-budget", "soon"])
+        assert result.exit_code != 0
+        assert "not a duration" in result.output
+
+    def test_bench(self, tmp_path: Path) -> None:
+        runner = CliRunner()
+        output = tmp_path / "bench.json"
+        args = ["bench", "--samples", "200", "--stage", "load", "--stage", "exact_dedup"]
+        result = runner.invoke(cli, [*args, "--in-process", "-o", str(output)])
+        assert result.exit_code == 0, result.output
+        assert "exact_dedup" in result.output
+        saved = json.loads(output.read_text())
+        assert saved["sample_count"] == 200
+        assert [s["stage"] for s in saved["stages"]] == ["load", "exact_dedup"]
+
+        result = runner.invoke(cli, ["--json", *args, "--in-process", "--baseline", str(output)])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.output)["sample_count"] == 200
+
+    def test_bench_unknown_stage(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(cli, ["bench", "--stage", "nope"])
+        assert result.exit_code == 2
+        assert "nope" in result.output
+
+    def test_strict_matches_default(
+        self, quality_issues_dataset_path: Path, test_config_path: Path
+    ) -> None:
+        runner = CliRunner()
+        args = ["--config", str(test_config_path), "--json"]
+        outputs = [
+            runner.invoke(cli, [*args, *extra, "profile", str(quality_issues_dataset_path)])
+            for extra in ([], ["--strict"])
+        ]
+        assert all(r.exit_code == 0 for r in outputs), outputs[0].output
+        assert outputs[0].output == outputs[1].output
 
     def test_contamination_stub(self, minimal_dataset_path: str) -> None:
         runner = CliRunner()
@@ -50,10 +322,53 @@ class TestCli:
         result = runner.invoke(cli, ["diversity", str(minimal_dataset_path)])
         assert "Not yet implemented" in result.output
 
-    def test_report_stub(self, minimal_dataset_path: str) -> None:
+    def test_profile_timings(self, minimal_dataset_path: Path, test_config_path: Path) -> None:
         runner = CliRunner()
-        result = runner.invoke(cli, ["report", str(minimal_dataset_path)])
-        assert "Not yet implemented" in result.output
+        args = ["--config", str(test_config_path), "--json"]
+        result = runner.invoke(cli, [*args, "profile", str(minimal_dataset_path)])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.output)["timings"] == []
+
+        result = runner.invoke(cli, [*args, "--timings", "profile", str(minimal_dataset_path)])
+        assert result.exit_code == 0, result.output
+        stages = [t["stage"] for t in json.loads(result.output)["timings"]]
+        assert stages == [
+            "load",
+            "profile",
+            "profile.tokenize",
+            "profile.stats",
+            "profile.language",
+        ]
+
+        result = runner.invoke(
+            cli,
+            ["--config", str(test_config_path), "--timings", "profile", str(minimal_dataset_path)],
+        )
+        assert result.exit_code == 0, result.output
+        assert "Timings" in result.output
+
+    def test_report(
+        self, quality_issues_dataset_path: Path, test_config_path: Path, tmp_path: Path
+    ) -> None:
+        runner = CliRunner()
+        output = tmp_path / "report.html"
+        result = runner.invoke(
+            cli,
+            [
+                "--config",
+                str(test_config_path),
+                "--timings",
+                "report",
+                str(quality_issues_dataset_path),
+                "-o",
+                str(output),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        html = output.read_text()
+        assert html.startswith("<!DOCTYPE html>")
+        for section in ("Token lengths", "Quality", "Duplicates", "Timings", "exact_dedup"):
+            assert section in html
 
     def test_init_stub(self) -> None:
         runner = CliRunner()
@@ -0,0 +1,209 @@
+"""Integration tests for `ftdata serve` and transparent forwarding."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from ftdata import server
+from ftdata.cli import cli, main
+from ftdata.exceptions import ServerLostError, ServerRunningError
+
+
+@pytest.fixture
+def running_server(isolated_cache_dir: Path, test_encoding: str) -> Iterator[server.CommandServer]:
+    ready = threading.Event()
+    started: list[server.CommandServer] = []
+
+    def on_ready(instance: server.CommandServer) -> None:
+        started.append(instance)
+        ready.set()
+
+    thread = threading.Thread(
+        target=server.serve, args=(None, test_encoding, on_ready), daemon=True
+    )
+    thread.start()
+    assert ready.wait(10)
+    yield started[0]
+    server.stop()
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+class TestServedCommand:
+    @pytest.mark.parametrize(
+        ("argv", "expected"),
+        [
+            (["stats", "data.jsonl"], "stats"),
+            (["--config", "check", "--json", "check", "x"], "check"),
+            (["-q", "profile", "x"], "profile"),
+            (["cache", "stats"], None),
+            (["serve"], None),
+            (["profile", "--watch", "x"], None),
+            (["--version"], None),
+            ([], None),
+        ],
+    )
+    def test_detects_command(self, argv: list[str], expected: str | None) -> None:
+        assert server.served_command(argv) == expected
+
+
+class TestServer:
+    def test_forwards_commands(
+        self,
+        running_server: server.CommandServer,
+        minimal_dataset_path: Path,
+        test_config_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        argv = ["--config", str(test_config_path), "--json", "stats", str(minimal_dataset_path)]
+        assert server.forward(argv) == 0
+        forwarded = capsys.readouterr().out
+
+        direct = CliRunner().invoke(cli, argv)
+        assert forwarded == direct.output
+        assert running_server.served == 1
+
+    def test_exit_code_and_errors(
+        self,
+        running_server: server.CommandServer,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        missing = tmp_path / "missing.jsonl"
+        assert server.forward(["stats", str(missing)]) == 2
+        assert "does not exist" in capsys.readouterr().err
+
+    def test_runs_in_client_directory(
+        self,
+        running_server: server.CommandServer,
+        minimal_dataset_path: Path,
+        test_config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.chdir(minimal_dataset_path.parent)
+        argv = ["--config", str(test_config_path), "stats", minimal_dataset_path.name]
+        assert server.forward(argv) == 0
+        assert "Token lengths" in capsys.readouterr().out
+
+    def test_resolves_paths_without_chdir(
+        self,
+        minimal_dataset_path: Path,
+        test_config_path: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        # The client's directory holds the dataset and its .ftdata.yaml.
+        client_dir = test_config_path.parent
+        (client_dir / "data.jsonl").write_bytes(minimal_dataset_path.read_bytes())
+        server_dir = tmp_path / "server"
+        server_dir.mkdir()
+        monkeypatch.chdir(server_dir)
+        monkeypatch.setattr(os, "chdir", None)
+        response = server.run_command({"argv": ["stats", "data.jsonl"], "cwd": str(client_dir)})
+        assert response["exit_code"] == 0, response["stderr"]
+        assert "Token lengths" in response["stdout"]
+        assert Path.cwd() == server_dir
+
+    def test_uses_client_environment(
+        self, isolated_cache_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("FTDATA_NO_SUCH_SETTING", "server")
+        request = {
+            "argv": ["--json", "cache", "stats"],
+            "cwd": str(tmp_path),
+            "env": {"XDG_CACHE_HOME": str(tmp_path / "client-cache")},
+        }
+        response = server.run_command(request)
+        assert response["exit_code"] == 0, response["stderr"]
+        # The server's FTDATA_CACHE_DIR is not the client's, so it is unset.
+        assert json.loads(response["stdout"])["path"].startswith(str(tmp_path / "client-cache"))
+        assert os.environ["FTDATA_CACHE_DIR"] == str(isolated_cache_dir)
+        assert os.environ["FTDATA_NO_SUCH_SETTING"] == "server"
+
+    def test_client_environment_is_sent(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("FTDATA_CACHE_DIR", "/data/cache")
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "key")
+        monkeypatch.setenv("UNRELATED", "x")
+        env = server.client_env()
+        assert env["FTDATA_CACHE_DIR"] == "/data/cache"
+        assert env["ANTHROPIC_API_KEY"] == "key"
+        assert "UNRELATED" not in env
+        assert "COLUMNS" in env
+
+    def test_second_server_refused(self, running_server: server.CommandServer) -> None:
+        with pytest.raises(ServerRunningError):
+            server.serve(running_server.path)
+
+    def test_main_uses_server(
+        self,
+        running_server: server.CommandServer,
+        minimal_dataset_path: Path,
+        test_config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        argv = ["ftdata", "--config", str(test_config_path), "stats", str(minimal_dataset_path)]
+        monkeypatch.setattr("sys.argv", argv)
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code == 0
+        assert running_server.served == 1
+
+
+class TestWithoutServer:
+    def test_forward_returns_none(self, isolated_cache_dir: Path) -> None:
+        assert server.forward(["stats", "x"]) is None
+        assert not server.stop()
+
+    def test_stale_socket_is_ignored(self, isolated_cache_dir: Path) -> None:
+        server.socket_path().write_text("")
+        assert server.forward(["stats", "x"]) is None
+
+
+@pytest.fixture
+def dying_server(isolated_cache_dir: Path) -> Iterator[Path]:
+    """A server that reads one request and hangs up without answering."""
+    path = server.socket_path()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen(1)
+
+    def accept() -> None:
+        connection, _ = listener.accept()
+        with connection, connection.makefile("rb") as stream:
+            stream.readline()
+
+    thread = threading.Thread(target=accept, daemon=True)
+    thread.start()
+    yield path
+    thread.join(10)
+    listener.close()
+
+
+class TestServerLost:
+    def test_forward_raises(self, dying_server: Path) -> None:
+        with pytest.raises(ServerLostError, match="closed the connection"):
+            server.forward(["stats", "x"])
+
+    def test_main_does_not_rerun(
+        self,
+        dying_server: Path,
+        minimal_dataset_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.setattr("sys.argv", ["ftdata", "stats", str(minimal_dataset_path)])
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "closed the connection" in captured.err
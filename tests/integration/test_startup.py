@@ -0,0 +1,67 @@
+"""Startup-time checks: the CLI must not import analyzers it does not need."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+import ftdata
+from ftdata.core import models
+
+# Wall-clock budget for `ftdata --version` in a fresh interpreter (best of
+# several runs, so one slow run on a loaded machine does not fail the suite).
+STARTUP_BUDGET_SECONDS = 0.5
+RUNS = 3
+
+HEAVY_MODULES = [
+    "anthropic",
+    "datasketch",
+    "jinja2",
+    "numpy",
+    "pydantic",
+    "rich",
+    "tiktoken",
+    "torch",
+    "yaml",
+]
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def test_cli_import_is_light() -> None:
+    code = (
+        "import json, sys\n"
+        "import ftdata, ftdata.cli\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    assert json.loads(_run(code)) == []
+
+
+def test_version_within_budget() -> None:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-m", "ftdata", "--version"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        timings.append(time.perf_counter() - start)
+        assert ftdata.__version__ in result.stdout
+    assert min(timings) < STARTUP_BUDGET_SECONDS, timings
+
+
+def test_lazy_package_attributes() -> None:
+    assert ftdata.Dataset is models.Dataset
+    assert "QualityResult" in dir(ftdata)
+    with pytest.raises(AttributeError):
+        _ = ftdata.not_a_name  # type: ignore[attr-defined]
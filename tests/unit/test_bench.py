@@ -0,0 +1,105 @@
+"""Tests for the synthetic dataset generator and benchmark suite."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from ftdata.bench.suite import compare_reports, run_benchmarks
+from ftdata.bench.synthetic import PII_SNIPPETS, generate_dataset
+from ftdata.core.loader import detect_format, load_dataset
+from ftdata.core.models import BenchmarkReport, DatasetFormat, StageTiming
+from ftdata.dedup.exact import find_exact_duplicates
+
+
+class TestGenerateDataset:
+    def test_deterministic(self, tmp_path: Path) -> None:
+        first = generate_dataset(tmp_path / "a.jsonl", samples=200, seed=3)
+        second = generate_dataset(tmp_path / "b.jsonl", samples=200, seed=3)
+        other = generate_dataset(tmp_path / "c.jsonl", samples=200, seed=4)
+        assert first.read_bytes() == second.read_bytes()
+        assert first.read_bytes() != other.read_bytes()
+
+    @pytest.mark.parametrize(
+        "fmt", [DatasetFormat.CHATML, DatasetFormat.ALPACA, DatasetFormat.SHAREGPT]
+    )
+    def test_formats_load(self, tmp_path: Path, fmt: DatasetFormat) -> None:
+        path = generate_dataset(tmp_path / "data.jsonl", samples=50, format=fmt, max_turns=4)
+        assert detect_format(path) == fmt
+        dataset = load_dataset(path)
+        assert dataset.sample_count == 50
+        max_turns = 2 if fmt == DatasetFormat.ALPACA else 8
+        assert all(2 <= s.turn_count <= max_turns + 1 for s in dataset.samples)
+
+    def test_duplicates_and_pii(self, tmp_path: Path) -> None:
+        path = generate_dataset(
+            tmp_path / "data.jsonl", samples=2000, duplicate_rate=0.1, pii_rate=0.1
+        )
+        dataset = load_dataset(path)
+        duplicates = find_exact_duplicates(dataset).total_duplicates
+        assert 120 <= duplicates <= 280
+        with_pii = sum(
+            any(snippet in s.raw_content for snippet in PII_SNIPPETS) for s in dataset.samples
+        )
+        assert with_pii >= 100
+
+    def test_no_duplicates(self, tmp_path: Path) -> None:
+        path = generate_dataset(tmp_path / "data.jsonl", samples=300, duplicate_rate=0.0)
+        assert find_exact_duplicates(load_dataset(path)).total_duplicates == 0
+
+
+class TestRunBenchmarks:
+    def test_in_process(self, tmp_path: Path, test_encoding: str) -> None:
+        path = generate_dataset(tmp_path / "data.jsonl", samples=100)
+        seen: list[str] = []
+        report = run_benchmarks(
+            path,
+            ["load", "tokenize", "exact_dedup", "profile"],
+            test_encoding,
+            repeat=2,
+            isolated=False,
+            on_stage=lambda timing: seen.append(timing.stage),
+        )
+        assert seen == ["load", "tokenize", "exact_dedup", "profile"]
+        assert [t.stage for t in report.stages] == seen
+        assert report.sample_count == 100
+        assert report.size_bytes == path.stat().st_size
+        assert report.dataset_format == DatasetFormat.CHATML
+        assert not report.isolated
+        for timing in report.stages:
+            assert timing.seconds > 0
+            assert timing.samples_per_second > 0
+            assert timing.peak_rss_mb is None or timing.peak_rss_mb > 0
+
+    def test_isolated(self, tmp_path: Path) -> None:
+        path = generate_dataset(tmp_path / "data.jsonl", samples=50)
+        report = run_benchmarks(path, ["load", "exact_dedup"])
+        assert report.isolated
+        assert [t.stage for t in report.stages] == ["load", "exact_dedup"]
+
+    def test_unknown_stage(self, tmp_path: Path) -> None:
+        path = generate_dataset(tmp_path / "data.jsonl", samples=10)
+        with pytest.raises(ValueError, match="nope"):
+            run_benchmarks(path, ["load", "nope"], isolated=False)
+
+
+def test_compare_reports() -> None:
+    def report(rates: dict[str, float]) -> BenchmarkReport:
+        return BenchmarkReport(
+            ftdata_version="0",
+            python_version="3",
+            platform="test",
+            dataset_path="data.jsonl",
+            dataset_format=DatasetFormat.CHATML,
+            sample_count=100,
+            size_bytes=1000,
+            stages=[
+                StageTiming(stage=s, seconds=1.0, samples_per_second=r, mb_per_second=1.0)
+                for s, r in rates.items()
+            ],
+        )
+
+    baseline = report({"load": 100.0, "pii": 50.0})
+    current = report({"load": 200.0, "pii": 25.0, "language": 10.0})
+    assert compare_reports(baseline, current) == {"load": 2.0, "pii": 0.5}
@@ -0,0 +1,110 @@
+"""Tests for the persistent per-sample result cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from ftdata.cache import ResultCache, config_hash, map_cached
+from ftdata.config import QualityConfig
+from ftdata.core.models import Sample
+
+
+def _samples(*contents: str) -> list[Sample]:
+    return [Sample(raw_content=c, index=i) for i, c in enumerate(contents)]
+
+
+class TestConfigHash:
+    def test_stable_across_key_order(self) -> None:
+        assert config_hash({"a": 1, "b": 2}) == config_hash({"b": 2, "a": 1})
+
+    def test_pydantic_model(self) -> None:
+        assert config_hash(QualityConfig()) != config_hash(QualityConfig(max_response_tokens=10))
+
+
+class TestResultCache:
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        with ResultCache(tmp_path / "c.sqlite3") as cache:
+            cache.put_many("tokens", "cfg", {"h1": [1, 2], "h2": {"x": "y"}})
+            found = cache.get_many("tokens", "cfg", ["h1", "h2", "h3"])
+        assert found == {"h1": [1, 2], "h2": {"x": "y"}}
+
+    def test_persists_across_opens(self, tmp_path: Path) -> None:
+        path = tmp_path / "c.sqlite3"
+        with ResultCache(path) as cache:
+            cache.put_many("tokens", "cfg", {"h1": 1})
+        with ResultCache(path) as cache:
+            assert cache.get_many("tokens", "cfg", ["h1"]) == {"h1": 1}
+
+    def test_key_includes_analyzer_config_and_version(self, tmp_path: Path) -> None:
+        path = tmp_path / "c.sqlite3"
+        with ResultCache(path, version="1.0") as cache:
+            cache.put_many("tokens", "cfg", {"h1": 1})
+            assert cache.get_many("pii", "cfg", ["h1"]) == {}
+            assert cache.get_many("tokens", "other", ["h1"]) == {}
+        with ResultCache(path, version="2.0") as cache:
+            assert cache.get_many("tokens", "cfg", ["h1"]) == {}
+
+    def test_lru_eviction_keeps_recently_used(self, tmp_path: Path) -> None:
+        with ResultCache(tmp_path / "c.sqlite3", max_bytes=10_000) as cache:
+            cache.put_many("a", "cfg", {"old": "x" * 3000})
+            cache.put_many("a", "cfg", {"used": "x" * 3000})
+            cache.put_many("a", "cfg", {"newer": "x" * 3000})
+            cache.get_many("a", "cfg", ["old"])
+            cache.put_many("a", "cfg", {"newest": "x" * 3000})
+            found = cache.get_many("a", "cfg", ["old", "used", "newer", "newest"])
+            assert "used" not in found
+            assert {"old", "newest"} <= found.keys()
+            assert cache.stats().size_bytes <= 10_000
+
+    def test_prune_drops_stale_versions(self, tmp_path: Path) -> None:
+        path = tmp_path / "c.sqlite3"
+        with ResultCache(path, version="1.0") as cache:
+            cache.put_many("a", "cfg", {"h1": 1, "h2": 2})
+        with ResultCache(path, version="2.0") as cache:
+            cache.put_many("a", "cfg", {"h3": 3})
+            assert cache.stats().stale_entries == 2
+            assert cache.prune() == 2
+            stats = cache.stats()
+        assert stats.entries == 1
+        assert stats.stale_entries == 0
+
+    def test_prune_to_size(self, tmp_path: Path) -> None:
+        with ResultCache(tmp_path / "c.sqlite3") as cache:
+            cache.put_many("a", "cfg", {f"h{i}": "x" * 100 for i in range(10)})
+            cache.prune(max_bytes=500)
+            assert 0 < cache.stats().size_bytes <= 500
+
+    def test_clear_and_stats(self, tmp_path: Path) -> None:
+        with ResultCache(tmp_path / "c.sqlite3") as cache:
+            cache.put_many("a", "cfg", {"h1": 1})
+            cache.put_many("b", "cfg", {"h1": 1, "h2": 2})
+            stats = cache.stats()
+            assert stats.entries == 3
+            assert stats.analyzers == {"a": 1, "b": 2}
+            assert cache.clear() == 3
+            assert cache.stats().size_bytes == 0
+
+
+class TestMapCached:
+    def test_computes_only_misses(self, tmp_path: Path) -> None:
+        calls: list[str] = []
+
+        def compute(batch: list[Sample]) -> list[int]:
+            calls.extend(s.raw_content for s in batch)
+            return [len(s.raw_content) for s in batch]
+
+        with ResultCache(tmp_path / "c.sqlite3") as cache:
+            assert map_cached(_samples("a", "bb"), "len", {}, compute, cache) == [1, 2]
+            assert map_cached(_samples("a", "bb", "ccc"), "len", {}, compute, cache) == [1, 2, 3]
+            assert cache.hits == 2
+        assert calls == ["a", "bb", "ccc"]
+
+    def test_identical_content_computed_once(self) -> None:
+        calls: list[str] = []
+
+        def compute(batch: list[Sample]) -> list[int]:
+            calls.extend(s.raw_content for s in batch)
+            return [len(s.raw_content) for s in batch]
+
+        assert map_cached(_samples("a", "a", "b"), "len", {}, compute) == [1, 1, 1]
+        assert calls == ["a", "b"]
@@ -0,0 +1,104 @@
+"""Tests for transparent compressed dataset input and output."""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import importlib.util
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO
+
+import pytest
+
+from ftdata.core import compression
+from ftdata.core.compression import compression_of, data_suffix, open_text
+from ftdata.core.loader import detect_format, load_dataset
+from ftdata.core.models import DatasetFormat
+from ftdata.core.writer import DatasetWriter
+from ftdata.exceptions import DatasetLoadError
+from ftdata.quality.pii import redact_file
+
+HAS_ZSTANDARD = importlib.util.find_spec("zstandard") is not None
+
+
+def test_suffixes() -> None:
+    assert compression_of(Path("data.jsonl.GZ")) == "gzip"
+    assert compression_of(Path("data.jsonl")) is None
+    assert data_suffix(Path("data.jsonl.zst")) == ".jsonl"
+    assert data_suffix(Path("data.json")) == ".json"
+
+
+@pytest.mark.parametrize("suffix, opener", [(".gz", gzip.open), (".bz2", bz2.open)])
+def test_load_matches_plain(
+    tmp_path: Path, chatml_dataset_path: Path, suffix: str, opener: Callable[..., IO[bytes]]
+) -> None:
+    packed = tmp_path / f"data.jsonl{suffix}"
+    with opener(packed, "wb") as f:
+        f.write(chatml_dataset_path.read_bytes())
+    assert detect_format(packed) == DatasetFormat.CHATML
+    assert load_dataset(packed).samples == load_dataset(chatml_dataset_path).samples
+
+
+def test_concatenated_members_and_small_blocks(
+    tmp_path: Path, chatml_dataset_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(compression, "COMPRESSED_BLOCK", 7)
+    lines = chatml_dataset_path.read_bytes().splitlines(keepends=True)
+    packed = tmp_path / "data.jsonl.gz"
+    packed.write_bytes(gzip.compress(b"".join(lines[:2])) + gzip.compress(b"".join(lines[2:])))
+    assert load_dataset(packed).samples == load_dataset(chatml_dataset_path).samples
+
+
+def test_json_array(tmp_path: Path) -> None:
+    packed = tmp_path / "data.json.bz2"
+    packed.write_bytes(bz2.compress(b'[{"instruction": "Hi", "output": "Hello"}]'))
+    assert detect_format(packed) == DatasetFormat.ALPACA
+    assert load_dataset(packed).sample_count == 1
+
+
+@pytest.mark.parametrize("data", [b"not gzip at all", None])
+def test_corrupt_or_truncated(
+    tmp_path: Path, chatml_dataset_path: Path, data: bytes | None
+) -> None:
+    packed = tmp_path / "data.jsonl.gz"
+    if data is None:
+        data = gzip.compress(chatml_dataset_path.read_bytes())[:-40]
+    packed.write_bytes(data)
+    with pytest.raises(DatasetLoadError):
+        load_dataset(packed, DatasetFormat.CHATML)
+
+
+def test_partial_read_closes(tmp_path: Path) -> None:
+    packed = tmp_path / "big.jsonl.gz"
+    packed.write_bytes(gzip.compress(b'{"messages": []}\n' * 200_000))
+    with open_text(packed) as f:
+        assert f.readline() == '{"messages": []}\n'
+
+
+def test_writer_and_redaction_round_trip(tmp_path: Path, quality_issues_dataset_path: Path) -> None:
+    packed = tmp_path / "in.jsonl.gz"
+    packed.write_bytes(gzip.compress(quality_issues_dataset_path.read_bytes()))
+    output = tmp_path / "out.jsonl.bz2"
+    result = redact_file(packed, output)
+    plain = tmp_path / "out.jsonl"
+    redact_file(quality_issues_dataset_path, plain)
+    assert bz2.decompress(output.read_bytes()) == plain.read_bytes()
+    assert result.sample_count == load_dataset(output).sample_count
+
+
+@pytest.mark.skipif(HAS_ZSTANDARD, reason="zstandard is installed")
+def test_zstd_requires_zstandard(tmp_path: Path) -> None:
+    packed = tmp_path / "data.jsonl.zst"
+    packed.write_bytes(b"\x28\xb5\x2f\xfd")
+    with pytest.raises(DatasetLoadError, match="zstandard"):
+        load_dataset(packed, DatasetFormat.CHATML)
+
+
+@pytest.mark.skipif(not HAS_ZSTANDARD, reason="zstandard is not installed")
+def test_zstd_round_trip(tmp_path: Path, chatml_dataset_path: Path) -> None:
+    packed = tmp_path / "data.jsonl.zst"
+    with DatasetWriter(packed) as writer:
+        for line in chatml_dataset_path.read_text().splitlines():
+            writer.write_line(line)
+    assert load_dataset(packed).samples == load_dataset(chatml_dataset_path).samples
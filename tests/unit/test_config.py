@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from ftdata.config import (
     CONFIG_FILENAME,
     ContaminationConfig,
@@ -15,6 +17,7 @@ from ftdata.config import (
     discover_config,
     load_config,
 )
+from ftdata.exceptions import ConfigError
 
 
 class TestFtdataConfig:
@@ -103,3 +106,12 @@ class TestLoadConfig:
         config_file.write_text("")
         config = load_config(config_file)
         assert config == FtdataConfig()
+
+    @pytest.mark.parametrize(
+        "field", ["concurrency", "requests_per_minute", "tokens_per_minute", "max_tokens"]
+    )
+    def test_rejects_non_positive_judge_limits(self, tmp_path: Path, field: str) -> None:
+        config_file = tmp_path / CONFIG_FILENAME
+        config_file.write_text(f"judge:\n  {field}: 0\n")
+        with pytest.raises(ConfigError, match=field):
+            load_config(config_file)
@@ -0,0 +1,78 @@
+"""Tests for sampled profiling with confidence intervals."""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from ftdata.bench.synthetic import generate_dataset
+from ftdata.core.loader import load_dataset
+from ftdata.exceptions import DatasetLoadError, EmptyDatasetError
+from ftdata.profiling.estimate import LineSampler, estimate_profile
+from ftdata.profiling.stats import compute_length_profile, compute_turn_profile
+
+
+@pytest.fixture
+def synthetic_path(tmp_path: Path) -> Path:
+    path = tmp_path / "synthetic.jsonl"
+    generate_dataset(path, samples=2000, seed=7)
+    return path
+
+
+def test_line_sampler_returns_whole_lines(tmp_path: Path) -> None:
+    path = tmp_path / "lines.jsonl"
+    lines = [b"a\n", b"\n", b"bbbbbbbbbb\n", b"cc"]
+    path.write_bytes(b"".join(lines))
+    sampler = LineSampler(path, seed=1)
+    try:
+        drawn = [sampler.draw() for _ in range(200)]
+    finally:
+        sampler.close()
+    data = path.read_bytes()
+    assert all(draw is not None and data[draw[0] :].startswith(draw[1]) for draw in drawn)
+    assert {draw[1] for draw in drawn if draw} == {b"a\n", b"bbbbbbbbbb\n", b"cc"}
+    assert sampler.accepted == 200
+    assert sampler.draws > 200
+
+
+def test_estimates_cover_exact_statistics(synthetic_path: Path, test_encoding: str) -> None:
+    dataset = load_dataset(synthetic_path)
+    length = compute_length_profile(dataset, test_encoding)
+    turns = compute_turn_profile(dataset)
+
+    profile, estimate, _ = estimate_profile(
+        synthetic_path, sample_size=600, encoding_name=test_encoding, seed=0
+    )
+
+    assert estimate.sampled == 600
+    intervals = estimate.intervals
+    for name, exact in [
+        ("samples", dataset.sample_count),
+        ("total_tokens", length.total_tokens.total),
+        ("total_tokens.mean", length.total_tokens.mean),
+        ("prompt_tokens.median", length.prompt_tokens.median),
+        ("response_tokens.p95", length.response_tokens.p95),
+        ("turns.mean", turns.mean),
+    ]:
+        assert intervals[name].low <= exact <= intervals[name].high, name
+    assert profile.sample_count == pytest.approx(dataset.sample_count, rel=0.1)
+    assert intervals["language.en"].value == 100.0
+
+
+def test_time_budget_stops_early(synthetic_path: Path, test_encoding: str) -> None:
+    _, estimate, _ = estimate_profile(synthetic_path, time_budget=1e-6, encoding_name=test_encoding)
+    assert 0 < estimate.sampled < 2000
+
+
+def test_rejects_compressed_and_empty(tmp_path: Path, chatml_dataset_path: Path) -> None:
+    packed = tmp_path / "data.jsonl.gz"
+    packed.write_bytes(gzip.compress(chatml_dataset_path.read_bytes()))
+    with pytest.raises(DatasetLoadError, match="uncompressed"):
+        estimate_profile(packed, sample_size=10)
+
+    empty = tmp_path / "empty.jsonl"
+    empty.write_text("\n\n")
+    with pytest.raises(EmptyDatasetError):
+        estimate_profile(empty, sample_size=10)
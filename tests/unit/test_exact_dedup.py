@@ -2,19 +2,22 @@
 
 from __future__ import annotations
 
-import pytest
+from pathlib import Path
 
-from ftdata.core.models import Dataset
+from ftdata.core.loader import load_dataset
+from ftdata.core.models import Dataset, DedupMethod
 from ftdata.dedup.exact import find_exact_duplicates
 
 
 class TestFindExactDuplicates:
-    @pytest.mark.skip(reason="Exact dedup not yet implemented")
     def test_no_duplicates(self, sample_dataset: Dataset) -> None:
         result = find_exact_duplicates(sample_dataset)
         assert result.total_duplicates == 0
+        assert result.clusters == []
 
-    @pytest.mark.skip(reason="Exact dedup not yet implemented")
-    def test_with_duplicates(self) -> None:
-        # Uses with_duplicates.jsonl fixture
-        pass
+    def test_with_duplicates(self, duplicates_dataset_path: Path) -> None:
+        result = find_exact_duplicates(load_dataset(duplicates_dataset_path))
+        assert [c.indices for c in result.clusters] == [[0, 1], [3, 4]]
+        assert all(c.method == DedupMethod.EXACT for c in result.clusters)
+        assert result.total_duplicates == 2
+        assert result.duplicate_percentage == 33.33
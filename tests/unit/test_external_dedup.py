@@ -0,0 +1,64 @@
+"""Tests for exact dedup by external merge sort."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ftdata.core.loader import load_dataset
+from ftdata.dedup import external
+from ftdata.dedup.exact import find_exact_duplicates
+from ftdata.dedup.external import find_exact_duplicates_external
+from ftdata.exceptions import DatasetLoadError
+
+
+def _corpus(path: Path, count: int) -> Path:
+    records = [
+        {
+            "messages": [
+                {"role": "user", "content": f"question {i % 37}"},
+                {"role": "assistant", "content": f"answer {i % 53}"},
+            ]
+        }
+        for i in range(count)
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    return path
+
+
+def test_matches_in_memory_dedup(duplicates_dataset_path: Path) -> None:
+    expected = find_exact_duplicates(load_dataset(duplicates_dataset_path))
+    result, sample_count = find_exact_duplicates_external(duplicates_dataset_path)
+    assert sample_count == 6
+    assert result == expected
+    assert [c.indices for c in result.clusters] == [[0, 1], [3, 4]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_many_runs_and_merge_passes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    path = _corpus(tmp_path / "corpus.jsonl", 3000)
+    monkeypatch.setattr(external, "MIN_RUN_PAIRS", 64)
+    monkeypatch.setattr(external, "MIN_BLOCK_PAIRS", 8)
+    monkeypatch.setattr(external, "MERGE_FAN_IN", 4)
+    monkeypatch.setattr(external, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(external, "_HASH_BATCH", 100)
+
+    sort_dir = tmp_path / "sort"
+    sort_dir.mkdir()
+    result, sample_count = find_exact_duplicates_external(
+        path, memory_bytes=1024, temp_dir=sort_dir, workers=workers
+    )
+    assert sample_count == 3000
+    assert result == find_exact_duplicates(load_dataset(path))
+    assert list(sort_dir.iterdir()) == []
+
+
+def test_rejects_json_array(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps([{"text": "hello"}]))
+    with pytest.raises(DatasetLoadError, match="needs a JSONL file"):
+        find_exact_duplicates_external(path)
@@ -0,0 +1,156 @@
+"""Tests for policy-driven filtering."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ftdata.config import FtdataConfig
+from ftdata.core.writer import DatasetWriter
+from ftdata.exceptions import ConfigError, OutputWriteError
+from ftdata.quality import filter as filtering
+from ftdata.quality.filter import decision_log_path, filter_dataset
+
+
+@pytest.fixture
+def config(test_encoding: str) -> FtdataConfig:
+    return FtdataConfig.model_validate({"profiling": {"token_encoding": test_encoding}})
+
+
+def _decisions(path: Path) -> list[dict[str, object]]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_decision_log_path() -> None:
+    assert decision_log_path(Path("out/clean.jsonl.gz")) == Path("out/clean.decisions.jsonl")
+    assert decision_log_path(Path("clean.json")) == Path("clean.decisions.jsonl")
+
+
+def test_drops_errors_and_redacts_pii(
+    tmp_path: Path, quality_issues_dataset_path: Path, config: FtdataConfig
+) -> None:
+    output, log = tmp_path / "clean.jsonl", tmp_path / "log.jsonl"
+    result = filter_dataset(quality_issues_dataset_path, output, config, log)
+
+    assert (result.sample_count, result.kept, result.dropped) == (5, 4, {"quality": 1})
+    assert result.redacted_samples == 1
+    decisions = _decisions(log)
+    assert decisions[0] == {"index": 0, "action": "drop", "reasons": ["FT001"]}
+    assert decisions[2]["action"] == "redact"
+    assert "pii:ssn" in decisions[2]["reasons"]  # type: ignore[operator]
+
+    lines = quality_issues_dataset_path.read_text().splitlines()
+    written = output.read_text().splitlines()
+    assert written[0] == lines[1]
+    assert "<SSN>" in written[1] and "123-45-6789" not in written[1]
+
+
+def test_policy_toggles(
+    tmp_path: Path, quality_issues_dataset_path: Path, config: FtdataConfig
+) -> None:
+    config.filter.drop_errors = False
+    config.filter.redact_pii = False
+    output = tmp_path / "clean.jsonl"
+    result = filter_dataset(quality_issues_dataset_path, output, config)
+    assert (result.kept, result.redacted_samples) == (5, 0)
+    assert output.read_text() == quality_issues_dataset_path.read_text()
+
+
+@pytest.mark.parametrize("method", ["exact", "minhash"])
+def test_keeps_first_of_each_cluster(
+    tmp_path: Path, duplicates_dataset_path: Path, config: FtdataConfig, method: str
+) -> None:
+    config.dedup.method = method
+    output, log = tmp_path / "clean.jsonl", tmp_path / "log.jsonl"
+    result = filter_dataset(duplicates_dataset_path, output, config, log)
+
+    assert result.dropped == {"duplicate": 2}
+    lines = duplicates_dataset_path.read_text().splitlines()
+    assert output.read_text().splitlines() == [lines[0], lines[2], lines[3], lines[5]]
+    assert _decisions(log)[4] == {"index": 4, "action": "drop", "reasons": ["duplicate_of:3"]}
+
+
+def test_process_pool_matches_inline(
+    tmp_path: Path,
+    duplicates_dataset_path: Path,
+    config: FtdataConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    inline = filter_dataset(duplicates_dataset_path, tmp_path / "a.jsonl", config, workers=1)
+    monkeypatch.setattr(filtering, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(filtering, "_BATCH_RECORDS", 2)
+    pooled = filter_dataset(duplicates_dataset_path, tmp_path / "b.jsonl", config, workers=2)
+
+    assert pooled == inline.model_copy(update={"output_path": str(tmp_path / "b.jsonl")})
+    assert (tmp_path / "a.jsonl").read_bytes() == (tmp_path / "b.jsonl").read_bytes()
+
+
+def test_json_array_stays_array(tmp_path: Path, config: FtdataConfig) -> None:
+    source = tmp_path / "source.json"
+    records = [{"instruction": f"q{i % 2}", "output": f"a{i % 2}"} for i in range(4)]
+    source.write_text(json.dumps(records))
+    filter_dataset(source, tmp_path / "clean.json", config)
+    assert json.loads((tmp_path / "clean.json").read_text()) == records[:2]
+
+
+def test_rejects_semantic_dedup(
+    tmp_path: Path, minimal_dataset_path: Path, config: FtdataConfig
+) -> None:
+    config.dedup.method = "semantic"
+    with pytest.raises(ConfigError, match="semantic"):
+        filter_dataset(minimal_dataset_path, tmp_path / "clean.jsonl", config)
+
+
+def test_rejects_contamination_before_writing(
+    tmp_path: Path, minimal_dataset_path: Path, config: FtdataConfig
+) -> None:
+    config.contamination.benchmarks = ["mmlu"]
+    output, log = tmp_path / "clean.jsonl", tmp_path / "log.jsonl"
+    with pytest.raises(ConfigError, match="contamination"):
+        filter_dataset(minimal_dataset_path, output, config, log)
+    assert not output.exists() and not log.exists()
+
+    config.filter.drop_contaminated = False
+    assert filter_dataset(minimal_dataset_path, output, config).kept > 0
+
+
+def test_failure_midway_leaves_no_output(
+    tmp_path: Path,
+    duplicates_dataset_path: Path,
+    config: FtdataConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    evaluate = filtering._evaluate_batch
+
+    def flaky(policy: object, first: int, lines: list[str], cache: object = None) -> object:
+        if first:
+            raise ConnectionError("tokenizer download failed")
+        return evaluate(policy, first, lines, cache)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(filtering, "_BATCH_RECORDS", 2)
+    monkeypatch.setattr(filtering, "_evaluate_batch", flaky)
+    output, log = tmp_path / "clean.json", tmp_path / "log.jsonl"
+    output.write_text("previous run")
+    # A read-side OSError is not reported as a write failure.
+    with pytest.raises(ConnectionError):
+        filter_dataset(duplicates_dataset_path, output, config, log)
+    assert output.read_text() == "previous run"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["clean.json"]
+
+
+def test_write_failure(
+    tmp_path: Path,
+    duplicates_dataset_path: Path,
+    config: FtdataConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def full(self: DatasetWriter, line: str) -> None:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(DatasetWriter, "write_line", full)
+    output = tmp_path / "clean.jsonl"
+    with pytest.raises(OutputWriteError, match="Cannot write .*clean.jsonl: .*No space"):
+        filter_dataset(duplicates_dataset_path, output, config, tmp_path / "log.jsonl")
+    assert list(tmp_path.iterdir()) == []
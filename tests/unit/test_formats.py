@@ -2,13 +2,10 @@
 
 from __future__ import annotations
 
-import pytest
-
 from ftdata.core.formats import parse_alpaca, parse_chatml, parse_sharegpt
 
 
 class TestParseChatML:
-    @pytest.mark.skip(reason="Format parsers not yet implemented")
     def test_parse_basic(self) -> None:
         raw = {
             "messages": [
@@ -19,7 +16,6 @@ class TestParseChatML:
         sample = parse_chatml(raw, index=0)
         assert sample.turn_count == 2
 
-    @pytest.mark.skip(reason="Format parsers not yet implemented")
     def test_parse_with_system(self) -> None:
         raw = {
             "messages": [
@@ -33,13 +29,11 @@ class TestParseChatML:
 
 
 class TestParseAlpaca:
-    @pytest.mark.skip(reason="Format parsers not yet implemented")
     def test_parse_with_input(self) -> None:
         raw = {"instruction": "Summarize", "input": "Some text.", "output": "Summary."}
         sample = parse_alpaca(raw, index=0)
         assert sample.turn_count > 0
 
-    @pytest.mark.skip(reason="Format parsers not yet implemented")
     def test_parse_without_input(self) -> None:
         raw = {"instruction": "Write a haiku.", "input": "", "output": "A haiku here."}
         sample = parse_alpaca(raw, index=0)
@@ -47,10 +41,35 @@ class TestParseAlpaca:
 
 
 class TestParseShareGPT:
-    @pytest.mark.skip(reason="Format parsers not yet implemented")
     def test_parse_basic(self) -> None:
         raw = {
             "conversations": [{"from": "human", "value": "Hi"}, {"from": "gpt", "value": "Hello!"}]
         }
         sample = parse_sharegpt(raw, index=0)
         assert sample.turn_count == 2
+
+    def test_maps_speakers_to_roles(self) -> None:
+        raw = {
+            "conversations": [
+                {"from": "system", "value": "Be brief."},
+                {"from": "human", "value": "Hi"},
+                {"from": "gpt", "value": "Hello!"},
+            ]
+        }
+        sample = parse_sharegpt(raw, index=0)
+        assert [m.role for m in sample.messages] == ["system", "user", "assistant"]
+
+
+class TestFormatErrors:
+    def test_chatml_missing_content_recorded(self) -> None:
+        raw = {"messages": [{"role": "user"}, {"role": "assistant", "content": "Hi"}]}
+        sample = parse_chatml(raw, index=3)
+        assert sample.index == 3
+        assert sample.messages[0].content == ""
+        assert sample.metadata["format_errors"] == ["missing content"]
+
+    def test_extra_fields_kept_as_metadata(self) -> None:
+        raw = {"id": "abc", "messages": [{"role": "user", "content": "Hi"}]}
+        sample = parse_chatml(raw, index=0)
+        assert sample.metadata == {"id": "abc"}
+        assert "format_errors" not in sample.metadata
@@ -0,0 +1,92 @@
+"""Tests for heuristic quality checks."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+
+import numpy as np
+import pytest
+
+from ftdata.core.models import Dataset, Message, QualityRule, Sample
+from ftdata.quality import heuristics
+from ftdata.quality.heuristics import check_heuristics, exceeds_repetition, ngram_hashes
+
+PROSE = (
+    "Photosynthesis converts light energy into chemical energy. Chlorophyll absorbs "
+    "red and blue wavelengths, water is split to release oxygen, and carbon dioxide "
+    "is fixed into sugars during the Calvin cycle."
+)
+
+
+def _chat(*turns: tuple[str, str], index: int = 0) -> Sample:
+    return Sample(
+        messages=[Message(role=r, content=c) for r, c in turns],
+        raw_content=json.dumps(turns),
+        index=index,
+    )
+
+
+class TestNgramHashes:
+    def test_equal_windows_hash_equal(self) -> None:
+        hashes = ngram_hashes(np.array([1, 2, 3, 1, 2, 3]), 3)
+        assert len(hashes) == 4
+        assert hashes[0] == hashes[3]
+        assert len(set(hashes.tolist())) == 3
+
+    def test_shorter_than_n(self) -> None:
+        assert len(ngram_hashes(np.array([1, 2]), 3)) == 0
+
+
+class TestExceedsRepetition:
+    def test_degenerate_loop(self) -> None:
+        assert exceeds_repetition(np.tile(np.arange(7), 1000), n=4, threshold=0.4)
+
+    def test_distinct_tokens(self) -> None:
+        assert not exceeds_repetition(np.arange(5000), n=4, threshold=0.4)
+
+    def test_too_short_to_judge(self) -> None:
+        assert not exceeds_repetition(np.zeros(10, dtype=np.int64), n=4, threshold=0.1)
+
+    def test_stops_early(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(heuristics, "REPETITION_CHUNK", 64)
+        seen: list[int] = []
+
+        class CountingSet(set[int]):
+            def update(self, *items: Iterable[int]) -> None:
+                seen.append(1)
+                super().update(*items)
+
+        monkeypatch.setattr(heuristics, "set", CountingSet, raising=False)
+        assert exceeds_repetition(np.zeros(100_000, dtype=np.int64), n=4, threshold=0.1)
+        # Decided once 10% of the n-grams are known repeats, not at the end.
+        assert len(seen) == 10_000 // 64 + 1
+
+
+class TestCheckHeuristics:
+    def test_flags_repetitive_response(self, test_encoding: str) -> None:
+        dataset = Dataset(
+            samples=[
+                _chat(("user", "Explain photosynthesis."), ("assistant", PROSE)),
+                _chat(("user", "Count."), ("assistant", "one two three " * 50), index=1),
+            ]
+        )
+        result = check_heuristics(dataset, ngram_size=8, encoding_name=test_encoding)
+        assert [(i.rule, i.sample_index) for i in result.issues] == [(QualityRule.FT007, 1)]
+        assert result.issues[0].details == {"messages": [1], "ngram_size": 8}
+
+    def test_imbalanced_turns(self, test_encoding: str) -> None:
+        dataset = Dataset(
+            samples=[_chat(("user", "a"), ("user", "b"), ("user", "c"), ("assistant", "d"))]
+        )
+        result = check_heuristics(dataset, encoding_name=test_encoding)
+        assert [i.rule for i in result.issues] == [QualityRule.FT010]
+
+    def test_disabled_rules_skip_tokenization(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("tokenizer should not run")
+
+        monkeypatch.setattr(heuristics, "get_encoding", fail)
+        dataset = Dataset(samples=[_chat(("user", "q"), ("assistant", "a"))])
+        result = check_heuristics(dataset, disabled_rules=["FT007"])
+        assert result.issues == []
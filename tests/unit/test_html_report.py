@@ -0,0 +1,50 @@
+"""Tests for the HTML report."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from ftdata.core.models import (
+    DedupResult,
+    DuplicateCluster,
+    ProfileReport,
+    QualityIssue,
+    QualityResult,
+    QualityRule,
+    QualitySeverity,
+)
+from ftdata.report.html import render_html_report
+
+
+def _report() -> ProfileReport:
+    issue = QualityIssue(
+        rule=QualityRule.FT001,
+        severity=QualitySeverity.ERROR,
+        message="<script>alert(1)</script>",
+        sample_index=3,
+    )
+    return ProfileReport(
+        dataset_path="data.jsonl",
+        sample_count=5,
+        quality=QualityResult(issues=[issue]),
+        dedup=DedupResult(
+            clusters=[DuplicateCluster(indices=[0, 4])], total_duplicates=1, duplicate_percentage=20
+        ),
+    )
+
+
+def test_render_escapes_content(tmp_path: Path) -> None:
+    output = tmp_path / "report.html"
+    html = render_html_report(_report(), output)
+    assert output.read_text() == html
+    assert "&lt;script&gt;" in html
+    assert "<script>" not in html
+    assert "FAILED" in html
+    assert "0, 4" in html
+    assert "Timings" not in html
+
+
+def test_custom_template(tmp_path: Path) -> None:
+    template = tmp_path / "mine.html.j2"
+    template.write_text("{{ report.sample_count }} samples, {{ issues | length }} listed")
+    assert render_html_report(_report(), template_path=template) == "5 samples, 1 listed"
@@ -0,0 +1,107 @@
+"""Tests for language detection."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from ftdata.cache import ResultCache
+from ftdata.core.models import Dataset, Message, QualityRule, Sample
+from ftdata.profiling import language
+from ftdata.profiling.language import (
+    UNKNOWN_LANGUAGE,
+    detect_language,
+    detect_languages,
+    sample_language,
+    sample_languages,
+)
+from ftdata.quality.heuristics import check_heuristics
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("The cat is on the mat and it is happy.", "en"),
+        ("El perro de la casa es muy grande y no come.", "es"),
+        ("Der Hund ist nicht in dem Haus und die Katze auch nicht.", "de"),
+        ("Привет, как дела?", "ru"),
+        ("これは日本語の文章です。", "ja"),
+        ("这是一个中文句子。", "zh"),
+        ("12345 !!!", UNKNOWN_LANGUAGE),
+    ],
+)
+def test_detect_language(text: str, expected: str) -> None:
+    assert detect_language(text) == expected
+
+
+def test_detect_languages() -> None:
+    texts = ["What is the capital of France? It is Paris."] * 3 + [
+        "Wie spät ist es und wo ist der Bahnhof?"
+    ]
+    dataset = Dataset(
+        samples=[
+            Sample(messages=[Message(role="user", content=text)], raw_content=text, index=i)
+            for i, text in enumerate(texts)
+        ]
+    )
+    profile = detect_languages(dataset)
+    assert profile.languages == {"en": 3, "de": 1}
+    assert profile.primary_language == "en"
+    assert profile.primary_percentage == 75.0
+
+
+def _sample(index: int, prompt: str, response: str) -> Sample:
+    return Sample(
+        messages=[
+            Message(role="user", content=prompt),
+            Message(role="assistant", content=response),
+        ],
+        raw_content=f"{prompt}|{response}",
+        index=index,
+    )
+
+
+def test_sample_languages_labels_prompt_and_response() -> None:
+    samples = [
+        _sample(0, "What is the capital of France and is it big?", "It is Paris, and it is big."),
+        _sample(1, "Как дела?", "The weather is nice and it is warm."),
+        _sample(2, "これは何ですか", ""),
+    ]
+    assert sample_languages(samples) == [
+        ["en", "en", "en"],
+        [sample_language(samples[1]), "ru", "en"],
+        ["ja", "ja", UNKNOWN_LANGUAGE],
+    ]
+
+
+def test_detection_reads_only_leading_characters(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(language, "DETECT_CHARS", 20)
+    sample = _sample(0, "Привет " * 3 + "the cat is on the mat " * 20, "x")
+    assert sample_languages([sample])[0][1] == "ru"
+
+
+def test_pool_matches_inline(monkeypatch: pytest.MonkeyPatch) -> None:
+    samples = [_sample(i, f"Der Hund {i} ist nicht da und", "Это ответ") for i in range(40)]
+    inline = sample_languages(samples, workers=1)
+    monkeypatch.setattr(language, "PARALLEL_MIN_CHARS", 0)
+    monkeypatch.setattr(language, "_BATCH_TEXTS", 7)
+    assert sample_languages(samples, workers=2) == inline
+
+
+def test_mismatch_check_reuses_cached_languages(tmp_path: Path) -> None:
+    dataset = Dataset(
+        samples=[
+            _sample(0, "Wie spät ist es und wo ist der Bahnhof?", "The station is on the left."),
+            _sample(1, "What is it and where is the station?", "It is on the left of the bank."),
+        ]
+    )
+    with ResultCache(tmp_path / "c.sqlite3") as cache:
+        detect_languages(dataset, cache)
+        misses = cache.misses
+        issues = check_heuristics(dataset, ["FT007"], cache=cache).store
+        assert cache.misses == misses
+    mismatches = [i for i in issues if i.rule == QualityRule.FT008]
+    assert [(i.sample_index, i.details) for i in mismatches] == [
+        (0, {"prompt": "de", "response": "en"})
+    ]
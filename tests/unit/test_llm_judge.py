@@ -0,0 +1,385 @@
+"""Tests for the LLM judge, run against a local stub of the Messages API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from ftdata.config import JudgeConfig
+from ftdata.core.models import (
+    DATASET_LEVEL_INDEX,
+    Dataset,
+    Message,
+    QualitySeverity,
+    Sample,
+    SamplingPlan,
+    SamplingStratum,
+)
+from ftdata.quality.llm_judge import (
+    TokenBucket,
+    max_batch_size,
+    open_judgment_cache,
+    pack_batches,
+    parse_batch_verdicts,
+    parse_verdict,
+    score_with_llm,
+)
+
+pytest.importorskip("anthropic")
+
+
+class StubMessagesAPI:
+    """Minimal /v1/messages server: scores 1 if a conversation contains BAD, else 4.
+
+    Batch prompts get a JSON array with one verdict per conversation id.
+    Queued `replies` are returned verbatim first.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_first = 0
+        self.delay = 0.0
+        self.reply: str | None = None
+        self.replies: list[str] = []
+        self.prompts: list[str] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    fail = stub.requests <= stub.fail_first
+                    stub.prompts.append(body["messages"][0]["content"])
+                    queued = stub.replies.pop(0) if stub.replies and not fail else None
+                time.sleep(stub.delay)
+                with stub._lock:
+                    stub.in_flight -= 1
+                if fail:
+                    self._send(429, {"type": "error", "error": {"type": "rate_limit_error"}})
+                    return
+                text = queued or stub.reply or stub.verdicts(body["messages"][0]["content"])
+                self._send(
+                    200,
+                    {
+                        "id": "msg_stub",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": body["model"],
+                        "content": [{"type": "text", "text": text}],
+                        "stop_reason": "end_turn",
+                        "stop_sequence": None,
+                        "usage": {"input_tokens": 10, "output_tokens": 10},
+                    },
+                )
+
+            def _send(self, status: int, payload: dict[str, Any]) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("retry-after", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @staticmethod
+    def verdicts(prompt: str) -> str:
+        items = re.findall(r'<conversation id="(\d+)">(.*?)</conversation>', prompt, re.S)
+        if not items:
+            return json.dumps({"score": 1 if "BAD" in prompt else 4, "reason": "stub"})
+        return json.dumps(
+            [
+                {"id": int(i), "score": 1 if "BAD" in text else 4, "reason": "stub"}
+                for i, text in items
+            ]
+        )
+
+
+@pytest.fixture
+def stub_api(monkeypatch: pytest.MonkeyPatch) -> Iterator[StubMessagesAPI]:
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    stub = StubMessagesAPI()
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+
+
+def _config(stub: StubMessagesAPI, **overrides: Any) -> JudgeConfig:
+    settings: dict[str, Any] = {
+        "model": "judge-stub",
+        "base_url": stub.url,
+        "requests_per_minute": 60_000,
+        "tokens_per_minute": 10_000_000,
+        "backoff_base": 0.01,
+        "max_retries": 3,
+    }
+    return JudgeConfig(**(settings | overrides))
+
+
+def _dataset(*answers: str) -> Dataset:
+    return Dataset(
+        samples=[
+            Sample(
+                messages=[
+                    Message(role="user", content=f"Question {i}?"),
+                    Message(role="assistant", content=answer),
+                ],
+                raw_content=json.dumps([i, answer]),
+                index=i,
+            )
+            for i, answer in enumerate(answers)
+        ]
+    )
+
+
+class TestParseVerdict:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ('{"score": 4, "reason": "fine"}', [4, "fine"]),
+            ('Sure!\n```json\n{"score": 2, "reason": "vague"}\n```', [2, "vague"]),
+            ('{"note": {"x": 1}} then {"score": 5}', [5, ""]),
+        ],
+    )
+    def test_valid(self, text: str, expected: list[Any]) -> None:
+        assert parse_verdict(text) == expected
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "no json",
+            '{"score": 9}',
+            '{"score": "high"',
+            "",
+            '{"score": true}',
+            '{"score": 3.5}',
+            '{"score": NaN}',
+        ],
+    )
+    def test_malformed(self, text: str) -> None:
+        assert parse_verdict(text) is None
+
+
+class TestParseBatchVerdicts:
+    def test_array(self) -> None:
+        text = '[{"id": 2, "score": 3, "reason": "b"}, {"id": 1, "score": 5, "reason": "a"}]'
+        assert parse_batch_verdicts(text, 2) == {1: [5, "a"], 2: [3, "b"]}
+
+    def test_truncated_array_keeps_complete_items(self) -> None:
+        text = '```json\n[{"id": 1, "score": 4, "reason": "ok"}, {"id": 2, "score": 2, "rea'
+        assert parse_batch_verdicts(text, 3) == {1: [4, "ok"]}
+
+    def test_invalid_items_skipped(self) -> None:
+        text = json.dumps(
+            [
+                {"id": 1, "score": 9},
+                {"id": "2", "score": 2},
+                {"id": 7, "score": 3},
+                {"id": 2, "score": 5},
+            ]
+        )
+        assert parse_batch_verdicts(text, 3) == {2: [2, ""]}
+
+    def test_bool_and_fractional_scores_skipped(self) -> None:
+        text = '[{"id": 1, "score": true}, {"id": 2, "score": 2.5}, {"id": 3, "score": 4.0}]'
+        assert parse_batch_verdicts(text, 3) == {3: [4, ""]}
+
+    def test_positional_without_ids(self) -> None:
+        text = '[{"score": 1, "reason": "x"}, {"score": 5, "reason": "y"}]'
+        assert parse_batch_verdicts(text, 2) == {1: [1, "x"], 2: [5, "y"]}
+
+
+class TestPackBatches:
+    def test_respects_budget_and_size(self, test_encoding: str) -> None:
+        samples = _dataset(*["x" * 200] * 10).samples
+        batches = pack_batches(samples, test_encoding, budget=2000, max_size=4)
+        assert [s.index for b in batches for s in b] == list(range(10))
+        assert all(len(b) <= 4 for b in batches)
+        assert len(pack_batches(samples, test_encoding, budget=1500, max_size=20)) > 1
+
+    def test_oversized_sample_gets_own_batch(self, test_encoding: str) -> None:
+        samples = _dataset("short", "y" * 5000, "short too").samples
+        batches = pack_batches(samples, test_encoding, budget=1500, max_size=20)
+        assert [[s.index for s in b] for b in batches] == [[0], [1], [2]]
+
+
+class TestTokenBucket:
+    def test_waits_for_refill(self) -> None:
+        async def run() -> float:
+            bucket = TokenBucket(per_minute=6000)
+            await bucket.acquire(6000)
+            start = time.monotonic()
+            await bucket.acquire(10)
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 0.08
+
+    def test_clamps_to_capacity(self) -> None:
+        async def run() -> None:
+            await TokenBucket(per_minute=60_000, capacity=5).acquire(100)
+
+        asyncio.run(run())
+
+
+class TestScoreWithLLM:
+    def test_flags_low_scores(self, stub_api: StubMessagesAPI, test_encoding: str) -> None:
+        dataset = _dataset("Paris.", "BAD answer", "42.")
+        result = score_with_llm(dataset, config=_config(stub_api), encoding_name=test_encoding)
+
+        warnings = [i for i in result.issues if i.severity == QualitySeverity.WARNING]
+        assert [(i.sample_index, i.details["score"]) for i in warnings] == [(1, 1)]
+        summary = result.issues[0]
+        assert summary.sample_index == DATASET_LEVEL_INDEX
+        assert summary.details["judged"] == 3
+        assert summary.details["scores"]["4"] == 2
+        assert stub_api.requests == 3
+
+    def test_cached_verdicts_are_not_re_requested(
+        self, stub_api: StubMessagesAPI, test_encoding: str
+    ) -> None:
+        config = _config(stub_api)
+        with open_judgment_cache() as cache:
+            score_with_llm(
+                _dataset("a", "b"), config=config, cache=cache, encoding_name=test_encoding
+            )
+            assert stub_api.requests == 2
+            result = score_with_llm(
+                _dataset("a", "b", "c"), config=config, cache=cache, encoding_name=test_encoding
+            )
+        assert stub_api.requests == 3
+        assert result.issues[0].details["judged"] == 3
+
+    def test_retries_rate_limits(self, stub_api: StubMessagesAPI, test_encoding: str) -> None:
+        stub_api.fail_first = 2
+        result = score_with_llm(
+            _dataset("ok"), config=_config(stub_api, concurrency=1), encoding_name=test_encoding
+        )
+        assert stub_api.requests == 3
+        assert result.issues[0].details["failed"] == 0
+
+    def test_unparseable_replies_count_as_failed(
+        self, stub_api: StubMessagesAPI, test_encoding: str
+    ) -> None:
+        stub_api.reply = "I cannot rate this."
+        result = score_with_llm(
+            _dataset("ok"), config=_config(stub_api, max_retries=1), encoding_name=test_encoding
+        )
+        assert stub_api.requests == 2
+        assert result.issues[0].details["failed"] == 1
+
+    def test_concurrency_limit(self, stub_api: StubMessagesAPI, test_encoding: str) -> None:
+        stub_api.delay = 0.05
+        score_with_llm(
+            _dataset(*"abcdefgh"),
+            config=_config(stub_api, concurrency=3),
+            encoding_name=test_encoding,
+        )
+        assert stub_api.max_in_flight <= 3
+        assert stub_api.requests == 8
+
+    def test_sample_size(self, stub_api: StubMessagesAPI, test_encoding: str) -> None:
+        result = score_with_llm(
+            _dataset(*"abcdef"),
+            sample_size=2,
+            config=_config(stub_api),
+            encoding_name=test_encoding,
+        )
+        assert stub_api.requests == 2
+        assert result.issues[0].details["judged"] == 2
+
+    def test_plan_restricts_and_weights(
+        self, stub_api: StubMessagesAPI, test_encoding: str
+    ) -> None:
+        dataset = _dataset("a", "BAD", "c", "d")
+        plan = SamplingPlan(
+            strata=[
+                SamplingStratum(length_bucket=0, language="en", population=3, sample_indices=[0]),
+                SamplingStratum(length_bucket=1, language="en", population=1, sample_indices=[1]),
+            ],
+            excluded_errors=0,
+        )
+        result = score_with_llm(
+            dataset, config=_config(stub_api), encoding_name=test_encoding, plan=plan
+        )
+        assert stub_api.requests == 2
+        summary = result.issues[0].details
+        assert summary["judged"] == 2
+        assert summary["mean_score"] == pytest.approx(3.25)
+
+
+class TestBatchedJudging:
+    def test_batches_cut_requests(self, stub_api: StubMessagesAPI, test_encoding: str) -> None:
+        dataset = _dataset("Paris.", "BAD answer", "42.", "Blue.", "Yes.")
+        result = score_with_llm(
+            dataset, config=_config(stub_api, batch_tokens=4000), encoding_name=test_encoding
+        )
+        assert stub_api.requests == 1
+        warnings = [i for i in result.issues if i.severity == QualitySeverity.WARNING]
+        assert [i.sample_index for i in warnings] == [1]
+        assert result.issues[0].details["judged"] == 5
+
+    def test_batches_fit_output_limit(self, stub_api: StubMessagesAPI, test_encoding: str) -> None:
+        config = _config(stub_api, batch_tokens=4000, max_tokens=256, max_output_tokens=512)
+        assert max_batch_size(config) == 2
+        result = score_with_llm(
+            _dataset("a", "b", "c", "d", "e"), config=config, encoding_name=test_encoding
+        )
+        assert stub_api.requests == 3
+        assert [p.count("<conversation id=") for p in stub_api.prompts] == [2, 2, 1]
+        assert result.issues[0].details["judged"] == 5
+
+    def test_only_missing_items_retried(
+        self, stub_api: StubMessagesAPI, test_encoding: str
+    ) -> None:
+        stub_api.replies = [
+            '[{"id": 1, "score": 4, "reason": "a"}, {"id": 3, "score": 5, "reason": "c"}, '
+            '{"id": 2, "score": "bad"}, {"id": 4, "sco'
+        ]
+        dataset = _dataset("a", "b", "c", "d")
+        result = score_with_llm(
+            dataset, config=_config(stub_api, batch_tokens=4000), encoding_name=test_encoding
+        )
+        assert stub_api.requests == 2
+        retried = stub_api.prompts[1]
+        assert retried.count("<conversation id=") == 2
+        assert "Question 1?" in retried and "Question 3?" in retried
+        assert result.issues[0].details["failed"] == 0
+
+    def test_batch_cache_key(self, stub_api: StubMessagesAPI, test_encoding: str) -> None:
+        config = _config(stub_api, batch_tokens=4000)
+        with open_judgment_cache() as cache:
+            score_with_llm(
+                _dataset("a", "b"), config=config, cache=cache, encoding_name=test_encoding
+            )
+            score_with_llm(
+                _dataset("a", "b"), config=config, cache=cache, encoding_name=test_encoding
+            )
+            assert stub_api.requests == 1
+            score_with_llm(
+                _dataset("a", "b"),
+                config=_config(stub_api),
+                cache=cache,
+                encoding_name=test_encoding,
+            )
+        assert stub_api.requests == 3
@@ -2,21 +2,22 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import pytest
 
-from ftdata.core.loader import detect_format, load_dataset
-from ftdata.exceptions import EmptyDatasetError, FormatDetectionError
+from ftdata.core import loader
+from ftdata.core.loader import decode_json, detect_format, load_dataset
+from ftdata.core.models import DatasetFormat
+from ftdata.exceptions import DatasetLoadError, EmptyDatasetError, FormatDetectionError
 
 
 class TestDetectFormat:
-    @pytest.mark.skip(reason="Loader not yet implemented")
     def test_detect_jsonl(self, chatml_dataset_path: Path) -> None:
         fmt = detect_format(chatml_dataset_path)
         assert fmt is not None
 
-    @pytest.mark.skip(reason="Loader not yet implemented")
     def test_detect_unknown_raises(self, tmp_path: Path) -> None:
         unknown = tmp_path / "unknown.xyz"
         unknown.write_text("not a dataset")
@@ -25,14 +26,87 @@ class TestDetectFormat:
 
 
 class TestLoadDataset:
-    @pytest.mark.skip(reason="Loader not yet implemented")
     def test_load_chatml(self, chatml_dataset_path: Path) -> None:
         dataset = load_dataset(chatml_dataset_path)
         assert dataset.sample_count == 5
 
-    @pytest.mark.skip(reason="Loader not yet implemented")
     def test_load_empty_raises(self, tmp_path: Path) -> None:
         empty = tmp_path / "empty.jsonl"
         empty.write_text("")
         with pytest.raises(EmptyDatasetError):
             load_dataset(empty)
+
+    def test_load_alpaca(self, alpaca_dataset_path: Path) -> None:
+        dataset = load_dataset(alpaca_dataset_path)
+        assert dataset.format == DatasetFormat.ALPACA
+        assert [s.index for s in dataset.samples] == list(range(5))
+
+    def test_invalid_json_raises(self, tmp_path: Path) -> None:
+        broken = tmp_path / "broken.jsonl"
+        broken.write_text('{"messages": []}\n{not json\n')
+        with pytest.raises(DatasetLoadError, match="line 2"):
+            load_dataset(broken, DatasetFormat.CHATML)
+
+    def test_json_array(self, tmp_path: Path) -> None:
+        array = tmp_path / "data.json"
+        array.write_text('[{"instruction": "Hi", "output": "Hello"}]')
+        assert load_dataset(array).sample_count == 1
+
+
+class TestFastDecode:
+    @pytest.mark.parametrize(
+        "fixture",
+        ["minimal", "simple_chatml", "simple_alpaca", "quality_issues", "with_duplicates"],
+    )
+    def test_matches_strict(
+        self, fixtures_dir: Path, fixture: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # Small batches so the fixtures span several build_samples calls.
+        monkeypatch.setattr(loader, "DECODE_BATCH", 2)
+        path = fixtures_dir / f"{fixture}.jsonl"
+        assert load_dataset(path) == load_dataset(path, strict=True)
+
+    def test_sharegpt_and_format_errors(self, tmp_path: Path) -> None:
+        path = tmp_path / "data.jsonl"
+        path.write_text(
+            '{"conversations": [{"from": "human", "value": "Hi"}, {"from": "gpt", "value": 1}]}\n'
+            '{"conversations": "oops", "id": 7}\n'
+        )
+        fast = load_dataset(path)
+        assert fast == load_dataset(path, strict=True)
+        assert [m.role for m in fast.samples[0].messages] == ["user", "assistant"]
+        assert fast.samples[0].metadata["format_errors"] == ["non-string value"]
+        assert fast.samples[1].metadata == {
+            "id": 7,
+            "format_errors": ["conversations is not a list"],
+        }
+
+    def test_interns_repeated_strings(self, tmp_path: Path) -> None:
+        path = tmp_path / "data.jsonl"
+        system = {"role": "system", "content": "You are a careful assistant. " * 20}
+        records = [
+            {"messages": [system, {"role": "user", "content": f"Question {i}"}]} for i in (1, 2, 1)
+        ]
+        path.write_text("".join(json.dumps(r) + "\n" for r in records))
+        first, second, third = load_dataset(path).samples
+        assert first.messages[0].content is second.messages[0].content
+        assert first.messages[0].role is third.messages[0].role
+        assert first.raw_content is third.raw_content
+        assert first.messages[1].content is not second.messages[1].content
+
+    def test_decode_falls_back_to_json(self) -> None:
+        assert decode_json('{"a": 1}') == {"a": 1}
+        big = 2**70
+        assert decode_json(f'{{"n": {big}}}') == {"n": big}
+        assert decode_json('{"s": "\\ud800"}') == {"s": "\ud800"}
+        with pytest.raises(ValueError):
+            decode_json("{not json")
+
+    def test_json_array_matches_strict(self, tmp_path: Path) -> None:
+        array = tmp_path / "data.json"
+        array.write_text('[{"instruction": "Hi", "output": "Hello", "score": NaN}]')
+        fast = load_dataset(array)
+        assert fast.samples[0].metadata["score"] != fast.samples[0].metadata["score"]
+        assert (
+            fast.samples[0].raw_content == load_dataset(array, strict=True).samples[0].raw_content
+        )
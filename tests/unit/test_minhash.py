@@ -0,0 +1,34 @@
+"""Tests for MinHash near-duplicate detection."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from ftdata.core.loader import load_dataset
+from ftdata.core.models import Dataset, DedupMethod
+from ftdata.dedup.minhash import find_minhash_duplicates, word_shingles
+
+
+class TestWordShingles:
+    def test_shingles(self) -> None:
+        assert word_shingles("The quick brown fox") == [b"the quick brown", b"quick brown fox"]
+
+    def test_short_text_is_one_shingle(self) -> None:
+        assert word_shingles("Hi there") == [b"hi there"]
+
+
+class TestFindMinhashDuplicates:
+    def test_no_duplicates(self, sample_dataset: Dataset) -> None:
+        assert find_minhash_duplicates(sample_dataset).clusters == []
+
+    def test_identical_samples(self, duplicates_dataset_path: Path) -> None:
+        result = find_minhash_duplicates(load_dataset(duplicates_dataset_path))
+        assert [c.indices for c in result.clusters] == [[0, 1], [3, 4]]
+        assert all(c.method == DedupMethod.MINHASH for c in result.clusters)
+
+    def test_lower_threshold_merges_paraphrase(self, duplicates_dataset_path: Path) -> None:
+        result = find_minhash_duplicates(load_dataset(duplicates_dataset_path), threshold=0.3)
+        cluster = result.clusters[0]
+        assert cluster.indices == [0, 1, 2]
+        assert 0.3 <= cluster.similarity < 1.0
+        assert result.total_duplicates == 3
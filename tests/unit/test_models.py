@@ -15,6 +15,7 @@ from ftdata.core.models import (
     DedupResult,
     DiversityResult,
     DuplicateCluster,
+    IssueStore,
     LanguageProfile,
     LengthProfile,
     Message,
@@ -60,6 +61,22 @@ class TestSample:
         s2 = Sample(raw_content="version 2")
         assert s1.content_hash != s2.content_hash
 
+    @pytest.mark.parametrize("deep", [False, True])
+    def test_content_hash_follows_copy_update(self, deep: bool) -> None:
+        s1 = Sample(raw_content="version 1")
+        cached = s1.content_hash
+        s2 = s1.model_copy(update={"raw_content": "version 2"}, deep=deep)
+        assert s2.content_hash == Sample(raw_content="version 2").content_hash
+        assert s2.content_hash != cached
+        assert s1.model_copy(update={"index": 3}).content_hash == cached
+
+    def test_content_hash_follows_assignment(self) -> None:
+        sample = Sample(raw_content="version 1")
+        cached = sample.content_hash
+        sample.raw_content = "version 2"
+        assert sample.content_hash == Sample(raw_content="version 2").content_hash
+        assert sample.content_hash != cached
+
     def test_turn_count(self) -> None:
         sample = Sample(
             messages=[
@@ -259,6 +276,47 @@ class TestQualityResult:
         assert result.passed is True
         assert result.warning_count == 1
 
+    def test_json_round_trip(self) -> None:
+        store = IssueStore()
+        store.add(QualityRule.FT009, QualitySeverity.WARNING, "PII", 3, {"type": "email"})
+        result = QualityResult(store=store)
+        restored = QualityResult.model_validate_json(result.model_dump_json())
+        assert restored == result
+        assert restored.rule_counts == {"FT009": 1}
+
+
+class TestIssueStore:
+    def test_counters(self) -> None:
+        store = IssueStore()
+        store.add_many(QualityRule.FT001, QualitySeverity.ERROR, "Empty", [0, 4, 9])
+        store.add(QualityRule.FT011, QualitySeverity.INFO, "No system", 2)
+        assert len(store) == 4
+        assert store.severity_count(QualitySeverity.ERROR) == 3
+        assert store.counts() == {
+            (QualityRule.FT001, QualitySeverity.ERROR): 3,
+            (QualityRule.FT011, QualitySeverity.INFO): 1,
+        }
+
+    def test_sort_keeps_details(self) -> None:
+        store = IssueStore()
+        store.add_many(
+            QualityRule.FT005, QualitySeverity.WARNING, "Long", [5, 1], [{"n": 5}, {"n": 1}]
+        )
+        other = IssueStore()
+        other.add(QualityRule.FT001, QualitySeverity.ERROR, "Empty", 3)
+        store.extend(other)
+        store.sort_by_sample()
+        assert [(i.sample_index, i.message, i.details) for i in store] == [
+            (1, "Long", {"n": 1}),
+            (3, "Empty", {}),
+            (5, "Long", {"n": 5}),
+        ]
+
+    def test_page(self) -> None:
+        store = IssueStore()
+        store.add_many(QualityRule.FT002, QualitySeverity.WARNING, "Cut", range(10))
+        assert [i.sample_index for i in store.page(8, 5)] == [8, 9]
+
 
 class TestBenchmarkMatch:
     def test_creation(self) -> None:
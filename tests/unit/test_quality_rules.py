@@ -2,24 +2,106 @@
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
+import numpy as np
 import pytest
 
-from ftdata.core.models import Dataset
-from ftdata.quality.rules import check_quality_rules
+from ftdata.core.loader import load_dataset
+from ftdata.core.models import Dataset, Message, QualityIssue, QualityRule, Sample
+from ftdata.quality import rules
+from ftdata.quality.rules import RULES, Thresholds, check_quality_rules, evaluate_rules
+
+
+def _chat(*turns: tuple[str, str], index: int = 0, **metadata: object) -> Sample:
+    return Sample(
+        messages=[Message(role=r, content=c) for r, c in turns],
+        raw_content=json.dumps(turns),
+        metadata=metadata,
+        index=index,
+    )
+
+
+def _rules_hit(result_issues: list[QualityIssue], index: int = 0) -> set[str]:
+    return {i.rule.value for i in result_issues if i.sample_index == index}
 
 
 class TestCheckQualityRules:
-    @pytest.mark.skip(reason="Quality rules not yet implemented")
-    def test_clean_dataset(self, sample_dataset: Dataset) -> None:
-        result = check_quality_rules(sample_dataset)
+    def test_clean_dataset(self, sample_dataset: Dataset, test_encoding: str) -> None:
+        result = check_quality_rules(sample_dataset, encoding_name=test_encoding)
         assert result.passed is True
+        assert result.issues == []
 
-    @pytest.mark.skip(reason="Quality rules not yet implemented")
-    def test_disabled_rules(self, sample_dataset: Dataset) -> None:
-        result = check_quality_rules(sample_dataset, disabled_rules=["FT001"])
+    def test_disabled_rules(self, sample_dataset: Dataset, test_encoding: str) -> None:
+        result = check_quality_rules(
+            sample_dataset, disabled_rules=["FT001"], encoding_name=test_encoding
+        )
         assert result is not None
 
-    @pytest.mark.skip(reason="Quality rules not yet implemented")
-    def test_empty_response_detected(self) -> None:
-        # Uses quality_issues.jsonl fixture
-        pass
+    def test_disabled_rules_skip_tokenization(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("tokenizer should not run")
+
+        monkeypatch.setattr(rules, "count_tokens", fail)
+        dataset = Dataset(samples=[_chat(("user", "Hi"), ("assistant", ""))])
+        result = check_quality_rules(dataset, disabled_rules=["FT005", "FT006"])
+        assert _rules_hit(result.issues) == {"FT001", "FT011"}
+
+    def test_empty_response_detected(
+        self, quality_issues_dataset_path: Path, test_encoding: str
+    ) -> None:
+        result = check_quality_rules(
+            load_dataset(quality_issues_dataset_path), encoding_name=test_encoding
+        )
+        empty = [i for i in result.issues if i.rule == QualityRule.FT001]
+        assert [i.sample_index for i in empty] == [0]
+        assert result.passed is False
+
+    def test_truncation_detected(
+        self, quality_issues_dataset_path: Path, test_encoding: str
+    ) -> None:
+        result = check_quality_rules(
+            load_dataset(quality_issues_dataset_path), encoding_name=test_encoding
+        )
+        assert "FT002" in _rules_hit(result.issues, index=1)
+
+    def test_length_limits(self, test_encoding: str) -> None:
+        dataset = Dataset(
+            samples=[
+                _chat(("system", "s"), ("user", "q"), ("assistant", "x" * 50)),
+                _chat(("user", "q"), ("assistant", "ok"), index=1),
+            ]
+        )
+        result = check_quality_rules(
+            dataset,
+            disabled_rules=["FT011"],
+            max_response_tokens=10,
+            min_response_tokens=3,
+            encoding_name=test_encoding,
+        )
+        assert [(i.rule.value, i.sample_index) for i in result.issues] == [
+            ("FT005", 0),
+            ("FT006", 1),
+        ]
+        assert result.issues[0].details == {"response_tokens": 50}
+
+    def test_encoding_and_format_errors(self) -> None:
+        dataset = Dataset(
+            samples=[
+                _chat(("user", "caf\ufffd"), ("assistant", "Sure.")),
+                _chat(("user", "Hi"), index=1, format_errors=["missing content"]),
+            ]
+        )
+        result = check_quality_rules(dataset, disabled_rules=["FT005", "FT006", "FT011"])
+        assert _rules_hit(result.issues, 0) == {"FT003"}
+        assert _rules_hit(result.issues, 1) == {"FT004"}
+        assert result.issues[1].details == {"format_errors": 2}
+
+
+class TestEvaluateRules:
+    def test_only_failing_rows_materialized(self) -> None:
+        columns = {"has_system": np.array([True, False, True, False])}
+        ft011 = [r for r in RULES if r.rule == QualityRule.FT011]
+        issues = evaluate_rules(columns, np.array([10, 11, 12, 13]), ft011, Thresholds(10, 1))
+        assert [i.sample_index for i in issues] == [11, 13]
@@ -0,0 +1,85 @@
+"""Tests for the cross-dataset reference index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ftdata.core.loader import load_dataset
+from ftdata.core.models import DedupMethod
+from ftdata.dedup.reference import (
+    ReferenceIndex,
+    band_keys,
+    build_reference_index,
+    find_reference_duplicates,
+)
+from ftdata.exceptions import DatasetLoadError
+
+
+def _chatml(path: Path, pairs: list[tuple[str, str]]) -> Path:
+    records = [
+        {"messages": [{"role": "user", "content": q}, {"role": "assistant", "content": a}]}
+        for q, a in pairs
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    return path
+
+
+LONG = " ".join(f"word{i}" for i in range(60))
+
+
+@pytest.fixture
+def index(tmp_path: Path, minimal_dataset_path: Path) -> ReferenceIndex:
+    reference = _chatml(
+        tmp_path / "train.jsonl",
+        [("What is the capital of France?", "Paris."), ("Summarize this.", LONG)],
+    )
+    return build_reference_index([minimal_dataset_path, reference], tmp_path / "ref")
+
+
+def test_band_keys_depend_only_on_their_rows() -> None:
+    signatures = np.arange(12, dtype=np.uint32).reshape(2, 6)
+    changed = signatures.copy()
+    changed[0, 5] += 1
+    keys, changed_keys = band_keys(signatures, 2, 3), band_keys(changed, 2, 3)
+    assert keys.shape == (2, 2)
+    assert keys[0, 0] == changed_keys[0, 0] and keys[0, 1] != changed_keys[0, 1]
+
+
+def test_index_files_and_sources(index: ReferenceIndex, minimal_dataset_path: Path) -> None:
+    assert index.sample_count == 4
+    assert index.source_of(0) == (str(minimal_dataset_path), 0)
+    assert index.source_of(3)[1] == 1
+    assert not (index.directory / "signatures.tmp").exists()
+    assert ReferenceIndex(index.directory).manifest == index.manifest
+
+
+def test_matches_name_the_reference_sample(index: ReferenceIndex, tmp_path: Path) -> None:
+    query = _chatml(
+        tmp_path / "new.jsonl",
+        [
+            ("Something new entirely", "Fresh answer."),
+            ("What is the capital of France?", "Paris."),
+            ("Summarize this.", LONG.replace("word59", "word60")),
+        ],
+    )
+    dataset = load_dataset(query)
+
+    result = find_reference_duplicates(dataset, index)
+    assert result.sample_count == 3
+    exact, near = result.matches
+    assert (exact.sample_index, exact.reference_index, exact.method) == (1, 0, DedupMethod.EXACT)
+    assert exact.reference_path.endswith("train.jsonl")
+    assert (near.sample_index, near.reference_index, near.method) == (2, 1, DedupMethod.MINHASH)
+    assert 0.8 <= near.similarity < 1.0
+
+    exact_only = find_reference_duplicates(dataset, index, DedupMethod.EXACT)
+    assert [m.sample_index for m in exact_only.matches] == [1]
+
+
+def test_rejects_missing_index(tmp_path: Path) -> None:
+    with pytest.raises(DatasetLoadError, match="not a reference index"):
+        ReferenceIndex(tmp_path)
@@ -0,0 +1,115 @@
+"""Tests for the LLM-judge sampling planner."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from ftdata.core.models import (
+    Dataset,
+    DedupResult,
+    DuplicateCluster,
+    Message,
+    QualityIssue,
+    QualityResult,
+    QualityRule,
+    QualitySeverity,
+    Sample,
+)
+from ftdata.quality.sampling import allocate, plan_judge_sample, stratified_mean
+
+ENGLISH = "What is the answer to this question and why is it true?"
+GERMAN = "Was ist die Antwort auf die Frage und warum ist das nicht so?"
+
+
+def _dataset(*prompts: str) -> Dataset:
+    return Dataset(
+        samples=[
+            Sample(
+                messages=[
+                    Message(role="user", content=prompt),
+                    Message(role="assistant", content="ok " * (i % 4 + 1)),
+                ],
+                raw_content=json.dumps([i, prompt]),
+                index=i,
+            )
+            for i, prompt in enumerate(prompts)
+        ]
+    )
+
+
+class TestAllocate:
+    def test_proportional(self) -> None:
+        assert allocate([60, 30, 10], 10) == [6, 3, 1]
+
+    def test_every_stratum_represented(self) -> None:
+        assert allocate([98, 1, 1], 3) == [1, 1, 1]
+
+    def test_capped_at_population(self) -> None:
+        assert allocate([5, 1], 10) == [5, 1]
+        assert sum(allocate([7, 2, 50], 20)) == 20
+
+
+class TestPlanJudgeSample:
+    def test_excludes_errors_and_duplicates(self, test_encoding: str) -> None:
+        dataset = _dataset(*[ENGLISH] * 6)
+        quality = QualityResult(
+            issues=[
+                QualityIssue(
+                    rule=QualityRule.FT002,
+                    severity=QualitySeverity.ERROR,
+                    message="Empty message",
+                    sample_index=0,
+                ),
+                QualityIssue(
+                    rule=QualityRule.FT006,
+                    severity=QualitySeverity.WARNING,
+                    message="Long",
+                    sample_index=5,
+                ),
+            ]
+        )
+        duplicates = DedupResult(clusters=[DuplicateCluster(indices=[0, 1, 2])])
+        plan = plan_judge_sample(dataset, None, quality, duplicates, test_encoding)
+
+        assert plan.excluded_errors == 1
+        # Sample 0 is an error, so sample 1 represents the cluster.
+        assert plan.excluded_duplicates == 1
+        assert plan.sample_indices() == [1, 3, 4, 5]
+
+    def test_strata_by_language(self, test_encoding: str) -> None:
+        dataset = _dataset(*[ENGLISH] * 16, *[GERMAN] * 4)
+        strata = plan_judge_sample(dataset, encoding_name=test_encoding).strata
+        plan = plan_judge_sample(dataset, len(strata), encoding_name=test_encoding)
+
+        assert {s.language for s in plan.strata} == {"en", "de"}
+        assert sum(s.population for s in plan.strata) == 20
+        # A budget covering every stratum gives each one a sample.
+        assert all(len(s.sample_indices) == 1 for s in plan.strata)
+        assert plan.sample_count == len(strata)
+
+    def test_deterministic(self, test_encoding: str) -> None:
+        dataset = _dataset(*[ENGLISH] * 20)
+        first = plan_judge_sample(dataset, 5, encoding_name=test_encoding, seed=7)
+        second = plan_judge_sample(dataset, 5, encoding_name=test_encoding, seed=7)
+        assert first == second
+
+
+class TestStratifiedMean:
+    def test_weights_by_population(self) -> None:
+        mean, _ = stratified_mean([(90, [4, 4]), (10, [1, 1])])
+        assert mean == pytest.approx(3.7)
+
+    def test_census_has_no_sampling_error(self) -> None:
+        mean, half_width = stratified_mean([(3, [1, 3, 5])])
+        assert mean == 3.0
+        assert half_width == 0.0
+
+    def test_interval_shrinks_with_sample_size(self) -> None:
+        _, small = stratified_mean([(1000, [1, 5, 3, 4])])
+        _, large = stratified_mean([(1000, [1, 5, 3, 4] * 25)])
+        assert 0 < large < small
+
+    def test_empty(self) -> None:
+        assert stratified_mean([(10, [])]) == (0.0, 0.0)
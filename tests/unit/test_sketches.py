@@ -0,0 +1,121 @@
+"""Tests for streaming prompt-diversity sketches."""
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+from ftdata.core.models import DATASET_LEVEL_INDEX, Dataset, Message, QualityRule, Sample
+from ftdata.diversity.sketches import PromptSketch, sketch_prompts, template_key
+from ftdata.quality.heuristics import check_heuristics
+
+WORDS = [
+    "apple",
+    "river",
+    "quantum",
+    "violin",
+    "desert",
+    "matrix",
+    "ocean",
+    "lantern",
+    "cipher",
+    "meadow",
+    "glacier",
+    "orbit",
+    "pepper",
+    "harbor",
+    "falcon",
+    "canyon",
+    "ember",
+    "tundra",
+    "willow",
+    "prism",
+]
+
+
+def _random_prompt(rng: random.Random, length: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def _sample(prompt: str, index: int = 0) -> Sample:
+    return Sample(
+        messages=[Message(role="user", content=prompt), Message(role="assistant", content="ok")],
+        raw_content=json.dumps(prompt),
+        index=index,
+    )
+
+
+class TestTemplateKey:
+    def test_digits_and_case_collapsed(self) -> None:
+        assert template_key("Add 12 and 7") == template_key("add 3 AND 41")
+
+
+class TestPromptSketch:
+    def test_distinct_estimate(self) -> None:
+        sketch = PromptSketch()
+        for i in range(2000):
+            sketch.add(f"question number {i % 500}")
+        summary = sketch.summary()
+        assert summary.sample_count == 2000
+        assert summary.distinct_prompts == pytest.approx(500, rel=0.05)
+
+    def test_heavy_hitter_template(self) -> None:
+        rng = random.Random(0)
+        sketch = PromptSketch()
+        for i in range(3000):
+            if i % 5 < 3:
+                sketch.add(f"Translate the following sentence into French: {_random_prompt(rng)}")
+            else:
+                sketch.add(_random_prompt(rng))
+        summary = sketch.summary()
+        top, count = next(iter(summary.top_templates.items()))
+        assert top.startswith("translate the following sentence")
+        assert summary.top_template_share == pytest.approx(0.6, abs=0.05)
+        assert count <= 1800
+
+    def test_similarity(self) -> None:
+        rng = random.Random(1)
+        distinct = PromptSketch()
+        near_duplicates = PromptSketch()
+        base = _random_prompt(rng, 40)
+        for i in range(300):
+            distinct.add(_random_prompt(rng, 40))
+            near_duplicates.add(f"{base} variant {i}")
+        assert near_duplicates.mean_similarity() > 0.7
+        assert distinct.mean_similarity() < 0.2
+
+    def test_merge_matches_single_pass(self) -> None:
+        rng = random.Random(2)
+        prompts = [_random_prompt(rng, 6) for _ in range(4000)]
+        whole = sketch_prompts(_sample(p) for p in prompts)
+        left = sketch_prompts(_sample(p) for p in prompts[:1500])
+        right = sketch_prompts(_sample(p) for p in prompts[1500:])
+        left.merge(right)
+
+        merged, single = left.summary(), whole.summary()
+        assert merged.sample_count == single.sample_count
+        assert merged.distinct_prompts == single.distinct_prompts
+        assert merged.mean_similarity == single.mean_similarity
+
+
+class TestLowDiversityHeuristic:
+    def test_flags_templated_dataset(self) -> None:
+        samples = [_sample(f"Summarize article {i} in one line.", i) for i in range(40)]
+        result = check_heuristics(Dataset(samples=samples), disabled_rules=["FT007"])
+        (issue,) = result.issues
+        assert issue.rule == QualityRule.FT012
+        assert issue.sample_index == DATASET_LEVEL_INDEX
+        assert issue.details["top_template_share"] == 1.0
+
+    def test_diverse_dataset_passes(self) -> None:
+        rng = random.Random(3)
+        samples = [_sample(_random_prompt(rng, 20), i) for i in range(40)]
+        result = check_heuristics(Dataset(samples=samples), disabled_rules=["FT007"])
+        assert result.issues == []
+
+    def test_small_dataset_not_judged(self) -> None:
+        samples = [_sample("Same prompt", i) for i in range(5)]
+        result = check_heuristics(Dataset(samples=samples), disabled_rules=["FT007"])
+        assert result.issues == []
@@ -2,28 +2,143 @@
 
 from __future__ import annotations
 
+import random
+from pathlib import Path
+from typing import Any
+
 import pytest
 
-from ftdata.core.models import Dataset
-from ftdata.profiling.stats import compute_length_profile, compute_turn_profile, profile_dataset
+from ftdata.cache import ResultCache
+from ftdata.core.models import Dataset, Message, Sample, TokenStats
+from ftdata.profiling import tokens
+from ftdata.profiling.stats import (
+    LengthHistogram,
+    compute_length_profile,
+    compute_turn_profile,
+    compute_vocab_profile,
+    profile_dataset,
+    token_stats,
+    turn_stats,
+)
+
+
+class TestTokenStats:
+    def test_empty(self) -> None:
+        assert token_stats([]).total == 0
+
+    def test_percentiles(self) -> None:
+        stats = token_stats(list(range(1, 101)))
+        assert stats.min == 1
+        assert stats.max == 100
+        assert stats.median == 50.5
+        assert stats.total == 5050
+        assert 95 < stats.p95 < 96
+
+
+class TestLengthHistogram:
+    def test_empty(self) -> None:
+        assert LengthHistogram().token_stats() == TokenStats()
+
+    def test_matches_sorted_stats(self) -> None:
+        rng = random.Random(7)
+        values = [rng.randint(0, 300) for _ in range(1001)]
+        histogram = LengthHistogram()
+        seen: list[int] = []
+        for start in range(0, len(values), 250):
+            batch = values[start : start + 250]
+            histogram.update(batch)
+            seen.extend(batch)
+            assert histogram.token_stats() == token_stats(seen)
+            assert histogram.turn_stats() == turn_stats(seen)
+        assert len(histogram.counts) <= 301
 
 
 class TestComputeLengthProfile:
-    @pytest.mark.skip(reason="Stats not yet implemented")
-    def test_basic(self, sample_dataset: Dataset) -> None:
-        profile = compute_length_profile(sample_dataset)
+    def test_basic(self, sample_dataset: Dataset, test_encoding: str) -> None:
+        profile = compute_length_profile(sample_dataset, test_encoding)
         assert profile.total_tokens.total > 0
 
+    def test_prompt_and_response_split(self, sample_dataset: Dataset, test_encoding: str) -> None:
+        profile = compute_length_profile(sample_dataset, test_encoding)
+        # Byte-level test encoding: one token per byte.
+        assert profile.response_tokens.total == len("2+2 equals 4.")
+        assert profile.prompt_tokens.total == len("You are a helpful assistant.What is 2+2?")
+
+    def test_repeated_contents_encoded_once(
+        self, test_encoding: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        system = Message(role="system", content="Shared system prompt.")
+        samples = [
+            Sample(
+                messages=[system, Message(role="assistant", content=f"Answer {i}")],
+                raw_content=str(i),
+                index=i,
+            )
+            for i in range(3)
+        ]
+        encoding = tokens.get_encoding(test_encoding)
+        encoded: list[str] = []
+
+        class CountingEncoding:
+            def encode_ordinary_batch(self, texts: list[str]) -> Any:
+                encoded.extend(texts)
+                return encoding.encode_ordinary_batch(texts)
+
+        monkeypatch.setattr(tokens, "get_encoding", lambda name: CountingEncoding())
+        records = tokens.tokenize_samples(Dataset(samples=samples), test_encoding)
+        assert encoded.count(system.content) == 1
+        assert [r[:2] for r in records] == [[len(system.content), len("Answer 0")]] * 3
+        assert dict(map(tuple, records[0][2]))[ord("S")] == 1
+
+
+class TestCountTokens:
+    def test_matches_tokenize_samples(self, sample_dataset: Dataset, test_encoding: str) -> None:
+        samples = [*sample_dataset.samples, Sample(raw_content="empty", index=99)]
+        counts = tokens.count_tokens(samples, test_encoding)
+        records = tokens.tokenize_samples(Dataset(samples=samples), test_encoding)
+        assert counts.shape == (len(samples), 2)
+        assert counts.tolist() == [r[:2] for r in records]
+        assert counts[-1].tolist() == [0, 0]
+
+    def test_cached_counts_skip_encoding(
+        self,
+        sample_dataset: Dataset,
+        test_encoding: str,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        with ResultCache(tmp_path / "c.sqlite3") as cache:
+            first = tokens.count_tokens(sample_dataset.samples, test_encoding, cache)
+            monkeypatch.setattr(tokens, "get_encoding", None)
+            cached = tokens.count_tokens(sample_dataset.samples, test_encoding, cache)
+        assert cached.tolist() == first.tolist()
+
 
 class TestComputeTurnProfile:
-    @pytest.mark.skip(reason="Stats not yet implemented")
     def test_basic(self, sample_dataset: Dataset) -> None:
         profile = compute_turn_profile(sample_dataset)
         assert profile.min >= 0
 
 
+class TestComputeVocabProfile:
+    def test_basic(self, sample_dataset: Dataset, test_encoding: str) -> None:
+        profile = compute_vocab_profile(sample_dataset, test_encoding)
+        assert profile.unique_tokens > 0
+        assert 0 < profile.type_token_ratio <= 1
+        assert profile.top_tokens[0][1] >= profile.top_tokens[-1][1]
+
+
 class TestProfileDataset:
-    @pytest.mark.skip(reason="Stats not yet implemented")
-    def test_full_profile(self, sample_dataset: Dataset) -> None:
-        result = profile_dataset(sample_dataset)
+    def test_full_profile(self, sample_dataset: Dataset, test_encoding: str) -> None:
+        result = profile_dataset(sample_dataset, test_encoding)
         assert result.sample_count > 0
+
+    def test_cached_rerun_matches(
+        self, sample_dataset: Dataset, test_encoding: str, tmp_path: Path
+    ) -> None:
+        with ResultCache(tmp_path / "c.sqlite3") as cache:
+            first = profile_dataset(sample_dataset, test_encoding, cache)
+            second = profile_dataset(sample_dataset, test_encoding, cache)
+            # One lookup each for token counts and languages.
+            assert cache.hits == 2
+        assert first == second
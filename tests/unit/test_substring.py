@@ -0,0 +1,99 @@
+"""Tests for repeated-span detection over the token stream."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ftdata.dedup import substring
+from ftdata.dedup.substring import find_repeated_spans, window_hashes
+
+BOILERPLATE = "Note: this answer was generated automatically; check every figure yourself."
+
+
+def _corpus(path: Path, count: int) -> Path:
+    records = []
+    for i in range(count):
+        answer = f"Answer number {i} with its own wording."
+        if i % 3 == 0:
+            answer = f"{answer} {BOILERPLATE} Closing remark {i}."
+        records.append(
+            {
+                "messages": [
+                    {"role": "user", "content": f"Question {i}?"},
+                    {"role": "assistant", "content": answer},
+                ]
+            }
+        )
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    return path
+
+
+def test_window_hashes_match_direct_polynomial() -> None:
+    rng = np.random.default_rng(0)
+    table = rng.integers(0, 2**63, size=50, dtype=np.uint64)
+    tokens = rng.integers(0, 50, size=40).astype(np.uint32)
+    for width in (2, 5, 13):
+        hashes = window_hashes(tokens, width, table)
+        assert len(hashes) == len(tokens) - width + 1
+        for start in (0, 7, len(hashes) - 1):
+            expected = 0
+            for token in tokens[start : start + width]:
+                expected = (expected * substring._HASH_BASE + int(table[token])) % 2**64
+            assert int(hashes[start]) == expected
+
+
+@pytest.mark.parametrize("small_chunks", [False, True])
+def test_finds_boilerplate_span(
+    tmp_path: Path, test_encoding: str, monkeypatch: pytest.MonkeyPatch, small_chunks: bool
+) -> None:
+    path = _corpus(tmp_path / "corpus.jsonl", 60)
+    if small_chunks:
+        monkeypatch.setattr(substring, "MIN_RUN_PAIRS", 64)
+    result = find_repeated_spans(
+        path,
+        min_tokens=30,
+        max_occurrences=5,
+        encoding_name=test_encoding,
+        memory_bytes=1024 if small_chunks else 1 << 24,
+    )
+    assert result.sample_count == 60
+    # Extends left and right for as long as the 20 occurrences stay identical.
+    assert [s.text for s in result.spans] == [
+        f" with its own wording. {BOILERPLATE} Closing remark "
+    ]
+    (span,) = result.spans
+    assert span.occurrences == 20
+    assert span.token_count == len(span.text)
+    assert span.sample_indices == list(range(0, 60, 3))
+    assert result.affected_samples == 20
+
+
+def test_spans_stay_inside_samples(tmp_path: Path, test_encoding: str) -> None:
+    # Every sample is the same 20 bytes: a 30-token window would have to span two samples.
+    path = tmp_path / "short.jsonl"
+    record = {
+        "messages": [
+            {"role": "user", "content": "x" * 10},
+            {"role": "assistant", "content": "y" * 9},
+        ]
+    }
+    path.write_text((json.dumps(record) + "\n") * 50)
+    result = find_repeated_spans(
+        path, min_tokens=30, max_occurrences=2, encoding_name=test_encoding
+    )
+    assert result.token_count == 50 * 20
+    assert result.spans == []
+
+    result = find_repeated_spans(
+        path, min_tokens=20, max_occurrences=2, encoding_name=test_encoding
+    )
+    assert [(s.occurrences, s.token_count) for s in result.spans] == [(50, 20)]
+
+
+def test_rejects_short_spans(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="at least 2"):
+        find_repeated_spans(tmp_path / "missing.jsonl", min_tokens=1)
@@ -0,0 +1,75 @@
+"""Tests for per-stage timing spans."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from ftdata.core.loader import load_dataset
+from ftdata.core.models import ProfileReport, TimingSpan
+from ftdata.profiling.stats import profile_dataset
+from ftdata.quality.runner import run_quality_checks
+from ftdata.timing import record_timings, span
+
+
+class TestSpans:
+    def test_disabled_records_nothing(self) -> None:
+        with span("load") as timed:
+            timed.samples = 10
+        with record_timings(enabled=False) as recorder, span("load"):
+            pass
+        assert recorder.spans == []
+
+    def test_nested_spans_in_open_order(self) -> None:
+        with record_timings() as recorder:
+            with span("outer", 4):
+                with span("inner") as timed:
+                    timed.samples = 2
+                with span("second"):
+                    pass
+            with span("after"):
+                pass
+        assert [s.stage for s in recorder.spans] == [
+            "outer",
+            "outer.inner",
+            "outer.second",
+            "after",
+        ]
+        assert recorder.spans[0].samples == 4
+        assert recorder.spans[1].samples == 2
+        outer = recorder.spans[0]
+        assert outer.wall_seconds >= recorder.spans[1].wall_seconds >= 0
+        assert outer.cpu_seconds >= 0
+
+    def test_span_closed_on_error(self) -> None:
+        with record_timings() as recorder:
+            with pytest.raises(RuntimeError), span("failing"):
+                raise RuntimeError("boom")
+            with span("next"):
+                pass
+        assert [s.stage for s in recorder.spans] == ["failing", "next"]
+
+    def test_samples_per_second(self) -> None:
+        assert TimingSpan(stage="a", wall_seconds=2.0, cpu_seconds=1.0, samples=10).model_dump()[
+            "samples_per_second"
+        ] == pytest.approx(5.0)
+        assert TimingSpan(stage="a", wall_seconds=2.0, cpu_seconds=1.0).samples_per_second is None
+
+
+class TestInstrumentedStages:
+    def test_load_profile_and_quality(self, chatml_dataset_path: Path, test_encoding: str) -> None:
+        with record_timings() as recorder:
+            dataset = load_dataset(chatml_dataset_path)
+            profile_dataset(dataset, test_encoding)
+            run_quality_checks(dataset, encoding_name=test_encoding)
+        stages = [s.stage for s in recorder.spans]
+        assert stages[:4] == ["load", "profile", "profile.tokenize", "profile.stats"]
+        assert {"quality", "quality.rules", "quality.heuristics", "quality.pii"} <= set(stages)
+        assert all(s.samples == dataset.sample_count for s in recorder.spans)
+
+    def test_report_round_trip(self) -> None:
+        timing = TimingSpan(stage="load", wall_seconds=0.5, cpu_seconds=0.4, samples=3)
+        report = ProfileReport(timings=[timing])
+        restored = ProfileReport.model_validate_json(report.model_dump_json())
+        assert restored.timings == [timing]
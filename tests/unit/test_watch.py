@@ -0,0 +1,146 @@
+"""Tests for incremental profiling of growing JSONL files."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from ftdata.core.loader import load_dataset
+from ftdata.dedup.exact import find_exact_duplicates
+from ftdata.dedup.minhash import find_minhash_duplicates
+from ftdata.exceptions import DatasetLoadError
+from ftdata.profiling.stats import profile_dataset
+from ftdata.profiling.watch import JsonlTail, WatchSession
+from ftdata.quality.runner import run_quality_checks
+from ftdata.report.cli_report import watch_renderable
+
+
+def _line(prompt: str, answer: str) -> str:
+    messages = [{"role": "user", "content": prompt}, {"role": "assistant", "content": answer}]
+    return json.dumps({"messages": messages}) + "\n"
+
+
+def _lines(count: int) -> list[str]:
+    lines = []
+    for i in range(count):
+        # Every fifth sample repeats an earlier one; many share one template.
+        n = i - 3 if i % 5 == 4 else i
+        answer = "" if n % 7 == 6 else f"The answer is {n} because it follows from step {n % 3}."
+        lines.append(_line(f"Summarize report {n}: revenue grew by {n} percent.", answer))
+    return lines
+
+
+class TestJsonlTail:
+    def test_partial_line_waits_for_newline(self, tmp_path: Path) -> None:
+        path = tmp_path / "data.jsonl"
+        path.write_text('{"a": 1}\n{"a": 2')
+        tail = JsonlTail(path)
+        assert tail.read_lines() == [(1, '{"a": 1}')]
+        assert tail.read_lines() == []
+
+        with open(path, "a") as f:
+            f.write('}\n\n{"a": 3}\n')
+        assert tail.read_lines() == [(2, '{"a": 2}'), (4, '{"a": 3}')]
+        assert tail.offset == path.stat().st_size
+
+    def test_small_chunks(self, tmp_path: Path) -> None:
+        path = tmp_path / "data.jsonl"
+        path.write_text("".join(f'{{"i": {i}}}\n' for i in range(50)))
+        tail = JsonlTail(path, chunk_bytes=7)
+        seen = []
+        while lines := tail.read_lines():
+            seen.extend(text for _, text in lines)
+        assert seen == [f'{{"i": {i}}}' for i in range(50)]
+
+    def test_truncated_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "data.jsonl"
+        path.write_text('{"a": 1}\n{"a": 2}\n')
+        tail = JsonlTail(path)
+        tail.read_lines()
+        path.write_text('{"a": 1}\n')
+        with pytest.raises(DatasetLoadError, match="truncated"):
+            tail.read_lines()
+
+
+class TestWatchSession:
+    def test_matches_full_analysis(self, tmp_path: Path, test_encoding: str) -> None:
+        path = tmp_path / "data.jsonl"
+        lines = _lines(60)
+        session = WatchSession(path, encoding_name=test_encoding)
+
+        path.write_text("")
+        text = "".join(lines)
+        # Append in uneven pieces that split records mid-line.
+        for start in range(0, len(text), 997):
+            with open(path, "a") as f:
+                f.write(text[start : start + 997])
+            while session.poll():
+                pass
+        assert session.sample_count == 60
+        assert session.bytes_read == path.stat().st_size
+
+        dataset = load_dataset(path)
+        report = session.report()
+        assert report.profile == profile_dataset(dataset, test_encoding)
+        assert report.quality == run_quality_checks(dataset, encoding_name=test_encoding)
+        assert any(i.rule.value == "FT012" for i in report.quality.issues)
+        assert session.exact_duplicates() == find_exact_duplicates(dataset)
+        assert session.near_duplicates() == find_minhash_duplicates(dataset)
+
+    def test_live_view_uses_running_counts(
+        self, tmp_path: Path, test_encoding: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        path = tmp_path / "data.jsonl"
+        path.write_text("".join(_lines(60)))
+        session = WatchSession(path, encoding_name=test_encoding)
+        while session.poll():
+            pass
+        report = session.report()
+
+        def fail(*args: object) -> None:
+            raise AssertionError("live view must not rebuild full results")
+
+        for name in ("report", "quality", "exact_duplicates", "near_duplicates"):
+            monkeypatch.setattr(session, name, fail)
+        monkeypatch.setattr(session._minhash, "clusters", fail)
+        assert session.live_report().profile == report.profile
+        assert session.issue_counts() == report.quality.store.counts()
+        dataset = load_dataset(path)
+        assert session.exact_duplicate_count == find_exact_duplicates(dataset).total_duplicates
+        assert session.near_duplicate_count == find_minhash_duplicates(dataset).total_duplicates
+        assert session.exact_duplicate_count > 0
+
+        view = watch_renderable(
+            session.live_report(),
+            session.issue_counts(),
+            session.exact_duplicate_count,
+            session.near_duplicate_count,
+            session.bytes_read,
+        )
+        console = Console(width=120, record=True)
+        console.print(view)
+        text = console.export_text()
+        assert "FT012" in text
+        assert f"{session.exact_duplicate_count:,} exact" in text
+
+    def test_only_new_lines_are_processed(self, tmp_path: Path, test_encoding: str) -> None:
+        path = tmp_path / "data.jsonl"
+        path.write_text("".join(_lines(10)))
+        session = WatchSession(path, encoding_name=test_encoding)
+        assert session.poll() == 10
+        assert session.poll() == 0
+
+        with open(path, "a") as f:
+            f.write(_line("A brand new question?", "A brand new answer."))
+        assert session.poll() == 1
+        assert session.report().sample_count == 11
+
+    def test_invalid_json_reports_line(self, tmp_path: Path, test_encoding: str) -> None:
+        path = tmp_path / "data.jsonl"
+        path.write_text(_lines(1)[0] + "{broken\n")
+        session = WatchSession(path, encoding_name=test_encoding)
+        with pytest.raises(DatasetLoadError, match="line 2"):
+            session.poll()
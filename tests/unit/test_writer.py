@@ -0,0 +1,89 @@
+"""Tests for the streaming keep/drop writer."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ftdata.core import writer
+from ftdata.core.loader import load_dataset
+from ftdata.core.writer import keep_bitmap, shard_path, write_kept
+from ftdata.dedup.exact import find_exact_duplicates, keep_first
+from ftdata.exceptions import DatasetLoadError
+
+
+def test_keep_bitmap_is_one_bit_per_sample() -> None:
+    bitmap = keep_bitmap(10, [1, 8, 42])
+    assert bitmap.dtype == np.uint8
+    assert len(bitmap) == 2
+    assert np.unpackbits(bitmap, bitorder="little")[:10].tolist() == [
+        1, 0, 1, 1, 1, 1, 1, 1, 0, 1
+    ]  # fmt: skip
+
+
+def test_shard_path() -> None:
+    assert shard_path(Path("out/clean.jsonl.gz"), 3) == Path("out/clean-00003.jsonl.gz")
+    assert shard_path(Path("clean.jsonl"), 0) == Path("clean-00000.jsonl")
+
+
+def test_copies_kept_lines_verbatim(tmp_path: Path, duplicates_dataset_path: Path) -> None:
+    source = tmp_path / "source.jsonl"
+    lines = duplicates_dataset_path.read_bytes().splitlines(keepends=True)
+    # Unusual spacing, CRLF and a blank line must survive untouched.
+    lines[0] = lines[0].replace(b'": "', b'":   "').replace(b"\n", b"\r\n")
+    source.write_bytes(b"".join(lines[:3]) + b"\n" + b"".join(lines[3:]))
+
+    result = find_exact_duplicates(load_dataset(source))
+    cleaned = write_kept(source, tmp_path / "clean.jsonl", keep_first(result, 6))
+
+    assert (cleaned.kept, cleaned.dropped) == (4, 2)
+    expected = [lines[0], lines[2], lines[3], lines[5]]
+    assert (tmp_path / "clean.jsonl").read_bytes() == b"".join(expected)
+    assert cleaned.bytes_written == sum(map(len, expected))
+
+
+@pytest.mark.parametrize("separator", ["\n\u00a0\n", "\r"])
+def test_numbers_records_like_the_loader(tmp_path: Path, separator: str) -> None:
+    # A line holding only a non-breaking space is blank to the loader, and a
+    # lone CR ends a line; the copy must index records the same way.
+    source = tmp_path / "source.jsonl"
+    a, b = (json.dumps({"instruction": q, "output": "x"}) for q in ("A", "B"))
+    source.write_bytes(f"{a}{separator}{a}\n{b}\n".encode())
+
+    result = find_exact_duplicates(load_dataset(source))
+    cleaned = write_kept(source, tmp_path / "clean.jsonl", keep_first(result, 3))
+
+    assert (cleaned.kept, cleaned.dropped) == (2, 1)
+    kept = (tmp_path / "clean.jsonl").read_text().splitlines()
+    assert [json.loads(line)["instruction"] for line in kept] == ["A", "B"]
+
+
+def test_json_array_stays_array(tmp_path: Path) -> None:
+    source = tmp_path / "source.json"
+    records = [{"instruction": f"q{i}", "output": f"a{i}"} for i in range(4)]
+    source.write_text(json.dumps(records))
+    write_kept(source, tmp_path / "clean.json", keep_bitmap(4, [0, 2]))
+    assert json.loads((tmp_path / "clean.json").read_text()) == [records[1], records[3]]
+
+
+def test_shards_by_size(
+    tmp_path: Path, chatml_dataset_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(writer, "WRITE_BLOCK", 16)
+    lines = chatml_dataset_path.read_bytes().splitlines(keepends=True)
+    output = tmp_path / "clean.jsonl.gz"
+    cleaned = write_kept(
+        chatml_dataset_path, output, keep_bitmap(len(lines), [1]), shard_bytes=1, workers=2
+    )
+    assert len(cleaned.output_paths) == len(lines) - 1
+    shards = [gzip.decompress(Path(p).read_bytes()) for p in cleaned.output_paths]
+    assert shards == [lines[0], *lines[2:]]
+
+
+def test_rejects_records_beyond_bitmap(tmp_path: Path, chatml_dataset_path: Path) -> None:
+    with pytest.raises(DatasetLoadError, match="more records than the keep bitmap"):
+        write_kept(chatml_dataset_path, tmp_path / "clean.jsonl", keep_bitmap(0))